@@ -0,0 +1,22 @@
+"""
+Gunicorn settings (loaded from the working directory, see Dockerfile)
+
+The app is imported once in the master and the workers are forked from
+it, so what it loads at import (notably local embedding models, see
+src/infrastructure/services/embedding_backends.py) is shared copy-on-write
+instead of loaded by every worker.
+"""
+import gc
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+threads = int(os.getenv("GUNICORN_THREADS", "2"))
+preload_app = True
+
+
+def when_ready(server):
+    # Objects of the loaded app move out of the collector's generations:
+    # collections in a worker would otherwise write to (and so copy) every
+    # page holding one
+    gc.freeze()
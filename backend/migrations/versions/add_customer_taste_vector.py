@@ -0,0 +1,28 @@
+"""Add customer taste vectors
+
+Revision ID: add_customer_taste_vector
+Revises: add_product_embedding_hash
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_customer_taste_vector'
+down_revision = 'add_product_embedding_hash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('customers', sa.Column('taste_vector', Vector(1536), nullable=True))
+    op.add_column('customers', sa.Column('taste_weight', sa.Float(), server_default='0', nullable=False))
+    op.add_column('customers', sa.Column('taste_updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('customers', 'taste_updated_at')
+    op.drop_column('customers', 'taste_weight')
+    op.drop_column('customers', 'taste_vector')
@@ -0,0 +1,108 @@
+"""Move product embeddings into per-version rows for online model changes
+
+Revision ID: add_embedding_versions
+Revises: add_quantized_vector_indexes
+Create Date: 2026-10-19
+"""
+import os
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+import pgvector.sqlalchemy
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_embedding_versions'
+down_revision = 'add_quantized_vector_indexes'
+branch_labels = None
+depends_on = None
+
+# The model products were embedded with so far
+INITIAL_VERSION = 'text-embedding-3-small@1'
+INITIAL_MODEL = 'text-embedding-3-small'
+DIMENSION = 1536
+
+# Frozen copy of vector_search.version_index_definition() for INITIAL_VERSION
+INDEXES = {
+    'float': ('(embedding::vector(1536))', 'vector_cosine_ops'),
+    'halfvec': ('(embedding::halfvec(1536))', 'halfvec_cosine_ops'),
+    'binary': ('(binary_quantize(embedding)::bit(1536))', 'bit_hamming_ops'),
+}
+
+
+def _index_name(mode):
+    slug = re.sub(r'[^a-z0-9]+', '_', INITIAL_VERSION.lower()).strip('_')[:40]
+    return f'idx_product_embeddings_{slug}_{mode}'
+
+
+def upgrade():
+    mode = os.getenv('VECTOR_INDEX_MODE', 'float').lower()
+    if mode not in INDEXES:
+        raise ValueError(f"VECTOR_INDEX_MODE must be one of {', '.join(INDEXES)}, not {mode!r}")
+
+    op.create_table(
+        'embedding_versions',
+        sa.Column('version', sa.String(64), primary_key=True),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('dimension', sa.Integer, nullable=False),
+        sa.Column('status', sa.String(16), nullable=False),
+        sa.Column('created_at', sa.DateTime, nullable=False),
+        sa.Column('updated_at', sa.DateTime, nullable=False),
+    )
+    op.execute(sa.text(
+        "INSERT INTO embedding_versions (version, model, dimension, status, created_at, updated_at)"
+        " VALUES (:version, :model, :dimension, 'active', now() at time zone 'utc', now() at time zone 'utc')"
+    ).bindparams(version=INITIAL_VERSION, model=INITIAL_MODEL, dimension=DIMENSION))
+
+    op.create_table(
+        'product_embeddings',
+        sa.Column('product_id', UUID(as_uuid=True), sa.ForeignKey('products.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('model_version', sa.String(64), sa.ForeignKey('embedding_versions.version'), primary_key=True),
+        sa.Column('tenant_id', UUID(as_uuid=True), sa.ForeignKey('tenants.id'), nullable=False),
+        sa.Column('embedding', pgvector.sqlalchemy.vector.VECTOR(), nullable=False),
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('updated_at', sa.DateTime, nullable=False),
+    )
+    op.create_index('idx_product_embeddings_version_tenant', 'product_embeddings', ['model_version', 'tenant_id'])
+    op.execute(sa.text("""
+        INSERT INTO product_embeddings (product_id, model_version, tenant_id, embedding, content_hash, updated_at)
+        SELECT id, :version, tenant_id, embedding_vector, coalesce(embedding_hash, ''), updated_at
+        FROM products WHERE embedding_vector IS NOT NULL
+    """).bindparams(version=INITIAL_VERSION))
+    expression, opclass = INDEXES[mode]
+    op.execute(
+        f"CREATE INDEX {_index_name(mode)} ON product_embeddings USING hnsw ({expression} {opclass})"
+        f" WHERE model_version = '{INITIAL_VERSION}'"
+    )
+    # Takes the products' HNSW indexes with it
+    op.drop_column('products', 'embedding_vector')
+    op.drop_column('products', 'embedding_hash')
+
+    op.execute('ALTER TABLE customers ALTER COLUMN taste_vector TYPE vector')
+    op.add_column('customers', sa.Column('taste_version', sa.String(64), nullable=True))
+    op.execute(sa.text(
+        "UPDATE customers SET taste_version = :version WHERE taste_vector IS NOT NULL"
+    ).bindparams(version=INITIAL_VERSION))
+
+
+def downgrade():
+    # Only 1536-dimension vectors fit the old columns; others are dropped
+    op.execute("""
+        UPDATE customers SET taste_vector = NULL, taste_weight = 0, taste_updated_at = NULL
+        WHERE vector_dims(taste_vector) <> 1536
+    """)
+    op.drop_column('customers', 'taste_version')
+    op.execute('ALTER TABLE customers ALTER COLUMN taste_vector TYPE vector(1536)')
+
+    op.add_column('products', sa.Column('embedding_vector', pgvector.sqlalchemy.vector.VECTOR(dim=1536), nullable=True))
+    op.add_column('products', sa.Column('embedding_hash', sa.String(64), nullable=True))
+    op.execute("""
+        UPDATE products p SET embedding_vector = e.embedding::vector(1536), embedding_hash = e.content_hash
+        FROM product_embeddings e JOIN embedding_versions v ON v.version = e.model_version
+        WHERE e.product_id = p.id AND v.status = 'active' AND v.dimension = 1536
+    """)
+    op.drop_table('product_embeddings')
+    op.drop_table('embedding_versions')
+    op.execute('CREATE INDEX IF NOT EXISTS idx_products_embedding_hnsw ON products USING hnsw (embedding_vector vector_cosine_ops)')
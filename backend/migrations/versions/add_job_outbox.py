@@ -0,0 +1,33 @@
+"""Add transactional outbox for background jobs
+
+Revision ID: add_job_outbox
+Revises: add_sync_changes
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_job_outbox'
+down_revision = 'add_sync_changes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'job_outbox',
+        sa.Column('id', sa.Uuid(), primary_key=True),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('lane', sa.String(10), nullable=False, server_default='default'),
+        sa.Column('dedupe_key', sa.String(255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('idx_job_outbox_created', 'job_outbox', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('idx_job_outbox_created', 'job_outbox')
+    op.drop_table('job_outbox')
@@ -0,0 +1,62 @@
+"""Add loyalty ledger and stored membership tier
+
+Revision ID: add_loyalty_ledger
+Revises: add_embeddings_table
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_loyalty_ledger'
+down_revision = 'add_embeddings_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'customers',
+        sa.Column('membership_tier', sa.String(20), nullable=False, server_default='IRON')
+    )
+    # Backfill tiers from current balances (thresholds from domain.models.customer)
+    op.execute("""
+        UPDATE customers SET membership_tier = CASE
+            WHEN loyalty_points >= 15000 THEN 'DIAMOND'
+            WHEN loyalty_points >= 5000 THEN 'GOLD'
+            WHEN loyalty_points >= 1000 THEN 'SILVER'
+            ELSE 'IRON'
+        END
+    """)
+
+    op.create_table(
+        'loyalty_ledger',
+        sa.Column('id', sa.Uuid(), primary_key=True),
+        sa.Column('tenant_id', sa.Uuid(), sa.ForeignKey('tenants.id'), nullable=False),
+        sa.Column('customer_id', sa.Uuid(), sa.ForeignKey('customers.id'), nullable=False),
+        sa.Column('order_id', sa.Uuid(), sa.ForeignKey('orders.id'), nullable=True),
+        sa.Column('entry_type', sa.String(20), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('idx_loyalty_ledger_customer', 'loyalty_ledger', ['customer_id', 'created_at'])
+    op.create_index(
+        'uq_loyalty_ledger_order_accrual', 'loyalty_ledger', ['order_id'],
+        unique=True, postgresql_where=sa.text("entry_type = 'ACCRUAL'")
+    )
+
+    # Opening balances, so ledger sums match existing loyalty_points
+    op.execute("""
+        INSERT INTO loyalty_ledger (id, tenant_id, customer_id, entry_type, points, created_at)
+        SELECT gen_random_uuid(), tenant_id, id, 'ADJUSTMENT', loyalty_points, NOW()
+        FROM customers
+        WHERE loyalty_points <> 0
+    """)
+
+
+def downgrade():
+    op.drop_index('uq_loyalty_ledger_order_accrual', 'loyalty_ledger')
+    op.drop_index('idx_loyalty_ledger_customer', 'loyalty_ledger')
+    op.drop_table('loyalty_ledger')
+    op.drop_column('customers', 'membership_tier')
@@ -0,0 +1,32 @@
+"""Mark the orders folded into customers' tastes
+
+Revision ID: add_order_taste_marker
+Revises: add_embedding_versions
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_order_taste_marker'
+down_revision = 'add_embedding_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('orders', sa.Column('taste_folded_at', sa.DateTime(), nullable=True))
+    # Until now a taste held every order completed up to its taste_updated_at
+    op.execute("""
+        UPDATE orders o SET taste_folded_at = c.taste_updated_at
+        FROM customers c
+        WHERE o.customer_id = c.id
+          AND o.status = 'COMPLETED'
+          AND c.taste_updated_at IS NOT NULL
+          AND o.updated_at <= c.taste_updated_at
+    """)
+
+
+def downgrade():
+    op.drop_column('orders', 'taste_folded_at')
@@ -0,0 +1,23 @@
+"""Add content hash of product embeddings
+
+Revision ID: add_product_embedding_hash
+Revises: add_job_outbox
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_product_embedding_hash'
+down_revision = 'add_job_outbox'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('products', sa.Column('embedding_hash', sa.String(64), nullable=True))
+
+
+def downgrade():
+    op.drop_column('products', 'embedding_hash')
@@ -0,0 +1,47 @@
+"""Add full-text, trigram and vector indexes for hybrid menu search
+
+Revision ID: add_product_search_indexes
+Revises: add_customer_taste_vector
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_product_search_indexes'
+down_revision = 'add_customer_taste_vector'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # unaccent() is only STABLE (its dictionary could change), so it can't be
+    # indexed directly; pinning the dictionary makes an IMMUTABLE wrapper safe
+    op.execute("""
+        CREATE OR REPLACE FUNCTION s2o_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """)
+    # Expressions must match ProductRepository's SEARCH_DOCUMENT_SQL / SEARCH_NAME_SQL
+    op.execute("""
+        CREATE INDEX idx_products_search_document ON products USING gin (
+            (to_tsvector('simple'::regconfig, s2o_unaccent(coalesce(name, '') || ' ' || coalesce(description, ''))))
+        )
+    """)
+    op.execute("""
+        CREATE INDEX idx_products_name_trgm ON products USING gin ((s2o_unaccent(lower(name))) gin_trgm_ops)
+    """)
+    op.execute("""
+        CREATE INDEX idx_products_embedding_hnsw ON products USING hnsw (embedding_vector vector_cosine_ops)
+    """)
+    op.create_index('idx_products_tenant', 'products', ['tenant_id'])
+
+
+def downgrade():
+    op.drop_index('idx_products_tenant', 'products')
+    op.execute('DROP INDEX IF EXISTS idx_products_embedding_hnsw')
+    op.execute('DROP INDEX IF EXISTS idx_products_name_trgm')
+    op.execute('DROP INDEX IF EXISTS idx_products_search_document')
+    op.execute('DROP FUNCTION IF EXISTS s2o_unaccent(text)')
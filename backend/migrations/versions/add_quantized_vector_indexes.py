@@ -0,0 +1,65 @@
+"""Backfill embeddings.embedding_vector and build HNSW indexes in the configured layout
+
+Revision ID: add_quantized_vector_indexes
+Revises: add_product_search_indexes
+Create Date: 2026-10-19
+"""
+import os
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_quantized_vector_indexes'
+down_revision = 'add_product_search_indexes'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of infrastructure/repositories/vector_search.index_definitions();
+# scripts/set_vector_index_mode.py switches modes after this has run
+INDEXES = {
+    'float': ('embedding_hnsw', 'embedding_vector', 'vector_cosine_ops'),
+    'halfvec': ('embedding_halfvec', '(embedding_vector::halfvec(1536))', 'halfvec_cosine_ops'),
+    'binary': ('embedding_binary', '(binary_quantize(embedding_vector)::bit(1536))', 'bit_hamming_ops'),
+}
+
+
+def upgrade():
+    mode = os.getenv('VECTOR_INDEX_MODE', 'float').lower()
+    if mode not in INDEXES:
+        raise ValueError(f"VECTOR_INDEX_MODE must be one of {', '.join(INDEXES)}, not {mode!r}")
+
+    # Rows written before the repository filled embedding_vector only have the text copy
+    op.execute("""
+        DO $$
+        DECLARE r record;
+        BEGIN
+            FOR r IN SELECT id, embedding FROM embeddings
+                     WHERE embedding_vector IS NULL AND embedding IS NOT NULL LOOP
+                BEGIN
+                    UPDATE embeddings SET embedding_vector = r.embedding::vector(1536) WHERE id = r.id;
+                EXCEPTION WHEN others THEN
+                    RAISE NOTICE 'embedding % is not a 1536-dimension vector, skipping', r.id;
+                END;
+            END LOOP;
+        END $$;
+    """)
+    # IVFFlat clusters were trained on an empty table and never reflect the data
+    op.execute('DROP INDEX IF EXISTS idx_embeddings_vector')
+    if mode != 'float':
+        op.execute('DROP INDEX IF EXISTS idx_products_embedding_hnsw')
+    suffix, expression, opclass = INDEXES[mode]
+    for table in ('products', 'embeddings'):
+        op.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{suffix} ON {table} USING hnsw ({expression} {opclass})')
+
+
+def downgrade():
+    for suffix, _, _ in INDEXES.values():
+        op.execute(f'DROP INDEX IF EXISTS idx_embeddings_{suffix}')
+        if suffix != 'embedding_hnsw':
+            op.execute(f'DROP INDEX IF EXISTS idx_products_{suffix}')
+    op.execute('CREATE INDEX IF NOT EXISTS idx_products_embedding_hnsw ON products USING hnsw (embedding_vector vector_cosine_ops)')
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_embeddings_vector
+        ON embeddings USING ivfflat (embedding_vector vector_cosine_ops) WITH (lists = 100)
+    """)
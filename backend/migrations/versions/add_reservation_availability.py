@@ -0,0 +1,46 @@
+"""Add table seats, reservation table/duration and no-double-booking constraint
+
+Revision ID: add_reservation_availability
+Revises: add_loyalty_ledger
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_reservation_availability'
+down_revision = 'add_loyalty_ledger'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # btree_gist lets a GiST exclusion constraint compare plain columns with =
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+
+    op.add_column('tables', sa.Column('seats', sa.Integer(), nullable=False, server_default='4'))
+
+    op.add_column('reservations', sa.Column('table_id', sa.Uuid(), sa.ForeignKey('tables.id'), nullable=True))
+    op.add_column('reservations', sa.Column('party_size', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('reservations', sa.Column('duration_minutes', sa.Integer(), nullable=False, server_default='90'))
+    op.create_index('idx_reservations_branch_time', 'reservations', ['branch_id', 'booking_time'])
+
+    # Existing reservations have no table yet, so the constraint starts out satisfied
+    op.execute("""
+        ALTER TABLE reservations ADD CONSTRAINT excl_reservations_table_time
+        EXCLUDE USING gist (
+            table_id WITH =,
+            tsrange(booking_time, booking_time + duration_minutes * interval '1 minute') WITH &&
+        )
+        WHERE (table_id IS NOT NULL AND status IN ('PENDING', 'CONFIRMED'))
+    """)
+
+
+def downgrade():
+    op.execute('ALTER TABLE reservations DROP CONSTRAINT IF EXISTS excl_reservations_table_time')
+    op.drop_index('idx_reservations_branch_time', 'reservations')
+    op.drop_column('reservations', 'duration_minutes')
+    op.drop_column('reservations', 'party_size')
+    op.drop_column('reservations', 'table_id')
+    op.drop_column('tables', 'seats')
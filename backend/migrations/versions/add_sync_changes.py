@@ -0,0 +1,42 @@
+"""Add per-tenant change versions and tombstones for delta sync
+
+Revision ID: add_sync_changes
+Revises: add_reservation_availability
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_sync_changes'
+down_revision = 'add_reservation_availability'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'tenant_sync_versions',
+        sa.Column('tenant_id', sa.Uuid(), sa.ForeignKey('tenants.id'), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('purged_version', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    op.create_table(
+        'sync_changes',
+        sa.Column('tenant_id', sa.Uuid(), sa.ForeignKey('tenants.id'), primary_key=True),
+        sa.Column('resource', sa.String(20), primary_key=True),
+        sa.Column('entity_id', sa.Uuid(), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('deleted', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('changed_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('idx_sync_changes_cursor', 'sync_changes', ['tenant_id', 'resource', 'version'])
+    # No backfill: rows written before this revision reach clients through
+    # their first (full) sync, which every client starts with
+
+
+def downgrade():
+    op.drop_index('idx_sync_changes_cursor', 'sync_changes')
+    op.drop_table('sync_changes')
+    op.drop_table('tenant_sync_versions')
@@ -0,0 +1,94 @@
+"""
+Benchmark: /apispec.json latency and the memory its docstrings hold
+
+Usage (from the repository root):
+    python -m backend.scripts.benchmark_apispec [--requests 200]
+
+Compares flasgger rebuilding the spec per request (what it does whenever
+app.debug is set, the default config) with the cached spec served by
+src/docs.py: plain, gzip, and revalidated with If-None-Match (304).
+Memory is measured with tracemalloc: the parsed spec dict flasgger keeps
+versus the serialized bytes kept instead, and the view docstrings that a
+prebuilt spec (APISPEC_FILE) lets the server drop by running with -OO.
+"""
+import gc
+import argparse
+import tracemalloc
+from time import perf_counter
+
+from backend.src.create_app import create_app
+from backend.src.docs import CachedSpec, LazySwagger
+
+
+def timed(n: int, fn) -> float:
+    started = perf_counter()
+    for _ in range(n):
+        fn()
+    return (perf_counter() - started) / n * 1000
+
+
+def retained(build):
+    """Bytes still allocated after build() returns (its result kept alive)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_app()
+    client = app.test_client()
+    docs = LazySwagger()
+    swagger = docs.get(app)
+
+    def rebuild():
+        swagger.apispecs.clear()
+        with app.app_context():
+            app.json.dumps(swagger.get_apispecs("apispec"))
+
+    rebuild_ms = timed(max(5, args.requests // 20), rebuild)
+
+    client.get("/apispec.json")
+    etag = client.get("/apispec.json").headers["ETag"]
+    gz_etag = client.get("/apispec.json", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    plain_ms = timed(args.requests, lambda: client.get("/apispec.json"))
+    gzip_ms = timed(args.requests, lambda: client.get("/apispec.json", headers={"Accept-Encoding": "gzip"}))
+    not_modified_ms = timed(args.requests, lambda: client.get(
+        "/apispec.json", headers={"Accept-Encoding": "gzip", "If-None-Match": gz_etag}
+    ))
+    assert etag and gz_etag
+
+    def parsed_dict():
+        swagger.apispecs.clear()
+        with app.app_context():
+            return swagger.get_apispecs("apispec")
+
+    spec_dict, dict_bytes = retained(parsed_dict)
+    cached, cached_bytes = retained(lambda: CachedSpec(docs.build(app)))
+    docstring_bytes = sum(len(view.__doc__ or "") for view in app.view_functions.values())
+
+    print(f"routes                 {len(app.view_functions)}")
+    print(f"spec                   {len(cached.body) / 1024:.1f} KiB json, {len(cached.gzipped) / 1024:.1f} KiB gzip")
+    print()
+    print(f"rebuild per request    {rebuild_ms:8.2f} ms   (flasgger with app.debug)")
+    print(f"cached                 {plain_ms:8.2f} ms")
+    print(f"cached, gzip           {gzip_ms:8.2f} ms")
+    print(f"cached, 304            {not_modified_ms:8.2f} ms")
+    print()
+    print(f"parsed spec dict       {dict_bytes / 1024:8.1f} KiB retained")
+    print(f"bytes + gzip + etag    {cached_bytes / 1024:8.1f} KiB retained")
+    print(f"view docstrings        {docstring_bytes / 1024:8.1f} KiB of text (dropped by -OO with APISPEC_FILE)")
+    del spec_dict
+
+
+if __name__ == "__main__":
+    main()
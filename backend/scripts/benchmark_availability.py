@@ -0,0 +1,61 @@
+"""
+Benchmark: 30-day availability search on the in-memory AvailabilityIndex
+
+Usage (from the repository root):
+    python -m backend.scripts.benchmark_availability [--tables 40] [--per-day 120]
+
+Pure Python: builds the index from synthetic tables and reservations, the
+same input the service gets from its two queries.
+"""
+import random
+import argparse
+from time import perf_counter
+from datetime import date, datetime, time, timedelta
+
+from backend.src.domain.availability import AvailabilityIndex
+from backend.src.domain.models.reservation import Reservation
+from backend.src.domain.models.table import Table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tables", type=int, default=40)
+    parser.add_argument("--per-day", type=int, default=120, help="reservations per day")
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    tables = [
+        Table(id=f"t{i}", tenant_id="t", branch_id="b", name=f"T{i}", seats=rng.choice([2, 2, 4, 4, 6, 8]))
+        for i in range(args.tables)
+    ]
+    first_day = date(2026, 11, 1)
+    reservations = []
+    for offset in range(args.days):
+        for n in range(args.per_day):
+            start = datetime.combine(first_day + timedelta(days=offset), time(10)) + timedelta(minutes=30 * rng.randrange(22))
+            reservations.append(Reservation(
+                id=f"r{offset}-{n}", tenant_id="t", branch_id="b", user_id="u",
+                booking_time=start, party_size=rng.randint(1, 8)
+            ))
+
+    start = perf_counter()
+    index = AvailabilityIndex.build(tables, reservations)
+    built = perf_counter() - start
+
+    start = perf_counter()
+    slots = 0
+    for offset in range(args.days):
+        slots += len(index.available_slots(
+            first_day + timedelta(days=offset), 4, timedelta(minutes=90),
+            time(10), time(22), timedelta(minutes=30)
+        ))
+    searched = perf_counter() - start
+
+    print(f"tables={args.tables} reservations={len(reservations)} days={args.days}")
+    print(f"build  {built * 1000:7.2f} ms")
+    print(f"search {searched * 1000:7.2f} ms   ({slots} open slots for a party of 4)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark: prompt tokens and vector searches per chatbot turn
+
+Usage (from the repository root; no database or API key needed):
+    python -m backend.scripts.benchmark_chat_memory [--conversations 200] [--turns 20]
+        [--history-tokens 1200] [--version multilingual-minilm-l12@1]
+
+Plays synthetic guest conversations (questions about dishes, with
+follow-ups and questions asked again in other words) through
+ChatbotService with an in-memory conversation store and a vector
+repository that only counts searches. Answers are canned text of a
+typical length. Reports, per turn number, the prompt tokens generate_answer
+would send and the vector searches run, and what the summaries would cost,
+for:
+
+    full     every earlier turn resent verbatim, a search every turn
+    session  the token-budgeted window with summary, and retrieval reuse
+
+Retrieval reuse of reworded questions needs a real embedding model
+(--version; without OPENAI_API_KEY or the local model only repeated
+questions are recognised).
+"""
+import random
+import argparse
+
+from backend.src.config import Config
+from backend.src.services.chatbot_service import ChatbotService, RETRIEVAL_TOP_K
+from backend.src.services.embedding_version_service import estimate_tokens
+from backend.src.infrastructure.services.openai_service import OpenAIService
+from backend.src.infrastructure.services.embedding_service import EmbeddingService, EMBEDDING_MODELS
+from backend.src.infrastructure.services.conversation_store import InMemoryConversationStore
+from backend.scripts.benchmark_menu_search import dish_name
+
+# About 120 tokens, a typical answer (generate_answer allows 500)
+ANSWER = (
+    "Món này gồm bánh phở tươi, thịt bò tái và nước dùng hầm xương trong 12 tiếng, ăn kèm rau thơm, "
+    "giá và chanh. Giá 65.000đ một tô, có thể chọn thêm trứng trần hoặc gầu với giá 10.000đ. "
+    "Nước dùng không cay; tương ớt và ớt tươi có sẵn trên bàn nếu quý khách thích ăn cay. "
+    "Quán có phiên bản chay với nước dùng rau củ và đậu hũ, giá 55.000đ. "
+    "Món được phục vụ từ 6 giờ sáng đến 10 giờ tối, gọi trước qua ứng dụng sẽ được chuẩn bị ngay khi đến."
+)
+FOLLOW_UPS = ["Giá bao nhiêu?", "Có cay không?", "Món đó có chay không?", "Phần lớn có không?"]
+REWORDINGS = ["Cho tôi biết về {}", "{} có gì?", "{} là món gì vậy?"]
+
+
+class CountingVectorRepository:
+    """Stands in for the embeddings table: counts searches, returns menu-like documents"""
+
+    def __init__(self):
+        self.searches = 0
+
+    def search_vector(self, embedding, top_k: int = 5):
+        self.searches += 1
+        return [
+            {"id": f"doc-{self.searches}-{i}", "text": f"{ANSWER[:160]} ({i})", "metadata": "{}", "similarity": 0.8}
+            for i in range(top_k)
+        ]
+
+
+class CannedOpenAIService(OpenAIService):
+    """Answers with fixed text and records the tokens each call would have cost"""
+
+    def __init__(self):
+        super().__init__(api_key="")
+        self.prompt_tokens = []
+        self.summary_tokens = 0
+
+    def generate_answer(self, query, context_docs, history=None, summary=None):
+        messages = self.build_answer_messages(query, context_docs, history, summary)
+        self.prompt_tokens.append(sum(estimate_tokens(m["content"]) for m in messages))
+        return ANSWER
+
+    def summarize_conversation(self, summary, turns, max_tokens=200):
+        # Prompt (previous summary and evicted turns) plus the summary written
+        self.summary_tokens += estimate_tokens(summary or "") + max_tokens + sum(
+            estimate_tokens(t["question"]) + estimate_tokens(t["answer"]) for t in turns
+        )
+        return super().summarize_conversation(summary, turns, max_tokens)
+
+
+def conversation(rng: random.Random, turns: int):
+    dishes = [dish_name(rng) for _ in range(3)]
+    questions = []
+    for _ in range(turns):
+        roll = rng.random()
+        if questions and roll < 0.4:
+            questions.append(rng.choice(FOLLOW_UPS))
+        else:
+            questions.append(rng.choice(REWORDINGS).format(rng.choice(dishes)))
+    return questions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--history-tokens", type=int, default=Config.CHAT_HISTORY_TOKENS)
+    parser.add_argument("--version", default=None, choices=list(EMBEDDING_MODELS), help="embedding version")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    Config.CHAT_HISTORY_TOKENS = args.history_tokens
+    rng = random.Random(args.seed)
+    embedding = EmbeddingService(version=args.version) if args.version else EmbeddingService()
+    print(f"embedding {embedding.model_key}, history budget {Config.CHAT_HISTORY_TOKENS} tokens")
+
+    full_tokens = [0] * args.turns
+    session_tokens = [0] * args.turns
+    session_searches = [0] * args.turns
+    summary_tokens = 0
+    for _ in range(args.conversations):
+        questions = conversation(rng, args.turns)
+
+        # Every turn resent, a search per question
+        openai = CannedOpenAIService()
+        history = []
+        for question in questions:
+            openai.generate_answer(question, CountingVectorRepository().search_vector(None, RETRIEVAL_TOP_K), history)
+            history.append({"question": question, "answer": ANSWER})
+        for turn, tokens in enumerate(openai.prompt_tokens):
+            full_tokens[turn] += tokens
+
+        openai, repo = CannedOpenAIService(), CountingVectorRepository()
+        chatbot = ChatbotService(repo, openai, embedding, store=InMemoryConversationStore())
+        session_id = None
+        for turn, question in enumerate(questions):
+            before = repo.searches
+            session_id = chatbot.ask_chatbot(question, "bench", session_id, "guest")["session_id"]
+            session_searches[turn] += repo.searches - before
+        for turn, tokens in enumerate(openai.prompt_tokens):
+            session_tokens[turn] += tokens
+        summary_tokens += openai.summary_tokens
+
+    n = args.conversations
+    print(f"\n{'turn':>4} {'full tokens':>12} {'session tokens':>15} {'searches/turn':>14}")
+    for turn in range(args.turns):
+        print(
+            f"{turn + 1:>4} {full_tokens[turn] / n:12.0f} {session_tokens[turn] / n:15.0f} "
+            f"{session_searches[turn] / n:14.2f}"
+        )
+    print(
+        f"{'all':>4} {sum(full_tokens) / n:12.0f} {sum(session_tokens) / n:15.0f} "
+        f"{sum(session_searches) / n:14.2f}   (per conversation; full runs {args.turns} searches)"
+    )
+    print(f"summarizing: {summary_tokens / n:.0f} tokens per conversation on top of the session column")
+
+
+if __name__ == "__main__":
+    main()
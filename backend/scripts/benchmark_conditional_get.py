@@ -0,0 +1,110 @@
+"""
+Benchmark: bytes on the wire and latency of conditional, compressed reads
+
+Usage (from the repository root, after scripts/seed_synthetic.py):
+    python -m backend.scripts.benchmark_conditional_get [--requests 200]
+
+For each read endpoint behind conditional_get, in-process through the
+Flask test client, against the first seeded tenant:
+
+    plain      no Accept-Encoding, no validator
+    gzip       Accept-Encoding: gzip (br as well when Brotli is installed)
+    304        revalidated with the ETag of the previous response
+
+and the totals for a guest session that loads the menu and then polls it
+every few seconds while nothing changes. The 304 rows run no SQL when
+Redis holds the data versions; without Redis the ETag is a body hash and
+the view still runs (queries per request tells which case was measured).
+"""
+import re
+import json
+import argparse
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import jwt
+
+from backend.src.config import Config
+from backend.src.create_app import create_app
+from backend.src.compression import BROTLI_AVAILABLE
+
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def endpoints(tenant: dict):
+    return [
+        "/api/v1/menu/categories",
+        "/api/v1/menu/products",
+        f"/api/v1/menu/products?category_id={tenant['categories'][0]}",
+        "/api/v1/categories",
+        "/api/v1/tables",
+        "/api/v1/promotions?active=true",
+    ]
+
+
+def measure(client, path, headers, n):
+    """(wire bytes, ms per request, queries per request, etag) of n GETs"""
+    response = None
+    started = perf_counter()
+    for _ in range(n):
+        response = client.get(path, headers=headers)
+    ms = (perf_counter() - started) / n * 1000
+    match = _QUERIES.search(response.headers.get("Server-Timing", ""))
+    return len(response.get_data()), ms, int(match.group(1)) if match else None, response.headers.get("ETag")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--manifest", default="bench_manifest.json", help="written by seed_synthetic")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=60, help="menu polls per guest session")
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        tenant = json.load(f)["tenants"][0]
+    token = jwt.encode(
+        {
+            "sub": tenant["owner_user_id"], "tenant_id": tenant["id"], "role": "OWNER",
+            "exp": datetime.utcnow() + timedelta(hours=1)
+        },
+        Config.SECRET_KEY, algorithm="HS256"
+    )
+    auth = {"Authorization": f"Bearer {token}"}
+    client = create_app().test_client()
+
+    encodings = ["gzip", "br"] if BROTLI_AVAILABLE else ["gzip"]
+    print(f"{'endpoint':<52}{'variant':>8}{'bytes':>10}{'ms':>9}{'q/req':>7}")
+    for path in endpoints(tenant):
+        variants = [("plain", {})] + [(e, {"Accept-Encoding": e}) for e in encodings]
+        etag = None
+        for name, headers in variants:
+            size, ms, queries, etag = measure(client, path, {**auth, **headers}, args.requests)
+            print(f"{path:<52}{name:>8}{size:>10}{ms:>9.2f}{str(queries):>7}")
+        revalidate = {**auth, "Accept-Encoding": encodings[-1], "If-None-Match": etag or ""}
+        size, ms, queries, _ = measure(client, path, revalidate, args.requests)
+        print(f"{path:<52}{'304':>8}{size:>10}{ms:>9.2f}{str(queries):>7}")
+
+    # Guest session: first load, then polls of an unchanged menu
+    menu = ["/api/v1/menu/categories", "/api/v1/menu/products"]
+    for label, conditional, headers in (
+        ("unconditional, plain", False, {}),
+        ("unconditional, gzip", False, {"Accept-Encoding": "gzip"}),
+        ("conditional, gzip", True, {"Accept-Encoding": "gzip"}),
+    ):
+        total_bytes = 0
+        etags = {}
+        started = perf_counter()
+        for _ in range(args.polls + 1):
+            for path in menu:
+                request_headers = {**auth, **headers}
+                if conditional and path in etags:
+                    request_headers["If-None-Match"] = etags[path]
+                response = client.get(path, headers=request_headers)
+                etags[path] = response.headers.get("ETag", "")
+                total_bytes += len(response.get_data())
+        ms = (perf_counter() - started) * 1000
+        print(f"guest session ({args.polls} polls) {label:<22}{total_bytes / 1024:>10.1f} KiB{ms:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: "frequently ordered together" model build and lookup
+
+Usage (from the repository root):
+    python -m backend.scripts.benchmark_cooccurrence [--items 10000000] [--products 2000]
+
+Synthesizes order items (1-7 lines per order, Zipf-like product popularity
+plus a few dishes that tend to be ordered together), then times the sparse
+build (pair counts + top-K ranking), an incremental order update, and
+neighbour lookups from the in-memory store. The database query that feeds
+the build is not included.
+"""
+import argparse
+import statistics
+from time import perf_counter
+
+import numpy as np
+
+from backend.src.domain.cooccurrence import pair_counts, top_neighbours, rank_neighbours, order_pairs
+from backend.src.infrastructure.services.cooccurrence_store import InMemoryCooccurrenceStore
+
+
+def synthesize(items: int, products: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(1, 8, size=items // 3)
+    sizes = sizes[:np.searchsorted(np.cumsum(sizes), items)]
+    orders = np.repeat(np.arange(len(sizes)), sizes)
+    popularity = 1.0 / np.arange(1, products + 1) ** 0.8
+    chosen = rng.choice(products, size=len(orders), p=popularity / popularity.sum())
+    # Every tenth product is usually ordered with its successor (dish + side)
+    pairs = (chosen % 10 == 0) & (rng.random(len(chosen)) < 0.6)
+    chosen[1:][pairs[:-1]] = (chosen[:-1][pairs[:-1]] + 1) % products
+    return orders, chosen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10_000_000, help="order items")
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    orders, products = synthesize(args.items, args.products)
+    product_ids = [f"p{i}" for i in range(args.products)]
+    print(f"order_items={len(orders)} orders={int(orders[-1]) + 1} products={args.products}")
+
+    start = perf_counter()
+    counts, order_counts = pair_counts(orders, products, args.products)
+    counted = perf_counter() - start
+    start = perf_counter()
+    neighbours = top_neighbours(counts, order_counts, product_ids)
+    ranked = perf_counter() - start
+    print(f"pair counts  {counted:8.2f} s   ({counts.nnz // 2} product pairs)")
+    print(f"top-K rank   {ranked:8.2f} s")
+
+    store = InMemoryCooccurrenceStore()
+    rows = {}
+    for i, product_id in enumerate(product_ids):
+        start_, end_ = counts.indptr[i], counts.indptr[i + 1]
+        rows[product_id] = {product_ids[j]: int(c) for j, c in zip(counts.indices[start_:end_], counts.data[start_:end_])}
+    store.replace("t", rows, {p: int(n) for p, n in zip(product_ids, order_counts)}, neighbours)
+
+    basket = {"p0", "p1", "p7", "p42"}
+    start = perf_counter()
+    store.add_order("t", "o-new", order_pairs(basket), basket)
+    basket_rows, basket_counts = store.get_rows("t", basket)
+    store.set_neighbours("t", {p: rank_neighbours(p, basket_rows[p], basket_counts) for p in basket})
+    print(f"order update {(perf_counter() - start) * 1000:8.2f} ms  (4-item order)")
+
+    rng = np.random.default_rng(1)
+    sample = [product_ids[i] for i in rng.integers(0, args.products, size=args.lookups)]
+    timings = []
+    for product_id in sample:
+        start = perf_counter()
+        store.get_neighbours("t", product_id)
+        timings.append(perf_counter() - start)
+    timings.sort()
+    p50 = statistics.median(timings) * 1e6
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+    print(f"lookup       p50 {p50:6.2f} us   p99 {p99:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
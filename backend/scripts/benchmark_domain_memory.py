@@ -0,0 +1,110 @@
+"""
+Benchmark: memory retained by domain objects loaded through OrderItemRepository
+
+Compares the slotted OrderItem domain model against an equivalent
+__dict__-backed class (the previous layout) and against the row path,
+which skips building domain objects altogether.
+
+Usage (from the repository root):
+    python -m backend.scripts.benchmark_domain_memory [--rows 1000000]
+
+Uses an in-memory SQLite database unless DATABASE_URI is set.
+"""
+import gc
+import os
+import sys
+import uuid
+import argparse
+import tracemalloc
+from time import perf_counter
+from decimal import Decimal
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from backend.src.infrastructure.databases.base import Base
+from backend.src.infrastructure.models import OrderItem, OrderItemStatus
+from backend.src.infrastructure.repositories import order_item_repository
+from backend.src.infrastructure.repositories.order_item_repository import OrderItemRepository
+from backend.src.domain.models.order_item import OrderItem as DomainOrderItem
+
+# Same constructor as the domain model, but with a per-instance __dict__
+DictOrderItem = type("DictOrderItem", (), {"__init__": DomainOrderItem.__init__})
+
+
+def seed(engine, order_id: uuid.UUID, rows: int, batch: int = 50_000) -> None:
+    tenant_id = uuid.uuid4()
+    product_ids = [uuid.uuid4() for _ in range(200)]
+    with engine.begin() as conn:
+        for start in range(0, rows, batch):
+            conn.execute(insert(OrderItem), [
+                {
+                    "id": uuid.uuid4(),
+                    "tenant_id": tenant_id,
+                    "order_id": order_id,
+                    "product_id": product_ids[i % len(product_ids)],
+                    "quantity": (i % 5) + 1,
+                    "price_at_order": Decimal("12.50"),
+                    "item_status": OrderItemStatus.PENDING,
+                }
+                for i in range(start, min(start + batch, rows))
+            ])
+
+
+def load_domain(session: Session, order_id: uuid.UUID):
+    return OrderItemRepository(session).get_by_order(order_id)
+
+
+def load_rows(session: Session, order_id: uuid.UUID):
+    return OrderItemRepository(session).get_rows_by_order(order_id)
+
+
+def measure(engine, loader, order_id: uuid.UUID):
+    """Return (seconds, retained bytes, sample) for the result of loader"""
+    gc.collect()
+    tracemalloc.start()
+    start = perf_counter()
+    with Session(engine) as session:
+        result = loader(session, order_id)
+    elapsed = perf_counter() - start
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, retained, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    engine = create_engine(os.getenv("DATABASE_URI", "sqlite://"))
+    Base.metadata.create_all(engine, tables=[Base.metadata.tables["order_items"]])
+    order_id = uuid.uuid4()
+    seed(engine, order_id, args.rows)
+    print(f"rows={args.rows}")
+
+    cases = (
+        ("__dict__ domain", DictOrderItem, load_domain),
+        ("__slots__ domain", DomainOrderItem, load_domain),
+        ("rows (no domain)", DomainOrderItem, load_rows),
+    )
+    for name, domain_cls, loader in cases:
+        order_item_repository.DomainOrderItem = domain_cls
+        try:
+            seconds, retained, result = measure(engine, loader, order_id)
+        finally:
+            order_item_repository.DomainOrderItem = DomainOrderItem
+        shell = sys.getsizeof(result[0])
+        if hasattr(result[0], "__dict__"):
+            shell += sys.getsizeof(result[0].__dict__)
+        print(
+            f"{name:<18} {seconds:7.2f} s   retained {retained / len(result):6.0f} B/item"
+            f"   object shell {shell} B"
+        )
+        del result
+        gc.collect()
+
+
+if __name__ == "__main__":
+    main()
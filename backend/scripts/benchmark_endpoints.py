@@ -0,0 +1,322 @@
+"""
+Benchmark: hot API endpoints against seeded synthetic tenants
+
+Usage (from the repository root, after scripts/seed_synthetic.py):
+    python -m backend.scripts.benchmark_endpoints [--requests 300] [--concurrency 1]
+        [--base-url http://localhost:5000] [--output results.json] [--compare baseline.json]
+
+Without --base-url the app runs in-process behind the Flask test client;
+with it, requests go over HTTP to a running server (which must share
+SECRET_KEY so the minted tokens verify). Scenarios run one after the other:
+
+    menu_browse       GET  /menu/categories, /menu/products?category_id=
+    order_placement   POST /orders, then POST /orders/<id>/items
+    kitchen_status    GET  /orders/kitchen-board/<branch>, PATCH /order-items/<id>/status
+    invoicing         POST /invoices for orders placed by order_placement
+    recommendations   GET  /recommendations/personalized, /similar-products/<id>
+
+Each reports throughput, p50/p95/p99 latency and SQL statements per request
+(read from the Server-Timing header the instrumentation middleware sets).
+Results are written as JSON; --compare prints the change against an earlier
+results file and exits non-zero when p95 or queries per request regress
+past --max-regression.
+"""
+import os
+import re
+import sys
+import json
+import math
+import random
+import argparse
+import platform
+import threading
+import subprocess
+from time import perf_counter
+from datetime import datetime, timedelta
+
+import jwt
+
+from backend.src.config import Config
+
+API = "/api/v1"
+SCENARIOS = ("menu_browse", "order_placement", "kitchen_status", "invoicing", "recommendations")
+
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+class Sample:
+    __slots__ = ("seconds", "status", "queries")
+
+    def __init__(self, seconds: float, status: int, queries):
+        self.seconds = seconds
+        self.status = status
+        self.queries = queries
+
+
+class TestClientTransport:
+    """In-process app; no network or server needed"""
+
+    def __init__(self):
+        from backend.src.create_app import create_app
+        self.client = create_app().test_client()
+
+    def request(self, method, path, token, body=None):
+        response = self.client.open(
+            API + path, method=method, json=body, headers={"Authorization": f"Bearer {token}"}
+        )
+        return response.status_code, response.headers.get("Server-Timing", ""), response.get_json(silent=True)
+
+
+class HttpTransport:
+    def __init__(self, base_url: str):
+        import requests
+        self.base_url = base_url.rstrip("/")
+        self._local = threading.local()
+        self._requests = requests
+
+    def request(self, method, path, token, body=None):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        response = session.request(
+            method, self.base_url + API + path, json=body, headers={"Authorization": f"Bearer {token}"}
+        )
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = None
+        return response.status_code, response.headers.get("Server-Timing", ""), payload
+
+
+class Bench:
+    def __init__(self, transport, manifest: dict, secret_key: str, seed: int):
+        self.transport = transport
+        self.rng = random.Random(seed)
+        self.tenants = manifest["tenants"]
+        self.tokens = {
+            t["id"]: jwt.encode(
+                {
+                    "sub": t["owner_user_id"], "tenant_id": t["id"], "role": "OWNER",
+                    "exp": datetime.utcnow() + timedelta(hours=6)
+                },
+                secret_key, algorithm="HS256"
+            )
+            for t in self.tenants
+        }
+        self.samples = []
+        self.placed_orders = []   # (tenant_id, order_id, total) for invoicing
+        self._lock = threading.Lock()
+
+    def call(self, method, path, tenant, body=None, record=True):
+        started = perf_counter()
+        status, timing, payload = self.transport.request(method, path, self.tokens[tenant["id"]], body)
+        seconds = perf_counter() - started
+        if record:
+            match = _QUERIES.search(timing)
+            with self._lock:
+                self.samples.append(Sample(seconds, status, int(match.group(1)) if match else None))
+        return status, payload
+
+    # Scenarios: one operation each; an operation may issue several requests
+    def menu_browse(self, rng, record):
+        tenant = rng.choice(self.tenants)
+        if rng.random() < 0.3:
+            self.call("GET", "/menu/categories", tenant, record=record)
+        else:
+            self.call("GET", f"/menu/products?category_id={rng.choice(tenant['categories'])}", tenant, record=record)
+
+    def order_placement(self, rng, record):
+        tenant = rng.choice(self.tenants)
+        branch = rng.choice(tenant["branches"])
+        status, order = self.call(
+            "POST", "/orders", tenant,
+            {"branch_id": branch["id"], "table_id": rng.choice(branch["tables"]), "note": "bench"},
+            record=record
+        )
+        if status != 201 or not order:
+            return
+        total = 0.0
+        for product in rng.sample(tenant["products"], min(3, len(tenant["products"]))):
+            quantity = rng.randint(1, 3)
+            total += product["price"] * quantity
+            self.call(
+                "POST", f"/orders/{order['id']}/items", tenant,
+                {"product_id": product["id"], "quantity": quantity, "price": product["price"]},
+                record=record
+            )
+        with self._lock:
+            self.placed_orders.append((tenant["id"], order["id"], total))
+
+    def kitchen_status(self, rng, record):
+        tenant = rng.choice(self.tenants)
+        branch = rng.choice(tenant["branches"])
+        status, board = self.call("GET", f"/orders/kitchen-board/{branch['id']}", tenant, record=record)
+        items = [
+            item for order in (board or []) for item in order.get("items", [])
+            if item.get("item_status") in ("PENDING", "PREPARING", "COOKING")
+        ]
+        if items:
+            item = rng.choice(items)
+            self.call(
+                "PATCH", f"/order-items/{item['id']}/status", tenant,
+                {"item_status": rng.choice(("COOKING", "READY"))}, record=record
+            )
+
+    def invoicing(self, rng, record):
+        with self._lock:
+            if not self.placed_orders:
+                return
+            tenant_id, order_id, total = self.placed_orders.pop()
+        tenant = next(t for t in self.tenants if t["id"] == tenant_id)
+        self.call(
+            "POST", "/invoices", tenant,
+            {"order_id": order_id, "final_amount": total, "payment_method": "CASH"}, record=record
+        )
+
+    def recommendations(self, rng, record):
+        tenant = rng.choice(self.tenants)
+        if rng.random() < 0.5:
+            customer_id = rng.choice(tenant["customers"])
+            self.call("GET", f"/recommendations/personalized?customer_id={customer_id}&top_k=10", tenant, record=record)
+        else:
+            product = rng.choice(tenant["products"])
+            self.call("GET", f"/recommendations/similar-products/{product['id']}?top_k=5", tenant, record=record)
+
+    def run(self, scenario: str, operations: int, warmup: int, concurrency: int) -> dict:
+        operation = getattr(self, scenario)
+        for _ in range(warmup):
+            operation(self.rng, record=False)
+        self.samples = []
+
+        def worker(n, seed):
+            rng = random.Random(seed)
+            for _ in range(n):
+                operation(rng, record=True)
+
+        shares = [operations // concurrency + (1 if i < operations % concurrency else 0) for i in range(concurrency)]
+        threads = [
+            threading.Thread(target=worker, args=(n, self.rng.getrandbits(32)))
+            for n in shares
+        ]
+        started = perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return summarize(self.samples, perf_counter() - started)
+
+
+def percentile(ordered, p: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples, elapsed: float) -> dict:
+    latencies = sorted(s.seconds * 1000 for s in samples)
+    queries = [s.queries for s in samples if s.queries is not None]
+    errors = sum(1 for s in samples if s.status >= 400)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        "max_queries": max(queries) if queries else None,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict, max_regression: float) -> bool:
+    """Print per-scenario deltas; False when a scenario regressed"""
+    ok = True
+    print(f"\ncompared with {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')})")
+    print(f"{'scenario':<18}{'p95 ms (before -> now)':>26}{'rps change':>12}{'queries/req':>18}")
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if not before:
+            continue
+        p95_change = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        rps_change = (result["throughput_rps"] - before["throughput_rps"]) / before["throughput_rps"] if before["throughput_rps"] else 0.0
+        q_now, q_before = result["queries_per_request"], before["queries_per_request"]
+        more_queries = q_now is not None and q_before is not None and q_now > q_before
+        flag = ""
+        if p95_change > max_regression or more_queries:
+            ok = False
+            flag = "  REGRESSION"
+        print(
+            f"{name:<18}{before['p95_ms']:>14.2f} -> {result['p95_ms']:<8.2f}"
+            f"{rps_change * 100:>+11.1f}%{str(q_before):>10} -> {str(q_now):<6}{flag}"
+        )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--manifest", default="bench_manifest.json", help="written by seed_synthetic")
+    parser.add_argument("--base-url", help="benchmark a running server instead of the test client")
+    parser.add_argument("--secret-key", default=Config.SECRET_KEY)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=300, help="operations per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="unrecorded operations per scenario")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="results file (default bench-<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.10, help="allowed relative p95 increase")
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    transport = HttpTransport(args.base_url) if args.base_url else TestClientTransport()
+    bench = Bench(transport, manifest, args.secret_key, args.seed)
+
+    commit = git_commit()
+    results = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "transport": args.base_url or "test-client",
+            "manifest_seed": manifest.get("seed"),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "scenarios": {},
+    }
+
+    print(f"{'scenario':<18}{'reqs':>7}{'err':>5}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'q/req':>7}")
+    for scenario in args.scenarios.split(","):
+        result = bench.run(scenario.strip(), args.requests, args.warmup, args.concurrency)
+        results["scenarios"][scenario] = result
+        print(
+            f"{scenario:<18}{result['requests']:>7}{result['errors']:>5}{result['throughput_rps']:>9.1f}"
+            f"{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+            f"{str(result['queries_per_request']):>7}"
+        )
+
+    output = args.output or f"bench-{commit}.json"
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {output}")
+
+    if args.compare and os.path.exists(args.compare):
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
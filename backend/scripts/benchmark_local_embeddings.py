@@ -0,0 +1,136 @@
+"""
+Benchmark: local embedding model throughput on the CPU
+
+Usage (from the repository root, with the model installed, see
+backend/src/infrastructure/services/embedding_backends.py):
+    python -m backend.scripts.benchmark_local_embeddings [--version multilingual-minilm-l12@1]
+        [--texts 2000] [--batch-sizes 1,8,32,64] [--threads 1,4] [--workers 4]
+
+Embeds --texts synthetic menu texts (dish names with diacritics, category
+and description, as ProductEmbeddingService builds them) and reports
+texts/sec for every thread count and batch size, plus the latency of one
+short query text, the way search embeds queries.
+
+With --workers the model is loaded once and that many processes are
+forked from it, as gunicorn's preload_app does; each embeds and reports
+how much of its memory is still shared with the others (Linux only).
+"""
+import os
+import random
+import argparse
+from time import perf_counter
+
+from backend.src.infrastructure.services.embedding_service import EMBEDDING_MODELS
+from backend.src.infrastructure.services.embedding_backends import LocalEmbeddingBackend, get_local_backend
+from backend.src.services.product_embedding_service import ProductEmbeddingService
+from backend.scripts.benchmark_menu_search import dish_name, percentile
+
+LOCAL_VERSIONS = [v for v, m in EMBEDDING_MODELS.items() if m.provider == "local"]
+CATEGORIES = ["Món chính", "Món nước", "Khai vị", "Tráng miệng", "Đồ uống"]
+DESCRIPTIONS = [
+    "Nước dùng hầm xương 12 tiếng, ăn kèm rau thơm",
+    "Phục vụ nóng, có thể chọn mức cay",
+    "Nguyên liệu tươi trong ngày",
+    "",
+]
+
+
+def menu_text(rng: random.Random) -> str:
+    return ProductEmbeddingService.embedding_text(dish_name(rng), rng.choice(CATEGORIES), rng.choice(DESCRIPTIONS))
+
+
+def memory_kib() -> dict:
+    """Rss and the private (not shared with another process) part of it, in KiB"""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Private_Clean", "Private_Dirty"):
+                values[key] = int(rest.split()[0])
+    return {"rss": values["Rss"], "private": values["Private_Clean"] + values["Private_Dirty"]}
+
+
+def throughput(backend: LocalEmbeddingBackend, texts, batch_size: int) -> float:
+    backend.batch_size = batch_size
+    backend.embed(texts[:batch_size * backend.threads])
+    started = perf_counter()
+    backend.embed(texts)
+    return len(texts) / (perf_counter() - started)
+
+
+def forked(backend: LocalEmbeddingBackend, texts, workers: int) -> None:
+    print(f"\nparent after load: {memory_kib()['rss'] / 1024:.0f} MiB rss")
+    children = []
+    for n in range(workers):
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            started = perf_counter()
+            backend.embed(texts)
+            rate = len(texts) / (perf_counter() - started)
+            memory = memory_kib()
+            os.write(write, f"{rate:.0f} {memory['rss']} {memory['private']}".encode())
+            os._exit(0)
+        os.close(write)
+        children.append((pid, read))
+    print(f"{'worker':>6} {'texts/s':>8} {'rss MiB':>8} {'private MiB':>12}")
+    for n, (pid, read) in enumerate(children):
+        os.waitpid(pid, 0)
+        rate, rss, private = os.read(read, 100).decode().split()
+        os.close(read)
+        print(f"{n:>6} {rate:>8} {int(rss) / 1024:8.0f} {int(private) / 1024:12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--version", default=LOCAL_VERSIONS[0], choices=LOCAL_VERSIONS)
+    parser.add_argument("--model-dir", help="model directory (default: the version's, under LOCAL_EMBEDDING_MODELS_DIR)")
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-sizes", default="1,8,32,64")
+    parser.add_argument("--threads", default=f"1,{os.cpu_count() or 1}")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=0, help="fork this many workers from the loaded model")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    model = EMBEDDING_MODELS[args.version]
+    if args.model_dir:
+        backend = LocalEmbeddingBackend(args.model_dir, model.dimension)
+    else:
+        backend = get_local_backend(model.model, model.dimension)
+    if not backend.available:
+        parser.error(f"{backend.model_dir} has no model.onnx and tokenizer.json, or onnxruntime/tokenizers are missing")
+
+    started = perf_counter()
+    backend.load()
+    print(f"model   {backend.model_dir} loaded in {(perf_counter() - started) * 1000:.0f} ms, {os.cpu_count()} CPUs")
+
+    rng = random.Random(args.seed)
+    texts = [menu_text(rng) for _ in range(args.texts)]
+    thread_counts = [int(t) for t in args.threads.split(",")]
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",")]
+    print(f"\n{'threads':>7} " + " ".join(f"{f'batch {b}':>10}" for b in batch_sizes) + "   (texts/s)")
+    for threads in thread_counts:
+        # A backend (and model copy) per thread count, each with its own pool
+        runner = LocalEmbeddingBackend(backend.model_dir, backend.dimension, threads=threads)
+        runner.load()
+        rates = [throughput(runner, texts, batch_size) for batch_size in batch_sizes]
+        del runner
+        print(f"{threads:>7} " + " ".join(f"{rate:10.0f}" for rate in rates))
+
+    timings = []
+    for _ in range(args.queries):
+        query = " ".join(dish_name(rng).split()[:2])
+        started = perf_counter()
+        backend.embed([query])
+        timings.append(perf_counter() - started)
+    timings.sort()
+    print(f"\nquery   p50 {percentile(timings, 0.5):.2f} ms   p99 {percentile(timings, 0.99):.2f} ms")
+
+    if args.workers:
+        forked(backend, texts, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Benchmark: hybrid menu search over a large catalog
+
+Usage (from the repository root, against a migrated PostgreSQL database):
+    python -m backend.scripts.benchmark_menu_search [--products 100000] [--tenants 4]
+        [--queries 500] [--vectors] [--keep]
+
+Loads --products products (Vietnamese dish names with diacritics) split over
+--tenants synthetic tenants, so the tenant filter has to do real work, then
+times MenuSearchService-equivalent repository calls for a mix of queries:
+
+    exact      words as written on the menu ("Phở bò tái")
+    unaccent   the same without diacritics ("pho bo tai")
+    typo       one character dropped or swapped ("pho bo tia")
+    prefix     an unfinished last word ("pho b")
+
+With --vectors every product gets a random unit vector and searches pass
+one too, so the pgvector ranking joins the fusion. Reports p50/p95/p99 per
+kind and overall, and the plan of one query so index use can be checked.
+The synthetic tenants are deleted afterwards unless --keep is given.
+"""
+import uuid
+import random
+import argparse
+from time import perf_counter
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from backend.src.config import Config
+from backend.src.infrastructure.repositories.product_repository import ProductRepository
+from backend.src.services.menu_search_service import RRF_K, MAX_RESULTS, prefix_tsquery
+from backend.src.infrastructure.services.embedding_service import DEFAULT_EMBEDDING_VERSION
+from backend.scripts.seed_synthetic import copy_rows, EMBEDDING_DIMENSION
+
+SLUG_PREFIX = "search-bench-"
+# Vectors are loaded as this version, which the migrations register as active
+VERSION = DEFAULT_EMBEDDING_VERSION
+BASES = ["Phở", "Bún", "Cơm", "Bánh mì", "Bánh xèo", "Gỏi cuốn", "Lẩu", "Cháo", "Mì", "Hủ tiếu", "Chè", "Cà phê"]
+FILLINGS = ["bò", "gà", "heo", "tôm", "cua", "cá", "mực", "chay", "vịt", "sườn", "đậu hũ", "nấm"]
+STYLES = ["tái", "chín", "nướng", "xào", "chiên", "hấp", "kho", "sốt cay", "đặc biệt", "thập cẩm", "sữa đá", "trứng"]
+ACCENTS = str.maketrans(
+    "àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵđ",
+    "aaaaaaaaaaaaaaaaaeeeeeeeeeeeiiiiiooooooooooooooooouuuuuuuuuuuyyyyyd"
+)
+
+
+def dish_name(rng: random.Random) -> str:
+    return f"{rng.choice(BASES)} {rng.choice(FILLINGS)} {rng.choice(STYLES)}"
+
+
+def make_query(rng: random.Random, kind: str) -> str:
+    name = dish_name(rng)
+    if kind == "exact":
+        return name
+    plain = name.lower().translate(ACCENTS)
+    if kind == "unaccent":
+        return plain
+    if kind == "typo":
+        i = rng.randrange(1, len(plain) - 1)
+        if rng.random() < 0.5:
+            return plain[:i] + plain[i + 1:]
+        return plain[:i - 1] + plain[i] + plain[i - 1] + plain[i + 1:]
+    words = plain.split()
+    return " ".join(words[:-1] + [words[-1][:1]])
+
+
+def random_vector(rng: np.random.Generator) -> list:
+    v = rng.standard_normal(EMBEDDING_DIMENSION).astype(np.float32)
+    return (v / np.linalg.norm(v)).tolist()
+
+
+def load(engine, args, rng: random.Random, vrng: np.random.Generator):
+    now = datetime.utcnow()
+    tenants = [(str(uuid.uuid4()), f"{SLUG_PREFIX}{n}") for n in range(args.tenants)]
+    categories = {t: str(uuid.uuid4()) for t, _ in tenants}
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        copy_rows(cursor, "tenants", ("id", "name", "slug", "subscription_plan", "is_active", "created_at", "updated_at"),
+                  ((t, f"Search Bench {slug}", slug, "PRO", True, now, now) for t, slug in tenants))
+        copy_rows(cursor, "categories", ("id", "tenant_id", "name", "display_order", "created_at", "updated_at"),
+                  ((c, t, "Bench", 0, now, now) for t, c in categories.items()))
+
+        product_tenants = []
+
+        def products():
+            for n in range(args.products):
+                tenant_id = tenants[n % len(tenants)][0]
+                product_id = str(uuid.uuid4())
+                product_tenants.append((product_id, tenant_id))
+                yield (
+                    product_id, tenant_id, categories[tenant_id], dish_name(rng), 50000.0,
+                    f"Món {n}", rng.random() > 0.05, now, now
+                )
+
+        def embeddings():
+            for product_id, tenant_id in product_tenants:
+                vector = "[" + ",".join(f"{x:.6f}" for x in random_vector(vrng)) + "]"
+                yield product_id, VERSION, tenant_id, vector, "bench", now
+
+        started = perf_counter()
+        n = copy_rows(cursor, "products", (
+            "id", "tenant_id", "category_id", "name", "price", "description", "is_available",
+            "created_at", "updated_at"
+        ), products())
+        if args.vectors:
+            copy_rows(cursor, "product_embeddings", (
+                "product_id", "model_version", "tenant_id", "embedding", "content_hash", "updated_at"
+            ), embeddings())
+        raw.commit()
+        cursor.execute("ANALYZE products")
+        cursor.execute("ANALYZE product_embeddings")
+        raw.commit()
+        print(f"loaded {n} products over {len(tenants)} tenants in {perf_counter() - started:.1f}s")
+    finally:
+        raw.close()
+    return [t for t, _ in tenants]
+
+
+def cleanup(engine, tenant_ids):
+    with engine.begin() as conn:
+        for table in ("product_embeddings", "products", "categories", "tenants"):
+            column = "id" if table == "tenants" else "tenant_id"
+            conn.execute(text(f"DELETE FROM {table} WHERE {column} = ANY(CAST(:ids AS uuid[]))"), {"ids": tenant_ids})
+
+
+def percentile(samples, q):
+    return samples[min(int(len(samples) * q), len(samples) - 1)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-uri", default=Config.SQLALCHEMY_DATABASE_URI)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--tenants", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=500, help="per kind")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--vectors", action="store_true", help="load product vectors and search with one")
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic tenants in place")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vrng = np.random.default_rng(args.seed)
+    engine = create_engine(args.database_uri)
+    tenant_ids = load(engine, args, rng, vrng)
+    try:
+        kinds = ("exact", "unaccent", "typo", "prefix")
+        timings = {kind: [] for kind in kinds}
+        hits = {kind: 0 for kind in kinds}
+        with Session(engine) as session:
+            repo = ProductRepository(session)
+
+            def search(query):
+                embedding = random_vector(vrng) if args.vectors else None
+                return repo.search_rows_hybrid(
+                    rng.choice(tenant_ids), prefix_tsquery(query), query, embedding,
+                    pool=MAX_RESULTS, rrf_k=RRF_K, limit=args.page_size, version=VERSION
+                )
+
+            for _ in range(20):
+                search(make_query(rng, "exact"))
+            for kind in kinds:
+                for _ in range(args.queries):
+                    query = make_query(rng, kind)
+                    started = perf_counter()
+                    rows, _ = search(query)
+                    timings[kind].append(perf_counter() - started)
+                    hits[kind] += bool(rows)
+                    session.rollback()
+
+            print(f"\n{'kind':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'hit rate':>9}")
+            for kind in kinds:
+                samples = sorted(timings[kind])
+                print(
+                    f"{kind:<10} {percentile(samples, 0.5):8.2f} {percentile(samples, 0.95):8.2f} "
+                    f"{percentile(samples, 0.99):8.2f} {hits[kind] / len(samples):9.1%}"
+                )
+            overall = sorted(t for samples in timings.values() for t in samples)
+            print(f"{'all':<10} {percentile(overall, 0.5):8.2f} {percentile(overall, 0.95):8.2f} {percentile(overall, 0.99):8.2f}")
+
+            query = make_query(rng, "unaccent")
+            tsquery = prefix_tsquery(query)
+            print(f"\nplan for {query!r} (full-text and trigram rankings):")
+            plan = session.execute(text(
+                "EXPLAIN (COSTS OFF) SELECT id FROM products WHERE tenant_id = :tenant AND ("
+                " to_tsvector('simple'::regconfig, s2o_unaccent(coalesce(products.name, '') || ' ' ||"
+                " coalesce(products.description, ''))) @@ to_tsquery('simple'::regconfig, s2o_unaccent(:tsquery))"
+                " OR s2o_unaccent(lower(:q)) <% s2o_unaccent(lower(products.name)))"
+            ), {"tenant": tenant_ids[0], "tsquery": tsquery, "q": query})
+            for (line,) in plan:
+                print("  " + line)
+    finally:
+        if not args.keep:
+            cleanup(engine, tenant_ids)
+
+
+if __name__ == "__main__":
+    main()
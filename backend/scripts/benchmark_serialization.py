@@ -0,0 +1,101 @@
+"""
+Benchmark: ORM -> domain -> dict -> json  vs  column rows -> orjson
+
+Usage (from the repository root):
+    python -m backend.scripts.benchmark_serialization [--rows 10000]
+
+Uses an in-memory SQLite database unless DATABASE_URI is set.
+"""
+import os
+import json
+import uuid
+import argparse
+import tracemalloc
+from time import perf_counter
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from backend.src.infrastructure.databases.base import Base
+from backend.src.infrastructure.models import OrderItem, OrderItemStatus
+from backend.src.infrastructure.repositories.order_item_repository import OrderItemRepository
+from backend.src.services.order_item_service import OrderItemService
+from backend.src.api.responses import dumps, ORJSON_AVAILABLE
+
+
+def seed(session: Session, order_id: uuid.UUID, rows: int) -> None:
+    tenant_id = uuid.uuid4()
+    session.add_all([
+        OrderItem(
+            id=uuid.uuid4(),
+            tenant_id=tenant_id,
+            order_id=order_id,
+            product_id=uuid.uuid4(),
+            quantity=(i % 5) + 1,
+            price_at_order=Decimal("12.50"),
+            item_status=OrderItemStatus.PENDING,
+        )
+        for i in range(rows)
+    ])
+    session.commit()
+
+
+def legacy_path(session: Session, order_id: uuid.UUID) -> bytes:
+    """Previous list path: ORM objects -> domain objects -> dicts -> stdlib json"""
+    repo = OrderItemRepository(session)
+    service = OrderItemService(repo)
+    items = [service._to_dict(i) for i in repo.get_by_order(order_id)]
+    return json.dumps({"order_items": items}, default=str).encode()
+
+
+def row_path(session: Session, order_id: uuid.UUID) -> bytes:
+    """Current list path: column rows -> orjson"""
+    items = OrderItemService(OrderItemRepository(session)).get_order_items_by_order(order_id)
+    return dumps({"order_items": items})
+
+
+def measure(fn, session: Session, order_id: uuid.UUID, repeat: int):
+    session.expunge_all()
+    fn(session, order_id)  # warm-up
+    best = float("inf")
+    for _ in range(repeat):
+        session.expunge_all()
+        start = perf_counter()
+        fn(session, order_id)
+        best = min(best, perf_counter() - start)
+
+    session.expunge_all()
+    tracemalloc.start()
+    fn(session, order_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(os.getenv("DATABASE_URI", "sqlite://"))
+    Base.metadata.create_all(engine, tables=[Base.metadata.tables["order_items"]])
+
+    with Session(engine) as session:
+        order_id = uuid.uuid4()
+        seed(session, order_id, args.rows)
+
+        print(f"rows={args.rows} orjson={'yes' if ORJSON_AVAILABLE else 'no (json fallback)'}")
+        results = {}
+        for name, fn in (("orm->domain->json", legacy_path), ("rows->orjson", row_path)):
+            seconds, peak = measure(fn, session, order_id, args.repeat)
+            results[name] = (seconds, peak)
+            print(f"{name:<20} {seconds * 1000:8.1f} ms   peak {peak / 1024 / 1024:7.2f} MiB")
+
+        (old_t, old_m), (new_t, new_m) = results.values()
+        print(f"speedup x{old_t / new_t:.1f}, peak memory x{old_m / new_m:.1f} lower")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: worker cold start (module imports + create_app) and RSS
+
+Usage (from the repository root):
+    python -m backend.scripts.benchmark_startup [--runs 7] [--top 12] [--compare-ref HEAD~1]
+
+Every run is a fresh interpreter started with -X importtime, so the numbers
+include the full import graph a gunicorn worker pays. Reports the median
+boot time and peak RSS, the app's own STARTUP_TIMINGS, and the heaviest
+top-level packages by cumulative import time. --compare-ref measures the
+same thing on another commit (checked out into a temporary git worktree).
+"""
+import os
+import re
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+PROBE = """
+import json, resource, time
+started = time.perf_counter()
+from backend.src.create_app import create_app
+app = create_app()
+print(json.dumps({
+    "boot_ms": (time.perf_counter() - started) * 1000,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "timings": app.config.get("STARTUP_TIMINGS", {}),
+}))
+"""
+
+_IMPORT_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)")
+
+
+def heaviest_packages(importtime_log: str, top: int):
+    """Top-level third-party packages by cumulative import time (ms)"""
+    packages = {}
+    for line in importtime_log.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(3)
+        if name.startswith("backend"):
+            continue
+        package = name.split(".")[0]
+        packages[package] = max(packages.get(package, 0), int(match.group(1)) / 1000)
+    return sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+
+def measure(root: str, runs: int, top: int) -> dict:
+    env = dict(os.environ, PYTHONPATH=root, PYTHONDONTWRITEBYTECODE="")
+    # Keep a dead Redis from dominating older commits that connect at boot
+    env.setdefault("REDIS_URL", "redis://127.0.0.1:1/0")
+    samples, packages = [], []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE],
+            cwd=root, env=env, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise SystemExit(f"startup probe failed in {root}:\n{result.stderr[-2000:]}")
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+        packages = heaviest_packages(result.stderr, top)
+    return {
+        "boot_ms": statistics.median(s["boot_ms"] for s in samples),
+        "rss_mb": statistics.median(s["rss_mb"] for s in samples),
+        "timings": samples[-1]["timings"],
+        "packages": packages,
+    }
+
+
+def report(label: str, result: dict) -> None:
+    print(f"{label}: boot {result['boot_ms']:.0f} ms (median), peak RSS {result['rss_mb']:.1f} MiB")
+    if result["timings"]:
+        print(f"  app timings: {result['timings']}")
+    for package, ms in result["packages"]:
+        print(f"  {ms:8.1f} ms  {package}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=12, help="packages listed by import time")
+    parser.add_argument("--compare-ref", help="git revision to measure for comparison")
+    args = parser.parse_args()
+
+    root = subprocess.check_output(["git", "rev-parse", "--show-toplevel"], text=True).strip()
+    current = measure(root, args.runs, args.top)
+
+    if args.compare_ref:
+        worktree = tempfile.mkdtemp(prefix="s2o-startup-")
+        try:
+            subprocess.run(
+                ["git", "worktree", "add", "--detach", worktree, args.compare_ref],
+                cwd=root, check=True, capture_output=True
+            )
+            baseline = measure(worktree, args.runs, args.top)
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=root, capture_output=True)
+            shutil.rmtree(worktree, ignore_errors=True)
+        report(args.compare_ref, baseline)
+        print()
+
+    report("working tree", current)
+    if args.compare_ref:
+        print(
+            f"\nboot {current['boot_ms'] - baseline['boot_ms']:+.0f} ms, "
+            f"RSS {current['rss_mb'] - baseline['rss_mb']:+.1f} MiB vs {args.compare_ref}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: typeahead index build, memory and lookup
+
+Usage (from the repository root):
+    python -m backend.scripts.benchmark_typeahead [--products 20000] [--lookups 100000]
+
+Builds one tenant's index from synthetic Vietnamese dish names (with
+diacritics and Zipf-like popularity), then times lookups for prefixes of
+1 to 8 characters typed without accents, the way guests type them. The
+repository reads that feed a build are not included.
+"""
+import random
+import argparse
+import tracemalloc
+from time import perf_counter
+
+from backend.src.domain.typeahead import TypeaheadEntry, TypeaheadIndex, fold
+from backend.scripts.benchmark_menu_search import dish_name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    entries = [
+        TypeaheadEntry("product", f"p{n}", f"{dish_name(rng)} {n}", "c", 1000.0 / (n + 1) ** 0.8)
+        for n in range(args.products)
+    ]
+
+    start = perf_counter()
+    index = TypeaheadIndex(entries)
+    built = perf_counter() - start
+    # Measured on a second build; tracing slows the timed one down
+    tracemalloc.start()
+    traced = TypeaheadIndex(entries)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del traced
+    print(f"build   {built * 1000:8.1f} ms   {len(index)} keys, {len(index.precomputed)} precomputed prefixes")
+    print(f"memory  {memory / 2**20:8.1f} MiB (index, excluding the entries themselves)")
+
+    names = [fold(e.name) for e in entries]
+    print(f"\n{'prefix':>6} {'p50 us':>8} {'p99 us':>8} {'max us':>8}")
+    for length in range(1, 9):
+        prefixes = []
+        for _ in range(args.lookups // 8):
+            words = rng.choice(names).split(" ")
+            prefixes.append(" ".join(words[rng.randrange(len(words)):])[:length])
+        timings = []
+        for prefix in prefixes:
+            start = perf_counter()
+            index.lookup(prefix)
+            timings.append(perf_counter() - start)
+        timings.sort()
+        p50 = timings[len(timings) // 2] * 1e6
+        p99 = timings[int(len(timings) * 0.99)] * 1e6
+        print(f"{length:>6} {p50:8.1f} {p99:8.1f} {timings[-1] * 1e6:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
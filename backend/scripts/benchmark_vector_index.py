@@ -0,0 +1,114 @@
+"""
+Benchmark: pgvector index size, build time, recall and latency per storage mode
+
+Usage (from the repository root, against PostgreSQL with pgvector >= 0.7):
+    python -m backend.scripts.benchmark_vector_index [--vectors 100000] [--queries 200]
+        [--modes float,halfvec,binary] [--rescore-factor N]
+
+Loads --vectors clustered unit vectors (menu embeddings group by dish kind,
+so uniform noise would flatter the quantized modes) into a scratch table.
+For each mode it builds that mode's HNSW index alone, then runs the same
+nearest() query the repositories issue and reports index size, build time,
+recall@10 against an exact scan, and p50/p95 latency. The scratch table is
+dropped afterwards.
+"""
+import argparse
+from time import perf_counter
+
+import numpy as np
+from sqlalchemy import create_engine, text, table, column, select, func
+from pgvector.sqlalchemy import Vector
+
+from backend.src.config import Config
+from backend.src.infrastructure.repositories import vector_search
+from backend.src.infrastructure.repositories.vector_search import (
+    VECTOR_DIMENSION, VECTOR_INDEX_MODES, index_definitions, nearest, ef_search
+)
+from backend.scripts.seed_synthetic import copy_rows
+from backend.scripts.benchmark_menu_search import percentile
+
+TABLE = "vector_index_bench"
+TOP_K = 10
+bench = table(TABLE, column("id"), column("embedding_vector", Vector(VECTOR_DIMENSION)))
+
+
+def clustered_vectors(rng: np.random.Generator, n: int, clusters: int = 64) -> np.ndarray:
+    centres = rng.standard_normal((clusters, VECTOR_DIMENSION)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, VECTOR_DIMENSION)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def literal(vector) -> str:
+    return "[" + ",".join(f"{x:.6f}" for x in vector) + "]"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-uri", default=Config.SQLALCHEMY_DATABASE_URI)
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--modes", default=",".join(VECTOR_INDEX_MODES))
+    parser.add_argument("--rescore-factor", type=int, help="override the per-mode default")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    data = clustered_vectors(rng, args.vectors)
+    queries = [v.tolist() for v in clustered_vectors(rng, args.queries)]
+    engine = create_engine(args.database_uri)
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE UNLOGGED TABLE {TABLE} (id integer PRIMARY KEY, embedding_vector vector({VECTOR_DIMENSION}))"))
+    try:
+        raw = engine.raw_connection()
+        try:
+            started = perf_counter()
+            copy_rows(raw.cursor(), TABLE, ("id", "embedding_vector"), ((i, literal(v)) for i, v in enumerate(data)))
+            raw.commit()
+        finally:
+            raw.close()
+        print(f"loaded {args.vectors} vectors in {perf_counter() - started:.1f}s")
+
+        with engine.connect() as conn:
+            # No vector index exists yet, so these are exact scans
+            exact = []
+            for q in queries:
+                near = nearest(bench.c.id, bench.c.embedding_vector, q, TOP_K, mode="float")
+                exact.append({row.id for row in conn.execute(select(near.c.id))})
+            conn.rollback()
+
+        if args.rescore_factor:
+            vector_search.Config.VECTOR_RESCORE_FACTOR = args.rescore_factor
+        print(f"\n{'mode':<8} {'index MiB':>10} {'build s':>8} {'recall@10':>10} {'p50 ms':>8} {'p95 ms':>8}")
+        for mode in args.modes.split(","):
+            vector_search.Config.VECTOR_INDEX_MODE = mode
+            ((name, definition),) = index_definitions(mode, {TABLE: "embedding_vector"}).items()
+            with engine.begin() as conn:
+                conn.execute(text("SET maintenance_work_mem = '1GB'"))
+                started = perf_counter()
+                conn.execute(text(definition.format(concurrently="")))
+                built = perf_counter() - started
+                size = conn.execute(text("SELECT pg_relation_size(CAST(:name AS regclass))"), {"name": name}).scalar()
+            timings, found = [], 0
+            with engine.connect() as conn:
+                for q, truth in zip(queries, exact):
+                    started = perf_counter()
+                    conn.execute(select(func.set_config("hnsw.ef_search", ef_search(TOP_K), True)))
+                    near = nearest(bench.c.id, bench.c.embedding_vector, q, TOP_K, mode=mode)
+                    ids = {row.id for row in conn.execute(select(near.c.id))}
+                    timings.append(perf_counter() - started)
+                    found += len(ids & truth)
+                    conn.rollback()
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP INDEX {name}"))
+            timings.sort()
+            print(
+                f"{mode:<8} {size / 2**20:10.1f} {built:8.1f} {found / (TOP_K * len(queries)):10.3f} "
+                f"{percentile(timings, 0.5):8.2f} {percentile(timings, 0.95):8.2f}"
+            )
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Write the OpenAPI (Swagger 2.0) spec to a file at build time
+
+Usage (from the repository root):
+    python -m backend.scripts.build_apispec [--output backend/build/apispec.json]
+
+Point APISPEC_FILE at the output and /apispec.json is served from it
+without importing flasgger or parsing a single docstring.
+"""
+import os
+import argparse
+
+from backend.src.create_app import create_app
+from backend.src.docs import LazySwagger
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=os.path.join("backend", "build", "apispec.json"))
+    args = parser.parse_args()
+
+    app = create_app()
+    body = LazySwagger().build(app)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "wb") as f:
+        f.write(body)
+    print(f"{len(body)} bytes, {len(app.url_map._rules)} routes -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Rebuild "frequently ordered together" models
+
+Usage (from the repository root; run nightly, e.g. from cron):
+    python -m backend.scripts.build_cooccurrence [--tenant TENANT_ID]
+
+Completed orders update the models incrementally; a full rebuild also
+refreshes the neighbour lists of products those updates didn't touch and
+takes in orders completed before the model existed.
+"""
+import argparse
+from time import perf_counter
+
+from sqlalchemy import select
+
+from backend.src.infrastructure.databases.postgres import SessionLocal
+from backend.src.infrastructure.models import Tenant
+from backend.src.infrastructure.repositories import OrderItemRepository
+from backend.src.infrastructure.services.cooccurrence_store import get_cooccurrence_store
+from backend.src.services.cooccurrence_service import CooccurrenceService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenant", help="only this tenant (default: all)")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        tenant_ids = [args.tenant] if args.tenant else [str(t) for t in session.scalars(select(Tenant.id))]
+        service = CooccurrenceService(OrderItemRepository(session), get_cooccurrence_store())
+        for tenant_id in tenant_ids:
+            start = perf_counter()
+            stats = service.build(tenant_id)
+            print(
+                f"{tenant_id}: {stats['orders']} orders, {stats['products']} products, "
+                f"{stats['pairs']} pairs in {perf_counter() - start:.2f}s"
+            )
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Rebuild customer taste vectors from order history
+
+Usage (from the repository root; once after deploying, then as needed):
+    python -m backend.scripts.build_taste_vectors [--tenant TENANT_ID] [--customer CUSTOMER_ID]
+
+Completed orders update taste vectors incrementally; a rebuild takes in
+orders completed before that, or before their products had embeddings.
+Tastes are built in the active embedding version, so run it again after
+an embedding cutover (scripts/embedding_versions.py).
+"""
+import argparse
+from time import perf_counter
+
+from sqlalchemy import select
+
+from backend.src.infrastructure.databases.postgres import SessionLocal
+from backend.src.infrastructure.models import Customer, Tenant
+from backend.src.infrastructure.repositories import (
+    OrderItemRepository, ProductRepository, EmbeddingVersionRepository
+)
+from backend.src.infrastructure.repositories.customer_repository import CustomerRepository
+from backend.src.services.taste_service import TasteService
+from backend.src.services.embedding_version_service import EmbeddingVersionService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenant", help="only this tenant (default: all)")
+    parser.add_argument("--customer", help="only this customer (requires --tenant)")
+    args = parser.parse_args()
+    if args.customer and not args.tenant:
+        parser.error("--customer requires --tenant")
+
+    session = SessionLocal()
+    try:
+        tenant_ids = [args.tenant] if args.tenant else [str(t) for t in session.scalars(select(Tenant.id))]
+        version = EmbeddingVersionService(EmbeddingVersionRepository(session)).active()
+        service = TasteService(
+            CustomerRepository(session), ProductRepository(session), OrderItemRepository(session),
+            embedding_version=version
+        )
+        for tenant_id in tenant_ids:
+            start = perf_counter()
+            if args.customer:
+                customer_ids = [args.customer]
+            else:
+                customer_ids = [
+                    str(c) for c in session.scalars(select(Customer.id).where(Customer.tenant_id == tenant_id))
+                ]
+            orders = sum(service.rebuild(tenant_id, customer_id, commit=session.commit) for customer_id in customer_ids)
+            print(f"{tenant_id}: {len(customer_ids)} customers, {orders} orders in {perf_counter() - start:.2f}s")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
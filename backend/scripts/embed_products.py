@@ -0,0 +1,49 @@
+"""
+Backfill product embeddings
+
+Usage (from the repository root):
+    python -m backend.scripts.embed_products [--tenant TENANT_ID]
+
+Menu writes queue the menu.embed_products job on their own; this embeds
+products that predate it, in every live embedding version. Products whose
+stored content hash still matches are skipped, so re-running it is cheap.
+To move to another embedding model use scripts/embedding_versions.py,
+which backfills in the background within the API budget.
+"""
+import time
+import argparse
+
+from sqlalchemy import select
+
+from backend.src.infrastructure.databases.postgres import SessionLocal
+from backend.src.infrastructure.models import Tenant
+from backend.src.infrastructure.repositories import ProductRepository, EmbeddingVersionRepository
+from backend.src.infrastructure.services.embedding_service import EmbeddingService
+from backend.src.services.product_embedding_service import ProductEmbeddingService
+from backend.src.services.embedding_version_service import EmbeddingVersionService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenant", help="only this tenant (default: all)")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        tenant_ids = [args.tenant] if args.tenant else [str(t) for t in session.scalars(select(Tenant.id))]
+        versions = EmbeddingVersionService(EmbeddingVersionRepository(session)).live()
+        total, started = 0, time.perf_counter()
+        for version in versions:
+            service = ProductEmbeddingService(ProductRepository(session), EmbeddingService(version=version))
+            for tenant_id in tenant_ids:
+                embedded = service.embed_stale(tenant_id, commit=session.commit)
+                if embedded:
+                    print(f"{tenant_id}: embedded {embedded} products ({version})")
+                total += embedded
+        print(f"embedded {total} products in {time.perf_counter() - started:.1f}s")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Roll product embeddings over to another embedding model version
+
+Usage (from the repository root, against a migrated PostgreSQL database):
+    python -m backend.scripts.embedding_versions status
+    python -m backend.scripts.embedding_versions start VERSION
+    python -m backend.scripts.embedding_versions cutover VERSION [--force]
+    python -m backend.scripts.embedding_versions retire VERSION
+
+start registers VERSION (one of EMBEDDING_MODELS in
+infrastructure/services/embedding_service.py) and queues its backfill on
+the job workers, which embed every product again in batches, paced by
+REEMBED_REQUESTS_PER_MINUTE / REEMBED_TOKENS_PER_MINUTE, while queries
+keep using the active version. status shows progress; a version is ready
+once the backfill has found nothing left. cutover builds the version's
+vector index (concurrently) and makes it the one queries use, within a
+few seconds on every server. The previous version stays ready, so
+cutting back is instant, until it is retired: that deletes its vectors
+and drops its indexes. Rebuild taste vectors after a cutover
+(scripts/build_taste_vectors.py).
+"""
+import argparse
+
+from sqlalchemy import create_engine, text
+
+from backend.src.config import Config
+from backend.src.infrastructure.databases.postgres import SessionLocal
+from backend.src.infrastructure.repositories import (
+    ProductRepository, OutboxRepository, EmbeddingVersionRepository
+)
+from backend.src.infrastructure.repositories.vector_search import (
+    VECTOR_INDEX_MODES, index_mode, version_index_definition
+)
+from backend.src.infrastructure.services.cache_service import get_cache_service
+from backend.src.infrastructure.services.embedding_service import EMBEDDING_MODELS
+from backend.src.infrastructure.services.job_queue import install_outbox_dispatch
+from backend.src.services.embedding_version_service import EmbeddingVersionService
+from backend.scripts.set_vector_index_mode import build_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("status", "start", "cutover", "retire"))
+    parser.add_argument("version", nargs="?", choices=sorted(EMBEDDING_MODELS))
+    parser.add_argument("--force", action="store_true", help="cutover: don't wait for the backfill to finish")
+    args = parser.parse_args()
+    if args.command != "status" and not args.version:
+        parser.error(f"{args.command} needs a VERSION")
+
+    install_outbox_dispatch()
+    session = SessionLocal()
+    try:
+        versions = EmbeddingVersionService(
+            EmbeddingVersionRepository(session), ProductRepository(session), OutboxRepository(session),
+            get_cache_service()
+        )
+        if args.command == "start":
+            versions.start(args.version)
+            session.commit()
+            print(f"{args.version}: backfill queued")
+        elif args.command == "cutover":
+            dimension = EMBEDDING_MODELS[args.version].dimension
+            engine = create_engine(Config.SQLALCHEMY_DATABASE_URI, isolation_level="AUTOCOMMIT")
+            with engine.connect() as conn:
+                build_index(conn, *version_index_definition(args.version, dimension, index_mode()))
+            result = versions.cutover(args.version, force=args.force)
+            session.commit()
+            print(f"queries now use {result['version']} (was {result['previous']})")
+        elif args.command == "retire":
+            deleted = versions.retire(args.version)
+            session.commit()
+            engine = create_engine(Config.SQLALCHEMY_DATABASE_URI, isolation_level="AUTOCOMMIT")
+            with engine.connect() as conn:
+                for mode in VECTOR_INDEX_MODES:
+                    name, _ = version_index_definition(args.version, EMBEDDING_MODELS[args.version].dimension, mode)
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+            print(f"{args.version}: retired, {deleted} vectors deleted")
+
+        print(f"\n{'version':<28} {'dim':>5} {'status':<9} {'embedded':>17}")
+        for v in versions.get_versions():
+            coverage = f"{v['embedded']}/{v['products']}" if "embedded" in v else "-"
+            print(f"{v['version']:<28} {v['dimension']:>5} {v['status']:<9} {coverage:>17}")
+    except ValueError as e:
+        session.rollback()
+        raise SystemExit(str(e))
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Purge delta-sync tombstones older than SYNC_TOMBSTONE_DAYS
+
+Usage (from the repository root; run daily, e.g. from cron):
+    python -m backend.scripts.purge_sync_tombstones [--days 30]
+
+Live rows keep their single change-log row; only tombstones of deleted
+rows accumulate. Purging them raises each tenant's purged_version, and a
+client whose cursor is older gets a full sync on its next call.
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from backend.src.config import Config
+from backend.src.infrastructure.databases.postgres import SessionLocal
+from backend.src.infrastructure.repositories import SyncRepository
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=Config.SYNC_TOMBSTONE_DAYS)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        purged = SyncRepository(session).purge_tombstones(datetime.utcnow() - timedelta(days=args.days))
+        session.commit()
+        print(f"purged {purged} tombstones older than {args.days} days")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Recompute per-branch popularity and trending rankings
+
+Usage (from the repository root; run hourly, e.g. from cron):
+    python -m backend.scripts.recompute_popularity [--branch BRANCH_ID]
+
+Completed orders update the rankings incrementally; a recompute also
+drops cancelled lines, takes in orders missed by those updates, and
+rebases the stored scores.
+"""
+import argparse
+from time import perf_counter
+
+from sqlalchemy import select
+
+from backend.src.infrastructure.databases.postgres import SessionLocal
+from backend.src.infrastructure.models import Branch
+from backend.src.infrastructure.repositories import OrderItemRepository
+from backend.src.infrastructure.services.popularity_store import get_popularity_store
+from backend.src.services.popularity_service import PopularityService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--branch", help="only this branch (default: all)")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        branch_ids = [args.branch] if args.branch else [str(b) for b in session.scalars(select(Branch.id))]
+        service = PopularityService(OrderItemRepository(session), get_popularity_store())
+        for branch_id in branch_ids:
+            start = perf_counter()
+            ranked = service.recompute(branch_id)
+            counts = ", ".join(f"{window} {n}" for window, n in ranked.items())
+            print(f"{branch_id}: {counts} products in {perf_counter() - start:.2f}s")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Run background job workers
+
+Usage (from the repository root):
+    python -m backend.scripts.run_job_worker [--processes 2] [--threads 4] [--lanes high,default,low]
+
+Starts --processes worker processes, each running --threads workers that
+claim jobs from the given lanes (highest priority first) plus the outbox
+relay. Needs JOB_QUEUE_BACKEND=redis: the in-memory queue only serves the
+web process that owns it. Set SOCKETIO_MESSAGE_QUEUE (also on the web
+servers) so jobs that emit realtime events reach connected clients.
+SIGTERM or Ctrl+C lets running jobs finish, then exits.
+"""
+import os
+import signal
+import logging
+import argparse
+import threading
+import multiprocessing
+
+from backend.src.infrastructure.services.job_queue import (
+    LANES, InMemoryJobQueue, JobWorker, OutboxRelay, init_job_queue, install_outbox_dispatch
+)
+
+
+def run_process(threads: int, lanes, relay: bool):
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    queue = init_job_queue(workers=0)
+    if isinstance(queue, InMemoryJobQueue):
+        raise SystemExit("run_job_worker needs a reachable Redis (JOB_QUEUE_BACKEND=redis, REDIS_URL)")
+    # Jobs that queue follow-up jobs (e.g. batched backfills) push them on commit
+    install_outbox_dispatch()
+
+    message_queue = os.getenv('SOCKETIO_MESSAGE_QUEUE')
+    if message_queue:
+        from backend.src.infrastructure.services.realtime_service import get_realtime_service
+        get_realtime_service().init_emitter(message_queue)
+
+    from backend.src.infrastructure.services.metrics_service import get_metrics_service
+
+    workers = [
+        threading.Thread(target=JobWorker(queue, lanes, get_metrics_service()).run_forever, args=(stop,))
+        for _ in range(threads)
+    ]
+    if relay:
+        older_than = float(os.getenv('JOB_OUTBOX_RELAY_SECONDS') or 30)
+        workers.append(threading.Thread(target=OutboxRelay(queue, older_than).run_forever, args=(stop,)))
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--lanes", default=",".join(LANES), help="comma-separated, highest priority first")
+    args = parser.parse_args()
+
+    lanes = [lane.strip() for lane in args.lanes.split(",") if lane.strip()]
+    unknown = set(lanes) - set(LANES)
+    if unknown:
+        parser.error(f"unknown lanes: {', '.join(sorted(unknown))}")
+
+    if args.processes <= 1:
+        run_process(args.threads, lanes, relay=True)
+        return
+
+    # One relay is enough; SKIP LOCKED keeps extra ones harmless anyway
+    processes = [
+        multiprocessing.Process(target=run_process, args=(args.threads, lanes, i == 0), name=f"job-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    signal.signal(signal.SIGTERM, lambda *_: [p.terminate() for p in processes if p.is_alive()])
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
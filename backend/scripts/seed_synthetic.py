@@ -0,0 +1,336 @@
+"""
+Synthetic tenants at benchmark scale, bulk-loaded with COPY
+
+Usage (from the repository root, against a migrated PostgreSQL database):
+    python -m backend.scripts.seed_synthetic [--tenants 2] [--branches 5] [--tables 30]
+        [--products 200] [--customers 5000] [--orders 1000000] [--embeddings]
+
+Generation is deterministic for a given --seed, so two runs against empty
+databases produce identical data and benchmark results stay comparable
+between commits. Rows are streamed straight into COPY; nothing is held in
+memory beyond the id pools the next table needs.
+
+Orders are spread over the last --days days. Most are COMPLETED with a paid
+invoice; the newest --active-orders per branch stay open with pending items
+so the kitchen board has work on it. A manifest of the generated ids
+(tenants, owners, branches, tables, products, open orders) is written for
+scripts/benchmark_endpoints.py.
+"""
+import io
+import csv
+import json
+import uuid
+import random
+import argparse
+import bcrypt
+from time import perf_counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from backend.src.config import Config
+
+SLUG_PREFIX = "bench-"
+DEFAULT_MANIFEST = "bench_manifest.json"
+
+# Every synthetic user shares this password; hashed once per run
+PASSWORD = "benchmark"
+
+CATEGORY_NAMES = ["Starters", "Soups", "Noodles", "Rice", "Grill", "Seafood", "Vegetarian", "Desserts", "Drinks", "Coffee"]
+DISHES = ["Pho", "Bun Cha", "Com Tam", "Banh Xeo", "Goi Cuon", "Lau", "Bo Luc Lac", "Ca Kho", "Che", "Tra Da", "Ca Phe Sua"]
+EMBEDDING_DIMENSION = 1536
+
+
+class _RowStream(io.RawIOBase):
+    """File-like view over an iterator of CSV rows, consumed by copy_expert"""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buffer = b""
+        self._text = io.StringIO()
+        self._writer = csv.writer(self._text, lineterminator="\n")
+        self.count = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        while len(self._buffer) < len(target):
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            self._buffer += chunk
+        n = min(len(target), len(self._buffer))
+        target[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def _next_chunk(self, rows_per_chunk: int = 2000) -> bytes:
+        self._text.seek(0)
+        self._text.truncate()
+        for _ in range(rows_per_chunk):
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow(["\\N" if v is None else v for v in row])
+            self.count += 1
+        return self._text.getvalue().encode()
+
+
+def copy_rows(cursor, table: str, columns, rows) -> int:
+    stream = _RowStream(rows)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+        io.BufferedReader(stream, buffer_size=1 << 16)
+    )
+    return stream.count
+
+
+class SyntheticTenants:
+    """Deterministic row generators; ids are kept for the tables that reference them"""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.now = datetime(2026, 1, 1) if args.fixed_clock else datetime.utcnow().replace(microsecond=0)
+        self.tenants = []       # (tenant_id, slug)
+        self.branches = {}      # tenant_id -> [branch_id]
+        self.tables = {}        # branch_id -> [table_id]
+        self.products = {}      # tenant_id -> [(product_id, price)]
+        self.customers = {}     # tenant_id -> [customer_id]
+        self.owners = {}        # tenant_id -> user_id
+        self.open_orders = {}   # branch_id -> [order_id]
+        self.password_hash = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode()
+
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def tenant_rows(self):
+        for t in range(self.args.tenants):
+            tenant_id, slug = self._uuid(), f"{SLUG_PREFIX}{self.args.seed}-{t}"
+            self.tenants.append((tenant_id, slug))
+            yield tenant_id, f"Bench Tenant {t}", slug, "PRO", True, self.now, self.now
+
+    def branch_rows(self):
+        for tenant_id, _ in self.tenants:
+            ids = self.branches[tenant_id] = [self._uuid() for _ in range(self.args.branches)]
+            for n, branch_id in enumerate(ids):
+                yield branch_id, tenant_id, f"Branch {n}", f"{n} Synthetic Street", True, self.now, self.now
+
+    def table_rows(self):
+        for tenant_id, _ in self.tenants:
+            for branch_id in self.branches[tenant_id]:
+                ids = self.tables[branch_id] = [self._uuid() for _ in range(self.args.tables)]
+                for n, table_id in enumerate(ids):
+                    seats = self.rng.choice((2, 2, 4, 4, 4, 6, 8))
+                    yield table_id, tenant_id, branch_id, f"T{n + 1}", seats, "AVAILABLE", self.now, self.now
+
+    def user_rows(self):
+        for tenant_id, slug in self.tenants:
+            owner_id = self.owners[tenant_id] = self._uuid()
+            yield owner_id, f"owner@{slug}.example.com", self.password_hash, f"Owner {slug}", "OWNER", self.now, self.now
+            for n in range(self.args.customers):
+                yield self._uuid(), f"c{n}@{slug}.example.com", self.password_hash, f"Customer {n}", "CUSTOMER", self.now, self.now
+
+    def customer_rows(self, user_ids_by_tenant):
+        for tenant_id, _ in self.tenants:
+            ids = self.customers[tenant_id] = []
+            for user_id in user_ids_by_tenant[tenant_id]:
+                customer_id = self._uuid()
+                ids.append(customer_id)
+                yield customer_id, user_id, tenant_id, None, 0, "IRON", self.now, self.now
+
+    def category_rows(self):
+        self.categories = {}
+        for tenant_id, _ in self.tenants:
+            ids = self.categories[tenant_id] = [self._uuid() for _ in CATEGORY_NAMES]
+            for n, (category_id, name) in enumerate(zip(ids, CATEGORY_NAMES)):
+                yield category_id, tenant_id, name, n, self.now, self.now
+
+    def product_rows(self):
+        for tenant_id, _ in self.tenants:
+            pool = self.products[tenant_id] = []
+            for n in range(self.args.products):
+                product_id = self._uuid()
+                price = float(self.rng.randrange(20, 400) * 1000)
+                pool.append((product_id, price))
+                name = f"{self.rng.choice(DISHES)} #{n}"
+                yield (
+                    product_id, tenant_id, self.rng.choice(self.categories[tenant_id]), name, price,
+                    f"Synthetic dish {n}", self.rng.random() > 0.05, self.now, self.now
+                )
+
+    def embedding_rows(self):
+        for tenant_id, _ in self.tenants:
+            for product_id, _ in self.products[tenant_id]:
+                vector = "[" + ",".join(f"{self.rng.gauss(0, 1):.4f}" for _ in range(EMBEDDING_DIMENSION)) + "]"
+                yield f"product:{product_id}", tenant_id, f"product {product_id}", vector, "product", product_id
+
+    def order_rows(self, items_out, invoices_out):
+        """
+        Orders, with their items and invoices appended to the given lists in
+        bounded batches by the caller (see load)
+        """
+        args = self.args
+        span = timedelta(days=args.days).total_seconds()
+        branches = [(t, b) for t, _ in self.tenants for b in self.branches[t]]
+        active_from = args.orders - args.active_orders * len(branches)
+        for n in range(args.orders):
+            tenant_id, branch_id = branches[n % len(branches)]
+            order_id = self._uuid()
+            active = n >= active_from
+            created = self.now - timedelta(seconds=span * (1 - n / args.orders))
+            customers = self.customers[tenant_id]
+            customer_id = self.rng.choice(customers) if customers and self.rng.random() < 0.5 else None
+
+            total = 0.0
+            item_status = "PENDING" if active else "SERVED"
+            for product_id, price in self.rng.sample(self.products[tenant_id], min(self.rng.randint(1, 5), len(self.products[tenant_id]))):
+                quantity = self.rng.randint(1, 3)
+                total += price * quantity
+                items_out.append((self._uuid(), tenant_id, order_id, product_id, quantity, price, item_status, created, created))
+
+            if active:
+                self.open_orders.setdefault(branch_id, []).append(order_id)
+                status = self.rng.choice(("PENDING", "CONFIRMED", "PREPARING"))
+            else:
+                status = "COMPLETED"
+                method = self.rng.choice(("CASH", "CREDIT_CARD", "QR_CODE", "E_WALLET"))
+                invoices_out.append((self._uuid(), tenant_id, order_id, total, method, "PAID", created, created))
+            yield (
+                order_id, tenant_id, branch_id, self.rng.choice(self.tables[branch_id]), customer_id,
+                status, total, None, created, created
+            )
+
+    def manifest(self) -> dict:
+        return {
+            "seed": self.args.seed,
+            "tenants": [
+                {
+                    "id": tenant_id,
+                    "slug": slug,
+                    "owner_user_id": self.owners[tenant_id],
+                    "branches": [
+                        {"id": b, "tables": self.tables[b], "open_orders": self.open_orders.get(b, [])[:200]}
+                        for b in self.branches[tenant_id]
+                    ],
+                    "categories": self.categories[tenant_id],
+                    "products": [{"id": p, "price": price} for p, price in self.products[tenant_id]],
+                    "customers": self.customers[tenant_id][:200],
+                }
+                for tenant_id, slug in self.tenants
+            ],
+        }
+
+
+def load(engine, data: SyntheticTenants, batch_orders: int = 50000) -> None:
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        ts = ("created_at", "updated_at")
+
+        def timed(table, columns, rows):
+            started = perf_counter()
+            n = copy_rows(cursor, table, columns, rows)
+            print(f"  {table:<12} {n:>10} rows  {perf_counter() - started:7.2f}s")
+            return n
+
+        timed("tenants", ("id", "name", "slug", "subscription_plan", "is_active") + ts, data.tenant_rows())
+        timed("branches", ("id", "tenant_id", "name", "address", "is_active") + ts, data.branch_rows())
+        timed("tables", ("id", "tenant_id", "branch_id", "name", "seats", "status") + ts, data.table_rows())
+
+        users = list(data.user_rows())
+        timed("users", ("id", "email", "password_hash", "full_name", "role") + ts, users)
+        by_tenant = {}
+        customers_per_tenant = data.args.customers + 1
+        for i, (tenant_id, _) in enumerate(data.tenants):
+            chunk = users[i * customers_per_tenant:(i + 1) * customers_per_tenant]
+            by_tenant[tenant_id] = [row[0] for row in chunk[1:]]
+        timed(
+            "customers",
+            ("id", "user_id", "tenant_id", "phone_number", "loyalty_points", "membership_tier") + ts,
+            data.customer_rows(by_tenant)
+        )
+        timed("categories", ("id", "tenant_id", "name", "display_order") + ts, data.category_rows())
+        timed(
+            "products",
+            ("id", "tenant_id", "category_id", "name", "price", "description", "is_available") + ts,
+            data.product_rows()
+        )
+        if data.args.embeddings:
+            timed(
+                "embeddings", ("id", "tenant_id", "text", "embedding", "entity_type", "entity_id"),
+                data.embedding_rows()
+            )
+
+        # Orders reference their items and invoices; load in batches so the
+        # child rows never pile up in memory
+        items, invoices = [], []
+        orders = data.order_rows(items, invoices)
+        order_columns = ("id", "tenant_id", "branch_id", "table_id", "customer_id", "status", "total_amount", "note") + ts
+        item_columns = ("id", "tenant_id", "order_id", "product_id", "quantity", "price_at_order", "item_status") + ts
+        invoice_columns = ("id", "tenant_id", "order_id", "final_amount", "payment_method", "payment_status") + ts
+        totals = {"orders": 0, "order_items": 0, "invoices": 0}
+        started = perf_counter()
+        while True:
+            batch = [row for _, row in zip(range(batch_orders), orders)]
+            if not batch:
+                break
+            totals["orders"] += copy_rows(cursor, "orders", order_columns, batch)
+            totals["order_items"] += copy_rows(cursor, "order_items", item_columns, items)
+            totals["invoices"] += copy_rows(cursor, "invoices", invoice_columns, invoices)
+            items.clear()
+            invoices.clear()
+            print(f"  orders       {totals['orders']:>10} rows  {perf_counter() - started:7.2f}s", end="\r")
+        print()
+        for table in ("order_items", "invoices"):
+            print(f"  {table:<12} {totals[table]:>10} rows")
+
+        raw.commit()
+        cursor.execute("ANALYZE")
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-uri", default=Config.SQLALCHEMY_DATABASE_URI)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tenants", type=int, default=2)
+    parser.add_argument("--branches", type=int, default=5, help="per tenant")
+    parser.add_argument("--tables", type=int, default=30, help="per branch")
+    parser.add_argument("--products", type=int, default=200, help="per tenant")
+    parser.add_argument("--customers", type=int, default=5000, help="per tenant")
+    parser.add_argument("--orders", type=int, default=1_000_000, help="total, across all branches")
+    parser.add_argument("--active-orders", type=int, default=20, help="open orders per branch")
+    parser.add_argument("--days", type=int, default=365, help="history the orders are spread over")
+    parser.add_argument("--embeddings", action="store_true", help="also load random product vectors")
+    parser.add_argument("--fixed-clock", action="store_true", help="timestamp from a fixed date, not now")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_uri)
+    with engine.connect() as conn:
+        existing = conn.execute(
+            text("SELECT count(*) FROM tenants WHERE slug LIKE :prefix"),
+            {"prefix": f"{SLUG_PREFIX}{args.seed}-%"}
+        ).scalar()
+    if existing:
+        raise SystemExit(f"{existing} synthetic tenants for seed {args.seed} already exist; use another --seed or a fresh database")
+
+    data = SyntheticTenants(args)
+    started = perf_counter()
+    load(engine, data)
+    print(f"loaded in {perf_counter() - started:.1f}s")
+
+    with open(args.manifest, "w") as f:
+        json.dump(data.manifest(), f)
+    print(f"manifest written to {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
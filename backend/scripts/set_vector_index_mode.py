@@ -0,0 +1,74 @@
+"""
+Switch the pgvector HNSW indexes to another storage layout
+
+Usage (from the repository root, against a migrated PostgreSQL database):
+    python -m backend.scripts.set_vector_index_mode --mode {float,halfvec,binary} [--keep-old]
+
+Builds the new mode's indexes with CREATE INDEX CONCURRENTLY, so searches
+and writes carry on meanwhile, then drops the other modes' indexes unless
+--keep-old is given. Product embeddings get one index per embedding
+version that is not retired. Set VECTOR_INDEX_MODE to the same mode and
+restart the API once the build is done: queries only use an index whose
+expression matches the mode they are issued in.
+"""
+import argparse
+from time import perf_counter
+from typing import Dict
+
+from sqlalchemy import create_engine, text
+
+from backend.src.config import Config
+from backend.src.infrastructure.repositories.vector_search import (
+    VECTOR_INDEX_MODES, index_definitions, version_index_definition
+)
+
+
+def mode_index_definitions(conn, mode: str) -> Dict[str, str]:
+    """Index definitions of a mode, including one per embedding version that is not retired"""
+    definitions = index_definitions(mode)
+    versions = conn.execute(text("SELECT version, dimension FROM embedding_versions WHERE status <> 'retired'"))
+    for version, dimension in versions:
+        name, definition = version_index_definition(version, dimension, mode)
+        definitions[name] = definition
+    return definitions
+
+
+def build_index(conn, name: str, definition: str) -> None:
+    """Build an index concurrently (conn in autocommit) and report its size"""
+    start = perf_counter()
+    # A cancelled concurrent build leaves an INVALID index that IF NOT EXISTS would keep
+    invalid = conn.execute(text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+        " WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {"name": name}).first()
+    if invalid:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY {name}"))
+    conn.execute(text(definition.format(concurrently="CONCURRENTLY")))
+    size = conn.execute(text("SELECT pg_size_pretty(pg_relation_size(CAST(:name AS regclass)))"), {"name": name}).scalar()
+    print(f"built {name} ({size}) in {perf_counter() - start:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-uri", default=Config.SQLALCHEMY_DATABASE_URI)
+    parser.add_argument("--mode", required=True, choices=VECTOR_INDEX_MODES)
+    parser.add_argument("--keep-old", action="store_true", help="leave the other modes' indexes in place")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_uri, isolation_level="AUTOCOMMIT")
+    with engine.connect() as conn:
+        target = mode_index_definitions(conn, args.mode)
+        for name, definition in target.items():
+            build_index(conn, name, definition)
+        if args.keep_old:
+            return
+        for mode in VECTOR_INDEX_MODES:
+            for name in mode_index_definitions(conn, mode):
+                # Versions above the float limit are indexed as halfvec in both modes
+                if name not in target:
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+                    print(f"dropped {name} (if present)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
 from flask import Blueprint, request, jsonify, g
 from pydantic import ValidationError
 from ..schemas.category_schema import CreateCategoryRequest, UpdateCategoryRequest
-from ..middleware import auth_required
+from ..middleware import auth_required, conditional_get
 from ...services.category_service import CategoryService
 from ...infrastructure.databases.postgres import get_db
 from ...infrastructure.repositories.category_repository import CategoryRepository
+from ...infrastructure.repositories.outbox_repository import OutboxRepository
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,6 +15,7 @@ category_bp = Blueprint("categories", __name__, url_prefix="/categories")
 
 @category_bp.route("", methods=["GET"])
 @auth_required()
+@conditional_get("categories")
 def get_categories():
     """
     Get all categories for current tenant
@@ -190,7 +192,7 @@ def update_category(category_id):
         req = UpdateCategoryRequest(**data)
         
         category_repo = CategoryRepository(db)
-        service = CategoryService(category_repo)
+        service = CategoryService(category_repo, OutboxRepository(db))
         
         result = service.update_category(category_id, req.model_dump(exclude_unset=True))
         db.commit()
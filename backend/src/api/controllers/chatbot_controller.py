@@ -6,6 +6,8 @@ from ...services.chatbot_service import ChatbotService
 from ...infrastructure.services.openai_service import OpenAIService
 from ...infrastructure.services.embedding_service import EmbeddingService
 from ...infrastructure.repositories.vector_repository import VectorRepository
+from ...infrastructure.repositories.outbox_repository import OutboxRepository
+from ...infrastructure.services.conversation_store import get_conversation_store
 from ...infrastructure.databases.postgres import get_db
 import logging
 
@@ -16,6 +18,7 @@ chatbot_bp = Blueprint("chatbot", __name__, url_prefix="/chatbot")
 
 class ChatRequest(BaseModel):
     question: str = Field(..., min_length=1, max_length=1000)
+    session_id: Optional[str] = Field(None, max_length=64)
 
 
 class IndexDocumentRequest(BaseModel):
@@ -48,6 +51,11 @@ def chat():
             question:
               type: string
               description: The question to ask the chatbot
+            session_id:
+              type: string
+              description: >
+                Conversation to continue, from an earlier response; omitted,
+                expired or unknown starts a new one
     responses:
       200:
         description: Chatbot response
@@ -62,6 +70,24 @@ def chat():
               type: array
               items:
                 type: object
+            session_id:
+              type: string
+              description: Send with the next question to continue the conversation
+            memory:
+              type: object
+              properties:
+                context_reused:
+                  type: boolean
+                  description: Context documents came from an earlier question of the session
+                history_turns:
+                  type: integer
+                history_tokens:
+                  type: integer
+                summarized:
+                  type: boolean
+                  description: Older turns were folded into the summary on this turn
+                has_summary:
+                  type: boolean
     """
     data = request.get_json()
     db = next(get_db())
@@ -74,8 +100,8 @@ def chat():
         openai_service = OpenAIService()
         embed_service = EmbeddingService()
         
-        chatbot = ChatbotService(vector_repo, openai_service, embed_service)
-        result = chatbot.ask_chatbot(req.question, g.tenant_id)
+        chatbot = ChatbotService(vector_repo, openai_service, embed_service, store=get_conversation_store())
+        result = chatbot.ask_chatbot(req.question, g.tenant_id, req.session_id, g.user_id)
         
         return jsonify(result), 200
     except Exception as e:
@@ -89,6 +115,39 @@ def chat():
         db.close()
 
 
+@chatbot_bp.route("/sessions/<session_id>", methods=["DELETE"])
+@auth_required()
+def end_session(session_id):
+    """
+    End a chatbot conversation (its history and context are forgotten)
+    ---
+    tags:
+      - AI Chatbot
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: path
+        name: session_id
+        type: string
+        required: true
+    responses:
+      200:
+        description: Conversation ended
+      404:
+        description: No such conversation of this user (or it expired)
+    """
+    try:
+        chatbot = ChatbotService(None, OpenAIService(), EmbeddingService(), store=get_conversation_store())
+        if chatbot.end_session(g.tenant_id, session_id, g.user_id):
+            return jsonify({"message": "Session ended"}), 200
+        return jsonify({"error": "Session not found"}), 404
+    except Exception as e:
+        logger.error(f"End chatbot session error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
 @chatbot_bp.route("/index", methods=["POST"])
 @auth_required(roles=['OWNER', 'SYS_ADMIN'])
 def index_document():
@@ -119,10 +178,8 @@ def index_document():
             entity_id:
               type: string
     responses:
-      200:
-        description: Document indexed successfully
-      400:
-        description: Indexing failed
+      202:
+        description: Document queued for indexing (embedded in the background)
     """
     data = request.get_json()
     db = next(get_db())
@@ -134,7 +191,7 @@ def index_document():
         openai_service = OpenAIService()
         embed_service = EmbeddingService()
         
-        chatbot = ChatbotService(vector_repo, openai_service, embed_service)
+        chatbot = ChatbotService(vector_repo, openai_service, embed_service, OutboxRepository(db))
         
         metadata = {
             "text": req.text,
@@ -143,13 +200,12 @@ def index_document():
             "entity_id": req.entity_id
         }
         
-        success = chatbot.index_document(req.doc_id, req.text, metadata)
+        result = chatbot.queue_index_document(req.doc_id, req.text, metadata)
+        db.commit()
         
-        if success:
-            return jsonify({"message": "Document indexed successfully", "doc_id": req.doc_id}), 200
-        else:
-            return jsonify({"error": "Failed to index document"}), 400
+        return jsonify({"message": "Document queued for indexing", **result}), 202
     except Exception as e:
+        db.rollback()
         logger.error(f"Index document error: {e}")
         return jsonify({"error": str(e)}), 500
     finally:
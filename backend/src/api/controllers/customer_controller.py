@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify, g
 from pydantic import ValidationError
-from ..schemas.customer_schema import CreateCustomerRequest, UpdateCustomerRequest, AddLoyaltyPointsRequest, RedeemLoyaltyPointsRequest
+from ..schemas.customer_schema import CreateCustomerRequest, UpdateCustomerRequest, AddLoyaltyPointsRequest, RedeemLoyaltyPointsRequest, AccrueLoyaltyPointsRequest
 from ..middleware import auth_required
 from ...services.customer_service import CustomerService
 from ...infrastructure.databases.postgres import get_db
@@ -252,7 +252,7 @@ def add_loyalty_points(user_id):
         customer_repo = CustomerRepository(db)
         service = CustomerService(customer_repo)
         
-        result = service.add_loyalty_points(user_id, req.points)
+        result = service.add_loyalty_points(g.tenant_id, user_id, req.points)
         db.commit()
         
         return jsonify(result), 200
@@ -308,7 +308,7 @@ def redeem_loyalty_points(user_id):
         customer_repo = CustomerRepository(db)
         service = CustomerService(customer_repo)
         
-        result = service.redeem_loyalty_points(user_id, req.points)
+        result = service.redeem_loyalty_points(g.tenant_id, user_id, req.points)
         db.commit()
         
         return jsonify(result), 200
@@ -324,3 +324,105 @@ def redeem_loyalty_points(user_id):
         return jsonify({"error": str(e)}), 500
     finally:
         db.close()
+
+
+@customer_bp.route("/<user_id>/loyalty/ledger", methods=["GET"])
+@auth_required()
+def get_loyalty_ledger(user_id):
+    """
+    Get loyalty points history for customer
+    ---
+    tags:
+      - Customers
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: path
+        name: user_id
+        type: string
+        required: true
+      - in: query
+        name: limit
+        type: integer
+        default: 50
+    responses:
+      200:
+        description: Loyalty ledger entries, newest first (customers of the caller's tenant only)
+      403:
+        description: Customers can only read their own ledger
+    """
+    if g.role == 'CUSTOMER' and user_id != g.user_id:
+        return jsonify({"error": "Forbidden: Insufficient permissions", "code": 403}), 403
+    db = next(get_db())
+    try:
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        
+        customer_repo = CustomerRepository(db)
+        service = CustomerService(customer_repo)
+        
+        entries = service.get_loyalty_history(g.tenant_id, user_id, limit)
+        return jsonify({"entries": entries}), 200
+    except Exception as e:
+        logger.error(f"Get loyalty ledger error: {e}")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        db.close()
+
+
+@customer_bp.route("/loyalty/accrue", methods=["POST"])
+@auth_required(roles=['OWNER', 'STAFF', 'SYS_ADMIN'])
+def accrue_loyalty_points():
+    """
+    Accrue loyalty points for a batch of completed orders
+    ---
+    tags:
+      - Customers
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: body
+        name: body
+        schema:
+          id: AccrueLoyaltyPointsRequest
+          required:
+            - order_ids
+          properties:
+            order_ids:
+              type: array
+              items:
+                type: string
+            points_rate:
+              type: number
+              default: 0.1
+    responses:
+      200:
+        description: Points accrued per customer
+    """
+    data = request.get_json()
+    db = next(get_db())
+    try:
+        req = AccrueLoyaltyPointsRequest(**data)
+        
+        customer_repo = CustomerRepository(db)
+        service = CustomerService(customer_repo)
+        
+        result = service.accrue_points_for_orders(g.tenant_id, req.order_ids, req.points_rate)
+        db.commit()
+        
+        return jsonify(result), 200
+    except ValidationError as e:
+        db.rollback()
+        return jsonify({"error": "Validation Error", "details": e.errors()}), 400
+    except ValueError as e:
+        db.rollback()
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Accrue loyalty points error: {e}")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        db.close()
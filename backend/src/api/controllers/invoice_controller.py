@@ -4,7 +4,7 @@ from ..schemas.invoice_schema import CreateInvoiceRequest, UpdatePaymentStatusRe
 from ..middleware import auth_required
 from ...services.invoice_service import InvoiceService
 from ...infrastructure.databases.postgres import get_db
-from ...infrastructure.repositories import InvoiceRepository
+from ...infrastructure.repositories import InvoiceRepository, OutboxRepository
 import logging
 
 logger = logging.getLogger(__name__)
@@ -168,7 +168,7 @@ def create_invoice():
         req = CreateInvoiceRequest(**data)
         
         invoice_repo = InvoiceRepository(db)
-        service = InvoiceService(invoice_repo)
+        service = InvoiceService(invoice_repo, OutboxRepository(db))
         
         result = service.create_invoice(g.tenant_id, req.order_id, req.model_dump())
         db.commit()
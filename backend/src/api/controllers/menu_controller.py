@@ -1,10 +1,20 @@
 from flask import Blueprint, request, jsonify, g
 from pydantic import ValidationError
-from ..schemas.menu_schema import CreateCategoryRequest, CreateProductRequest, CategoryResponse, ProductResponse
+from ..schemas.menu_schema import (
+    CreateCategoryRequest, CreateProductRequest, UpdateProductRequest, CategoryResponse, ProductResponse
+)
 from ...services.menu_service import MenuService
+from ...services.menu_search_service import MenuSearchService
+from ...services.typeahead_service import TypeaheadService
+from ...services.embedding_version_service import EmbeddingVersionService
+from ...infrastructure.services.cache_service import get_cache_service
+from ...infrastructure.services.typeahead_store import get_typeahead_store
 from ...infrastructure.databases.postgres import get_db
-from ...infrastructure.repositories import CategoryRepository, ProductRepository
-from ..middleware import auth_required
+from ...infrastructure.repositories import (
+    CategoryRepository, ProductRepository, OutboxRepository, OrderItemRepository, EmbeddingVersionRepository
+)
+from ..middleware import auth_required, conditional_get
+from ..responses import json_response
 from ..controllers.utils import standardize_response
 
 menu_bp = Blueprint('menu', __name__, url_prefix='/menu')
@@ -63,6 +73,7 @@ def create_category():
 
 @menu_bp.route('/categories', methods=['GET'])
 @auth_required()
+@conditional_get("categories")
 def get_categories():
     """
     List all categories for the tenant
@@ -135,7 +146,7 @@ def create_product():
         
         category_repo = CategoryRepository(db)
         product_repo = ProductRepository(db)
-        service = MenuService(category_repo, product_repo)
+        service = MenuService(category_repo, product_repo, OutboxRepository(db))
         
         # Note: g.tenant_id comes from token
         result = service.create_product(g.tenant_id, str(req.category_id), req.model_dump())
@@ -154,8 +165,77 @@ def create_product():
     finally:
         db.close()
 
+@menu_bp.route('/products/<product_id>', methods=['PUT'])
+@auth_required(roles=['OWNER', 'STAFF', 'SYS_ADMIN'])
+def update_product(product_id):
+    """
+    Update a product (its embedding is regenerated in the background when
+    name, description or category change)
+    ---
+    tags:
+      - Menu
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: path
+        name: product_id
+        type: string
+        required: true
+      - in: body
+        name: body
+        schema:
+            id: UpdateProductRequest
+            properties:
+                category_id:
+                    type: string
+                    format: uuid
+                name:
+                    type: string
+                price:
+                    type: number
+                description:
+                    type: string
+                is_available:
+                    type: boolean
+    responses:
+      200:
+        description: Product updated
+      404:
+        description: Product not found
+    """
+    data = request.get_json()
+    db = next(get_db())
+    try:
+        req = UpdateProductRequest(**data)
+
+        category_repo = CategoryRepository(db)
+        product_repo = ProductRepository(db)
+        service = MenuService(category_repo, product_repo, OutboxRepository(db))
+
+        result = service.update_product(g.tenant_id, product_id, req.model_dump(exclude_unset=True))
+        if result is None:
+            return jsonify({"error": "Product not found"}), 404
+        db.commit()
+
+        return json_response(result)
+    except ValidationError as e:
+        return jsonify({"error": "Validation Error", "details": e.errors()}), 400
+    except ValueError as e:
+        db.rollback()
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        db.rollback()
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+    finally:
+        db.close()
+
 @menu_bp.route('/products', methods=['GET'])
 @auth_required()
+@conditional_get("products", "categories")
 def get_products():
     """
     List products (optionally filtered by category)
@@ -182,7 +262,115 @@ def get_products():
         service = MenuService(category_repo, product_repo)
         
         results = service.get_products(g.tenant_id, category_id)
-        return jsonify(results), 200
+        return json_response(results)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": "Internal Server Error"}), 500
+    finally:
+        db.close()
+
+
+@menu_bp.route('/search', methods=['GET'])
+@auth_required()
+def search_products():
+    """
+    Search products by name, description and meaning
+    ---
+    tags:
+      - Menu
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: query
+        name: q
+        type: string
+        required: true
+        description: Accents and typos are tolerated ("pho bo" finds "Phở bò")
+      - in: query
+        name: page
+        type: integer
+        default: 1
+      - in: query
+        name: page_size
+        type: integer
+        default: 20
+      - in: query
+        name: include_unavailable
+        type: boolean
+        default: false
+        description: Staff only
+    responses:
+      200:
+        description: Products ranked by fused full-text, fuzzy and semantic relevance
+      400:
+        description: Missing query
+    """
+    query = (request.args.get('q') or '').strip()
+    if not query:
+        return jsonify({"error": "q is required"}), 400
+    include_unavailable = (
+        request.args.get('include_unavailable', 'false').lower() == 'true'
+        and g.role in ('OWNER', 'STAFF', 'SYS_ADMIN')
+    )
+    db = next(get_db())
+    try:
+        versions = EmbeddingVersionService(EmbeddingVersionRepository(db), cache=get_cache_service())
+        service = MenuSearchService(ProductRepository(db), versions.embedding_service(), get_cache_service())
+        result = service.search(
+            g.tenant_id, query,
+            page=request.args.get('page', 1, type=int),
+            page_size=request.args.get('page_size', 20, type=int),
+            available_only=not include_unavailable
+        )
+        return json_response(result)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": "Internal Server Error"}), 500
+    finally:
+        db.close()
+
+
+@menu_bp.route('/autocomplete', methods=['GET'])
+@auth_required()
+def autocomplete():
+    """
+    Suggest products and categories as a dish name is typed
+    ---
+    tags:
+      - Menu
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: query
+        name: q
+        type: string
+        required: true
+        description: What has been typed so far; accents are optional
+      - in: query
+        name: limit
+        type: integer
+        default: 10
+    responses:
+      200:
+        description: >
+          Names starting with q, or with a word starting with q; matches at
+          the start first, then the most ordered
+    """
+    prefix = request.args.get('q', '')
+    limit = max(1, min(request.args.get('limit', 10, type=int), 10))
+    # The session only connects if the index has to be built
+    db = next(get_db())
+    try:
+        service = TypeaheadService(
+            get_typeahead_store(), ProductRepository(db), CategoryRepository(db), OrderItemRepository(db)
+        )
+        return json_response(service.suggest(g.tenant_id, prefix, limit))
     except Exception as e:
         import traceback
         traceback.print_exc()
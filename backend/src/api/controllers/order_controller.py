@@ -2,9 +2,11 @@ from flask import Blueprint, request, jsonify, g
 from pydantic import ValidationError
 from ..schemas.order_schema import CreateOrderRequest, UpdateOrderStatusRequest, AddOrderItemRequest
 from ..middleware import auth_required
+from ...query_budget import query_budget
+from ..responses import json_response
 from ...services.order_service import OrderService
 from ...infrastructure.databases.postgres import get_db
-from ...infrastructure.repositories import OrderRepository, OrderItemRepository
+from ...infrastructure.repositories import OrderRepository, OrderItemRepository, OutboxRepository
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,7 @@ order_bp = Blueprint("orders", __name__, url_prefix="/orders")
 
 @order_bp.route("", methods=["GET"])
 @auth_required()
+@query_budget(1)
 def get_orders():
     """
     Get all orders for current tenant
@@ -53,7 +56,7 @@ def get_orders():
         else:
             orders = service.get_orders_by_tenant(g.tenant_id)
         
-        return jsonify({"orders": orders}), 200
+        return json_response({"orders": orders})
     except Exception as e:
         logger.error(f"Get orders error: {e}")
         return jsonify({"error": str(e)}), 500
@@ -61,8 +64,56 @@ def get_orders():
         db.close()
 
 
+@order_bp.route("/kitchen-board/<branch_id>", methods=["GET"])
+@auth_required(roles=['OWNER', 'STAFF', 'SYS_ADMIN'])
+@query_budget(2)
+def get_kitchen_board(branch_id):
+    """
+    Get open orders of a branch with their items (kitchen board)
+    ---
+    tags:
+      - Orders
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: path
+        name: branch_id
+        type: string
+        required: true
+      - in: query
+        name: status
+        type: string
+        description: Comma-separated order statuses (default PENDING,CONFIRMED,PREPARING,READY,SERVED)
+    responses:
+      200:
+        description: Orders with items, oldest first
+      400:
+        description: Invalid status
+    """
+    db = next(get_db())
+    try:
+        status = request.args.get('status')
+        statuses = [s.strip().upper() for s in status.split(',') if s.strip()] if status else None
+        
+        order_repo = OrderRepository(db)
+        service = OrderService(order_repo)
+        
+        orders = service.get_kitchen_board(g.tenant_id, branch_id, statuses)
+        return jsonify({"branch_id": branch_id, "orders": orders}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Get kitchen board error: {e}")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        db.close()
+
+
 @order_bp.route("/<order_id>", methods=["GET"])
 @auth_required()
+@query_budget(2)
 def get_order(order_id):
     """
     Get order by ID with items
@@ -87,8 +138,7 @@ def get_order(order_id):
     db = next(get_db())
     try:
         order_repo = OrderRepository(db)
-        order_item_repo = OrderItemRepository(db)
-        service = OrderService(order_repo, order_item_repo)
+        service = OrderService(order_repo)
         
         order = service.get_order(order_id)
         if not order:
@@ -194,7 +244,7 @@ def update_order_status(order_id):
         req = UpdateOrderStatusRequest(**data)
         
         order_repo = OrderRepository(db)
-        service = OrderService(order_repo)
+        service = OrderService(order_repo, outbox=OutboxRepository(db))
         
         result = service.update_order_status(order_id, req.status)
         db.commit()
@@ -6,9 +6,12 @@ from ..schemas.order_item_schema import (
     UpdateOrderItemStatusRequest
 )
 from ..middleware import auth_required
+from ...query_budget import query_budget
+from ..responses import json_response
 from ...services.order_item_service import OrderItemService
 from ...infrastructure.databases.postgres import get_db
 from ...infrastructure.repositories.order_item_repository import OrderItemRepository
+from ...infrastructure.repositories.order_repository import OrderRepository
 import logging
 
 logger = logging.getLogger(__name__)
@@ -57,6 +60,7 @@ def get_order_item(order_item_id):
 
 @order_item_bp.route("/by-order/<order_id>", methods=["GET"])
 @auth_required()
+@query_budget(1)
 def get_order_items_by_order(order_id):
     """
     Get all items for an order
@@ -91,7 +95,7 @@ def get_order_items_by_order(order_id):
         else:
             items = service.get_order_items_by_order(order_id)
         
-        return jsonify({"order_items": items}), 200
+        return json_response({"order_items": items})
     except Exception as e:
         logger.error(f"Get order items error: {e}")
         return jsonify({"error": str(e)}), 500
@@ -143,7 +147,7 @@ def create_order_item():
         req = CreateOrderItemRequest(**data)
         
         repo = OrderItemRepository(db)
-        service = OrderItemService(repo)
+        service = OrderItemService(repo, OrderRepository(db))
         
         result = service.create_order_item(g.tenant_id, req.model_dump())
         db.commit()
@@ -200,7 +204,7 @@ def update_order_item(order_item_id):
         req = UpdateOrderItemRequest(**data)
         
         repo = OrderItemRepository(db)
-        service = OrderItemService(repo)
+        service = OrderItemService(repo, OrderRepository(db))
         
         result = service.update_order_item(order_item_id, req.model_dump(exclude_unset=True))
         db.commit()
@@ -259,7 +263,7 @@ def update_order_item_status(order_item_id):
         req = UpdateOrderItemStatusRequest(**data)
         
         repo = OrderItemRepository(db)
-        service = OrderItemService(repo)
+        service = OrderItemService(repo, OrderRepository(db))
         
         result = service.update_status(order_item_id, req.item_status.value)
         db.commit()
@@ -305,7 +309,7 @@ def delete_order_item(order_item_id):
     db = next(get_db())
     try:
         repo = OrderItemRepository(db)
-        service = OrderItemService(repo)
+        service = OrderItemService(repo, OrderRepository(db))
         
         deleted = service.delete_order_item(order_item_id)
         db.commit()
@@ -347,7 +351,7 @@ def mark_cooking(order_item_id):
     db = next(get_db())
     try:
         repo = OrderItemRepository(db)
-        service = OrderItemService(repo)
+        service = OrderItemService(repo, OrderRepository(db))
         
         result = service.mark_cooking(order_item_id)
         db.commit()
@@ -389,7 +393,7 @@ def mark_ready(order_item_id):
     db = next(get_db())
     try:
         repo = OrderItemRepository(db)
-        service = OrderItemService(repo)
+        service = OrderItemService(repo, OrderRepository(db))
         
         result = service.mark_ready(order_item_id)
         db.commit()
@@ -430,7 +434,7 @@ def mark_served(order_item_id):
     db = next(get_db())
     try:
         repo = OrderItemRepository(db)
-        service = OrderItemService(repo)
+        service = OrderItemService(repo, OrderRepository(db))
         
         result = service.mark_served(order_item_id)
         db.commit()
@@ -471,7 +475,7 @@ def cancel_order_item(order_item_id):
     db = next(get_db())
     try:
         repo = OrderItemRepository(db)
-        service = OrderItemService(repo)
+        service = OrderItemService(repo, OrderRepository(db))
         
         result = service.cancel_order_item(order_item_id)
         db.commit()
@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify, g
 from pydantic import ValidationError
 from ..schemas.promotion_schema import CreatePromotionRequest, UpdatePromotionRequest, ApplyPromotionRequest
-from ..middleware import auth_required
+from ..middleware import auth_required, conditional_get
 from ...services.promotion_service import PromotionService
 from ...infrastructure.databases.postgres import get_db
 from ...infrastructure.repositories import PromotionRepository
@@ -14,6 +14,8 @@ promotion_bp = Blueprint("promotions", __name__, url_prefix="/promotions")
 
 @promotion_bp.route("", methods=["GET"])
 @auth_required()
+# Active promotions depend on the clock, not only on writes
+@conditional_get("promotions", window=60)
 def get_promotions():
     """
     Get all promotions for current tenant
@@ -247,7 +247,10 @@ def get_qr_image(qr_type, entity_id):
         
         if qr_type == "table":
             branch_id = request.args.get('branch_id', '')
-            result = service.generate_table_qr(tenant_id, branch_id, entity_id)
+            image_data = service.get_table_qr_png(tenant_id, branch_id, entity_id)
+            if image_data is None:
+                return jsonify({"error": "QR code generation failed"}), 500
+            return Response(image_data, mimetype='image/png')
         elif qr_type == "restaurant":
             result = service.generate_restaurant_qr(tenant_id, entity_id)
         else:
@@ -5,6 +5,16 @@ from ..middleware import auth_required
 from ...services.recommendation_service import RecommendationService
 from ...infrastructure.services.embedding_service import EmbeddingService
 from ...infrastructure.repositories.vector_repository import VectorRepository
+from ...infrastructure.repositories.product_repository import ProductRepository
+from ...infrastructure.repositories.customer_repository import CustomerRepository
+from ...infrastructure.services.cache_service import get_cache_service
+from ...infrastructure.services.cooccurrence_store import get_cooccurrence_store
+from ...infrastructure.services.popularity_store import get_popularity_store
+from ...infrastructure.services.job_queue import get_job_queue
+from ...services.taste_service import TasteService
+from ...services.embedding_version_service import EmbeddingVersionService
+from ...infrastructure.repositories.embedding_version_repository import EmbeddingVersionRepository
+from ..responses import json_response
 from ...infrastructure.databases.postgres import get_db
 import logging
 
@@ -159,17 +169,13 @@ def get_similar_products(product_id):
     try:
         top_k = request.args.get('top_k', 5, type=int)
         
-        vector_repo = VectorRepository(db)
-        embed_service = EmbeddingService()
-        
-        # Get the product embedding (in production, this would come from the database)
-        # For now, we'll create an embedding from the product_id as a placeholder
-        product_embedding = embed_service.create_embedding(f"product:{product_id}")
-        
-        service = RecommendationService(vector_repo, embed_service)
-        result = service.get_similar_products(product_id, product_embedding, top_k)
+        version = EmbeddingVersionService(EmbeddingVersionRepository(db), cache=get_cache_service()).active()
+        service = RecommendationService(
+            VectorRepository(db), product_repo=ProductRepository(db), embedding_version=version
+        )
+        result = service.get_similar_products(g.tenant_id, product_id, top_k)
         
-        return jsonify(result), 200
+        return json_response(result)
     except Exception as e:
         logger.error(f"Similar products error: {e}")
         return jsonify({"error": str(e), "similar_products": []}), 200
@@ -177,11 +183,117 @@ def get_similar_products(product_id):
         db.close()
 
 
+@recommendation_bp.route("/frequently-ordered-together/<product_id>", methods=["GET"])
+@auth_required()
+def get_frequently_ordered_together(product_id):
+    """
+    Get products most often ordered together with a given product
+    ---
+    tags:
+      - AI Recommendations
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: path
+        name: product_id
+        type: string
+        required: true
+      - in: query
+        name: top_k
+        type: integer
+        default: 5
+    responses:
+      200:
+        description: >
+          Available products ranked by co-occurrence score. Empty until the
+          tenant's model has been built (queued by the first request).
+    """
+    db = next(get_db())
+    
+    try:
+        top_k = request.args.get('top_k', 5, type=int)
+        
+        service = RecommendationService(
+            VectorRepository(db), product_repo=ProductRepository(db),
+            cooccurrence_store=get_cooccurrence_store(), job_queue=get_job_queue()
+        )
+        result = service.get_frequently_ordered_together(g.tenant_id, product_id, top_k)
+        
+        return json_response(result)
+    except Exception as e:
+        logger.error(f"Frequently ordered together error: {e}")
+        return jsonify({"error": str(e), "products": []}), 200
+    finally:
+        db.close()
+
+
+@recommendation_bp.route("/popular", methods=["GET"])
+@auth_required()
+def get_popular_products():
+    """
+    Get a branch's most ordered products
+    ---
+    tags:
+      - AI Recommendations
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: query
+        name: branch_id
+        type: string
+        required: true
+      - in: query
+        name: window
+        type: string
+        enum: [popular, trending]
+        default: trending
+        description: popular decays over a week, trending over hours
+      - in: query
+        name: top_k
+        type: integer
+        default: 10
+    responses:
+      200:
+        description: >
+          Available products ranked by time-decayed order quantity. Empty until
+          the branch's rankings have been computed (queued by the first request).
+      400:
+        description: Missing branch_id or unknown window
+    """
+    branch_id = request.args.get('branch_id')
+    if not branch_id:
+        return jsonify({"error": "branch_id is required"}), 400
+    db = next(get_db())
+    
+    try:
+        window = request.args.get('window', 'trending')
+        top_k = max(1, min(request.args.get('top_k', 10, type=int), 50))
+        
+        service = RecommendationService(
+            VectorRepository(db), product_repo=ProductRepository(db),
+            job_queue=get_job_queue(), popularity_store=get_popularity_store()
+        )
+        result = service.get_popular_products(g.tenant_id, branch_id, window, top_k)
+        
+        return json_response(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Popular products error: {e}")
+        return jsonify({"error": str(e), "products": []}), 200
+    finally:
+        db.close()
+
+
 @recommendation_bp.route("/personalized", methods=["GET"])
 @auth_required()
 def get_personalized_recommendations():
     """
-    Get personalized recommendations for current user
+    Get personalized recommendations for a customer, from the products they ordered
     ---
     tags:
       - AI Recommendations
@@ -190,30 +302,42 @@ def get_personalized_recommendations():
         name: Authorization
         type: string
         required: true
+      - in: query
+        name: customer_id
+        type: string
+        description: Staff only; customers always get their own recommendations
       - in: query
         name: top_k
         type: integer
         default: 10
     responses:
       200:
-        description: Personalized recommendations
+        description: >
+          Products closest to the customer's taste vector. Empty until the
+          customer has completed an order.
+      404:
+        description: Customer not found
     """
     db = next(get_db())
     
     try:
-        top_k = request.args.get('top_k', 10, type=int)
+        top_k = max(1, min(request.args.get('top_k', 10, type=int), 50))
         
-        vector_repo = VectorRepository(db)
-        embed_service = EmbeddingService()
-        
-        # Create a user preference embedding (in production, this would be based on user history)
-        # For now, we use the user_id to create a deterministic embedding
-        user_preference = embed_service.create_embedding(f"user:{g.user_id}")
+        customer_repo = CustomerRepository(db)
+        customer_id = request.args.get('customer_id') if g.role != 'CUSTOMER' else None
+        if not customer_id:
+            customer_id = customer_repo.get_id_for_user(g.tenant_id, g.user_id)
+            if not customer_id:
+                return jsonify({"error": "Customer not found"}), 404
         
-        service = RecommendationService(vector_repo, embed_service)
-        result = service.get_personalized_recommendations(user_preference, top_k)
+        version = EmbeddingVersionService(EmbeddingVersionRepository(db), cache=get_cache_service()).active()
+        service = RecommendationService(
+            VectorRepository(db), product_repo=ProductRepository(db), embedding_version=version,
+            taste_service=TasteService(customer_repo, cache=get_cache_service(), embedding_version=version)
+        )
+        result = service.get_personalized_recommendations(g.tenant_id, customer_id, top_k)
         
-        return jsonify(result), 200
+        return json_response(result)
     except Exception as e:
         logger.error(f"Personalized recommendation error: {e}")
         return jsonify({"error": str(e), "personalized_recommendations": []}), 200
@@ -1,10 +1,13 @@
+from datetime import date, time
 from flask import Blueprint, request, jsonify, g
 from pydantic import ValidationError
 from ..schemas.reservation_schema import CreateReservationRequest, UpdateReservationRequest, UpdateReservationStatusRequest
 from ..middleware import auth_required
+from ...query_budget import query_budget
 from ...services.reservation_service import ReservationService
 from ...infrastructure.databases.postgres import get_db
-from ...infrastructure.repositories import ReservationRepository
+from ...infrastructure.repositories import ReservationRepository, TableRepository, BranchRepository
+from ...domain.exceptions import ReservationConflictException, ResourceNotFoundException
 import logging
 
 logger = logging.getLogger(__name__)
@@ -53,6 +56,86 @@ def get_reservations():
         db.close()
 
 
+@reservation_bp.route("/availability", methods=["GET"])
+@auth_required()
+@query_budget(3)
+def get_availability():
+    """
+    Get bookable slots for a party at a branch
+    ---
+    tags:
+      - Reservations
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: query
+        name: branch_id
+        type: string
+        required: true
+      - in: query
+        name: date
+        type: string
+        required: true
+        description: First day (YYYY-MM-DD)
+      - in: query
+        name: party_size
+        type: integer
+        default: 2
+      - in: query
+        name: days
+        type: integer
+        default: 1
+        description: Number of days to search (max 31)
+      - in: query
+        name: duration_minutes
+        type: integer
+        default: 90
+      - in: query
+        name: open
+        type: string
+        description: Opening time HH:MM (default 10:00)
+      - in: query
+        name: close
+        type: string
+        description: Closing time HH:MM (default 22:00)
+    responses:
+      200:
+        description: Available slots per day, each with the best-fitting table
+      400:
+        description: Invalid parameters
+      404:
+        description: Branch not found
+    """
+    db = next(get_db())
+    try:
+        branch_id = request.args.get('branch_id')
+        if not branch_id or not request.args.get('date'):
+            return jsonify({"error": "branch_id and date are required"}), 400
+        start_date = date.fromisoformat(request.args['date'])
+        party_size = int(request.args.get('party_size', 2))
+        days = int(request.args.get('days', 1))
+        duration_minutes = int(request.args.get('duration_minutes', 90))
+        opening = time.fromisoformat(request.args['open']) if request.args.get('open') else None
+        closing = time.fromisoformat(request.args['close']) if request.args.get('close') else None
+
+        service = ReservationService(ReservationRepository(db), TableRepository(db), BranchRepository(db))
+        availability = service.get_availability(
+            g.tenant_id, branch_id, start_date, party_size, days, duration_minutes, opening, closing
+        )
+        return jsonify({"branch_id": branch_id, "party_size": party_size, "availability": availability}), 200
+    except ResourceNotFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Get availability error: {e}")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        db.close()
+
+
 @reservation_bp.route("/<reservation_id>", methods=["GET"])
 @auth_required()
 def get_reservation(reservation_id):
@@ -151,9 +234,19 @@ def create_reservation():
               description: ISO format datetime
             party_size:
               type: integer
+            table_id:
+              type: string
+              description: Specific table; best fit is chosen when omitted
+            duration_minutes:
+              type: integer
+              default: 90
     responses:
       201:
         description: Reservation created
+      404:
+        description: Branch not found
+      409:
+        description: No table available at the requested time
     """
     data = request.get_json()
     db = next(get_db())
@@ -161,7 +254,7 @@ def create_reservation():
         req = CreateReservationRequest(**data)
         
         reservation_repo = ReservationRepository(db)
-        service = ReservationService(reservation_repo)
+        service = ReservationService(reservation_repo, TableRepository(db), BranchRepository(db))
         
         result = service.create_reservation(g.tenant_id, req.branch_id, g.user_id, req.model_dump())
         db.commit()
@@ -170,6 +263,12 @@ def create_reservation():
     except ValidationError as e:
         db.rollback()
         return jsonify({"error": "Validation Error", "details": e.errors()}), 400
+    except ResourceNotFoundException as e:
+        db.rollback()
+        return jsonify({"error": str(e)}), 404
+    except ReservationConflictException as e:
+        db.rollback()
+        return jsonify({"error": str(e)}), 409
     except Exception as e:
         db.rollback()
         logger.error(f"Create reservation error: {e}")
@@ -204,9 +303,15 @@ def update_reservation(reservation_id):
               type: string
             party_size:
               type: integer
+            table_id:
+              type: string
+            duration_minutes:
+              type: integer
     responses:
       200:
         description: Reservation updated
+      409:
+        description: No table available at the requested time
     """
     data = request.get_json()
     db = next(get_db())
@@ -214,7 +319,7 @@ def update_reservation(reservation_id):
         req = UpdateReservationRequest(**data)
         
         reservation_repo = ReservationRepository(db)
-        service = ReservationService(reservation_repo)
+        service = ReservationService(reservation_repo, TableRepository(db))
         
         result = service.update_reservation(reservation_id, req.model_dump(exclude_unset=True))
         db.commit()
@@ -223,6 +328,9 @@ def update_reservation(reservation_id):
     except ValidationError as e:
         db.rollback()
         return jsonify({"error": "Validation Error", "details": e.errors()}), 400
+    except ReservationConflictException as e:
+        db.rollback()
+        return jsonify({"error": str(e)}), 409
     except ValueError as e:
         db.rollback()
         return jsonify({"error": str(e)}), 404
@@ -279,6 +387,9 @@ def update_reservation_status(reservation_id):
     except ValidationError as e:
         db.rollback()
         return jsonify({"error": "Validation Error", "details": e.errors()}), 400
+    except ReservationConflictException as e:
+        db.rollback()
+        return jsonify({"error": str(e)}), 409
     except ValueError as e:
         db.rollback()
         return jsonify({"error": str(e)}), 404
@@ -0,0 +1,151 @@
+from flask import Blueprint, request, jsonify, g
+from ..middleware import auth_required
+from ...query_budget import query_budget
+from ..responses import json_response
+from ...services.sync_service import SyncService, DEFAULT_PAGE_SIZE
+from ...infrastructure.databases.postgres import get_db
+from ...infrastructure.repositories import (
+    SyncRepository, ProductRepository, CategoryRepository, TableRepository, OrderRepository
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+sync_bp = Blueprint("sync", __name__, url_prefix="/sync")
+
+
+def _sync_args():
+    return request.args.get('since', type=int), request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+
+
+@sync_bp.route("/menu", methods=["GET"])
+@auth_required()
+@query_budget(5)
+def sync_menu():
+    """
+    Delta sync of the menu (categories and products)
+    ---
+    tags:
+      - Sync
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: query
+        name: since
+        type: integer
+        description: Version returned by the previous sync; omit for a full sync
+      - in: query
+        name: limit
+        type: integer
+        description: Maximum changes per response (default 500); has_more asks for another call
+    responses:
+      200:
+        description: >
+          New version, changed rows and removed IDs per resource. When "full" is
+          true, "changes" holds every row and replaces the client's copy.
+    """
+    db = next(get_db())
+    try:
+        since, limit = _sync_args()
+        service = SyncService(SyncRepository(db), product_repo=ProductRepository(db), category_repo=CategoryRepository(db))
+        return json_response(service.get_menu(g.tenant_id, since, limit))
+    except Exception as e:
+        logger.error(f"Sync menu error: {e}")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        db.close()
+
+
+@sync_bp.route("/tables", methods=["GET"])
+@auth_required()
+@query_budget(4)
+def sync_tables():
+    """
+    Delta sync of tables
+    ---
+    tags:
+      - Sync
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: query
+        name: since
+        type: integer
+        description: Version returned by the previous sync; omit for a full sync
+      - in: query
+        name: branch_id
+        type: string
+        description: Only tables of this branch
+      - in: query
+        name: limit
+        type: integer
+        description: Maximum changes per response (default 500)
+    responses:
+      200:
+        description: New version, changed tables and removed table IDs
+    """
+    db = next(get_db())
+    try:
+        since, limit = _sync_args()
+        service = SyncService(SyncRepository(db), table_repo=TableRepository(db))
+        return json_response(service.get_tables(g.tenant_id, since, request.args.get('branch_id'), limit))
+    except Exception as e:
+        logger.error(f"Sync tables error: {e}")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        db.close()
+
+
+@sync_bp.route("/orders", methods=["GET"])
+@auth_required()
+@query_budget(5)
+def sync_open_orders():
+    """
+    Delta sync of open orders with their items
+    ---
+    tags:
+      - Sync
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: query
+        name: since
+        type: integer
+        description: Version returned by the previous sync; omit for a full sync
+      - in: query
+        name: branch_id
+        type: string
+        description: Only orders of this branch
+      - in: query
+        name: table_id
+        type: string
+        description: Only orders of this table (guest app)
+      - in: query
+        name: limit
+        type: integer
+        description: Maximum changes per response (default 500)
+    responses:
+      200:
+        description: >
+          New version, changed open orders and removed order IDs (deleted,
+          completed or cancelled since)
+    """
+    db = next(get_db())
+    try:
+        since, limit = _sync_args()
+        service = SyncService(SyncRepository(db), order_repo=OrderRepository(db))
+        orders = service.get_open_orders(
+            g.tenant_id, since, request.args.get('branch_id'), request.args.get('table_id'), limit
+        )
+        return json_response(orders)
+    except Exception as e:
+        logger.error(f"Sync orders error: {e}")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        db.close()
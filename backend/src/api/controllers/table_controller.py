@@ -1,10 +1,14 @@
 from flask import Blueprint, request, jsonify, g
 from pydantic import ValidationError
 from ..schemas.table_schema import CreateTableRequest, UpdateTableRequest, UpdateTableStatusRequest
-from ..middleware import auth_required
+from ..middleware import auth_required, conditional_get
+from ...query_budget import query_budget
+from ..responses import json_response
 from ...services.table_service import TableService
+from ...services.table_board_service import TableBoardService
 from ...infrastructure.databases.postgres import get_db
-from ...infrastructure.repositories import TableRepository
+from ...infrastructure.repositories import TableRepository, OutboxRepository
+from ...infrastructure.services import get_table_board, get_table_status_writer, get_realtime_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,8 +16,15 @@ logger = logging.getLogger(__name__)
 table_bp = Blueprint("tables", __name__, url_prefix="/tables")
 
 
+def _board_service(db) -> TableBoardService:
+    return TableBoardService(
+        TableRepository(db), get_table_board(), get_table_status_writer(), get_realtime_service()
+    )
+
+
 @table_bp.route("", methods=["GET"])
 @auth_required()
+@conditional_get("tables")
 def get_tables():
     """
     Get all tables for current tenant
@@ -46,13 +57,13 @@ def get_tables():
         service = TableService(table_repo)
         
         if branch_id:
-            tables = service.get_tables_by_branch(branch_id)
+            tables = service.get_tables_by_branch(g.tenant_id, branch_id)
         elif status and status.upper() == 'AVAILABLE':
             tables = service.get_available_tables(g.tenant_id)
         else:
             tables = service.get_tables_by_tenant(g.tenant_id)
         
-        return jsonify({"tables": tables}), 200
+        return json_response({"tables": tables})
     except Exception as e:
         logger.error(f"Get tables error: {e}")
         return jsonify({"error": str(e)}), 500
@@ -60,6 +71,44 @@ def get_tables():
         db.close()
 
 
+@table_bp.route("/board/<branch_id>", methods=["GET"])
+@auth_required()
+@query_budget(1)
+def get_table_board_view(branch_id):
+    """
+    Live table board for a branch (host stand)
+    ---
+    tags:
+      - Tables
+    parameters:
+      - in: header
+        name: Authorization
+        type: string
+        required: true
+      - in: path
+        name: branch_id
+        type: string
+        required: true
+      - in: query
+        name: since
+        type: integer
+        description: Last version seen; only tables changed after it are returned
+    responses:
+      200:
+        description: Board version and tables (full board when "full" is true)
+    """
+    db = next(get_db())
+    try:
+        since = request.args.get('since', type=int)
+        board = _board_service(db).get_board(branch_id, since)
+        return json_response(board)
+    except Exception as e:
+        logger.error(f"Get table board error: {e}")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        db.close()
+
+
 @table_bp.route("/<table_id>", methods=["GET"])
 @auth_required()
 def get_table(table_id):
@@ -124,6 +173,9 @@ def create_table():
               type: string
             name:
               type: string
+            seats:
+              type: integer
+              default: 4
     responses:
       201:
         description: Table created
@@ -134,10 +186,11 @@ def create_table():
         req = CreateTableRequest(**data)
         
         table_repo = TableRepository(db)
-        service = TableService(table_repo)
+        service = TableService(table_repo, OutboxRepository(db))
         
         result = service.create_table(g.tenant_id, req.branch_id, req.model_dump())
         db.commit()
+        _board_service(db).invalidate(result['branch_id'])
         
         return jsonify(result), 201
     except ValidationError as e:
@@ -175,6 +228,8 @@ def update_table(table_id):
           properties:
             name:
               type: string
+            seats:
+              type: integer
     responses:
       200:
         description: Table updated
@@ -189,6 +244,7 @@ def update_table(table_id):
         
         result = service.update_table(table_id, req.model_dump(exclude_unset=True))
         db.commit()
+        _board_service(db).invalidate(result['branch_id'])
         
         return jsonify(result), 200
     except ValidationError as e:
@@ -241,11 +297,8 @@ def update_table_status(table_id):
     try:
         req = UpdateTableStatusRequest(**data)
         
-        table_repo = TableRepository(db)
-        service = TableService(table_repo)
-        
-        result = service.update_table_status(table_id, req.status)
-        db.commit()
+        # Served from the table board; the database write happens in the background
+        result = _board_service(db).update_status(table_id, req.status.upper())
         
         return jsonify(result), 200
     except ValidationError as e:
@@ -329,6 +382,8 @@ def delete_table(table_id):
         
         deleted = service.delete_table(table_id)
         db.commit()
+        if deleted:
+            _board_service(db).invalidate_table(table_id)
         
         if deleted:
             return jsonify({"message": "Table deleted"}), 200
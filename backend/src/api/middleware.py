@@ -1,7 +1,11 @@
+import time
+import hashlib
 from functools import wraps
-from flask import request, jsonify, g
+from flask import request, jsonify, g, make_response
 import jwt
 from ..config import Config
+from ..compression import etag_variants
+from ..infrastructure.services.data_version_store import get_data_versions
 
 def auth_required(roles=None):
     def decorator(f):
@@ -35,3 +39,64 @@ def auth_required(roles=None):
             return f(*args, **kwargs)
         return decorated_function
     return decorator
+
+
+# Bump when a conditional endpoint's response shape changes, so ETags
+# handed out by the previous release stop validating
+ETAG_SCHEMA = "1"
+
+
+def conditional_get(*resources, window=None):
+    """
+    ETag / If-None-Match for tenant-scoped read endpoints.
+    Goes below auth_required (needs g.tenant_id).
+
+    The ETag is derived from the tenant's data versions of `resources`
+    (table names, see data_version_store) and the request path, so a
+    matching If-None-Match gets a 304 before the view, and its query, runs.
+    `window` (seconds) also rolls the ETag over time, for responses that
+    depend on the clock (e.g. active promotions). Without data versions
+    (Redis down) the ETag is a hash of the response body instead.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            version = get_data_versions().current(g.tenant_id, resources)
+            etag = None
+            if version is not None:
+                bucket = int(time.time() // window) if window else ""
+                key = f"{ETAG_SCHEMA}|{g.tenant_id}|{request.full_path}|{version}|{bucket}"
+                etag = hashlib.sha1(key.encode()).hexdigest()
+                matched = _matching_etag(etag)
+                if matched:
+                    return _not_modified(matched)
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            if etag is None:
+                etag = hashlib.sha1(response.get_data()).hexdigest()
+                matched = _matching_etag(etag)
+                if matched:
+                    return _not_modified(matched)
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return decorated_function
+    return decorator
+
+
+def _matching_etag(etag):
+    """The form of `etag` (identity or per-encoding) the client sent, if any"""
+    for variant in etag_variants(etag):
+        if request.if_none_match.contains(variant):
+            return variant
+    return None
+
+
+def _not_modified(etag):
+    response = make_response("", 304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
@@ -1,5 +1,14 @@
-from flask import jsonify
-from datetime import datetime
+import json
+import uuid
+from enum import Enum
+from flask import jsonify, Response
+from datetime import datetime, date
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 def success_response(data=None, code=200, message="Success"):
@@ -66,3 +75,35 @@ def paginated_response(items, total, page, per_page, code=200):
         "timestamp": datetime.utcnow().isoformat()
     }
     return jsonify(response), code
+
+
+def _json_default(value):
+    """Encode the column types returned by row queries like orjson does"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data) -> bytes:
+    """Serialize data to JSON bytes, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(data, code=200):
+    """
+    Return a JSON response for raw row data
+    
+    Unlike jsonify, values may be UUIDs, datetimes and enums straight from
+    the database; they are encoded without an intermediate dict pass.
+    
+    Args:
+        data: Response data (dicts/lists of database row values)
+        code: HTTP status code
+    """
+    return Response(dumps(data), status=code, mimetype="application/json")
@@ -15,6 +15,7 @@ from .controllers.staff_controller import staff_bp
 from .controllers.user_controller import user_bp
 from .controllers.category_controller import category_bp
 from .controllers.order_item_controller import order_item_bp
+from .controllers.sync_controller import sync_bp
 from .controllers.chatbot_controller import chatbot_bp
 from .controllers.recommendation_controller import recommendation_bp
 from .controllers.qrcode_controller import qrcode_bp
@@ -38,6 +39,7 @@ api_bp.register_blueprint(staff_bp)
 api_bp.register_blueprint(user_bp)
 api_bp.register_blueprint(category_bp)
 api_bp.register_blueprint(order_item_bp)
+api_bp.register_blueprint(sync_bp)
 
 # Register Controllers - AI Features
 api_bp.register_blueprint(chatbot_bp)
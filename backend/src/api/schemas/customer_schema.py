@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 
 
 class CreateCustomerRequest(BaseModel):
@@ -18,7 +18,13 @@ class RedeemLoyaltyPointsRequest(BaseModel):
     points: int = Field(..., gt=0, description="Number of points to redeem")
 
 
+class AccrueLoyaltyPointsRequest(BaseModel):
+    order_ids: List[str] = Field(..., min_length=1, max_length=10000, description="Completed order IDs to accrue points for")
+    points_rate: float = Field(0.1, gt=0, description="Base points earned per currency unit spent")
+
+
 class CustomerResponse(BaseModel):
     user_id: str
     phone_number: Optional[str]
     loyalty_points: int
+    membership_tier: str
@@ -22,6 +22,13 @@ class CreateProductRequest(BaseModel):
     description: Optional[str] = None
     is_available: bool = True
 
+class UpdateProductRequest(BaseModel):
+    category_id: Optional[UUID] = None
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    price: Optional[float] = Field(None, gt=0)
+    description: Optional[str] = None
+    is_available: Optional[bool] = None
+
 class ProductResponse(BaseModel):
     id: UUID
     tenant_id: UUID
@@ -2,16 +2,22 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
+from ...domain.constants import DEFAULT_RESERVATION_MINUTES, MAX_RESERVATION_MINUTES
+
 
 class CreateReservationRequest(BaseModel):
     branch_id: str
     booking_time: str = Field(..., description="ISO format datetime")
     party_size: int = Field(1, ge=1)
+    table_id: Optional[str] = Field(None, description="Specific table; best fit is chosen when omitted")
+    duration_minutes: int = Field(DEFAULT_RESERVATION_MINUTES, ge=15, le=MAX_RESERVATION_MINUTES)
 
 
 class UpdateReservationRequest(BaseModel):
     booking_time: Optional[str] = None
     party_size: Optional[int] = Field(None, ge=1)
+    table_id: Optional[str] = None
+    duration_minutes: Optional[int] = Field(None, ge=15, le=MAX_RESERVATION_MINUTES)
 
 
 class UpdateReservationStatusRequest(BaseModel):
@@ -25,5 +31,7 @@ class ReservationResponse(BaseModel):
     user_id: str
     booking_time: str
     party_size: int
+    table_id: Optional[str] = None
+    duration_minutes: int = DEFAULT_RESERVATION_MINUTES
     status: str
     created_at: Optional[str] = None
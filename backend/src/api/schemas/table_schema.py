@@ -5,10 +5,12 @@ from typing import Optional
 class CreateTableRequest(BaseModel):
     branch_id: str
     name: str = Field(..., min_length=1, max_length=50)
+    seats: int = Field(4, ge=1, le=50)
 
 
 class UpdateTableRequest(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=50)
+    seats: Optional[int] = Field(None, ge=1, le=50)
 
 
 class UpdateTableStatusRequest(BaseModel):
@@ -20,6 +22,7 @@ class TableResponse(BaseModel):
     tenant_id: str
     branch_id: str
     name: str
+    seats: int
     status: str
     qr_code_link: Optional[str] = None
     created_at: Optional[str] = None
@@ -2,20 +2,38 @@ import logging
 import logging.config
 import os
 
+from .infrastructure.services.metrics_service import get_metrics_service
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds the current request ID (or '-') to every log record"""
+
+    def filter(self, record):
+        stats = get_metrics_service().current()
+        record.request_id = stats.request_id if stats else "-"
+        return True
+
+
 def setup_logging(app):
     logging_config = {
         'version': 1,
         'disable_existing_loggers': False,
+        'filters': {
+            'request_id': {
+                '()': RequestIdFilter
+            },
+        },
         'formatters': {
             'standard': {
-                'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+                'format': '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
             },
         },
         'handlers': {
             'console': {
                 'level': 'DEBUG',
                 'class': 'logging.StreamHandler',
-                'formatter': 'standard'
+                'formatter': 'standard',
+                'filters': ['request_id']
             },
         },
         'root': {
@@ -0,0 +1,80 @@
+"""
+Response compression (brotli or gzip, negotiated from Accept-Encoding)
+
+Config (env):
+    COMPRESS_MIN_SIZE         bodies smaller than this are sent as is (default 1024 bytes)
+    COMPRESS_GZIP_LEVEL       gzip level (default 6)
+    COMPRESS_BROTLI_QUALITY   brotli quality (default 4; higher costs far more CPU)
+
+Brotli is used when the Brotli package is installed and the client
+prefers or ties it with gzip. A strong ETag gets a per-encoding suffix,
+because each encoding is a different representation; etag_variants()
+lists the forms a client may send back in If-None-Match.
+"""
+import os
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+ETAG_SUFFIXES = {"br": "-br", "gzip": "-gz"}
+
+_COMPRESSIBLE = ("application/json", "application/javascript", "image/svg+xml")
+
+
+def etag_variants(etag: str):
+    """The identity ETag and its per-encoding forms"""
+    return (etag, *(etag + suffix for suffix in ETAG_SUFFIXES.values()))
+
+
+def _negotiate(accept_encodings) -> str:
+    gzip_q = accept_encodings["gzip"]
+    br_q = accept_encodings["br"] if BROTLI_AVAILABLE else 0
+    if br_q and br_q >= gzip_q:
+        return "br"
+    return "gzip" if gzip_q else ""
+
+
+def _compressible(mimetype: str) -> bool:
+    return mimetype.startswith("text/") or mimetype in _COMPRESSIBLE
+
+
+def setup_compression(app):
+    min_size = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+    gzip_level = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+    brotli_quality = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+
+    @app.after_request
+    def compress_response(response):
+        if (
+            response.direct_passthrough
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or not _compressible(response.mimetype or "")
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+
+        encoding = _negotiate(request.accept_encodings)
+        if not encoding:
+            return response
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+
+        if encoding == "br":
+            response.set_data(brotli.compress(body, quality=brotli_quality))
+        else:
+            response.set_data(gzip.compress(body, compresslevel=gzip_level, mtime=0))
+        response.headers["Content-Encoding"] = encoding
+
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag + ETAG_SUFFIXES[encoding])
+        return response
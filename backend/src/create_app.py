@@ -1,3 +1,6 @@
+from time import perf_counter
+_IMPORT_STARTED = perf_counter()
+
 import os
 from flask import Flask, jsonify
 from .config import config
@@ -6,6 +9,12 @@ from .api.routes import api_bp
 from .cors import setup_cors
 from .error_handler import register_error_handlers
 from .app_logging import setup_logging
+from .instrumentation import setup_instrumentation
+from .compression import setup_compression
+from .docs import setup_docs
+
+# Time spent importing the app's module graph (Flask, SQLAlchemy, controllers)
+IMPORT_SECONDS = perf_counter() - _IMPORT_STARTED
 
 # Global service instances
 _cache_service = None
@@ -13,6 +22,7 @@ _realtime_service = None
 
 
 def create_app(config_name=None):
+    started = perf_counter()
     if config_name is None:
         config_name = os.getenv('FLASK_CONFIG', 'default')
 
@@ -22,45 +32,16 @@ def create_app(config_name=None):
     # Initialize core extensions
     setup_cors(app)
     setup_logging(app)
+    setup_instrumentation(app)
+    # Registered after instrumentation so response sizes are measured compressed
+    setup_compression(app)
     register_error_handlers(app)
 
     # Initialize infrastructure services
     _init_services(app)
 
-    # Swagger Configuration
-    from flasgger import Swagger
-    import json
-    
-    swagger_config_path = os.path.join(os.path.dirname(__file__), 'swagger_config.json')
-    try:
-        with open(swagger_config_path, 'r') as f:
-            template = json.load(f)
-    except FileNotFoundError:
-        template = {
-            "swagger": "2.0",
-            "info": {
-                "title": "S2O Platform API",
-                "version": "1.0.0",
-                "description": "API Documentation"
-            }
-        }
-
-    swagger_config = {
-        "headers": [],
-        "specs": [
-            {
-                "endpoint": "apispec",
-                "route": "/apispec.json",
-                "rule_filter": lambda rule: True,
-                "model_filter": lambda tag: True,
-            }
-        ],
-        "static_url_path": "/flasgger_static",
-        "swagger_ui": True,
-        "specs_route": "/docs"
-    }
-
-    Swagger(app, template=template, config=swagger_config)
+    # Swagger UI and spec (flasgger imported on first docs request)
+    setup_docs(app)
 
     # Register Blueprints
     app.register_blueprint(api_bp)
@@ -84,6 +65,14 @@ def create_app(config_name=None):
     def shutdown_session(exception=None):
         db_session.remove()
 
+    app.config['STARTUP_TIMINGS'] = {
+        "imports_ms": round(IMPORT_SECONDS * 1000, 1),
+        "create_app_ms": round((perf_counter() - started) * 1000, 1),
+    }
+    app.logger.info(
+        f"App created in {app.config['STARTUP_TIMINGS']['create_app_ms']}ms "
+        f"(module imports {app.config['STARTUP_TIMINGS']['imports_ms']}ms)"
+    )
     return app
 
 
@@ -98,6 +87,34 @@ def _init_services(app):
     except Exception as e:
         app.logger.warning(f"Cache service initialization failed: {e}")
     
+    # Per-tenant data versions behind conditional GETs; writes are tracked
+    # from every session, the Redis client connects on first use
+    from .infrastructure.services.data_version_store import install_session_hooks
+    install_session_hooks()
+
+    # Change versions and tombstones for delta sync, written on every commit
+    from .infrastructure.databases.change_log import install_change_log_hooks
+    install_change_log_hooks()
+
+    # Outbox jobs are pushed after commit; the queue (and any in-process
+    # workers) starts on the first push
+    from .infrastructure.services.job_queue import install_outbox_dispatch
+    install_outbox_dispatch()
+    
+    # Installed local embedding models are loaded once, here: under
+    # gunicorn's preload_app that is in the master, and the workers forked
+    # from it share the weights
+    try:
+        from .infrastructure.services.embedding_backends import preload_local_backends
+        from .infrastructure.services.embedding_service import EMBEDDING_MODELS
+        for model in preload_local_backends(EMBEDDING_MODELS.values()):
+            app.logger.info(f"Local embedding model {model} loaded")
+    except Exception as e:
+        app.logger.warning(f"Local embedding model preload failed: {e}")
+
+    # Table board (Redis hashes, in-memory fallback) connects on first use
+    # through get_table_board(), keeping the Redis probe out of worker boot
+    
     # Initialize Realtime Service (only if explicitly enabled)
     if os.getenv('ENABLE_REALTIME', 'false').lower() == 'true':
         try:
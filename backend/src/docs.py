@@ -0,0 +1,188 @@
+"""
+API documentation: Swagger UI at /docs and the spec at /apispec.json
+
+The routes are registered at boot, but flasgger (and jsonschema, mistune,
+yaml behind it) is only imported by the first docs request, so workers
+that never serve docs don't pay for it. The blueprint is named "flasgger"
+and serves flasgger's own templates and static files, so its UI renders
+unchanged.
+
+The spec is built once per process, from the view docstrings or from the
+file written by scripts/build_apispec.py (APISPEC_FILE), and kept only as
+serialized bytes plus a gzip copy, served with an ETag. With a prebuilt
+file flasgger is never imported, and the server may run with -OO, which
+drops the docstrings from memory altogether.
+
+Config: DOCS_UI_ENABLED, APISPEC_ENABLED, APISPEC_FILE (see config.py).
+"""
+import os
+import gzip
+import json
+import hashlib
+import logging
+import threading
+import importlib.util
+
+from flask import Blueprint, Response, current_app, redirect, render_template, request, url_for
+
+logger = logging.getLogger(__name__)
+
+SWAGGER_CONFIG = {
+    "headers": [],
+    "specs": [
+        {
+            "endpoint": "apispec",
+            "route": "/apispec.json",
+            "rule_filter": lambda rule: True,
+            "model_filter": lambda tag: True,
+        }
+    ],
+    "static_url_path": "/flasgger_static",
+    "swagger_ui": True,
+    "specs_route": "/docs"
+}
+
+DEFAULT_TEMPLATE = {
+    "swagger": "2.0",
+    "info": {
+        "title": "S2O Platform API",
+        "version": "1.0.0",
+        "description": "API Documentation"
+    }
+}
+
+
+def _load_template():
+    path = os.path.join(os.path.dirname(__file__), 'swagger_config.json')
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return DEFAULT_TEMPLATE
+
+
+class CachedSpec:
+    """Serialized spec with its gzip body and ETag"""
+
+    __slots__ = ("body", "gzipped", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+
+    def response(self) -> Response:
+        if "gzip" in request.accept_encodings:
+            response = Response(self.gzipped, mimetype="application/json")
+            response.headers["Content-Encoding"] = "gzip"
+            response.set_etag(f"{self.etag}-gz")
+        else:
+            response = Response(self.body, mimetype="application/json")
+            response.set_etag(self.etag)
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = "no-cache"
+        return response.make_conditional(request)
+
+
+class LazySwagger:
+    """Builds the flasgger Swagger object and the spec on first use"""
+
+    def __init__(self, spec_file=None):
+        self.spec_file = spec_file
+        self._swagger = None
+        self._docs_view = None
+        self._spec = None
+        self._lock = threading.Lock()
+
+    def get(self, app):
+        if self._swagger is None:
+            with self._lock:
+                if self._swagger is None:
+                    from flasgger import Swagger
+                    from flasgger.base import APIDocsView
+
+                    # Not bound with init_app: that would register routes after
+                    # the first request. Spec generation only needs app + config.
+                    swagger = Swagger(config=SWAGGER_CONFIG, template=_load_template())
+                    swagger.app = app
+                    swagger.load_config(app)
+                    self._docs_view = APIDocsView.as_view("apidocs", view_args=dict(config=swagger.config))
+                    self._swagger = swagger
+        return self._swagger
+
+    def build(self, app) -> bytes:
+        """Generate the spec from the view docstrings and serialize it"""
+        swagger = self.get(app)
+        with app.app_context():
+            body = app.json.dumps(swagger.get_apispecs("apispec")).encode()
+        # flasgger caches the parsed dict; only the bytes are kept
+        swagger.apispecs.clear()
+        return body
+
+    def spec(self) -> CachedSpec:
+        # Built once per process, debug or not: the reloader restarts
+        # the process when a docstring changes
+        if self._spec is None:
+            app = current_app._get_current_object()
+            if self.spec_file:
+                with open(self.spec_file, "rb") as f:
+                    body = f.read()
+            else:
+                body = self.build(app)
+            with self._lock:
+                if self._spec is None:
+                    self._spec = CachedSpec(body)
+        return self._spec
+
+    def docs_page(self):
+        self.get(current_app._get_current_object())
+        return self._docs_view()
+
+
+def setup_docs(app):
+    """Register the docs routes; flasgger itself is imported lazily"""
+    ui_enabled = app.config.get("DOCS_UI_ENABLED", True)
+    # The UI loads the spec, so it keeps /apispec.json on
+    spec_enabled = app.config.get("APISPEC_ENABLED", True) or ui_enabled
+    spec_file = app.config.get("APISPEC_FILE")
+    if not ui_enabled and not spec_enabled:
+        return None
+
+    spec = importlib.util.find_spec("flasgger")
+    if spec is None and (ui_enabled or not spec_file):
+        logger.warning("flasgger not installed; /docs and /apispec.json disabled")
+        return None
+
+    docs = LazySwagger(spec_file)
+    if ui_enabled:
+        ui_root = os.path.join(spec.submodule_search_locations[0], "ui3")
+        blueprint = Blueprint(
+            "flasgger", __name__,
+            template_folder=os.path.join(ui_root, "templates"),
+            static_folder=os.path.join(ui_root, "static"),
+            static_url_path=SWAGGER_CONFIG["static_url_path"]
+        )
+    else:
+        blueprint = Blueprint("flasgger", __name__)
+
+    if spec_enabled:
+        @blueprint.route(SWAGGER_CONFIG["specs"][0]["route"], endpoint="apispec")
+        def apispec():
+            return docs.spec().response()
+
+    if ui_enabled:
+        @blueprint.route(SWAGGER_CONFIG["specs_route"], endpoint="apidocs")
+        def apidocs():
+            return docs.docs_page()
+
+        @blueprint.route("/oauth2-redirect.html", endpoint="oauth_redirect")
+        def oauth_redirect():
+            return render_template("flasgger/oauth2-redirect.html")
+
+        @blueprint.route("/apidocs/index.html")
+        def apidocs_index():
+            return redirect(url_for("flasgger.apidocs"))
+
+    app.register_blueprint(blueprint)
+    app.extensions["lazy_swagger"] = docs
+    return docs
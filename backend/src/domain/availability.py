@@ -0,0 +1,117 @@
+"""
+In-memory availability index for table reservations.
+
+Built once from a branch's tables and the reservations overlapping a date
+window, then answers slot and table queries without going back to the
+database. Each table keeps its bookings as sorted, non-overlapping
+intervals, so checking a slot is a binary search per candidate table.
+"""
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from .models.reservation import Reservation
+from .models.table import Table
+
+
+class TableSchedule:
+    """Booked intervals of a single table, sorted by start"""
+
+    __slots__ = ("table_id", "seats", "_starts", "_ends")
+
+    def __init__(self, table_id: str, seats: int):
+        self.table_id = table_id
+        self.seats = seats
+        self._starts: List[datetime] = []
+        self._ends: List[datetime] = []
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        """True if [start, end) overlaps no booking"""
+        # Bookings never overlap, so ends are sorted too: only the last booking
+        # starting before `end` can reach into the requested interval.
+        index = bisect_left(self._starts, end)
+        return index == 0 or self._ends[index - 1] <= start
+
+    def book(self, start: datetime, end: datetime) -> None:
+        index = bisect_left(self._starts, start)
+        self._starts.insert(index, start)
+        self._ends.insert(index, end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+
+class AvailabilityIndex:
+    """Tables of one branch, ordered by seats, with their bookings"""
+
+    def __init__(self, tables: Iterable[Tuple[str, int]]):
+        self._schedules = sorted(
+            (TableSchedule(table_id, seats) for table_id, seats in tables),
+            key=lambda s: s.seats
+        )
+        self._seats = [s.seats for s in self._schedules]
+        self._by_id = {s.table_id: s for s in self._schedules}
+
+    @classmethod
+    def build(cls, tables: Iterable[Table], reservations: Iterable[Reservation]) -> "AvailabilityIndex":
+        """Index tables and book every reservation onto them"""
+        index = cls((t.id, t.seats) for t in tables)
+        unassigned = []
+        for reservation in sorted(reservations, key=lambda r: r.booking_time):
+            schedule = index._by_id.get(reservation.table_id) if reservation.table_id else None
+            if schedule is not None:
+                schedule.book(reservation.booking_time, reservation.end_time)
+            else:
+                unassigned.append(reservation)
+
+        # Reservations made before tables were assigned still hold a seat:
+        # place them on the smallest table that fits, first come first served.
+        for reservation in unassigned:
+            start, end = reservation.booking_time, reservation.end_time
+            table_id = index.find_table(start, end, reservation.party_size)
+            if table_id is not None:
+                index._by_id[table_id].book(start, end)
+        return index
+
+    def _candidates(self, party_size: int) -> List[TableSchedule]:
+        return self._schedules[bisect_left(self._seats, party_size):]
+
+    def find_table(self, start: datetime, end: datetime, party_size: int) -> Optional[str]:
+        """Smallest free table that seats the party, or None"""
+        for schedule in self._candidates(party_size):
+            if schedule.is_free(start, end):
+                return schedule.table_id
+        return None
+
+    def is_table_free(self, table_id: str, start: datetime, end: datetime, party_size: int) -> bool:
+        schedule = self._by_id.get(table_id)
+        return bool(schedule and schedule.seats >= party_size and schedule.is_free(start, end))
+
+    def book(self, table_id: str, start: datetime, end: datetime) -> None:
+        self._by_id[table_id].book(start, end)
+
+    def available_slots(
+        self,
+        day: date,
+        party_size: int,
+        duration: timedelta,
+        opening: time,
+        closing: time,
+        step: timedelta
+    ) -> List[Tuple[datetime, str]]:
+        """(start, table_id) for every slot of the day a table can seat the party"""
+        candidates = self._candidates(party_size)
+        if not candidates:
+            return []
+
+        slots = []
+        start = datetime.combine(day, opening)
+        last_start = datetime.combine(day, closing) - duration
+        while start <= last_start:
+            end = start + duration
+            for schedule in candidates:
+                if schedule.is_free(start, end):
+                    slots.append((start, schedule.table_id))
+                    break
+            start += step
+        return slots
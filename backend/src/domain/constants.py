@@ -2,3 +2,11 @@
 
 DEFAULT_PAGE_SIZE = 20
 MAX_ITEMS_PER_ORDER = 100
+
+# Reservations
+DEFAULT_RESERVATION_MINUTES = 90
+MAX_RESERVATION_MINUTES = 240
+RESERVATION_SLOT_MINUTES = 30
+DEFAULT_OPENING_TIME = "10:00"
+DEFAULT_CLOSING_TIME = "22:00"
+MAX_AVAILABILITY_DAYS = 31
@@ -0,0 +1,97 @@
+"""
+Item-to-item co-occurrence ("frequently ordered together").
+
+Orders are the rows and products the columns of a binary sparse matrix X.
+X.T @ X counts, for every product pair, the orders containing both, and
+its diagonal the orders containing each product. A pair is scored with the
+Ochiai coefficient c_ij / sqrt(n_i * n_j), so a product everybody orders
+does not become everyone's neighbour. Each product keeps only its top-K
+neighbours, which is all a lookup needs.
+
+numpy/scipy are imported inside the builders: they are only needed where
+models are built (job workers, scripts), not to serve lookups.
+"""
+import heapq
+from math import sqrt
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+# Neighbours kept per product
+TOP_K = 20
+# Pairs seen together in fewer orders are noise
+MIN_PAIR_COUNT = 2
+
+# (neighbour product id, score), best first
+Neighbours = List[Tuple[str, float]]
+
+
+def pair_counts(order_index: Sequence[int], product_index: Sequence[int], n_products: int):
+    """
+    Co-occurrence counts from (order, product) index pairs.
+    Returns (counts, order_counts): a CSR products x products matrix of
+    orders containing both products (zero diagonal), and per product the
+    number of orders containing it. Repeated pairs count once.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    rows = np.asarray(order_index, dtype=np.int64)
+    cols = np.asarray(product_index, dtype=np.int32)
+    n_orders = int(rows.max()) + 1 if len(rows) else 0
+    x = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(n_orders, n_products)
+    )
+    # Duplicates were summed; two lines of the same dish in one order are one occurrence
+    x.data[:] = 1
+
+    counts = (x.T @ x).tocsr()
+    order_counts = counts.diagonal().astype(np.int64)
+    counts.setdiag(0)
+    counts.eliminate_zeros()
+    return counts, order_counts
+
+
+def top_neighbours(
+    counts, order_counts, product_ids: Sequence[str], k: int = TOP_K, min_count: int = MIN_PAIR_COUNT
+) -> Dict[str, Neighbours]:
+    """Top-k Ochiai neighbours of every product from pair_counts() output"""
+    import numpy as np
+
+    norms = np.sqrt(np.maximum(order_counts, 1).astype(np.float64))
+    result = {}
+    for i in range(counts.shape[0]):
+        start, end = counts.indptr[i], counts.indptr[i + 1]
+        if start == end:
+            continue
+        cols = counts.indices[start:end]
+        data = counts.data[start:end]
+        keep = data >= min_count
+        if not keep.any():
+            continue
+        cols, data = cols[keep], data[keep]
+        scores = data / (norms[i] * norms[cols])
+        if len(scores) > k:
+            top = np.argpartition(-scores, k)[:k]
+            cols, scores = cols[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        result[product_ids[i]] = [(product_ids[c], round(float(s), 4)) for c, s in zip(cols[order], scores[order])]
+    return result
+
+
+def rank_neighbours(
+    product_id: str, row: Mapping[str, int], order_counts: Mapping[str, int],
+    k: int = TOP_K, min_count: int = MIN_PAIR_COUNT
+) -> Neighbours:
+    """Top-k neighbours of one product from its count row (incremental updates)"""
+    n_self = max(order_counts.get(product_id, 0), 1)
+    scored = (
+        (other, round(count / sqrt(n_self * max(order_counts.get(other, 0), 1)), 4))
+        for other, count in row.items()
+        if other != product_id and count >= min_count
+    )
+    return heapq.nlargest(k, scored, key=lambda pair: pair[1])
+
+
+def order_pairs(product_ids: Iterable[str]) -> List[Tuple[str, str]]:
+    """Ordered pairs (a, b), a != b, of the distinct products of one order"""
+    distinct = sorted(set(product_ids))
+    return [(a, b) for a in distinct for b in distinct if a != b]
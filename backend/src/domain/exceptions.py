@@ -7,3 +7,7 @@ class ResourceNotFoundException(DomainException):
 
 class InvalidOperationException(DomainException):
     pass
+
+class ReservationConflictException(InvalidOperationException):
+    """Requested table/time overlaps an existing reservation"""
+    pass
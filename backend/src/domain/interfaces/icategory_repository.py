@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from ..models.category import Category
 
 
@@ -19,6 +19,16 @@ class ICategoryRepository(ABC):
         """Get all categories for a tenant"""
         pass
 
+    @abstractmethod
+    def get_rows_by_tenant(self, tenant_id: str) -> List[Dict[str, Any]]:
+        """Get all categories for a tenant as raw column dicts"""
+        pass
+
+    @abstractmethod
+    def get_rows_by_ids(self, tenant_id: str, ids: List[str]) -> List[Dict[str, Any]]:
+        """Get a tenant's categories by ID as raw column dicts"""
+        pass
+
     @abstractmethod
     def delete(self, category_id: str) -> bool:
         """Delete category by ID"""
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, List, Optional, Dict, Sequence
 from ..models.customer import Customer
+from ..models.loyalty_ledger import LoyaltyLedgerEntry
 
 
 class ICustomerRepository(ABC):
@@ -36,11 +38,43 @@ class ICustomerRepository(ABC):
         pass
     
     @abstractmethod
-    def add_loyalty_points(self, user_id: str, points: int) -> Customer:
-        """Add loyalty points to customer"""
+    def add_loyalty_points(self, tenant_id: str, user_id: str, points: int) -> Customer:
+        """Add loyalty points to a tenant's customer"""
         pass
     
     @abstractmethod
-    def redeem_loyalty_points(self, user_id: str, points: int) -> bool:
-        """Redeem loyalty points from customer"""
+    def redeem_loyalty_points(self, tenant_id: str, user_id: str, points: int) -> Optional[Customer]:
+        """Redeem loyalty points from a tenant's customer; the updated customer, None if the balance is insufficient"""
+        pass
+    
+    @abstractmethod
+    def accrue_points_for_orders(self, tenant_id: str, order_ids: List[str], points_rate: float = 0.1) -> Dict[str, int]:
+        """Accrue points for a tenant's completed orders in bulk; returns points added per user ID"""
+        pass
+    
+    @abstractmethod
+    def get_loyalty_ledger(self, tenant_id: str, user_id: str, limit: int = 50) -> List[LoyaltyLedgerEntry]:
+        """Get most recent loyalty ledger entries for a tenant's customer"""
+        pass
+    
+    @abstractmethod
+    def get_id_for_user(self, tenant_id: str, user_id: str) -> Optional[str]:
+        """Get the ID of a user's customer profile in a tenant"""
+        pass
+    
+    @abstractmethod
+    def get_taste(self, tenant_id: str, customer_id: str, for_update: bool = False) -> Optional[Dict[str, Any]]:
+        """Get a customer's taste (vector, version, weight, updated_at); None if no such customer in the tenant"""
+        pass
+    
+    @abstractmethod
+    def save_taste(
+        self, customer_id: str, vector: Sequence[float], version: str, weight: float, updated_at: datetime
+    ) -> None:
+        """Store a customer's taste, a vector in embedding version `version`"""
+        pass
+    
+    @abstractmethod
+    def mark_taste_orders(self, order_ids: List[str]) -> List[str]:
+        """Flag orders as folded into their customer's taste; returns the IDs not flagged before"""
         pass
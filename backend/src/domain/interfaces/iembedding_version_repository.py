@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+
+
+class IEmbeddingVersionRepository(ABC):
+	"""
+	Interface for Embedding Version Repository
+	Defines contract for the registry of embedding versions and their rollout status.
+	"""
+
+	@abstractmethod
+	def get_versions(self) -> List[Dict[str, Any]]:
+		"""All registered versions: [{"version", "model", "dimension", "status", ...}]"""
+		pass
+
+	@abstractmethod
+	def get_version(self, version: str, for_update: bool = False) -> Optional[Dict[str, Any]]:
+		pass
+
+	@abstractmethod
+	def add_version(self, version: str, model: str, dimension: int, status: str) -> None:
+		pass
+
+	@abstractmethod
+	def set_status(self, version: str, status: str) -> None:
+		pass
+
+	@abstractmethod
+	def lock_versions(self) -> None:
+		"""Serialize status changes for the rest of the transaction"""
+		pass
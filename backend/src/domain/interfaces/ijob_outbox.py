@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional
+
+
+class IJobOutbox(ABC):
+	"""
+	Interface for the Job Outbox
+	Jobs enqueued here run in the background once the current transaction commits,
+	and never if it rolls back.
+	"""
+
+	@abstractmethod
+	def enqueue(
+		self, name: str, payload: Dict[str, Any], lane: Optional[str] = None, dedupe_key: Optional[str] = None,
+		delay: float = 0.0
+	) -> str:
+		"""Enqueue job `name` after commit (run no sooner than `delay` seconds later), returning its ID"""
+		pass
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
 from ..models.order_item import OrderItem
 
 
@@ -20,6 +21,11 @@ class IOrderItemRepository(ABC):
         """Get order item by ID"""
         pass
     
+    @abstractmethod
+    def get_for_update(self, order_item_id: str) -> Optional[OrderItem]:
+        """Get order item by ID and lock it for the current transaction"""
+        pass
+    
     @abstractmethod
     def get_all(self) -> List[OrderItem]:
         """Get all order items"""
@@ -49,3 +55,35 @@ class IOrderItemRepository(ABC):
     def get_by_status(self, order_id: str, status: str) -> List[OrderItem]:
         """Get order items by status for an order"""
         pass
+    
+    @abstractmethod
+    def get_rows_by_order(self, order_id: str) -> List[Dict[str, Any]]:
+        """Get all items for an order as raw column dicts"""
+        pass
+    
+    @abstractmethod
+    def get_rows_by_status(self, order_id: str, status: str) -> List[Dict[str, Any]]:
+        """Get order items by status for an order as raw column dicts"""
+        pass
+
+    @abstractmethod
+    def get_completed_order_products(self, tenant_id: str) -> List[Tuple[Any, Any]]:
+        """Distinct (order_id, product_id) pairs of a tenant's completed orders"""
+        pass
+
+    @abstractmethod
+    def get_decayed_product_scores(
+        self, branch_id: str, half_life_seconds: float, since: datetime, now: datetime
+    ) -> List[Dict[str, Any]]:
+        """Time-decayed quantity per product of a branch's completed orders"""
+        pass
+
+    @abstractmethod
+    def get_customer_order_lines(self, tenant_id: str, customer_id: str) -> List[Dict[str, Any]]:
+        """Quantity per product of a customer's completed orders, oldest order first"""
+        pass
+
+    @abstractmethod
+    def get_product_order_counts(self, tenant_id: str, since: datetime) -> Dict[str, int]:
+        """Quantity ordered per product in a tenant's orders completed since `since`"""
+        pass
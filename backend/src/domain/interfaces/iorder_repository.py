@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from ..models.order import Order
 
 
@@ -19,6 +19,16 @@ class IOrderRepository(ABC):
 		"""Get order by ID"""
 		pass
 
+	@abstractmethod
+	def get_with_items(self, order_id: str) -> Optional[Order]:
+		"""Get order by ID with its items loaded"""
+		pass
+
+	@abstractmethod
+	def get_by_branch_with_items(self, tenant_id: str, branch_id: str, statuses: List[str]) -> List[Order]:
+		"""Get orders of a branch in the given statuses with their items loaded"""
+		pass
+
 	@abstractmethod
 	def get_all(self) -> List[Order]:
 		"""Get all orders"""
@@ -39,11 +49,39 @@ class IOrderRepository(ABC):
 		"""Get orders by status for a tenant"""
 		pass
 
+	@abstractmethod
+	def get_rows_by_tenant(self, tenant_id: str) -> List[Dict[str, Any]]:
+		"""Get all orders for a tenant as raw column dicts"""
+		pass
+
+	@abstractmethod
+	def get_rows_by_table(self, table_id: str) -> List[Dict[str, Any]]:
+		"""Get orders for a table as raw column dicts"""
+		pass
+
+	@abstractmethod
+	def get_rows_by_status(self, tenant_id: str, status: str) -> List[Dict[str, Any]]:
+		"""Get orders by status for a tenant as raw column dicts"""
+		pass
+
+	@abstractmethod
+	def get_rows_with_items(
+		self, tenant_id: str, statuses: List[str], order_ids: Optional[List[str]] = None,
+		branch_id: Optional[str] = None, table_id: Optional[str] = None
+	) -> List[Dict[str, Any]]:
+		"""Get orders in the given statuses as raw column dicts with their item rows"""
+		pass
+
 	@abstractmethod
 	def update(self, order_id: str, order: Order) -> Order:
 		"""Update order"""
 		pass
 
+	@abstractmethod
+	def adjust_total(self, order_id: str, delta: float) -> Optional[float]:
+		"""Atomically add delta to the order total; returns new total or None if not found"""
+		pass
+
 	@abstractmethod
 	def delete(self, order_id: str) -> bool:
 		"""Delete order"""
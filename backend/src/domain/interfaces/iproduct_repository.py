@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple
 from ..models.product import Product
 
 class IProductRepository(ABC):
@@ -18,3 +18,65 @@ class IProductRepository(ABC):
     @abstractmethod
     def get_all_by_tenant(self, tenant_id: str) -> List[Product]:
         pass
+
+    @abstractmethod
+    def get_rows_by_category(self, category_id: str) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def get_rows_by_tenant(self, tenant_id: str) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def get_rows_by_ids(self, tenant_id: str, ids: List[str]) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def get_embedding_sources(self, tenant_id: str, version: str) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def get_unembedded_sources(self, version: str, after_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def count_embeddings(self, version: str) -> Tuple[int, int]:
+        pass
+
+    @abstractmethod
+    def update_embeddings(self, version: str, rows: List[Dict[str, Any]]) -> int:
+        pass
+
+    @abstractmethod
+    def delete_embeddings(self, version: str) -> int:
+        pass
+
+    @abstractmethod
+    def get_embedding(self, tenant_id: str, product_id: str, version: str) -> Optional[List[float]]:
+        pass
+
+    @abstractmethod
+    def get_embeddings(self, tenant_id: str, product_ids: List[str], version: str) -> Dict[str, List[float]]:
+        pass
+
+    @abstractmethod
+    def search_rows_by_embedding(
+        self, tenant_id: str, version: str, embedding: List[float], top_k: int = 5, exclude_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def search_rows_hybrid(
+        self,
+        tenant_id: str,
+        tsquery: str,
+        text: str,
+        embedding: Optional[List[float]],
+        pool: int,
+        rrf_k: int,
+        limit: int,
+        offset: int = 0,
+        available_only: bool = True,
+        version: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        pass
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
+from datetime import datetime
 from ..models.reservation import Reservation
 
 
@@ -34,6 +35,11 @@ class IReservationRepository(ABC):
 		"""Get upcoming reservations for a tenant"""
 		pass
 
+	@abstractmethod
+	def get_active_in_window(self, branch_id: str, start: datetime, end: datetime) -> List[Reservation]:
+		"""Get pending/confirmed reservations of a branch that may overlap [start, end)"""
+		pass
+
 	@abstractmethod
 	def update(self, reservation_id: str, reservation: Reservation) -> Reservation:
 		"""Update reservation"""
@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Dict, Any, Tuple
+
+
+class ISyncRepository(ABC):
+	"""
+	Interface for Sync Repository
+	Defines contract for reading the per-tenant change log.
+	"""
+
+	@abstractmethod
+	def get_versions(self, tenant_id: str) -> Tuple[int, int]:
+		"""Current change version and purged-tombstone version of a tenant"""
+		pass
+
+	@abstractmethod
+	def get_changes(
+		self, tenant_id: str, resources: List[str], since: int, until: int, limit: int
+	) -> List[Dict[str, Any]]:
+		"""Changes with since < version <= until, oldest first, at most limit rows"""
+		pass
+
+	@abstractmethod
+	def get_changes_at(self, tenant_id: str, resources: List[str], version: int) -> List[Dict[str, Any]]:
+		"""All changes recorded with exactly this version"""
+		pass
+
+	@abstractmethod
+	def purge_tombstones(self, before: datetime) -> int:
+		"""Delete tombstones older than before, returning how many were deleted"""
+		pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from ..models.table import Table
 
 
@@ -44,8 +44,32 @@ class ITableRepository(ABC):
 		"""Update table"""
 		pass
 
+	@abstractmethod
+	def bulk_set_status(self, statuses: Dict[str, str]) -> int:
+		"""Set statuses for many tables (table_id -> status), returns rows updated"""
+		pass
+
 	@abstractmethod
 	def delete(self, table_id: str) -> bool:
 		"""Delete table"""
 		pass
 
+	@abstractmethod
+	def get_rows_by_tenant(self, tenant_id: str) -> List[Dict[str, Any]]:
+		"""Get all tables for a tenant as raw column dicts"""
+		pass
+
+	@abstractmethod
+	def get_rows_by_branch(self, tenant_id: str, branch_id: str) -> List[Dict[str, Any]]:
+		"""Get all tables of a tenant's branch as raw column dicts"""
+		pass
+
+	@abstractmethod
+	def get_rows_by_ids(self, tenant_id: str, ids: List[str]) -> List[Dict[str, Any]]:
+		"""Get a tenant's tables by ID as raw column dicts"""
+		pass
+
+	@abstractmethod
+	def get_rows_by_status(self, tenant_id: str, status: str) -> List[Dict[str, Any]]:
+		"""Get tables by status as raw column dicts"""
+		pass
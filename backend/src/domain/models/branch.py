@@ -8,6 +8,10 @@ class Branch:
 	Maps to the `branches` table in the DRD.
 	"""
 
+	__slots__ = (
+		"id", "tenant_id", "name", "address", "phone", "is_active", "created_at", "updated_at",
+	)
+
 	def __init__(
 		self,
 		id: str,
@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     id: uuid.UUID
     tenant_id: uuid.UUID
@@ -1,3 +1,4 @@
+from bisect import bisect_right
 from typing import Optional
 from enum import Enum
 
@@ -34,6 +35,16 @@ TIER_MULTIPLIERS = {
     MembershipTier.DIAMOND: 2.0,
 }
 
+# Tiers sorted by threshold, used for O(log n) tier lookup
+_TIERS_BY_THRESHOLD = sorted(TIER_THRESHOLDS, key=TIER_THRESHOLDS.get)
+_SORTED_THRESHOLDS = [TIER_THRESHOLDS[t] for t in _TIERS_BY_THRESHOLD]
+
+
+def tier_for_points(points: int) -> MembershipTier:
+    """Resolve the membership tier reached with the given loyalty points"""
+    index = bisect_right(_SORTED_THRESHOLDS, points) - 1
+    return _TIERS_BY_THRESHOLD[max(index, 0)]
+
 
 class Customer:
     """
@@ -44,6 +55,11 @@ class Customer:
     Includes membership tier system for loyalty program.
     """
     
+    __slots__ = (
+        "user_id", "phone_number", "loyalty_points",
+        "total_spent", "_membership_tier", "_tier_points",
+    )
+    
     def __init__(
         self,
         user_id: str,
@@ -56,26 +72,26 @@ class Customer:
         self.phone_number = phone_number
         self.loyalty_points = loyalty_points
         self.total_spent = total_spent
-        self._membership_tier = membership_tier
+        self._membership_tier = MembershipTier(membership_tier)
+        # Points the cached tier was computed for; None forces a recompute
+        self._tier_points: Optional[int] = None
     
     @property
     def membership_tier(self) -> MembershipTier:
         """Get current membership tier based on loyalty points"""
-        return self._calculate_tier()
+        if self._tier_points != self.loyalty_points:
+            self._membership_tier = self._calculate_tier()
+            self._tier_points = self.loyalty_points
+        return self._membership_tier
     
     @membership_tier.setter
     def membership_tier(self, value):
-        self._membership_tier = value
+        self._membership_tier = MembershipTier(value)
+        self._tier_points = None
     
     def _calculate_tier(self) -> MembershipTier:
         """Calculate tier based on total loyalty points earned"""
-        if self.loyalty_points >= TIER_THRESHOLDS[MembershipTier.DIAMOND]:
-            return MembershipTier.DIAMOND
-        elif self.loyalty_points >= TIER_THRESHOLDS[MembershipTier.GOLD]:
-            return MembershipTier.GOLD
-        elif self.loyalty_points >= TIER_THRESHOLDS[MembershipTier.SILVER]:
-            return MembershipTier.SILVER
-        return MembershipTier.IRON
+        return tier_for_points(self.loyalty_points)
     
     def add_loyalty_points(self, points: int) -> int:
         """
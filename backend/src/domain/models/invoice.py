@@ -29,6 +29,11 @@ class Invoice:
     Attributes map to the 'invoices' table in DRD.
     """
     
+    __slots__ = (
+        "id", "tenant_id", "order_id", "final_amount", "tax_amount",
+        "discount_amount", "payment_method", "payment_status", "issued_at",
+    )
+    
     def __init__(
         self,
         id: str,
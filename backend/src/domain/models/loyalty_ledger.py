@@ -0,0 +1,45 @@
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+
+
+class LoyaltyEntryType(str, Enum):
+    """Kinds of movement recorded in the loyalty ledger"""
+    ACCRUAL = "ACCRUAL"
+    REDEMPTION = "REDEMPTION"
+    ADJUSTMENT = "ADJUSTMENT"
+
+
+class LoyaltyLedgerEntry:
+    """
+    Domain Model for a Loyalty Ledger Entry
+    
+    Append-only record of a single change to a customer's loyalty points.
+    Accruals and adjustments carry positive points, redemptions negative ones,
+    so the sum of a customer's entries equals their current balance.
+    """
+    
+    __slots__ = (
+        "id", "tenant_id", "customer_id", "entry_type", "points", "order_id", "created_at",
+    )
+    
+    def __init__(
+        self,
+        id: str,
+        tenant_id: str,
+        customer_id: str,
+        entry_type: str,
+        points: int,
+        order_id: Optional[str] = None,
+        created_at: Optional[datetime] = None
+    ):
+        self.id = id
+        self.tenant_id = tenant_id
+        self.customer_id = customer_id
+        self.entry_type = entry_type
+        self.points = points
+        self.order_id = order_id
+        self.created_at = created_at or datetime.utcnow()
+    
+    def __repr__(self) -> str:
+        return f"<LoyaltyLedgerEntry customer_id={self.customer_id} type={self.entry_type} points={self.points}>"
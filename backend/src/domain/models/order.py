@@ -18,6 +18,11 @@ class Order:
 	Maps to the `orders` table in DRD.
 	"""
 
+	__slots__ = (
+		"id", "tenant_id", "branch_id", "table_id", "customer_id", "status",
+		"total_amount", "note", "created_at", "updated_at", "items",
+	)
+
 	def __init__(
 		self,
 		id: str,
@@ -19,6 +19,10 @@ class OrderItem:
     Attributes map to the 'order_items' table in DRD.
     """
     
+    __slots__ = (
+        "id", "tenant_id", "order_id", "product_id", "quantity", "price_at_order", "item_status",
+    )
+    
     def __init__(
         self,
         id: str,
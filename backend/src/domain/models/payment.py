@@ -23,6 +23,11 @@ class Payment:
 	Maps to a `payments` table.
 	"""
 
+	__slots__ = (
+		"id", "tenant_id", "order_id", "invoice_id", "amount",
+		"method", "status", "created_at", "updated_at",
+	)
+
 	def __init__(
 		self,
 		id: str,
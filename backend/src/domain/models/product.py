@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Any
+from typing import Optional
 import uuid
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Product:
     id: uuid.UUID
     tenant_id: uuid.UUID
@@ -12,6 +12,5 @@ class Product:
     price: float
     description: Optional[str]
     is_available: bool
-    embedding_vector: Optional[Any] # pgvector
     created_at: datetime
     updated_at: datetime
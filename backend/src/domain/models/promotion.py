@@ -19,6 +19,10 @@ class Promotion:
     Attributes map to the 'promotions' table in DRD.
     """
     
+    __slots__ = (
+        "id", "tenant_id", "code", "promotion_type", "value", "start_date", "end_date",
+    )
+    
     def __init__(
         self,
         id: str,
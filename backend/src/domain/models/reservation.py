@@ -1,6 +1,7 @@
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
+from ..constants import DEFAULT_RESERVATION_MINUTES
 
 
 class ReservationStatus(str, Enum):
@@ -16,6 +17,11 @@ class Reservation:
 	Maps to the `reservations` table in DRD.
 	"""
 
+	__slots__ = (
+		"id", "tenant_id", "branch_id", "user_id", "booking_time", "party_size", "status", "created_at",
+		"table_id", "duration_minutes",
+	)
+
 	def __init__(
 		self,
 		id: str,
@@ -26,6 +32,8 @@ class Reservation:
 		party_size: int,
 		status: str = ReservationStatus.PENDING,
 		created_at: Optional[datetime] = None,
+		table_id: Optional[str] = None,
+		duration_minutes: int = DEFAULT_RESERVATION_MINUTES,
 	):
 		self.id = id
 		self.tenant_id = tenant_id
@@ -35,6 +43,12 @@ class Reservation:
 		self.party_size = party_size
 		self.status = status
 		self.created_at = created_at or datetime.utcnow()
+		self.table_id = table_id
+		self.duration_minutes = duration_minutes
+
+	@property
+	def end_time(self) -> datetime:
+		return self.booking_time + timedelta(minutes=self.duration_minutes)
 
 	def approve(self) -> None:
 		self.status = ReservationStatus.APPROVED
@@ -46,7 +60,7 @@ class Reservation:
 		self.status = ReservationStatus.CANCELLED
 
 	def is_valid(self) -> bool:
-		return bool(self.id and self.tenant_id and self.branch_id and self.user_id and self.party_size > 0)
+		return bool(self.id and self.tenant_id and self.branch_id and self.user_id and self.party_size > 0 and self.duration_minutes > 0)
 
 	def __repr__(self) -> str:
 		return f"<Reservation id={self.id} booking_time={self.booking_time} party_size={self.party_size} status={self.status}>"
@@ -8,6 +8,10 @@ class Review:
 	Maps to the `reviews` table in DRD.
 	"""
 
+	__slots__ = (
+		"id", "user_id", "tenant_id", "order_id", "rating", "comment", "created_at",
+	)
+
 	def __init__(
 		self,
 		id: str,
@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-@dataclass
+@dataclass(slots=True)
 class StaffProfile:
     id: uuid.UUID
     user_id: uuid.UUID
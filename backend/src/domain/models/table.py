@@ -15,6 +15,11 @@ class Table:
 	Maps to the `tables` table in the DRD.
 	"""
 
+	__slots__ = (
+		"id", "tenant_id", "branch_id", "name", "qr_code_link", "status", "created_at", "updated_at",
+		"seats",
+	)
+
 	def __init__(
 		self,
 		id: str,
@@ -25,6 +30,7 @@ class Table:
 		status: str = TableStatus.AVAILABLE,
 		created_at: Optional[datetime] = None,
 		updated_at: Optional[datetime] = None,
+		seats: int = 4,
 	):
 		self.id = id
 		self.tenant_id = tenant_id
@@ -34,6 +40,7 @@ class Table:
 		self.status = status
 		self.created_at = created_at or datetime.utcnow()
 		self.updated_at = updated_at or datetime.utcnow()
+		self.seats = seats
 
 	def set_status(self, new_status: str) -> None:
 		self.status = new_status
@@ -42,8 +49,11 @@ class Table:
 	def is_available(self) -> bool:
 		return self.status == TableStatus.AVAILABLE
 
+	def fits(self, party_size: int) -> bool:
+		return self.seats >= party_size
+
 	def is_valid(self) -> bool:
-		return bool(self.id and self.tenant_id and self.branch_id and self.name)
+		return bool(self.id and self.tenant_id and self.branch_id and self.name and self.seats > 0)
 
 	def __repr__(self) -> str:
 		return f"<Table id={self.id} name={self.name} status={self.status}>"
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 import uuid
 
-@dataclass
+@dataclass(slots=True)
 class Tenant:
     id: uuid.UUID
     name: str
@@ -10,7 +10,7 @@ class UserRole(str, Enum):
     STAFF = "STAFF"
     CUSTOMER = "CUSTOMER"
 
-@dataclass
+@dataclass(slots=True)
 class User:
     id: uuid.UUID
     email: str
@@ -0,0 +1,110 @@
+"""
+Typeahead prefix index over menu names.
+
+Names are folded (lower case, accents stripped, "đ" -> "d", whitespace
+collapsed) and every word of a name starts a key running to the end of
+the name, so "bo" finds "Phở bò tái" as well as "Bò lúc lắc". Keys sit in
+one sorted list; the keys starting with a prefix are the contiguous run
+two bisections find.
+
+Suggestions rank a match at the start of the name before a match inside
+it, then the more popular entry first, then by name. Suggestions for
+every prefix matching more than HEAVY_RUN keys are computed when the
+index is built, so a lookup either reads them or ranks at most HEAVY_RUN
+keys.
+"""
+import heapq
+import unicodedata
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Bounds an index's memory: keys beyond this are dropped, inner-word keys
+# of the least popular entries first
+MAX_KEYS = 20_000
+MAX_SUGGESTIONS = 10
+# Prefixes matching more keys than this get their suggestions precomputed
+HEAVY_RUN = 128
+
+_END = "\U0010ffff"
+
+
+def fold(text: str) -> str:
+    """Accent-free lower case form that prefixes are matched on"""
+    decomposed = unicodedata.normalize("NFD", text.lower().replace("đ", "d"))
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).split())
+
+
+class TypeaheadEntry(NamedTuple):
+    kind: str           # "product" or "category"
+    id: str
+    name: str
+    category_id: Optional[str]
+    popularity: float
+
+
+class TypeaheadIndex:
+    """Immutable once built; safe to read from many threads"""
+
+    __slots__ = ("entries", "keys", "refs", "precomputed")
+
+    def __init__(self, entries: Iterable[TypeaheadEntry], max_keys: int = MAX_KEYS):
+        self.entries: List[TypeaheadEntry] = sorted(entries, key=lambda e: (-e.popularity, fold(e.name)))
+        starts, inner = [], []
+        for i, entry in enumerate(self.entries):
+            words = fold(entry.name).split(" ")
+            if words == [""]:
+                continue
+            starts.append((" ".join(words), i, True))
+            inner.extend((" ".join(words[w:]), i, False) for w in range(1, len(words)))
+        # Entries are in (popularity, name) order, so truncation drops the least popular
+        keyed = (starts + inner)[:max_keys]
+        keyed.sort()
+        self.keys: List[str] = [k for k, _, _ in keyed]
+        self.refs: List[Tuple[int, bool]] = [(i, at_start) for _, i, at_start in keyed]
+        self.precomputed: Dict[str, List[int]] = self._precompute()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _rank(self, matches: Iterable[Tuple[int, bool]], k: int) -> List[int]:
+        best: Dict[int, bool] = {}
+        for i, at_start in matches:
+            best[i] = best.get(i, False) or at_start
+        # Entry order is (popularity, name) order, so the index breaks ties
+        return heapq.nsmallest(k, best, key=lambda i: (not best[i], i))
+
+    def _precompute(self) -> Dict[str, List[int]]:
+        precomputed: Dict[str, List[int]] = {}
+        # Walk down from the empty prefix; a prefix's run only splits into its children's runs
+        stack = [("", 0, len(self.keys))]
+        while stack:
+            prefix, lo, hi = stack.pop()
+            if hi - lo <= HEAVY_RUN:
+                continue
+            if prefix:
+                precomputed[prefix] = self._rank(self.refs[lo:hi], MAX_SUGGESTIONS)
+            depth = len(prefix) + 1
+            start = lo
+            while start < hi:
+                child = self.keys[start][:depth]
+                if len(child) < depth:
+                    # Keys equal to the prefix itself sort first and have no children
+                    start = bisect_right(self.keys, child, start, hi)
+                    continue
+                end = bisect_left(self.keys, child + _END, start, hi)
+                stack.append((child, start, end))
+                start = end
+        return precomputed
+
+    def lookup(self, prefix: str, k: int = MAX_SUGGESTIONS) -> List[TypeaheadEntry]:
+        """Best k entries with a name or name word starting with `prefix`"""
+        folded = fold(prefix)
+        if not folded:
+            return []
+        k = min(k, MAX_SUGGESTIONS)
+        precomputed = self.precomputed.get(folded)
+        if precomputed is not None:
+            return [self.entries[i] for i in precomputed[:k]]
+        lo = bisect_left(self.keys, folded)
+        hi = bisect_left(self.keys, folded + _END, lo)
+        return [self.entries[i] for i in self._rank(self.refs[lo:hi], k)]
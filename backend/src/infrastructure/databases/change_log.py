@@ -0,0 +1,111 @@
+"""
+Change log for delta sync
+
+Every commit that writes rows of a synced table takes the next change
+version of each tenant it touched and upserts one sync_changes row per
+entity with it (a tombstone for deletes). Versions come from the tenant's
+tenant_sync_versions row, locked by the increment until commit, so a
+tenant's versions become visible in order: a client that has seen version
+V has seen every change up to V, and `version > V` is its whole delta.
+
+ORM flushes are tracked automatically. Bulk UPDATE/DELETE statements
+bypass the unit of work and must call record_change() themselves.
+"""
+import uuid
+from datetime import datetime
+from typing import Dict, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..models import SyncChange
+
+# Table -> (resource, attribute holding the entity id). Order items are
+# synced as part of their order, so an item write changes the order.
+SYNCED_TABLES = {
+    "products": ("products", "id"),
+    "categories": ("categories", "id"),
+    "tables": ("tables", "id"),
+    "orders": ("orders", "id"),
+    "order_items": ("orders", "order_id"),
+}
+
+_PENDING_KEY = "s2o_sync_changes"
+
+_NEXT_VERSION_SQL = text("""
+    INSERT INTO tenant_sync_versions (tenant_id, version, purged_version)
+    VALUES (:tenant_id, 1, 0)
+    ON CONFLICT (tenant_id) DO UPDATE SET version = tenant_sync_versions.version + 1
+    RETURNING version
+""")
+
+
+def _pending(session: Session) -> Dict[Tuple[str, str, str], bool]:
+    return session.info.setdefault(_PENDING_KEY, {})
+
+
+def record_change(session: Session, tenant_id, resource: str, entity_id, deleted: bool = False) -> None:
+    """Record a change made outside the unit of work (bulk UPDATE/DELETE)"""
+    key = (str(tenant_id), resource, str(entity_id))
+    pending = _pending(session)
+    pending[key] = pending.get(key, False) or deleted
+
+
+def _collect_flushed(session, flush_context) -> None:
+    for objects, deleted in ((session.new, False), (session.dirty, False), (session.deleted, True)):
+        for obj in objects:
+            synced = SYNCED_TABLES.get(getattr(obj, "__tablename__", None))
+            if synced is None:
+                continue
+            resource, id_attr = synced
+            tenant_id, entity_id = getattr(obj, "tenant_id", None), getattr(obj, id_attr, None)
+            if tenant_id is None or entity_id is None:
+                continue
+            # A deleted item only changes its order
+            record_change(session, tenant_id, resource, entity_id, deleted and id_attr == "id")
+
+
+def _write_changes(session) -> None:
+    # Commit flushes after this hook; flush first so every change is versioned
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    now = datetime.utcnow()
+    by_tenant: Dict[str, list] = {}
+    for (tenant_id, resource, entity_id), deleted in pending.items():
+        by_tenant.setdefault(tenant_id, []).append((resource, entity_id, deleted))
+
+    # Fixed lock order across tenants, so two commits can't deadlock
+    for tenant_id in sorted(by_tenant):
+        version = session.execute(_NEXT_VERSION_SQL, {"tenant_id": tenant_id}).scalar_one()
+        stmt = insert(SyncChange).values([
+            {
+                "tenant_id": uuid.UUID(tenant_id), "resource": resource, "entity_id": uuid.UUID(entity_id),
+                "version": version, "deleted": deleted, "changed_at": now,
+            }
+            for resource, entity_id, deleted in by_tenant[tenant_id]
+        ])
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=[SyncChange.tenant_id, SyncChange.resource, SyncChange.entity_id],
+            set_={
+                "version": stmt.excluded.version,
+                "deleted": stmt.excluded.deleted,
+                "changed_at": stmt.excluded.changed_at,
+            },
+        ))
+
+
+def _discard(session, *args) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def install_change_log_hooks() -> None:
+    """Record synced-table writes on every Session (idempotent)"""
+    if not event.contains(Session, "after_flush", _collect_flushed):
+        event.listen(Session, "after_flush", _collect_flushed)
+        event.listen(Session, "before_commit", _write_changes)
+        event.listen(Session, "after_rollback", _discard)
@@ -9,6 +9,9 @@ def get_database_uri():
     return os.getenv("DATABASE_URI", DEFAULT_DB_URI)
 
 engine = create_engine(get_database_uri(), echo=False)
+# A process forked from one that used the engine (gunicorn with preload_app)
+# starts with a fresh pool; the parent's connections stay the parent's
+os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 db_session = scoped_session(SessionLocal)
 
@@ -3,6 +3,7 @@ from .tenant_model import Tenant
 from .branch_model import Branch
 from .staff_profile_model import StaffProfile
 from .customer_model import Customer
+from .loyalty_ledger_model import LoyaltyLedgerEntry
 from .category_model import Category
 from .product_model import Product
 from .table_model import Table, TableStatus
@@ -12,12 +13,16 @@ from .invoice_model import Invoice, PaymentMethod, PaymentStatus
 from .reservation_model import Reservation, ReservationStatus
 from .review_model import Review
 from .promotion_model import Promotion, PromotionProduct
+from .sync_model import TenantSyncVersion, SyncChange
+from .job_outbox_model import JobOutbox
+from .embedding_model import EmbeddingVersion, ProductEmbedding
 __all__ = [
     "User", "UserRole",
     "Tenant",
     "Branch",
     "StaffProfile",
     "Customer",
+    "LoyaltyLedgerEntry",
     "Category",
     "Product",
     "Table", "TableStatus",
@@ -26,5 +31,8 @@ __all__ = [
     "Invoice", "PaymentMethod", "PaymentStatus",
     "Reservation", "ReservationStatus",
     "Review",
-    "Promotion", "PromotionProduct"
+    "Promotion", "PromotionProduct",
+    "TenantSyncVersion", "SyncChange",
+    "JobOutbox",
+    "EmbeddingVersion", "ProductEmbedding"
 ]
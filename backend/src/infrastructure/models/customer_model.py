@@ -1,5 +1,7 @@
 import uuid
-from sqlalchemy import String, Integer, ForeignKey
+from datetime import datetime
+from sqlalchemy import String, Integer, Float, DateTime, ForeignKey
+from pgvector.sqlalchemy import Vector
 from sqlalchemy.orm import Mapped, mapped_column
 from ..databases.base import Base, UUIDMixin, TimestampMixin
 
@@ -10,3 +12,11 @@ class Customer(Base, UUIDMixin, TimestampMixin):
     tenant_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tenants.id"), nullable=False)
     phone_number: Mapped[str] = mapped_column(String(20), nullable=True)
     loyalty_points: Mapped[int] = mapped_column(Integer, default=0)
+    # Maintained in SQL alongside loyalty_points (see CustomerRepository)
+    membership_tier: Mapped[str] = mapped_column(String(20), default="IRON", server_default="IRON", nullable=False)
+    # Taste: decayed mean of ordered products' embeddings (see domain/taste.py)
+    # in the embedding version named by taste_version
+    taste_vector = mapped_column(Vector(), nullable=True)
+    taste_version: Mapped[str] = mapped_column(String(64), nullable=True)
+    taste_weight: Mapped[float] = mapped_column(Float, default=0.0, server_default="0", nullable=False)
+    taste_updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
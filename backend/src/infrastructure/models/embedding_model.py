@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from pgvector.sqlalchemy import Vector
+from ..databases.base import Base
+
+
+class EmbeddingVersion(Base):
+    """An embedding model version and where it is in its rollout (see EmbeddingVersionService)."""
+    __tablename__ = "embedding_versions"
+
+    version: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    dimension: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)  # building, ready, active, retired
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class ProductEmbedding(Base):
+    """A product's vector under one embedding version; versions live side by side."""
+    __tablename__ = "product_embeddings"
+
+    product_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    model_version: Mapped[str] = mapped_column(ForeignKey("embedding_versions.version"), primary_key=True)
+    tenant_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tenants.id"), nullable=False)
+    # No fixed dimension: each version's HNSW index casts to its own (see vector_search)
+    embedding = mapped_column(Vector(), nullable=False)
+    # Hash of the model and text the vector was built from; a mismatch marks it stale
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("idx_product_embeddings_version_tenant", "model_version", "tenant_id"),
+    )
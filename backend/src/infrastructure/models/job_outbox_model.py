@@ -0,0 +1,19 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, JSON, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from ..databases.base import Base, UUIDMixin
+
+
+class JobOutbox(Base, UUIDMixin):
+    """Jobs written in the transaction that needs them; deleted once the job settles."""
+    __tablename__ = "job_outbox"
+
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload = mapped_column(JSON, nullable=False)
+    lane: Mapped[str] = mapped_column(String(10), nullable=False, default="default")
+    dedupe_key: Mapped[str] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("idx_job_outbox_created", "created_at"),
+    )
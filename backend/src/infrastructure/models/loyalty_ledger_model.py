@@ -0,0 +1,25 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import String, Integer, ForeignKey, DateTime, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from ..databases.base import Base, UUIDMixin
+
+class LoyaltyLedgerEntry(Base, UUIDMixin):
+    """Append-only: rows are inserted, never updated or deleted."""
+    __tablename__ = "loyalty_ledger"
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tenants.id"), nullable=False)
+    customer_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("customers.id"), nullable=False)
+    order_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("orders.id"), nullable=True)
+    entry_type: Mapped[str] = mapped_column(String(20), nullable=False)  # ACCRUAL, REDEMPTION, ADJUSTMENT
+    points: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("idx_loyalty_ledger_customer", "customer_id", "created_at"),
+        # An order accrues points at most once, which makes bulk accrual idempotent
+        Index(
+            "uq_loyalty_ledger_order_accrual", "order_id",
+            unique=True, postgresql_where=text("entry_type = 'ACCRUAL'")
+        ),
+    )
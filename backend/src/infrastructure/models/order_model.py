@@ -1,7 +1,9 @@
 import uuid
+from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import String, Float, Enum, ForeignKey, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from typing import List
+from sqlalchemy import String, Float, Enum, ForeignKey, Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..databases.base import Base, UUIDMixin, TimestampMixin
 
 class OrderStatus(PyEnum):
@@ -24,3 +26,8 @@ class Order(Base, UUIDMixin, TimestampMixin):
     status: Mapped[OrderStatus] = mapped_column(Enum(OrderStatus), default=OrderStatus.PENDING)
     total_amount: Mapped[float] = mapped_column(Float, default=0.0)
     note: Mapped[str] = mapped_column(Text, nullable=True)
+    # Set once the order is folded into its customer's taste (see TasteService)
+    taste_folded_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+    # Loaded explicitly (selectinload) by queries that need items; never lazily
+    items: Mapped[List["OrderItem"]] = relationship("OrderItem", lazy="raise", viewonly=True)
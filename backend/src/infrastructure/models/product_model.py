@@ -1,7 +1,6 @@
 import uuid
 from sqlalchemy import String, Float, Boolean, Text, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column
-from pgvector.sqlalchemy import Vector
 from ..databases.base import Base, UUIDMixin, TimestampMixin
 
 class Product(Base, UUIDMixin, TimestampMixin):
@@ -13,6 +12,4 @@ class Product(Base, UUIDMixin, TimestampMixin):
     price: Mapped[float] = mapped_column(Float, nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=True)
     is_available: Mapped[bool] = mapped_column(Boolean, default=True)
-    
-    # Embedding vector for AI Recommendation (Dimension 1536 for OpenAI compatible embeddings)
-    embedding_vector = mapped_column(Vector(1536))
+    # Embeddings, one per embedding version, live in product_embeddings
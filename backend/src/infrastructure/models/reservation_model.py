@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import DateTime, Enum, ForeignKey
+from sqlalchemy import DateTime, Integer, Enum, ForeignKey, Index, func, literal_column, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from ..databases.base import Base, UUIDMixin, TimestampMixin
 
@@ -17,6 +18,28 @@ class Reservation(Base, UUIDMixin, TimestampMixin):
     tenant_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tenants.id"), nullable=False)
     branch_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("branches.id"), nullable=False)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+    table_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tables.id"), nullable=True)
     
     booking_time: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    party_size: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    duration_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=90, server_default="90")
     status: Mapped[ReservationStatus] = mapped_column(Enum(ReservationStatus), default=ReservationStatus.PENDING)
+
+    __table_args__ = (
+        Index("idx_reservations_branch_time", "branch_id", "booking_time"),
+        # A table cannot hold two live reservations whose time ranges overlap.
+        # Needs the btree_gist extension (see migration add_reservation_availability).
+        ExcludeConstraint(
+            ("table_id", "="),
+            (
+                func.tsrange(
+                    literal_column("booking_time"),
+                    literal_column("booking_time + duration_minutes * interval '1 minute'")
+                ),
+                "&&"
+            ),
+            name="excl_reservations_table_time",
+            using="gist",
+            where=text("table_id IS NOT NULL AND status IN ('PENDING', 'CONFIRMED')"),
+        ).ddl_if(dialect="postgresql"),
+    )
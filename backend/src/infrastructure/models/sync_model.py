@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import String, BigInteger, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from ..databases.base import Base
+
+
+class TenantSyncVersion(Base):
+    """Per-tenant change counter; its row lock orders commits that record changes."""
+    __tablename__ = "tenant_sync_versions"
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tenants.id"), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # Highest version whose tombstones were purged; older cursors must resync in full
+    purged_version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class SyncChange(Base):
+    """Latest change of an entity (one row per entity, tombstone when deleted)."""
+    __tablename__ = "sync_changes"
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tenants.id"), primary_key=True)
+    resource: Mapped[str] = mapped_column(String(20), primary_key=True)  # products, categories, tables, orders
+    entity_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("idx_sync_changes_cursor", "tenant_id", "resource", "version"),
+    )
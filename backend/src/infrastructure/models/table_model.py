@@ -1,6 +1,6 @@
 import uuid
 from enum import Enum as PyEnum
-from sqlalchemy import String, Enum, ForeignKey
+from sqlalchemy import String, Integer, Enum, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column
 from ..databases.base import Base, UUIDMixin, TimestampMixin
 
@@ -14,4 +14,5 @@ class Table(Base, UUIDMixin, TimestampMixin):
     tenant_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tenants.id"), nullable=False)
     branch_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("branches.id"), nullable=False)
     name: Mapped[str] = mapped_column(String(50), nullable=False)
+    seats: Mapped[int] = mapped_column(Integer, nullable=False, default=4, server_default="4")
     status: Mapped[TableStatus] = mapped_column(Enum(TableStatus), default=TableStatus.AVAILABLE)
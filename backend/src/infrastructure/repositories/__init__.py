@@ -10,6 +10,9 @@ from .review_repository import ReviewRepository
 from .invoice_repository import InvoiceRepository
 from .promotion_repository import PromotionRepository
 from .order_item_repository import OrderItemRepository
+from .sync_repository import SyncRepository
+from .outbox_repository import OutboxRepository
+from .embedding_version_repository import EmbeddingVersionRepository
 
 __all__ = [
     "UserRepository", 
@@ -23,5 +26,8 @@ __all__ = [
     "ReviewRepository",
     "InvoiceRepository",
     "PromotionRepository",
-    "OrderItemRepository"
+    "OrderItemRepository",
+    "SyncRepository",
+    "OutboxRepository",
+    "EmbeddingVersionRepository"
 ]
@@ -1,9 +1,17 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 import uuid
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from ...domain.interfaces.icategory_repository import ICategoryRepository
 from ...domain.models.category import Category as DomainCategory
 from ...infrastructure.models import Category as ORMCategory
+from .utils import rows_to_dicts
+
+# Columns of the list/read path, in response order
+ROW_COLUMNS = (
+    ORMCategory.id, ORMCategory.tenant_id, ORMCategory.name, ORMCategory.display_order,
+    ORMCategory.created_at, ORMCategory.updated_at,
+)
 
 class CategoryRepository(ICategoryRepository):
     def __init__(self, session: Session):
@@ -54,6 +62,16 @@ class CategoryRepository(ICategoryRepository):
         orms = self.session.query(ORMCategory).filter_by(tenant_id=tid).order_by(ORMCategory.display_order).all()
         return [self._to_domain(o) for o in orms]
 
+    def get_rows_by_tenant(self, tenant_id: str) -> List[Dict[str, Any]]:
+        """Get all categories of a tenant as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(ORMCategory.tenant_id == tenant_id).order_by(ORMCategory.display_order)
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_rows_by_ids(self, tenant_id: str, ids: List[str]) -> List[Dict[str, Any]]:
+        """Get a tenant's categories by ID as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(ORMCategory.tenant_id == tenant_id, ORMCategory.id.in_(ids))
+        return rows_to_dicts(self.session.execute(stmt))
+
     def delete(self, category_id: str) -> bool:
         """Delete category by ID"""
         uid = uuid.UUID(category_id) if isinstance(category_id, str) else category_id
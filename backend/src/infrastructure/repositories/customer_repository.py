@@ -1,10 +1,96 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Dict, Sequence
+from datetime import datetime
 import uuid
+from sqlalchemy import text, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Session
 
 from ...domain.interfaces.icustomer_repository import ICustomerRepository
-from ...domain.models.customer import Customer
+from ...domain.models.customer import Customer, TIER_THRESHOLDS, TIER_MULTIPLIERS
+from ...domain.models.loyalty_ledger import LoyaltyLedgerEntry, LoyaltyEntryType
 from ..models.customer_model import Customer as CustomerModel
+from ..models.loyalty_ledger_model import LoyaltyLedgerEntry as LedgerModel
+
+
+def _tier_case_sql(points_sql: str) -> str:
+    """SQL CASE expression mapping a points expression to its membership tier"""
+    branches = " ".join(
+        f"WHEN {points_sql} >= {threshold} THEN '{tier.value}'"
+        for tier, threshold in sorted(TIER_THRESHOLDS.items(), key=lambda t: -t[1])
+        if threshold > 0
+    )
+    return f"CASE {branches} ELSE 'IRON' END"
+
+
+def _multiplier_case_sql(tier_sql: str) -> str:
+    """SQL CASE expression mapping a tier column to its points multiplier"""
+    branches = " ".join(
+        f"WHEN '{tier.value}' THEN {multiplier}"
+        for tier, multiplier in TIER_MULTIPLIERS.items()
+    )
+    return f"CASE {tier_sql} {branches} ELSE 1.0 END"
+
+
+# Balance change and ledger append in one statement. The row lock taken by the
+# UPDATE serializes concurrent callers, and the WHERE clause guards redemptions
+# against overdrawing, so no read-modify-write happens in Python.
+_APPLY_POINTS_SQL = text(f"""
+    WITH upd AS (
+        UPDATE customers
+        SET loyalty_points = loyalty_points + :delta,
+            membership_tier = {_tier_case_sql("loyalty_points + :delta")},
+            updated_at = NOW()
+        WHERE tenant_id = :tenant_id AND user_id = :user_id AND loyalty_points + :delta >= 0
+        RETURNING id, tenant_id, user_id, phone_number, loyalty_points, membership_tier
+    ), ledger AS (
+        INSERT INTO loyalty_ledger (id, tenant_id, customer_id, entry_type, points, created_at)
+        SELECT gen_random_uuid(), upd.tenant_id, upd.id, :entry_type, :delta, NOW()
+        FROM upd
+    )
+    SELECT user_id, phone_number, loyalty_points, membership_tier FROM upd
+""")
+
+# Accrues points for many completed orders at once: one ledger row per order
+# (skipping orders that already accrued), then one balance/tier update per
+# customer from the aggregated new entries.
+_ACCRUE_ORDERS_SQL = text(f"""
+    WITH src AS (
+        SELECT o.id AS order_id, o.tenant_id, c.id AS customer_id,
+               FLOOR(FLOOR(o.total_amount * :points_rate)
+                     * {_multiplier_case_sql("c.membership_tier")})::int AS points
+        FROM orders o
+        JOIN customers c ON c.id = o.customer_id
+        WHERE o.id = ANY(:order_ids) AND o.tenant_id = :tenant_id AND o.status = 'COMPLETED'
+    ), ledger AS (
+        INSERT INTO loyalty_ledger (id, tenant_id, customer_id, order_id, entry_type, points, created_at)
+        SELECT gen_random_uuid(), tenant_id, customer_id, order_id, 'ACCRUAL', points, NOW()
+        FROM src
+        WHERE points > 0
+        ON CONFLICT (order_id) WHERE entry_type = 'ACCRUAL' DO NOTHING
+        RETURNING customer_id, points
+    ), totals AS (
+        SELECT customer_id, SUM(points) AS points FROM ledger GROUP BY customer_id
+    )
+    UPDATE customers c
+    SET loyalty_points = c.loyalty_points + totals.points,
+        membership_tier = {_tier_case_sql("c.loyalty_points + totals.points")},
+        updated_at = NOW()
+    FROM totals
+    WHERE c.id = totals.customer_id
+    RETURNING c.user_id, totals.points
+""").bindparams(
+    bindparam("order_ids", type_=ARRAY(UUID(as_uuid=True))),
+    bindparam("tenant_id", type_=UUID(as_uuid=True))
+)
+
+
+# Claims orders for the taste: an order is folded at most once, whatever
+# order its completion jobs run in
+_MARK_TASTE_ORDERS_SQL = text("""
+    UPDATE orders SET taste_folded_at = NOW()
+    WHERE id = ANY(:order_ids) AND taste_folded_at IS NULL
+    RETURNING id
+""").bindparams(bindparam("order_ids", type_=ARRAY(UUID(as_uuid=True))))
 
 
 class CustomerRepository(ICustomerRepository):
@@ -18,6 +104,26 @@ class CustomerRepository(ICustomerRepository):
             user_id=str(model.user_id),
             phone_number=model.phone_number,
             loyalty_points=model.loyalty_points,
+            membership_tier=model.membership_tier or "IRON",
+        )
+    
+    def _row_to_domain(self, row) -> Customer:
+        return Customer(
+            user_id=str(row.user_id),
+            phone_number=row.phone_number,
+            loyalty_points=row.loyalty_points,
+            membership_tier=row.membership_tier,
+        )
+    
+    def _ledger_to_domain(self, model: LedgerModel) -> LoyaltyLedgerEntry:
+        return LoyaltyLedgerEntry(
+            id=str(model.id),
+            tenant_id=str(model.tenant_id),
+            customer_id=str(model.customer_id),
+            entry_type=model.entry_type,
+            points=model.points,
+            order_id=str(model.order_id) if model.order_id else None,
+            created_at=model.created_at,
         )
     
     def _to_orm(self, customer: Customer, tenant_id: str = None) -> CustomerModel:
@@ -27,6 +133,7 @@ class CustomerRepository(ICustomerRepository):
         model.tenant_id = uuid.UUID(tenant_id) if tenant_id else None
         model.phone_number = customer.phone_number
         model.loyalty_points = customer.loyalty_points
+        model.membership_tier = customer.membership_tier.value
         return model
     
     def create(self, customer: Customer, tenant_id: str = None) -> Customer:
@@ -72,26 +179,98 @@ class CustomerRepository(ICustomerRepository):
             return True
         return False
     
-    def add_loyalty_points(self, user_id: str, points: int) -> Customer:
-        model = self.db.query(CustomerModel).filter(
+    def _apply_points(self, tenant_id: str, user_id: str, delta: int, entry_type: LoyaltyEntryType) -> Optional[Customer]:
+        row = self.db.execute(_APPLY_POINTS_SQL, {
+            "tenant_id": uuid.UUID(str(tenant_id)),
+            "user_id": uuid.UUID(user_id),
+            "delta": delta,
+            "entry_type": entry_type.value,
+        }).first()
+        return self._row_to_domain(row) if row else None
+    
+    def _ensure_exists(self, tenant_id: str, user_id: str) -> None:
+        exists = self.db.query(CustomerModel.id).filter(
+            CustomerModel.tenant_id == uuid.UUID(str(tenant_id)),
             CustomerModel.user_id == uuid.UUID(user_id)
         ).first()
-        if not model:
+        if not exists:
             raise ValueError(f"Customer for user {user_id} not found")
-        
-        model.loyalty_points += points
-        self.db.flush()
-        return self._to_domain(model)
     
-    def redeem_loyalty_points(self, user_id: str, points: int) -> bool:
-        model = self.db.query(CustomerModel).filter(
-            CustomerModel.user_id == uuid.UUID(user_id)
-        ).first()
-        if not model:
+    def add_loyalty_points(self, tenant_id: str, user_id: str, points: int) -> Customer:
+        customer = self._apply_points(tenant_id, user_id, points, LoyaltyEntryType.ADJUSTMENT)
+        if not customer:
             raise ValueError(f"Customer for user {user_id} not found")
-        
-        if model.loyalty_points >= points:
-            model.loyalty_points -= points
-            self.db.flush()
-            return True
-        return False
+        return customer
+    
+    def redeem_loyalty_points(self, tenant_id: str, user_id: str, points: int) -> Optional[Customer]:
+        customer = self._apply_points(tenant_id, user_id, -points, LoyaltyEntryType.REDEMPTION)
+        if customer:
+            return customer
+        # Only the failure path pays for telling "unknown" from "insufficient"
+        self._ensure_exists(tenant_id, user_id)
+        return None
+    
+    def accrue_points_for_orders(self, tenant_id: str, order_ids: List[str], points_rate: float = 0.1) -> Dict[str, int]:
+        if not order_ids:
+            return {}
+        rows = self.db.execute(_ACCRUE_ORDERS_SQL, {
+            "order_ids": [uuid.UUID(str(o)) for o in order_ids],
+            "tenant_id": uuid.UUID(str(tenant_id)),
+            "points_rate": points_rate,
+        }).all()
+        return {str(row.user_id): int(row.points) for row in rows}
+    
+    def get_loyalty_ledger(self, tenant_id: str, user_id: str, limit: int = 50) -> List[LoyaltyLedgerEntry]:
+        models = self.db.query(LedgerModel).join(
+            CustomerModel, CustomerModel.id == LedgerModel.customer_id
+        ).filter(
+            CustomerModel.tenant_id == uuid.UUID(tenant_id),
+            CustomerModel.user_id == uuid.UUID(user_id)
+        ).order_by(LedgerModel.created_at.desc()).limit(limit).all()
+        return [self._ledger_to_domain(m) for m in models]
+    
+    def get_id_for_user(self, tenant_id: str, user_id: str) -> Optional[str]:
+        customer_id = self.db.query(CustomerModel.id).filter(
+            CustomerModel.tenant_id == uuid.UUID(tenant_id),
+            CustomerModel.user_id == uuid.UUID(user_id)
+        ).scalar()
+        return str(customer_id) if customer_id else None
+    
+    def get_taste(self, tenant_id: str, customer_id: str, for_update: bool = False) -> Optional[Dict[str, Any]]:
+        query = self.db.query(
+            CustomerModel.taste_vector, CustomerModel.taste_version, CustomerModel.taste_weight,
+            CustomerModel.taste_updated_at
+        ).filter(
+            CustomerModel.tenant_id == uuid.UUID(tenant_id),
+            CustomerModel.id == uuid.UUID(customer_id)
+        )
+        if for_update:
+            # Serializes concurrent folds of the same customer's orders
+            query = query.with_for_update()
+        row = query.first()
+        if row is None:
+            return None
+        return {
+            "vector": None if row.taste_vector is None else list(row.taste_vector),
+            "version": row.taste_version,
+            "weight": row.taste_weight,
+            "updated_at": row.taste_updated_at,
+        }
+    
+    def save_taste(
+        self, customer_id: str, vector: Sequence[float], version: str, weight: float, updated_at: datetime
+    ) -> None:
+        self.db.query(CustomerModel).filter(
+            CustomerModel.id == uuid.UUID(customer_id)
+        ).update({
+            CustomerModel.taste_vector: list(vector),
+            CustomerModel.taste_version: version,
+            CustomerModel.taste_weight: weight,
+            CustomerModel.taste_updated_at: updated_at,
+        }, synchronize_session=False)
+    
+    def mark_taste_orders(self, order_ids: List[str]) -> List[str]:
+        if not order_ids:
+            return []
+        rows = self.db.execute(_MARK_TASTE_ORDERS_SQL, {"order_ids": [uuid.UUID(str(o)) for o in order_ids]})
+        return [str(row.id) for row in rows]
@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from sqlalchemy import select, update, text
+from sqlalchemy.orm import Session
+from ...domain.interfaces.iembedding_version_repository import IEmbeddingVersionRepository
+from ...infrastructure.models import EmbeddingVersion
+from .utils import rows_to_dicts
+
+VERSION_COLUMNS = (
+    EmbeddingVersion.version, EmbeddingVersion.model, EmbeddingVersion.dimension,
+    EmbeddingVersion.status, EmbeddingVersion.created_at, EmbeddingVersion.updated_at,
+)
+
+
+class EmbeddingVersionRepository(IEmbeddingVersionRepository):
+    """SQLAlchemy implementation of IEmbeddingVersionRepository"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_versions(self) -> List[Dict[str, Any]]:
+        stmt = select(*VERSION_COLUMNS).order_by(EmbeddingVersion.created_at)
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_version(self, version: str, for_update: bool = False) -> Optional[Dict[str, Any]]:
+        stmt = select(*VERSION_COLUMNS).where(EmbeddingVersion.version == version)
+        if for_update:
+            stmt = stmt.with_for_update()
+        rows = rows_to_dicts(self.session.execute(stmt))
+        return rows[0] if rows else None
+
+    def add_version(self, version: str, model: str, dimension: int, status: str) -> None:
+        now = datetime.utcnow()
+        self.session.add(EmbeddingVersion(
+            version=version, model=model, dimension=dimension, status=status, created_at=now, updated_at=now
+        ))
+        self.session.flush()
+
+    def set_status(self, version: str, status: str) -> None:
+        self.session.execute(
+            update(EmbeddingVersion)
+            .where(EmbeddingVersion.version == version)
+            .values(status=status, updated_at=datetime.utcnow())
+        )
+
+    def lock_versions(self) -> None:
+        self.session.execute(text("LOCK TABLE embedding_versions IN SHARE ROW EXCLUSIVE MODE"))
@@ -1,9 +1,30 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+from sqlalchemy import select, func, literal
 from sqlalchemy.orm import Session
 from ...domain.interfaces.iorder_item_repository import IOrderItemRepository
 from ...domain.models.order_item import OrderItem as DomainOrderItem
-from ...infrastructure.models import OrderItem as ORMOrderItem, OrderItemStatus as ORMOrderItemStatus
+from ...infrastructure.models import (
+    Order as ORMOrder, OrderStatus as ORMOrderStatus, OrderItem as ORMOrderItem, OrderItemStatus as ORMOrderItemStatus
+)
+from .utils import rows_to_dicts
+
+# Domain status -> persisted status
+STATUS_MAP = {
+    "PENDING": ORMOrderItemStatus.PENDING,
+    "COOKING": ORMOrderItemStatus.PREPARING,
+    "PREPARING": ORMOrderItemStatus.PREPARING,
+    "READY": ORMOrderItemStatus.SERVED,
+    "SERVED": ORMOrderItemStatus.SERVED,
+    "CANCELLED": ORMOrderItemStatus.CANCELLED
+}
+
+# Columns of the list/read path, in response order
+ROW_COLUMNS = (
+    ORMOrderItem.id, ORMOrderItem.tenant_id, ORMOrderItem.order_id, ORMOrderItem.product_id,
+    ORMOrderItem.quantity, ORMOrderItem.price_at_order, ORMOrderItem.item_status,
+    (ORMOrderItem.quantity * ORMOrderItem.price_at_order).label("subtotal"),
+)
 
 
 class OrderItemRepository(IOrderItemRepository):
@@ -12,8 +33,9 @@ class OrderItemRepository(IOrderItemRepository):
     def __init__(self, session: Session):
         self.session = session
 
-    def _to_domain(self, orm_item: ORMOrderItem) -> DomainOrderItem:
-        """Convert ORM model to domain model"""
+    @staticmethod
+    def _to_domain(orm_item: ORMOrderItem) -> DomainOrderItem:
+        """Convert ORM model to domain model (also used for the items OrderRepository loads)"""
         return DomainOrderItem(
             id=str(orm_item.id),
             tenant_id=str(orm_item.tenant_id),
@@ -26,15 +48,6 @@ class OrderItemRepository(IOrderItemRepository):
 
     def _to_orm(self, domain_item: DomainOrderItem) -> ORMOrderItem:
         """Convert domain model to ORM model"""
-        # Map domain status to ORM status
-        status_map = {
-            "PENDING": ORMOrderItemStatus.PENDING,
-            "COOKING": ORMOrderItemStatus.PREPARING,
-            "PREPARING": ORMOrderItemStatus.PREPARING,
-            "READY": ORMOrderItemStatus.SERVED,
-            "SERVED": ORMOrderItemStatus.SERVED,
-            "CANCELLED": ORMOrderItemStatus.CANCELLED
-        }
         return ORMOrderItem(
             id=domain_item.id,
             tenant_id=domain_item.tenant_id,
@@ -42,7 +55,7 @@ class OrderItemRepository(IOrderItemRepository):
             product_id=domain_item.product_id,
             quantity=domain_item.quantity,
             price_at_order=domain_item.price_at_order,
-            item_status=status_map.get(domain_item.item_status, ORMOrderItemStatus.PENDING),
+            item_status=STATUS_MAP.get(domain_item.item_status, ORMOrderItemStatus.PENDING),
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow()
         )
@@ -61,6 +74,13 @@ class OrderItemRepository(IOrderItemRepository):
             return self._to_domain(orm)
         return None
 
+    def get_for_update(self, order_item_id: str) -> Optional[DomainOrderItem]:
+        """Get order item by ID, locking its row until the transaction ends"""
+        orm = self.session.query(ORMOrderItem).filter_by(id=order_item_id).with_for_update().first()
+        if orm:
+            return self._to_domain(orm)
+        return None
+
     def get_all(self) -> List[DomainOrderItem]:
         """Get all order items"""
         orm_list = self.session.query(ORMOrderItem).all()
@@ -80,18 +100,9 @@ class OrderItemRepository(IOrderItemRepository):
         """Update order item"""
         orm = self.session.query(ORMOrderItem).filter_by(id=order_item_id).first()
         if orm:
-            # Map domain status to ORM status
-            status_map = {
-                "PENDING": ORMOrderItemStatus.PENDING,
-                "COOKING": ORMOrderItemStatus.PREPARING,
-                "PREPARING": ORMOrderItemStatus.PREPARING,
-                "READY": ORMOrderItemStatus.SERVED,
-                "SERVED": ORMOrderItemStatus.SERVED,
-                "CANCELLED": ORMOrderItemStatus.CANCELLED
-            }
             orm.quantity = order_item.quantity
             orm.price_at_order = order_item.price_at_order
-            orm.item_status = status_map.get(order_item.item_status, orm.item_status)
+            orm.item_status = STATUS_MAP.get(order_item.item_status, orm.item_status)
             orm.updated_at = datetime.utcnow()
             self.session.flush()
             return self._to_domain(orm)
@@ -108,17 +119,95 @@ class OrderItemRepository(IOrderItemRepository):
 
     def get_by_status(self, order_id: str, status: str) -> List[DomainOrderItem]:
         """Get order items by status for an order"""
-        status_map = {
-            "PENDING": ORMOrderItemStatus.PENDING,
-            "COOKING": ORMOrderItemStatus.PREPARING,
-            "PREPARING": ORMOrderItemStatus.PREPARING,
-            "READY": ORMOrderItemStatus.SERVED,
-            "SERVED": ORMOrderItemStatus.SERVED,
-            "CANCELLED": ORMOrderItemStatus.CANCELLED
-        }
-        orm_status = status_map.get(status, ORMOrderItemStatus.PENDING)
+        orm_status = STATUS_MAP.get(status, ORMOrderItemStatus.PENDING)
         orm_list = self.session.query(ORMOrderItem).filter_by(
             order_id=order_id,
             item_status=orm_status
         ).all()
         return [self._to_domain(i) for i in orm_list]
+
+    def get_rows_by_order(self, order_id: str) -> List[Dict[str, Any]]:
+        """Get all items for an order as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(ORMOrderItem.order_id == order_id)
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_rows_by_status(self, order_id: str, status: str) -> List[Dict[str, Any]]:
+        """Get order items by status for an order as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(
+            ORMOrderItem.order_id == order_id,
+            ORMOrderItem.item_status == STATUS_MAP.get(status, ORMOrderItemStatus.PENDING)
+        )
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_completed_order_products(self, tenant_id: str) -> List[Tuple[Any, Any]]:
+        """Distinct (order_id, product_id) of a tenant's completed orders, cancelled lines excluded"""
+        stmt = (
+            select(ORMOrderItem.order_id, ORMOrderItem.product_id)
+            .join(ORMOrder, ORMOrder.id == ORMOrderItem.order_id)
+            .where(
+                ORMOrder.tenant_id == tenant_id,
+                ORMOrder.status == ORMOrderStatus.COMPLETED,
+                ORMOrderItem.item_status != ORMOrderItemStatus.CANCELLED
+            )
+            .distinct()
+        )
+        return self.session.execute(stmt).all()
+
+    def get_decayed_product_scores(
+        self, branch_id: str, half_life_seconds: float, since: datetime, now: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Quantity ordered per product in a branch's orders completed since `since`,
+        each order weighted 2^-(age / half_life) at `now`
+        """
+        age = func.extract("epoch", literal(now) - ORMOrder.updated_at)
+        score = func.sum(ORMOrderItem.quantity * func.power(2.0, -age / half_life_seconds))
+        stmt = (
+            select(ORMOrderItem.product_id, score.label("score"))
+            .join(ORMOrder, ORMOrder.id == ORMOrderItem.order_id)
+            .where(
+                ORMOrder.branch_id == branch_id,
+                ORMOrder.status == ORMOrderStatus.COMPLETED,
+                ORMOrder.updated_at >= since,
+                ORMOrderItem.item_status != ORMOrderItemStatus.CANCELLED
+            )
+            .group_by(ORMOrderItem.product_id)
+        )
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_customer_order_lines(self, tenant_id: str, customer_id: str) -> List[Dict[str, Any]]:
+        """
+        (order_id, completed_at, product_id, quantity) of a customer's completed
+        orders, cancelled lines excluded, oldest order first
+        """
+        stmt = (
+            select(
+                ORMOrder.id.label("order_id"), ORMOrder.updated_at.label("completed_at"),
+                ORMOrderItem.product_id, func.sum(ORMOrderItem.quantity).label("quantity")
+            )
+            .join(ORMOrder, ORMOrder.id == ORMOrderItem.order_id)
+            .where(
+                ORMOrder.tenant_id == tenant_id,
+                ORMOrder.customer_id == customer_id,
+                ORMOrder.status == ORMOrderStatus.COMPLETED,
+                ORMOrderItem.item_status != ORMOrderItemStatus.CANCELLED
+            )
+            .group_by(ORMOrder.id, ORMOrder.updated_at, ORMOrderItem.product_id)
+            .order_by(ORMOrder.updated_at, ORMOrder.id)
+        )
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_product_order_counts(self, tenant_id: str, since: datetime) -> Dict[str, int]:
+        """Quantity ordered per product in a tenant's orders completed since `since`, by product ID"""
+        stmt = (
+            select(ORMOrderItem.product_id, func.sum(ORMOrderItem.quantity))
+            .join(ORMOrder, ORMOrder.id == ORMOrderItem.order_id)
+            .where(
+                ORMOrder.tenant_id == tenant_id,
+                ORMOrder.status == ORMOrderStatus.COMPLETED,
+                ORMOrder.updated_at >= since,
+                ORMOrderItem.item_status != ORMOrderItemStatus.CANCELLED
+            )
+            .group_by(ORMOrderItem.product_id)
+        )
+        return {str(product_id): int(quantity) for product_id, quantity in self.session.execute(stmt)}
@@ -1,8 +1,20 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+from sqlalchemy import update, select
+from sqlalchemy.orm import Session, selectinload
 from ...domain.interfaces.iorder_repository import IOrderRepository
 from ...domain.models.order import Order as DomainOrder
-from ...infrastructure.models import Order as ORMOrder
+from ...infrastructure.models import Order as ORMOrder, OrderItem as ORMOrderItem
+from .utils import rows_to_dicts
+from .order_item_repository import OrderItemRepository, ROW_COLUMNS as ITEM_ROW_COLUMNS
+from ..databases.change_log import record_change
+
+# Columns of the list/read path, in response order
+ROW_COLUMNS = (
+    ORMOrder.id, ORMOrder.tenant_id, ORMOrder.branch_id, ORMOrder.table_id,
+    ORMOrder.customer_id, ORMOrder.status, ORMOrder.total_amount, ORMOrder.note,
+    ORMOrder.created_at, ORMOrder.updated_at,
+)
 
 
 class OrderRepository(IOrderRepository):
@@ -26,6 +38,12 @@ class OrderRepository(IOrderRepository):
             updated_at=orm_order.updated_at
         )
 
+    def _to_domain_with_items(self, orm_order: ORMOrder) -> DomainOrder:
+        """Convert ORM model with its eagerly loaded items to domain model"""
+        order = self._to_domain(orm_order)
+        order.items = [OrderItemRepository._to_domain(i) for i in orm_order.items]
+        return order
+
     def _to_orm(self, domain_order: DomainOrder) -> ORMOrder:
         """Convert domain model to ORM model"""
         from ...infrastructure.models import OrderStatus as ORMOrderStatus
@@ -56,6 +74,36 @@ class OrderRepository(IOrderRepository):
             return self._to_domain(orm_order)
         return None
 
+    def get_with_items(self, order_id: str) -> Optional[DomainOrder]:
+        """Get order by ID with its items (one query for the order, one for the items)"""
+        orm_order = (
+            self.session.query(ORMOrder)
+            .options(selectinload(ORMOrder.items))
+            .filter_by(id=order_id)
+            .first()
+        )
+        if orm_order:
+            return self._to_domain_with_items(orm_order)
+        return None
+
+    def get_by_branch_with_items(
+        self, tenant_id: str, branch_id: str, statuses: List[str]
+    ) -> List[DomainOrder]:
+        """Get a branch's orders in the given statuses with items, oldest first, in two queries"""
+        from ...infrastructure.models import OrderStatus as ORMOrderStatus
+        orm_orders = (
+            self.session.query(ORMOrder)
+            .options(selectinload(ORMOrder.items))
+            .filter(
+                ORMOrder.tenant_id == tenant_id,
+                ORMOrder.branch_id == branch_id,
+                ORMOrder.status.in_([ORMOrderStatus(s) for s in statuses])
+            )
+            .order_by(ORMOrder.created_at)
+            .all()
+        )
+        return [self._to_domain_with_items(o) for o in orm_orders]
+
     def get_all(self) -> List[DomainOrder]:
         """Get all orders"""
         orm_orders = self.session.query(ORMOrder).all()
@@ -80,6 +128,59 @@ class OrderRepository(IOrderRepository):
         ).all()
         return [self._to_domain(o) for o in orm_orders]
 
+    def get_rows_by_tenant(self, tenant_id: str) -> List[Dict[str, Any]]:
+        """Get all orders for a tenant as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(ORMOrder.tenant_id == tenant_id)
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_rows_by_table(self, table_id: str) -> List[Dict[str, Any]]:
+        """Get orders for a table as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(ORMOrder.table_id == table_id)
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_rows_by_status(self, tenant_id: str, status: str) -> List[Dict[str, Any]]:
+        """Get orders by status for a tenant as raw column dicts (read-only fast path)"""
+        from ...infrastructure.models import OrderStatus as ORMOrderStatus
+        stmt = select(*ROW_COLUMNS).where(
+            ORMOrder.tenant_id == tenant_id,
+            ORMOrder.status == ORMOrderStatus(status)
+        )
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_rows_with_items(
+        self, tenant_id: str, statuses: List[str], order_ids: Optional[List[str]] = None,
+        branch_id: Optional[str] = None, table_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a tenant's orders in the given statuses, optionally narrowed to IDs,
+        a branch or a table, as raw column dicts with an "items" list (two queries)
+        """
+        from ...infrastructure.models import OrderStatus as ORMOrderStatus
+        stmt = select(*ROW_COLUMNS).where(
+            ORMOrder.tenant_id == tenant_id,
+            ORMOrder.status.in_([ORMOrderStatus(s) for s in statuses])
+        )
+        if order_ids is not None:
+            stmt = stmt.where(ORMOrder.id.in_(order_ids))
+        if branch_id:
+            stmt = stmt.where(ORMOrder.branch_id == branch_id)
+        if table_id:
+            stmt = stmt.where(ORMOrder.table_id == table_id)
+        orders = rows_to_dicts(self.session.execute(stmt.order_by(ORMOrder.created_at)))
+        if not orders:
+            return orders
+
+        by_id = {}
+        for order in orders:
+            order["items"] = []
+            by_id[order["id"]] = order
+        items = self.session.execute(
+            select(*ITEM_ROW_COLUMNS).where(ORMOrderItem.order_id.in_(list(by_id)))
+        )
+        for item in rows_to_dicts(items):
+            by_id[item["order_id"]]["items"].append(item)
+        return orders
+
     def update(self, order_id: str, order: DomainOrder) -> DomainOrder:
         """Update order"""
         from ...infrastructure.models import OrderStatus as ORMOrderStatus
@@ -93,6 +194,25 @@ class OrderRepository(IOrderRepository):
             return self._to_domain(orm_order)
         raise ValueError(f"Order with id {order_id} not found")
 
+    def adjust_total(self, order_id: str, delta: float) -> Optional[float]:
+        """Atomically add delta to the order total, returning the new total"""
+        stmt = (
+            update(ORMOrder)
+            .where(ORMOrder.id == order_id)
+            .values(
+                total_amount=ORMOrder.total_amount + delta,
+                updated_at=datetime.utcnow()
+            )
+            .returning(ORMOrder.total_amount, ORMOrder.tenant_id)
+            .execution_options(synchronize_session=False)
+        )
+        row = self.session.execute(stmt).one_or_none()
+        if row is None:
+            return None
+        # Bulk UPDATE bypasses the session hooks
+        record_change(self.session, row.tenant_id, "orders", order_id)
+        return row.total_amount
+
     def delete(self, order_id: str) -> bool:
         """Delete order"""
         orm_order = self.session.query(ORMOrder).filter_by(id=order_id).first()
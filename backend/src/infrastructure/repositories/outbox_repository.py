@@ -0,0 +1,104 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from ...domain.interfaces.ijob_outbox import IJobOutbox
+from ...infrastructure.models import JobOutbox
+from ..services.job_queue import make_job, OUTBOX_PENDING_KEY, QUEUED, DUPLICATE
+
+
+class OutboxRepository(IJobOutbox):
+    """
+    SQLAlchemy implementation of IJobOutbox.
+    The row is written with the caller's transaction; job_queue pushes the
+    job after commit, and the worker deletes the row when the job settles.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def enqueue(
+        self, name: str, payload: Dict[str, Any], lane: Optional[str] = None, dedupe_key: Optional[str] = None,
+        delay: float = 0.0
+    ) -> str:
+        outbox_id = uuid.uuid4()
+        job = make_job(
+            name, payload, lane,
+            dedupe_key=dedupe_key or f"outbox:{outbox_id}",
+            job_id=outbox_id.hex,
+            outbox_id=str(outbox_id),
+            delay=delay
+        )
+        self.session.add(JobOutbox(
+            id=outbox_id,
+            name=name,
+            payload=payload,
+            lane=job["lane"],
+            dedupe_key=job["dedupe_key"],
+            created_at=datetime.utcnow()
+        ))
+        self.session.info.setdefault(OUTBOX_PENDING_KEY, []).append(job)
+        return str(outbox_id)
+
+
+def _job_from_row(row: JobOutbox) -> Dict[str, Any]:
+    return make_job(
+        row.name, row.payload, row.lane,
+        dedupe_key=row.dedupe_key,
+        job_id=row.id.hex,
+        outbox_id=str(row.id)
+    )
+
+
+def delete_outbox_rows(ids: List[str]) -> None:
+    """Delete settled outbox rows (own session; called by job workers)"""
+    from ..databases.postgres import SessionLocal
+
+    session = SessionLocal()
+    try:
+        session.execute(delete(JobOutbox).where(JobOutbox.id.in_([uuid.UUID(i) for i in ids])))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def relay_outbox_rows(queue, older_than: float, limit: int = 500) -> int:
+    """
+    Push outbox rows older than `older_than` seconds again; returns how many
+    were queued. Rows whose job is still queued or running are left alone
+    (the queue reports them in flight); rows whose dedupe key is held by a
+    different job are duplicates and are deleted.
+    """
+    from ..databases.postgres import SessionLocal
+
+    session = SessionLocal()
+    try:
+        rows = (
+            session.query(JobOutbox)
+            .filter(JobOutbox.created_at < datetime.utcnow() - timedelta(seconds=older_than))
+            .order_by(JobOutbox.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        pushed = 0
+        duplicates = []
+        for row in rows:
+            result = queue.enqueue(_job_from_row(row))
+            if result == QUEUED:
+                pushed += 1
+            elif result == DUPLICATE:
+                duplicates.append(row.id)
+        if duplicates:
+            session.execute(delete(JobOutbox).where(JobOutbox.id.in_(duplicates)))
+        session.commit()
+        return pushed
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
@@ -1,8 +1,35 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime
+from sqlalchemy import (
+    select, delete, values, column, cast, func, literal, literal_column, null, exists, and_, union_all,
+    Float, String, Uuid
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from pgvector.sqlalchemy import Vector
 from ...domain.interfaces.iproduct_repository import IProductRepository
 from ...domain.models.product import Product as DomainProduct
-from ...infrastructure.models import Product as ORMProduct
+from ...infrastructure.models import Product as ORMProduct, Category as ORMCategory, ProductEmbedding
+from ..services.embedding_service import EMBEDDING_MODELS
+from .utils import rows_to_dicts
+from .vector_search import nearest_in_partition, ef_search
+
+# Columns of the list/read path; the embedding vector is never sent to clients
+ROW_COLUMNS = (
+    ORMProduct.id, ORMProduct.tenant_id, ORMProduct.category_id, ORMProduct.name,
+    ORMProduct.price, ORMProduct.description, ORMProduct.is_available,
+    ORMProduct.created_at, ORMProduct.updated_at,
+)
+
+# Search expressions; idx_products_search_document and idx_products_name_trgm
+# index exactly these, so they must stay in step with that migration
+SEARCH_DOCUMENT_SQL = (
+    "to_tsvector('simple'::regconfig, "
+    "s2o_unaccent(coalesce(products.name, '') || ' ' || coalesce(products.description, '')))"
+)
+SEARCH_NAME_SQL = "s2o_unaccent(lower(products.name))"
+# Minimum word_similarity of a fuzzy name match
+TRIGRAM_THRESHOLD = 0.4
 
 class ProductRepository(IProductRepository):
     def __init__(self, session: Session):
@@ -17,12 +44,23 @@ class ProductRepository(IProductRepository):
             price=orm.price,
             description=orm.description,
             is_available=orm.is_available,
-            embedding_vector=orm.embedding_vector,
             created_at=orm.created_at,
             updated_at=orm.updated_at
         )
 
     def save(self, product: DomainProduct) -> DomainProduct:
+        existing = self.session.query(ORMProduct).filter_by(id=product.id).first()
+        if existing:
+            # Update existing; the embedding is maintained by the embedding job
+            existing.category_id = product.category_id
+            existing.name = product.name
+            existing.price = product.price
+            existing.description = product.description
+            existing.is_available = product.is_available
+            existing.updated_at = product.updated_at
+            self.session.flush()
+            return product
+
         orm = ORMProduct(
             id=product.id,
             tenant_id=product.tenant_id,
@@ -31,7 +69,6 @@ class ProductRepository(IProductRepository):
             price=product.price,
             description=product.description,
             is_available=product.is_available,
-            embedding_vector=product.embedding_vector,
             created_at=product.created_at,
             updated_at=product.updated_at
         )
@@ -50,3 +87,214 @@ class ProductRepository(IProductRepository):
     def get_all_by_tenant(self, tenant_id: str) -> List[DomainProduct]:
         orms = self.session.query(ORMProduct).filter_by(tenant_id=tenant_id).all()
         return [self._to_domain(o) for o in orms]
+
+    def get_rows_by_category(self, category_id: str) -> List[Dict[str, Any]]:
+        """Get products of a category as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(ORMProduct.category_id == category_id)
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_rows_by_tenant(self, tenant_id: str) -> List[Dict[str, Any]]:
+        """Get all products of a tenant as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(ORMProduct.tenant_id == tenant_id)
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_rows_by_ids(self, tenant_id: str, ids: List[str]) -> List[Dict[str, Any]]:
+        """Get a tenant's products by ID as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(ORMProduct.tenant_id == tenant_id, ORMProduct.id.in_(ids))
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_embedding_sources(self, tenant_id: str, version: str) -> List[Dict[str, Any]]:
+        """Text fields products are embedded from, with the hash of their embedding in `version`"""
+        stmt = (
+            select(
+                ORMProduct.id, ORMProduct.name, ORMProduct.description,
+                ORMCategory.name.label("category_name"), ProductEmbedding.content_hash.label("embedding_hash")
+            )
+            .join(ORMCategory, ORMCategory.id == ORMProduct.category_id)
+            .outerjoin(ProductEmbedding, and_(
+                ProductEmbedding.product_id == ORMProduct.id, ProductEmbedding.model_version == version
+            ))
+            .where(ORMProduct.tenant_id == tenant_id)
+        )
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_unembedded_sources(self, version: str, after_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """
+        Next `limit` products of any tenant, in ID order after `after_id`,
+        without an embedding in `version`; same fields as get_embedding_sources
+        """
+        stmt = (
+            select(
+                ORMProduct.id, ORMProduct.name, ORMProduct.description,
+                ORMCategory.name.label("category_name"), null().label("embedding_hash")
+            )
+            .join(ORMCategory, ORMCategory.id == ORMProduct.category_id)
+            .where(~exists().where(
+                ProductEmbedding.product_id == ORMProduct.id, ProductEmbedding.model_version == version
+            ))
+            .order_by(ORMProduct.id)
+            .limit(limit)
+        )
+        if after_id:
+            stmt = stmt.where(ORMProduct.id > after_id)
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def count_embeddings(self, version: str) -> Tuple[int, int]:
+        """(products with an embedding in `version`, all products)"""
+        embedded = select(func.count()).where(ProductEmbedding.model_version == version).scalar_subquery()
+        return tuple(self.session.execute(select(embedded, select(func.count(ORMProduct.id)).scalar_subquery())).one())
+
+    def update_embeddings(self, version: str, rows: List[Dict[str, Any]]) -> int:
+        """
+        Upsert embeddings of one version in one INSERT ... SELECT FROM (VALUES ...)
+        ... ON CONFLICT statement.
+        rows: [{"id", "embedding", "embedding_hash"}]
+        """
+        if not rows:
+            return 0
+        dimension = EMBEDDING_MODELS[version].dimension
+        data = values(
+            column("id", Uuid), column("embedding", Vector(dimension)), column("embedding_hash", String),
+            name="new_embeddings"
+        ).data([(r["id"], r["embedding"], r["embedding_hash"]) for r in rows])
+        source = select(
+            data.c.id, literal(version), ORMProduct.tenant_id,
+            # VALUES params arrive as text; vector has no implicit cast from it
+            cast(data.c.embedding, Vector(dimension)), data.c.embedding_hash, literal(datetime.utcnow())
+        ).join_from(data, ORMProduct, ORMProduct.id == data.c.id)
+        stmt = pg_insert(ProductEmbedding).from_select(
+            ["product_id", "model_version", "tenant_id", "embedding", "content_hash", "updated_at"], source
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductEmbedding.product_id, ProductEmbedding.model_version],
+            set_={
+                "embedding": stmt.excluded.embedding,
+                "content_hash": stmt.excluded.content_hash,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+        return self.session.execute(stmt).rowcount
+
+    def delete_embeddings(self, version: str) -> int:
+        """Delete every product embedding of a version"""
+        stmt = delete(ProductEmbedding).where(ProductEmbedding.model_version == version)
+        return self.session.execute(stmt).rowcount
+
+    def get_embedding(self, tenant_id: str, product_id: str, version: str) -> Optional[List[float]]:
+        """Get a product's embedding in `version` (None while not generated yet)"""
+        stmt = select(ProductEmbedding.embedding).where(
+            ProductEmbedding.tenant_id == tenant_id,
+            ProductEmbedding.product_id == product_id,
+            ProductEmbedding.model_version == version
+        )
+        embedding = self.session.execute(stmt).scalar_one_or_none()
+        return None if embedding is None else list(embedding)
+
+    def get_embeddings(self, tenant_id: str, product_ids: List[str], version: str) -> Dict[str, List[float]]:
+        """Embeddings in `version` of the given products by ID; products without one are left out"""
+        if not product_ids:
+            return {}
+        stmt = select(ProductEmbedding.product_id, ProductEmbedding.embedding).where(
+            ProductEmbedding.tenant_id == tenant_id,
+            ProductEmbedding.product_id.in_(product_ids),
+            ProductEmbedding.model_version == version
+        )
+        return {str(pid): list(embedding) for pid, embedding in self.session.execute(stmt)}
+
+    def _nearest(self, tenant_id: str, version: str, embedding: List[float], top_k: int, *criteria):
+        """nearest_in_partition() over a tenant's product embeddings of one version"""
+        return nearest_in_partition(
+            ProductEmbedding.product_id, ProductEmbedding.embedding, embedding, top_k,
+            [ProductEmbedding.model_version == version, ProductEmbedding.tenant_id == tenant_id], *criteria,
+            dimension=EMBEDDING_MODELS[version].dimension
+        )
+
+    def search_rows_by_embedding(
+        self, tenant_id: str, version: str, embedding: List[float], top_k: int = 5, exclude_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Nearest products of a tenant by cosine distance between embeddings of
+        `version`, as raw column dicts with a similarity score
+        """
+        criteria = []
+        if exclude_id:
+            criteria.append(ProductEmbedding.product_id != exclude_id)
+        self.session.execute(select(func.set_config("hnsw.ef_search", ef_search(top_k, partitioned=True), True)))
+        near = self._nearest(tenant_id, version, embedding, top_k, *criteria)
+        stmt = (
+            select(*ROW_COLUMNS, (1 - near.c.distance).label("similarity"))
+            .join_from(ORMProduct, near, ORMProduct.id == near.c.id)
+            .order_by(near.c.distance)
+        )
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def search_rows_hybrid(
+        self,
+        tenant_id: str,
+        tsquery: str,
+        text: str,
+        embedding: Optional[List[float]],
+        pool: int,
+        rrf_k: int,
+        limit: int,
+        offset: int = 0,
+        available_only: bool = True,
+        version: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Products of a tenant ranked by reciprocal-rank fusion of up to three
+        rankings: full-text (tsquery), fuzzy name (text) and, with an embedding
+        of `version`, cosine distance. Each contributes its top `pool`. Returns
+        one page of raw column dicts with their fused score, and the number of
+        fused results.
+        """
+        self.session.execute(select(
+            func.set_config("pg_trgm.word_similarity_threshold", str(TRIGRAM_THRESHOLD), True),
+            func.set_config("hnsw.ef_search", ef_search(pool, partitioned=True), True),
+        ))
+        scope = [ORMProduct.tenant_id == tenant_id]
+        if available_only:
+            scope.append(ORMProduct.is_available.is_(True))
+
+        def ranked(score, *criteria):
+            # Limit first, so the index scan can stop early, then number the rows
+            top = (
+                select(ORMProduct.id, score.label("score"))
+                .where(*scope, *criteria)
+                .order_by(score.desc())
+                .limit(pool)
+                .subquery()
+            )
+            return select(top.c.id, func.row_number().over(order_by=top.c.score.desc()).label("rank"))
+
+        document = literal_column(SEARCH_DOCUMENT_SQL)
+        query = func.to_tsquery(literal_column("'simple'::regconfig"), func.s2o_unaccent(tsquery))
+        name = literal_column(SEARCH_NAME_SQL)
+        needle = func.s2o_unaccent(func.lower(text))
+        rankings = [
+            ranked(func.ts_rank_cd(document, query), document.op("@@")(query)),
+            ranked(func.word_similarity(needle, name), needle.op("<%")(name)),
+        ]
+        if embedding is not None:
+            near = self._nearest(
+                tenant_id, version, embedding, pool, ProductEmbedding.product_id == ORMProduct.id, *scope
+            )
+            rankings.append(select(near.c.id, func.row_number().over(order_by=near.c.distance).label("rank")))
+        ranks = union_all(*rankings).subquery("ranks")
+        fused = (
+            select(ranks.c.id, cast(func.sum(1.0 / (rrf_k + ranks.c.rank)), Float).label("score"))
+            .group_by(ranks.c.id)
+            .cte("fused")
+        )
+        stmt = (
+            select(*ROW_COLUMNS, fused.c.score, func.count().over().label("total"))
+            .join_from(ORMProduct, fused, ORMProduct.id == fused.c.id)
+            .order_by(fused.c.score.desc(), ORMProduct.name, ORMProduct.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        rows = rows_to_dicts(self.session.execute(stmt))
+        total = rows[0]["total"] if rows else 0
+        for row in rows:
+            del row["total"]
+        return rows, total
@@ -1,10 +1,17 @@
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from ...domain.constants import MAX_RESERVATION_MINUTES
+from ...domain.exceptions import ReservationConflictException
 from ...domain.interfaces.ireservation_repository import IReservationRepository
 from ...domain.models.reservation import Reservation as DomainReservation
 from ...infrastructure.models import Reservation as ORMReservation, ReservationStatus as ORMReservationStatus
 
+# Statuses that hold a table (mirrors the exclusion constraint's WHERE clause)
+ACTIVE_STATUSES = (ORMReservationStatus.PENDING, ORMReservationStatus.CONFIRMED)
+EXCLUSION_CONSTRAINT = "excl_reservations_table_time"
+
 
 class ReservationRepository(IReservationRepository):
     """SQLAlchemy implementation of IReservationRepository"""
@@ -20,9 +27,11 @@ class ReservationRepository(IReservationRepository):
             branch_id=str(orm_reservation.branch_id),
             user_id=str(orm_reservation.user_id),
             booking_time=orm_reservation.booking_time,
-            party_size=1,  # Default if not in ORM model
+            party_size=orm_reservation.party_size,
             status=orm_reservation.status.value if orm_reservation.status else "PENDING",
-            created_at=orm_reservation.created_at
+            created_at=orm_reservation.created_at,
+            table_id=str(orm_reservation.table_id) if orm_reservation.table_id else None,
+            duration_minutes=orm_reservation.duration_minutes
         )
 
     def _to_orm(self, domain_reservation: DomainReservation) -> ORMReservation:
@@ -32,17 +41,29 @@ class ReservationRepository(IReservationRepository):
             tenant_id=domain_reservation.tenant_id,
             branch_id=domain_reservation.branch_id,
             user_id=domain_reservation.user_id,
+            table_id=domain_reservation.table_id,
             booking_time=domain_reservation.booking_time,
+            party_size=domain_reservation.party_size,
+            duration_minutes=domain_reservation.duration_minutes,
             status=ORMReservationStatus(domain_reservation.status) if domain_reservation.status else ORMReservationStatus.PENDING,
             created_at=domain_reservation.created_at,
             updated_at=datetime.utcnow()
         )
 
+    def _flush(self) -> None:
+        """Flush, turning a double-booking rejected by the database into a domain error"""
+        try:
+            self.session.flush()
+        except IntegrityError as e:
+            if EXCLUSION_CONSTRAINT in str(e.orig):
+                raise ReservationConflictException("Table is already booked for the requested time") from e
+            raise
+
     def create(self, reservation: DomainReservation) -> DomainReservation:
         """Create a new reservation"""
         orm_reservation = self._to_orm(reservation)
         self.session.add(orm_reservation)
-        self.session.flush()
+        self._flush()
         return reservation
 
     def get_by_id(self, reservation_id: str) -> Optional[DomainReservation]:
@@ -77,14 +98,28 @@ class ReservationRepository(IReservationRepository):
         ).order_by(ORMReservation.booking_time).all()
         return [self._to_domain(r) for r in orm_list]
 
+    def get_active_in_window(self, branch_id: str, start: datetime, end: datetime) -> List[DomainReservation]:
+        """Get pending/confirmed reservations of a branch that may overlap [start, end)"""
+        orm_list = self.session.query(ORMReservation).filter(
+            ORMReservation.branch_id == branch_id,
+            ORMReservation.status.in_(ACTIVE_STATUSES),
+            ORMReservation.booking_time < end,
+            # No reservation is longer than MAX_RESERVATION_MINUTES, so earlier ones end before start
+            ORMReservation.booking_time > start - timedelta(minutes=MAX_RESERVATION_MINUTES)
+        ).all()
+        return [self._to_domain(r) for r in orm_list]
+
     def update(self, reservation_id: str, reservation: DomainReservation) -> DomainReservation:
         """Update reservation"""
         orm = self.session.query(ORMReservation).filter_by(id=reservation_id).first()
         if orm:
             orm.booking_time = reservation.booking_time
+            orm.party_size = reservation.party_size
+            orm.duration_minutes = reservation.duration_minutes
+            orm.table_id = reservation.table_id
             orm.status = ORMReservationStatus(reservation.status) if reservation.status else orm.status
             orm.updated_at = datetime.utcnow()
-            self.session.flush()
+            self._flush()
             return self._to_domain(orm)
         raise ValueError(f"Reservation with id {reservation_id} not found")
 
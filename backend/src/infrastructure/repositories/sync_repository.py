@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import List, Dict, Any, Tuple
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from ...domain.interfaces.isync_repository import ISyncRepository
+from ...infrastructure.models import SyncChange, TenantSyncVersion
+from .utils import rows_to_dicts
+
+CHANGE_COLUMNS = (SyncChange.resource, SyncChange.entity_id, SyncChange.version, SyncChange.deleted)
+
+# Tombstones go in one statement; each tenant's purged_version moves up to
+# the newest version purged, so cursors older than that resync in full
+_PURGE_TOMBSTONES_SQL = text("""
+    WITH purged AS (
+        DELETE FROM sync_changes
+        WHERE deleted AND changed_at < :before
+        RETURNING tenant_id, version
+    ), bumped AS (
+        UPDATE tenant_sync_versions t
+        SET purged_version = GREATEST(t.purged_version, p.max_version)
+        FROM (SELECT tenant_id, MAX(version) AS max_version FROM purged GROUP BY tenant_id) p
+        WHERE t.tenant_id = p.tenant_id
+        RETURNING t.tenant_id
+    )
+    SELECT COUNT(*) FROM purged
+""")
+
+
+class SyncRepository(ISyncRepository):
+    """SQLAlchemy implementation of ISyncRepository (written by databases.change_log)"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_versions(self, tenant_id: str) -> Tuple[int, int]:
+        row = self.session.execute(
+            select(TenantSyncVersion.version, TenantSyncVersion.purged_version)
+            .where(TenantSyncVersion.tenant_id == tenant_id)
+        ).first()
+        return (row.version, row.purged_version) if row else (0, 0)
+
+    def get_changes(
+        self, tenant_id: str, resources: List[str], since: int, until: int, limit: int
+    ) -> List[Dict[str, Any]]:
+        stmt = (
+            select(*CHANGE_COLUMNS)
+            .where(
+                SyncChange.tenant_id == tenant_id,
+                SyncChange.resource.in_(resources),
+                SyncChange.version > since,
+                SyncChange.version <= until
+            )
+            .order_by(SyncChange.version)
+            .limit(limit)
+        )
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_changes_at(self, tenant_id: str, resources: List[str], version: int) -> List[Dict[str, Any]]:
+        stmt = select(*CHANGE_COLUMNS).where(
+            SyncChange.tenant_id == tenant_id,
+            SyncChange.resource.in_(resources),
+            SyncChange.version == version
+        )
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def purge_tombstones(self, before: datetime) -> int:
+        return self.session.execute(_PURGE_TOMBSTONES_SQL, {"before": before}).scalar_one()
@@ -1,8 +1,19 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+from sqlalchemy import select, null, update
 from sqlalchemy.orm import Session
 from ...domain.interfaces.itable_repository import ITableRepository
 from ...domain.models.table import Table as DomainTable
 from ...infrastructure.models import Table as ORMTable, TableStatus as ORMTableStatus
+from .utils import rows_to_dicts
+from ..services.data_version_store import mark_changed
+from ..databases.change_log import record_change
+
+# Columns of the list/read path, in response order
+ROW_COLUMNS = (
+    ORMTable.id, ORMTable.tenant_id, ORMTable.branch_id, ORMTable.name, ORMTable.seats, ORMTable.status,
+    null().label("qr_code_link"), ORMTable.created_at, ORMTable.updated_at,
+)
 
 
 class TableRepository(ITableRepository):
@@ -20,7 +31,8 @@ class TableRepository(ITableRepository):
             name=orm_table.name,
             status=orm_table.status.value if orm_table.status else "AVAILABLE",
             created_at=orm_table.created_at,
-            updated_at=orm_table.updated_at
+            updated_at=orm_table.updated_at,
+            seats=orm_table.seats
         )
 
     def _to_orm(self, domain_table: DomainTable) -> ORMTable:
@@ -30,6 +42,7 @@ class TableRepository(ITableRepository):
             tenant_id=domain_table.tenant_id,
             branch_id=domain_table.branch_id,
             name=domain_table.name,
+            seats=domain_table.seats,
             status=ORMTableStatus(domain_table.status) if domain_table.status else ORMTableStatus.AVAILABLE,
             created_at=domain_table.created_at,
             updated_at=domain_table.updated_at
@@ -68,12 +81,12 @@ class TableRepository(ITableRepository):
         return [self._to_domain(t) for t in orm_tables]
 
     def find_available(self, tenant_id: str, seats: int) -> List[DomainTable]:
-        """Find available tables that match seat count"""
-        # Note: seats filtering not implemented as ORM model doesn't have seats column
-        orm_tables = self.session.query(ORMTable).filter_by(
-            tenant_id=tenant_id,
-            status=ORMTableStatus.AVAILABLE
-        ).all()
+        """Find available tables that match seat count, smallest first"""
+        orm_tables = self.session.query(ORMTable).filter(
+            ORMTable.tenant_id == tenant_id,
+            ORMTable.status == ORMTableStatus.AVAILABLE,
+            ORMTable.seats >= seats
+        ).order_by(ORMTable.seats).all()
         return [self._to_domain(t) for t in orm_tables]
 
     def get_by_branch(self, branch_id: str) -> List[DomainTable]:
@@ -81,17 +94,62 @@ class TableRepository(ITableRepository):
         orm_tables = self.session.query(ORMTable).filter_by(branch_id=branch_id).all()
         return [self._to_domain(t) for t in orm_tables]
 
+    def get_rows_by_tenant(self, tenant_id: str) -> List[Dict[str, Any]]:
+        """Get all tables for a tenant as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(ORMTable.tenant_id == tenant_id)
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_rows_by_branch(self, tenant_id: str, branch_id: str) -> List[Dict[str, Any]]:
+        """Get all tables of a tenant's branch as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(ORMTable.tenant_id == tenant_id, ORMTable.branch_id == branch_id)
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_rows_by_ids(self, tenant_id: str, ids: List[str]) -> List[Dict[str, Any]]:
+        """Get a tenant's tables by ID as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(ORMTable.tenant_id == tenant_id, ORMTable.id.in_(ids))
+        return rows_to_dicts(self.session.execute(stmt))
+
+    def get_rows_by_status(self, tenant_id: str, status: str) -> List[Dict[str, Any]]:
+        """Get tables by status as raw column dicts (read-only fast path)"""
+        stmt = select(*ROW_COLUMNS).where(
+            ORMTable.tenant_id == tenant_id,
+            ORMTable.status == ORMTableStatus(status)
+        )
+        return rows_to_dicts(self.session.execute(stmt))
+
     def update(self, table_id: str, table: DomainTable) -> DomainTable:
         """Update table"""
         orm_table = self.session.query(ORMTable).filter_by(id=table_id).first()
         if orm_table:
             orm_table.name = table.name
+            orm_table.seats = table.seats
             orm_table.status = ORMTableStatus(table.status) if table.status else orm_table.status
             orm_table.updated_at = table.updated_at
             self.session.flush()
             return self._to_domain(orm_table)
         raise ValueError(f"Table with id {table_id} not found")
 
+    def bulk_set_status(self, statuses: Dict[str, str]) -> int:
+        """Set many table statuses at once: one UPDATE per distinct status"""
+        by_status: Dict[str, List[str]] = {}
+        for table_id, status in statuses.items():
+            by_status.setdefault(status, []).append(table_id)
+        updated = 0
+        now = datetime.utcnow()
+        for status, table_ids in by_status.items():
+            rows = self.session.execute(
+                update(ORMTable)
+                .where(ORMTable.id.in_(table_ids))
+                .values(status=ORMTableStatus(status), updated_at=now)
+                .returning(ORMTable.tenant_id, ORMTable.id)
+            ).all()
+            updated += len(rows)
+            # Bulk UPDATE bypasses the session hooks
+            for tenant_id, table_id in rows:
+                mark_changed(self.session, tenant_id, "tables")
+                record_change(self.session, tenant_id, "tables", table_id)
+        return updated
+
     def delete(self, table_id: str) -> bool:
         """Delete table"""
         orm_table = self.session.query(ORMTable).filter_by(id=table_id).first()
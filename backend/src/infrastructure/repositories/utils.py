@@ -0,0 +1,8 @@
+from typing import Any, Dict, List
+from sqlalchemy.engine import Result
+
+
+def rows_to_dicts(result: Result) -> List[Dict[str, Any]]:
+    """Turn a column-select result into plain dicts without building ORM or domain objects"""
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
@@ -1,7 +1,15 @@
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, table, column, select, bindparam, func
+from pgvector.sqlalchemy import Vector
 from ...domain.interfaces.ivector_repository import IVectorRepository
+from .vector_search import nearest, ef_search, VECTOR_DIMENSION
+
+embeddings = table(
+    "embeddings",
+    column("id"), column("text"), column("metadata"),
+    column("embedding_vector", Vector(VECTOR_DIMENSION)),
+)
 
 
 class VectorRepository(IVectorRepository):
@@ -18,19 +26,21 @@ class VectorRepository(IVectorRepository):
         Insert or update a vector with metadata
         """
         sql = text("""
-            INSERT INTO embeddings (id, text, embedding, metadata)
-            VALUES (:id, :text, :embedding, :metadata)
+            INSERT INTO embeddings (id, text, embedding, embedding_vector, metadata)
+            VALUES (:id, :text, :embedding, :embedding_vector, :metadata)
             ON CONFLICT (id) DO UPDATE SET
                 text = EXCLUDED.text,
                 embedding = EXCLUDED.embedding,
+                embedding_vector = EXCLUDED.embedding_vector,
                 metadata = EXCLUDED.metadata,
                 updated_at = NOW()
-        """)
+        """).bindparams(bindparam("embedding_vector", type_=Vector(VECTOR_DIMENSION)))
         
         self.db.execute(sql, {
             "id": vector_id,
             "text": metadata.get("text", ""),
-            "embedding": embedding,
+            "embedding": str(embedding),
+            "embedding_vector": embedding,
             "metadata": str(metadata)
         })
         self.db.commit()
@@ -40,19 +50,16 @@ class VectorRepository(IVectorRepository):
         Search for similar vectors using cosine distance
         Returns list of matching documents with similarity scores
         """
-        sql = text("""
-            SELECT id, text, metadata, 
-                   1 - (embedding <=> :embedding::vector) as similarity
-            FROM embeddings
-            ORDER BY embedding <=> :embedding::vector
-            LIMIT :top_k
-        """)
+        near = nearest(embeddings.c.id, embeddings.c.embedding_vector, embedding, top_k)
+        sql = (
+            select(embeddings.c.id, embeddings.c.text, embeddings.c.metadata, (1 - near.c.distance).label("similarity"))
+            .join(near, near.c.id == embeddings.c.id)
+            .order_by(near.c.distance)
+        )
 
         try:
-            result = self.db.execute(sql, {
-                "embedding": embedding,
-                "top_k": top_k
-            })
+            self.db.execute(select(func.set_config("hnsw.ef_search", ef_search(top_k), True)))
+            result = self.db.execute(sql)
             
             rows = result.fetchall()
             return [
@@ -0,0 +1,202 @@
+"""
+Nearest-neighbour queries over pgvector columns, in the deployment's index layout.
+
+VECTOR_INDEX_MODE selects what the HNSW indexes store:
+
+    float    the float32 vectors themselves (default)
+    halfvec  float16 copies, half the index size
+    binary   one bit per dimension, 1/32 of the index size
+
+The float32 columns stay the source of truth. With a quantized index a
+query first reads top_k * rescore factor candidates through the index by
+quantized distance, then orders those by exact cosine distance on the
+float32 vectors, which recovers most of the ranking quantization loses.
+scripts/set_vector_index_mode.py switches an existing database's indexes.
+
+Product vectors of all embedding versions share one column without a fixed
+dimension (product_embeddings.embedding); each version has a partial index
+over its rows, cast to its dimension. HNSW indexes float32 vectors of at
+most 2000 dimensions, so larger versions are indexed as halfvec even in
+float mode.
+
+An HNSW index holds every tenant's vectors, and a tenant filter is applied
+to what the index scan returns: at most hnsw.ef_search (1000) candidates,
+with no iterative scan in pgvector 0.5. A tenant owning a small share of
+the rows can get few or no results that way, so nearest_in_partition()
+scans a tenant's rows exactly, without the HNSW index, while it has at
+most VECTOR_EXACT_SCAN_ROWS of them. Larger tenants go through the index
+at the largest ef_search; their results are complete while they own more
+than about top_k / 1000 of the indexed rows.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import cast, func, select, union_all, not_
+from pgvector.sqlalchemy import Vector, HALFVEC, BIT
+
+from ...config import Config
+
+VECTOR_DIMENSION = 1536
+VECTOR_INDEX_MODES = ("float", "halfvec", "binary")
+# Candidates read per result: float16 barely reorders neighbours, single bits do
+DEFAULT_RESCORE_FACTORS = {"float": 1, "halfvec": 2, "binary": 10}
+# Tables with searched vector columns of a fixed dimension
+VECTOR_COLUMNS = {"embeddings": "embedding_vector"}
+# Largest float32 vector an HNSW index takes
+HNSW_MAX_VECTOR_DIMENSION = 2000
+
+
+def index_mode() -> str:
+    mode = Config.VECTOR_INDEX_MODE
+    if mode not in VECTOR_INDEX_MODES:
+        raise ValueError(f"VECTOR_INDEX_MODE must be one of {', '.join(VECTOR_INDEX_MODES)}, not {mode!r}")
+    return mode
+
+
+def rescore_factor(mode: str) -> int:
+    return Config.VECTOR_RESCORE_FACTOR or DEFAULT_RESCORE_FACTORS[mode]
+
+
+# pgvector's upper bound for hnsw.ef_search
+MAX_EF_SEARCH = 1000
+
+
+def ef_search(top_k: int, partitioned: bool = False) -> str:
+    """
+    hnsw.ef_search that lets one index scan return every candidate of a top_k
+    query; the largest for a partitioned one, whose filter drops candidates
+    """
+    if partitioned:
+        return str(MAX_EF_SEARCH)
+    return str(min(max(top_k * rescore_factor(index_mode()), 40), MAX_EF_SEARCH))
+
+
+def _indexed_mode(mode: str, dimension: int) -> str:
+    return "halfvec" if mode == "float" and dimension > HNSW_MAX_VECTOR_DIMENSION else mode
+
+
+def _cast_column(column, dimension: Optional[int]):
+    """Untyped columns (dimension given) are indexed cast to the dimension"""
+    return column if dimension is None else cast(column, Vector(dimension))
+
+
+def index_distance(column, embedding: List[float], mode: str, dimension: Optional[int] = None):
+    """The distance a mode's index orders by; must match index_definition()"""
+    size = dimension or VECTOR_DIMENSION
+    if mode == "halfvec":
+        return cast(column, HALFVEC(size)).cosine_distance(cast(embedding, HALFVEC(size)))
+    if mode == "binary":
+        return cast(func.binary_quantize(column), BIT(size)).hamming_distance(
+            func.binary_quantize(cast(embedding, Vector(size)))
+        )
+    return _cast_column(column, dimension).cosine_distance(embedding)
+
+
+def nearest(
+    id_column, vector_column, embedding: List[float], top_k: int, *criteria,
+    mode: Optional[str] = None, dimension: Optional[int] = None
+):
+    """
+    Subquery of (id, distance) for the top_k rows matching `criteria` that
+    are nearest to `embedding` by cosine distance, read through the index.
+    Pass `dimension` for a column without a fixed one.
+    """
+    mode = _indexed_mode(mode or index_mode(), dimension or VECTOR_DIMENSION)
+    criteria = (*criteria, vector_column.is_not(None))
+    if mode == "float":
+        distance = index_distance(vector_column, embedding, mode, dimension)
+        return (
+            select(id_column.label("id"), distance.label("distance"))
+            .where(*criteria).order_by(distance).limit(top_k).subquery("nearest")
+        )
+    candidates = (
+        select(id_column.label("id"), vector_column.label("vector"))
+        .where(*criteria)
+        .order_by(index_distance(vector_column, embedding, mode, dimension))
+        .limit(top_k * rescore_factor(mode))
+        .subquery("candidates")
+    )
+    distance = candidates.c.vector.cosine_distance(embedding)
+    return (
+        select(candidates.c.id, distance.label("distance"))
+        .order_by(distance).limit(top_k).subquery("nearest")
+    )
+
+
+def nearest_in_partition(
+    id_column, vector_column, embedding: List[float], top_k: int, partition, *criteria,
+    mode: Optional[str] = None, dimension: Optional[int] = None, exact_rows: Optional[int] = None
+):
+    """
+    nearest() among the rows of one partition (e.g. a tenant's vectors of
+    a version), which `partition` selects through a b-tree index. Within
+    the same statement, a partition of at most `exact_rows` rows
+    (VECTOR_EXACT_SCAN_ROWS) is ranked by exact distance over all of its
+    rows; a larger one is read through the shared HNSW index.
+    """
+    exact_rows = Config.VECTOR_EXACT_SCAN_ROWS if exact_rows is None else exact_rows
+    # Counted once per statement, and only up to the threshold, so a large
+    # partition costs no more than a small one
+    rows = select(func.count().label("rows")).select_from(
+        select(id_column).where(*partition).limit(exact_rows + 1).subquery()
+    ).cte("partition_rows")
+    small = select(rows.c.rows <= exact_rows).scalar_subquery()
+    # The function, not the <=> operator: no index serves it, so this reads every row
+    distance = func.cosine_distance(vector_column, cast(embedding, vector_column.type))
+    exact = (
+        select(id_column.label("id"), distance.label("distance"))
+        .where(small, *partition, *criteria, vector_column.is_not(None))
+        .order_by(distance).limit(top_k)
+        .subquery("exact")
+    )
+    indexed = nearest(
+        id_column, vector_column, embedding, top_k, not_(small), *partition, *criteria,
+        mode=mode, dimension=dimension
+    )
+    return union_all(
+        select(exact.c.id, exact.c.distance), select(indexed.c.id, indexed.c.distance)
+    ).subquery("nearest")
+
+
+def index_definition(
+    table: str, column: str, mode: str, name: str, dimension: Optional[int] = None, where: str = None
+) -> str:
+    """CREATE INDEX statement, with a {concurrently} placeholder; see index_distance()"""
+    size = dimension or VECTOR_DIMENSION
+    mode = _indexed_mode(mode, size)
+    if mode == "float":
+        expression = column if dimension is None else f"({column}::vector({size}))"
+        opclass = "vector_cosine_ops"
+    elif mode == "halfvec":
+        expression, opclass = f"({column}::halfvec({size}))", "halfvec_cosine_ops"
+    else:
+        expression, opclass = f"(binary_quantize({column})::bit({size}))", "bit_hamming_ops"
+    sql = f"CREATE INDEX {{concurrently}} IF NOT EXISTS {name} ON {table} USING hnsw ({expression} {opclass})"
+    return sql + (f" WHERE {where}" if where else "")
+
+
+def index_definitions(mode: str, columns: Dict[str, str] = VECTOR_COLUMNS) -> Dict[str, str]:
+    """CREATE INDEX statements (by index name) of a mode, for every fixed-dimension vector table"""
+    return {
+        index_name(table, mode): index_definition(table, column, mode, index_name(table, mode))
+        for table, column in columns.items()
+    }
+
+
+def index_name(table: str, mode: str) -> str:
+    return f"idx_{table}_embedding_{'hnsw' if mode == 'float' else mode}"
+
+
+def version_index_definition(version: str, dimension: int, mode: str) -> Tuple[str, str]:
+    """(name, CREATE INDEX statement) of an embedding version's product index"""
+    if "'" in version:
+        raise ValueError(f"Invalid embedding version: {version!r}")
+    name = version_index_name(version, _indexed_mode(mode, dimension))
+    return name, index_definition(
+        "product_embeddings", "embedding", mode, name, dimension, where=f"model_version = '{version}'"
+    )
+
+
+def version_index_name(version: str, mode: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "_", version.lower()).strip("_")[:40]
+    return f"idx_product_embeddings_{slug}_{mode}"
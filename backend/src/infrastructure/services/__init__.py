@@ -1,6 +1,29 @@
 # Infrastructure Services
 from .cache_service import CacheService, cache_service, get_cache_service, init_cache_service
 from .realtime_service import RealtimeService, RealtimeEvents, realtime_service, get_realtime_service, init_realtime_service
+from .metrics_service import MetricsService, metrics_service, get_metrics_service
+from .table_board_store import (
+    InMemoryTableBoard, RedisTableBoard, TableStatusWriter,
+    get_table_board, init_table_board, get_table_status_writer
+)
+from .data_version_store import (
+    DataVersionStore, get_data_versions, init_data_versions, mark_changed
+)
+from .job_queue import (
+    InMemoryJobQueue, RedisJobQueue, JobWorker, OutboxRelay, job,
+    get_job_queue, init_job_queue, start_inprocess_workers
+)
+from .cooccurrence_store import (
+    InMemoryCooccurrenceStore, RedisCooccurrenceStore, get_cooccurrence_store, init_cooccurrence_store
+)
+from .popularity_store import (
+    InMemoryPopularityStore, RedisPopularityStore, get_popularity_store, init_popularity_store
+)
+from .typeahead_store import TypeaheadStore, get_typeahead_store
+from .rate_limiter import InMemoryRateLimiter, RedisRateLimiter, get_rate_limiter, init_rate_limiter
+from .conversation_store import (
+    InMemoryConversationStore, RedisConversationStore, get_conversation_store, init_conversation_store
+)
 
 __all__ = [
     # Cache
@@ -14,4 +37,52 @@ __all__ = [
     'realtime_service',
     'get_realtime_service',
     'init_realtime_service',
+    # Metrics
+    'MetricsService',
+    'metrics_service',
+    'get_metrics_service',
+    # Table board
+    'InMemoryTableBoard',
+    'RedisTableBoard',
+    'TableStatusWriter',
+    'get_table_board',
+    'init_table_board',
+    'get_table_status_writer',
+    # Data versions
+    'DataVersionStore',
+    'get_data_versions',
+    'init_data_versions',
+    'mark_changed',
+    # Job queue
+    'InMemoryJobQueue',
+    'RedisJobQueue',
+    'JobWorker',
+    'OutboxRelay',
+    'job',
+    'get_job_queue',
+    'init_job_queue',
+    'start_inprocess_workers',
+    # Co-occurrence
+    'InMemoryCooccurrenceStore',
+    'RedisCooccurrenceStore',
+    'get_cooccurrence_store',
+    'init_cooccurrence_store',
+    # Popularity
+    'InMemoryPopularityStore',
+    'RedisPopularityStore',
+    'get_popularity_store',
+    'init_popularity_store',
+    # Typeahead
+    'TypeaheadStore',
+    'get_typeahead_store',
+    # Rate limiting
+    'InMemoryRateLimiter',
+    'RedisRateLimiter',
+    'get_rate_limiter',
+    'init_rate_limiter',
+    # Conversations
+    'InMemoryConversationStore',
+    'RedisConversationStore',
+    'get_conversation_store',
+    'init_conversation_store',
 ]
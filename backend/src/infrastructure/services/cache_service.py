@@ -4,9 +4,12 @@ Infrastructure layer service for caching operations
 No business logic - pure caching abstraction
 """
 import os
+import threading
 from typing import Optional, Any, Callable
 import logging
 
+from .metrics_service import get_metrics_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,45 +26,62 @@ class CacheService:
     """
     
     def __init__(self, app=None):
+        self._app = None
         self._cache = None
         self._available = False
         if app:
             self.init_app(app)
     
-    def init_app(self, app):
-        """Initialize cache with Flask app"""
+    def init_app(self, app, wait: bool = False):
+        """
+        Initialize cache with Flask app.
+
+        Flask-Caching is imported and Redis probed on a background thread, so
+        a slow or unreachable Redis never holds up worker boot. Until the
+        probe settles every lookup misses; then the cache is Redis, or
+        SimpleCache if Redis did not answer within CACHE_CONNECT_TIMEOUT.
+        A process forked before the global cache's probe settled (gunicorn
+        with preload_app) probes again itself.
+        """
+        self._app = app
+        thread = threading.Thread(target=self._connect, args=(app,), name="cache-connect", daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+
+    def _connect(self, app):
         try:
             from flask_caching import Cache
-            
-            redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
-            
-            # Try Redis first
-            cache_config = {
-                'CACHE_TYPE': 'RedisCache',
-                'CACHE_REDIS_URL': redis_url,
-                'CACHE_DEFAULT_TIMEOUT': 300,
-                'CACHE_KEY_PREFIX': 's2o_'
-            }
-            
-            try:
-                app.config.from_mapping(cache_config)
-                self._cache = Cache(app)
-                # Test connection
-                self._cache.set('_test_', 'test')
-                self._cache.delete('_test_')
-                self._available = True
-                logger.info(f"CacheService: Redis connected at {redis_url}")
-            except Exception as e:
-                # Fallback to simple cache
-                logger.warning(f"CacheService: Redis failed ({e}), using SimpleCache")
-                app.config['CACHE_TYPE'] = 'SimpleCache'
-                self._cache = Cache(app)
-                self._available = True
-                logger.info("CacheService: SimpleCache initialized")
-                
         except ImportError:
             logger.warning("CacheService: Flask-Caching not installed")
             self._available = False
+            return
+
+        redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        timeout = float(os.getenv('CACHE_CONNECT_TIMEOUT', '0.5'))
+
+        # Try Redis first
+        cache_config = {
+            'CACHE_TYPE': 'RedisCache',
+            'CACHE_REDIS_URL': redis_url,
+            'CACHE_DEFAULT_TIMEOUT': 300,
+            'CACHE_KEY_PREFIX': 's2o_',
+            'CACHE_OPTIONS': {'socket_connect_timeout': timeout, 'socket_timeout': timeout}
+        }
+
+        try:
+            cache = Cache(app, config=cache_config, with_jinja2_ext=False)
+            # Test connection
+            cache.set('_test_', 'test')
+            cache.delete('_test_')
+            logger.info(f"CacheService: Redis connected at {redis_url}")
+        except Exception as e:
+            # Fallback to simple cache
+            logger.warning(f"CacheService: Redis failed ({e}), using SimpleCache")
+            cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 300}, with_jinja2_ext=False)
+            logger.info("CacheService: SimpleCache initialized")
+        self._cache = cache
+        self._available = True
     
     @property
     def is_available(self) -> bool:
@@ -71,7 +91,9 @@ class CacheService:
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         if self._cache:
-            return self._cache.get(key)
+            value = self._cache.get(key)
+            get_metrics_service().record_cache_lookup(value is not None)
+            return value
         return None
     
     def set(self, key: str, value: Any, timeout: int = 300) -> bool:
@@ -114,6 +136,16 @@ class CacheService:
 cache_service = CacheService()
 
 
+def _probe_again_after_fork():
+    # The probe thread does not survive the fork
+    if cache_service._app is not None and cache_service._cache is None:
+        cache_service.init_app(cache_service._app)
+
+
+# Registered once per process, however many apps init_app is given
+os.register_at_fork(after_in_child=_probe_again_after_fork)
+
+
 def init_cache_service(app):
     """Initialize global cache service"""
     cache_service.init_app(app)
@@ -0,0 +1,117 @@
+"""
+Conversation Store for S2O Platform
+Infrastructure layer service holding chatbot conversation sessions
+No business logic - a session is an opaque dict; windowing and summaries live in the chat memory service
+
+Sessions expire a fixed time after their last turn, so an abandoned
+conversation costs nothing once it lapses and a guest coming back
+within that time picks up where they left off.
+"""
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# In-memory sessions beyond this are dropped, least recently used first
+MAX_MEMORY_SESSIONS = 10_000
+
+
+class InMemoryConversationStore:
+    """
+    Process-local sessions with expiry.
+    Used when Redis is unreachable and as the stand-in for tests; a
+    conversation then only continues on the worker that started it.
+    """
+
+    def __init__(self, max_sessions: int = MAX_MEMORY_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                return None
+            expires, data = entry
+            if expires <= time.monotonic():
+                del self._sessions[key]
+                return None
+            self._sessions.move_to_end(key)
+        # Stored serialized, so callers never share a session's lists
+        return json.loads(data)
+
+    def save(self, key: str, session: Dict[str, Any], ttl: int) -> None:
+        data = json.dumps(session)
+        with self._lock:
+            self._sessions[key] = (time.monotonic() + ttl, data)
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(key, None) is not None
+
+
+class RedisConversationStore:
+    """
+    Sessions shared by every worker process.
+
+    s2o:chat:<key>    the session as JSON, expiring ttl seconds after its last save
+    """
+
+    def __init__(self, client):
+        self._redis = client
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        data = self._redis.get(f"s2o:chat:{key}")
+        return json.loads(data) if data else None
+
+    def save(self, key: str, session: Dict[str, Any], ttl: int) -> None:
+        self._redis.set(f"s2o:chat:{key}", json.dumps(session), ex=ttl)
+
+    def delete(self, key: str) -> bool:
+        return bool(self._redis.delete(f"s2o:chat:{key}"))
+
+
+# Global instance
+conversation_store = None
+_conversation_store_lock = threading.Lock()
+
+
+def init_conversation_store(app=None):
+    """Initialize global conversation store (Redis when reachable, otherwise in-memory)"""
+    global conversation_store
+    redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    if REDIS_AVAILABLE:
+        try:
+            client = redis.Redis.from_url(redis_url, decode_responses=True, socket_connect_timeout=0.5)
+            client.ping()
+            conversation_store = RedisConversationStore(client)
+            logger.info(f"ConversationStore: Redis connected at {redis_url}")
+            return conversation_store
+        except Exception as e:
+            logger.warning(f"ConversationStore: Redis failed ({e}), using in-memory store")
+    conversation_store = InMemoryConversationStore()
+    return conversation_store
+
+
+def get_conversation_store():
+    """Get global conversation store instance, connecting on first use"""
+    if conversation_store is None:
+        with _conversation_store_lock:
+            if conversation_store is None:
+                init_conversation_store()
+    return conversation_store
@@ -0,0 +1,229 @@
+"""
+Co-occurrence Store for S2O Platform
+Infrastructure layer service holding "frequently ordered together" models
+No business logic - count and neighbour storage; scoring lives in domain/cooccurrence.py
+
+Per tenant the store keeps, for incremental updates, each product's pair
+counts and order count, and, for lookups, each product's top-K neighbours.
+Lookups are served from process memory: a process reloads a tenant's
+neighbours only when the tenant's version has changed, and checks the
+version at most every LOCAL_REFRESH_SECONDS.
+"""
+import os
+import json
+import time
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# How stale a process's copy of a tenant's neighbours may get
+LOCAL_REFRESH_SECONDS = 5.0
+# Orders are counted once even if their completion job is delivered twice
+SEEN_ORDER_TTL_SECONDS = 7 * 24 * 60 * 60
+SEEN_ORDER_LIMIT = 100_000
+
+Neighbours = List[Tuple[str, float]]
+
+
+class InMemoryCooccurrenceStore:
+    """
+    Process-local co-occurrence store.
+    Used when Redis is unreachable and as the stand-in for tests.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[str, Counter]] = {}
+        self._order_counts: Dict[str, Counter] = {}
+        self._neighbours: Dict[str, Dict[str, Neighbours]] = {}
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_built(self, tenant_id: str) -> bool:
+        return tenant_id in self._neighbours
+
+    def replace(
+        self, tenant_id: str, rows: Mapping[str, Mapping[str, int]], order_counts: Mapping[str, int],
+        neighbours: Mapping[str, Neighbours]
+    ) -> None:
+        with self._lock:
+            self._rows[tenant_id] = {p: Counter(row) for p, row in rows.items()}
+            self._order_counts[tenant_id] = Counter(order_counts)
+            self._neighbours[tenant_id] = dict(neighbours)
+
+    def add_order(self, tenant_id: str, order_id: str, pairs: Iterable[Tuple[str, str]], products: Iterable[str]) -> bool:
+        """Count one order; False if the tenant isn't built or the order was counted already"""
+        with self._lock:
+            if tenant_id not in self._neighbours or order_id in self._seen:
+                return False
+            self._seen[order_id] = None
+            if len(self._seen) > SEEN_ORDER_LIMIT:
+                self._seen.popitem(last=False)
+            rows = self._rows[tenant_id]
+            for a, b in pairs:
+                rows.setdefault(a, Counter())[b] += 1
+            self._order_counts[tenant_id].update(products)
+            return True
+
+    def get_rows(self, tenant_id: str, product_ids: Iterable[str]) -> Tuple[Dict[str, Dict[str, int]], Dict[str, int]]:
+        with self._lock:
+            rows = self._rows.get(tenant_id, {})
+            return (
+                {p: dict(rows.get(p, {})) for p in product_ids},
+                dict(self._order_counts.get(tenant_id, {}))
+            )
+
+    def set_neighbours(self, tenant_id: str, neighbours: Mapping[str, Neighbours]) -> None:
+        with self._lock:
+            self._neighbours.setdefault(tenant_id, {}).update(neighbours)
+
+    def get_neighbours(self, tenant_id: str, product_id: str) -> Optional[Neighbours]:
+        """Neighbours of a product ([] if none); None if the tenant has no model yet"""
+        tenant = self._neighbours.get(tenant_id)
+        if tenant is None:
+            return None
+        return tenant.get(product_id, [])
+
+
+class RedisCooccurrenceStore:
+    """
+    Co-occurrence store in Redis, shared by every worker process.
+
+    s2o:cooc:<tenant>:version       bumped on every neighbour change; absent until built
+    s2o:cooc:<tenant>:n             product -> orders containing it
+    s2o:cooc:<tenant>:row:<product> other product -> orders containing both
+    s2o:cooc:<tenant>:top           product -> JSON [[neighbour, score], ...]
+    s2o:cooc:seen:<order_id>        set once the order is counted
+    """
+
+    def __init__(self, client, refresh_seconds: float = LOCAL_REFRESH_SECONDS):
+        self._redis = client
+        self._refresh_seconds = refresh_seconds
+        # tenant -> (version, checked_at, neighbours)
+        self._local: Dict[str, Tuple[str, float, Dict[str, Neighbours]]] = {}
+        self._local_lock = threading.Lock()
+
+    @staticmethod
+    def _key(tenant_id: str, *parts: str) -> str:
+        return ":".join(("s2o:cooc", tenant_id, *parts))
+
+    def is_built(self, tenant_id: str) -> bool:
+        return bool(self._redis.exists(self._key(tenant_id, "version")))
+
+    def replace(
+        self, tenant_id: str, rows: Mapping[str, Mapping[str, int]], order_counts: Mapping[str, int],
+        neighbours: Mapping[str, Neighbours]
+    ) -> None:
+        stale_products = self._redis.hkeys(self._key(tenant_id, "n"))
+        pipe = self._redis.pipeline()
+        pipe.delete(
+            self._key(tenant_id, "n"), self._key(tenant_id, "top"),
+            *(self._key(tenant_id, "row", p) for p in stale_products)
+        )
+        for product_id, row in rows.items():
+            if row:
+                pipe.hset(self._key(tenant_id, "row", product_id), mapping=row)
+        if order_counts:
+            pipe.hset(self._key(tenant_id, "n"), mapping=order_counts)
+        if neighbours:
+            pipe.hset(self._key(tenant_id, "top"), mapping={p: json.dumps(n) for p, n in neighbours.items()})
+        pipe.incr(self._key(tenant_id, "version"))
+        pipe.execute()
+
+    def add_order(self, tenant_id: str, order_id: str, pairs: Iterable[Tuple[str, str]], products: Iterable[str]) -> bool:
+        """Count one order; False if the tenant isn't built or the order was counted already"""
+        if not self.is_built(tenant_id):
+            return False
+        if not self._redis.set(f"s2o:cooc:seen:{order_id}", 1, nx=True, ex=SEEN_ORDER_TTL_SECONDS):
+            return False
+        pipe = self._redis.pipeline(transaction=False)
+        for a, b in pairs:
+            pipe.hincrby(self._key(tenant_id, "row", a), b, 1)
+        for product_id in products:
+            pipe.hincrby(self._key(tenant_id, "n"), product_id, 1)
+        pipe.execute()
+        return True
+
+    def get_rows(self, tenant_id: str, product_ids: Iterable[str]) -> Tuple[Dict[str, Dict[str, int]], Dict[str, int]]:
+        product_ids = list(product_ids)
+        pipe = self._redis.pipeline(transaction=False)
+        for product_id in product_ids:
+            pipe.hgetall(self._key(tenant_id, "row", product_id))
+        pipe.hgetall(self._key(tenant_id, "n"))
+        *rows, order_counts = pipe.execute()
+        return (
+            {p: {q: int(c) for q, c in row.items()} for p, row in zip(product_ids, rows)},
+            {p: int(c) for p, c in order_counts.items()}
+        )
+
+    def set_neighbours(self, tenant_id: str, neighbours: Mapping[str, Neighbours]) -> None:
+        if not neighbours:
+            return
+        pipe = self._redis.pipeline()
+        pipe.hset(self._key(tenant_id, "top"), mapping={p: json.dumps(n) for p, n in neighbours.items()})
+        pipe.incr(self._key(tenant_id, "version"))
+        pipe.execute()
+
+    def get_neighbours(self, tenant_id: str, product_id: str) -> Optional[Neighbours]:
+        """Neighbours of a product ([] if none); None if the tenant has no model yet"""
+        local = self._local.get(tenant_id)
+        now = time.monotonic()
+        if local is None or now - local[1] >= self._refresh_seconds:
+            local = self._refresh(tenant_id, local, now)
+            if local is None:
+                return None
+        return local[2].get(product_id, [])
+
+    def _refresh(self, tenant_id: str, local, now: float):
+        with self._local_lock:
+            version = self._redis.get(self._key(tenant_id, "version"))
+            if version is None:
+                self._local.pop(tenant_id, None)
+                return None
+            if local is not None and local[0] == version:
+                local = (version, now, local[2])
+            else:
+                raw = self._redis.hgetall(self._key(tenant_id, "top"))
+                neighbours = {p: [tuple(pair) for pair in json.loads(n)] for p, n in raw.items()}
+                local = (version, now, neighbours)
+            self._local[tenant_id] = local
+            return local
+
+
+# Global instance
+cooccurrence_store = None
+_cooccurrence_store_lock = threading.Lock()
+
+
+def init_cooccurrence_store(app=None):
+    """Initialize global co-occurrence store (Redis when reachable, otherwise in-memory)"""
+    global cooccurrence_store
+    redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    if REDIS_AVAILABLE:
+        try:
+            client = redis.Redis.from_url(redis_url, decode_responses=True, socket_connect_timeout=0.5)
+            client.ping()
+            cooccurrence_store = RedisCooccurrenceStore(client)
+            logger.info(f"CooccurrenceStore: Redis connected at {redis_url}")
+            return cooccurrence_store
+        except Exception as e:
+            logger.warning(f"CooccurrenceStore: Redis failed ({e}), using in-memory store")
+    cooccurrence_store = InMemoryCooccurrenceStore()
+    return cooccurrence_store
+
+
+def get_cooccurrence_store():
+    """Get global co-occurrence store instance, connecting on first use"""
+    if cooccurrence_store is None:
+        with _cooccurrence_store_lock:
+            if cooccurrence_store is None:
+                init_cooccurrence_store()
+    return cooccurrence_store
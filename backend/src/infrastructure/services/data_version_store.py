@@ -0,0 +1,155 @@
+"""
+Data Version Store for S2O Platform
+Infrastructure layer service holding per-tenant data versions
+No business logic - counters plus the SQLAlchemy hooks that bump them
+
+A version is a Redis counter per (tenant, resource), where a resource is a
+table name ("products", "categories", "tables", "promotions"). Every commit
+that inserts, updates or deletes rows of a versioned table bumps the
+counters of the tenants it touched, so a read endpoint can build its ETag
+from the versions alone and answer 304 without running its query.
+
+ORM flushes are tracked automatically. Bulk UPDATE/DELETE statements
+bypass the unit of work and must call mark_changed() themselves.
+
+Versions must be shared by every worker, so there is no in-process
+fallback: while Redis is unreachable, current() returns None and callers
+fall back to hashing the response body. The client reconnects on its own;
+bumps are always attempted so no worker silently stops publishing.
+"""
+import os
+import time
+import logging
+import threading
+from typing import Iterable, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+VERSIONED_TABLES = frozenset({"products", "categories", "tables", "promotions"})
+
+# Reads skip Redis this long after a failure
+READ_RETRY_SECONDS = 5.0
+
+_PENDING_KEY = "s2o_changed_versions"
+
+
+class DataVersionStore:
+    """
+    Infrastructure service for per-tenant data versions.
+
+    Usage:
+        from infrastructure.services import get_data_versions
+        versions = get_data_versions()
+        token = versions.current(tenant_id, ("products", "categories"))
+        versions.bump([(tenant_id, "products")])
+    """
+
+    def __init__(self, client=None, prefix: str = "s2o:ver"):
+        self._client = client
+        self._prefix = prefix
+        # After a failed read, skip Redis until then (bumps always try)
+        self._retry_at = 0.0
+
+    @property
+    def is_available(self) -> bool:
+        return self._client is not None and time.monotonic() >= self._retry_at
+
+    def _key(self, tenant_id: str, resource: str) -> str:
+        return f"{self._prefix}:{tenant_id}:{resource}"
+
+    def current(self, tenant_id: str, resources: Sequence[str]) -> Optional[str]:
+        """Combined version token of the resources, or None when unavailable"""
+        if not self.is_available:
+            return None
+        try:
+            values = self._client.mget([self._key(tenant_id, r) for r in resources])
+        except Exception as e:
+            logger.warning(f"DataVersions: read failed ({e})")
+            self._retry_at = time.monotonic() + READ_RETRY_SECONDS
+            return None
+        return ".".join(v or "0" for v in values)
+
+    def bump(self, changes: Iterable[Tuple[str, str]]) -> None:
+        if self._client is None:
+            return
+        changes = set(changes)
+        if not changes:
+            return
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for tenant_id, resource in changes:
+                pipe.incr(self._key(tenant_id, resource))
+            pipe.execute()
+        except Exception as e:
+            # A missed bump can answer 304 with stale data until the next change
+            logger.error(f"DataVersions: bump failed for {sorted(changes)} ({e})")
+
+
+def mark_changed(session: Session, tenant_id, resource: str) -> None:
+    """Record a change made outside the unit of work (bulk UPDATE/DELETE)"""
+    session.info.setdefault(_PENDING_KEY, set()).add((str(tenant_id), resource))
+
+
+def _collect_flushed(session, flush_context) -> None:
+    pending: Set[Tuple[str, str]] = session.info.setdefault(_PENDING_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        tenant_id = getattr(obj, "tenant_id", None)
+        if table in VERSIONED_TABLES and tenant_id is not None:
+            pending.add((str(tenant_id), table))
+
+
+def _publish(session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        get_data_versions().bump(pending)
+
+
+def _discard(session, *args) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def install_session_hooks() -> None:
+    """Track versioned-table writes on every Session (idempotent)"""
+    if not event.contains(Session, "after_flush", _collect_flushed):
+        event.listen(Session, "after_flush", _collect_flushed)
+        event.listen(Session, "after_commit", _publish)
+        event.listen(Session, "after_rollback", _discard)
+
+
+# Global instance
+data_versions: Optional[DataVersionStore] = None
+_data_versions_lock = threading.Lock()
+
+
+def init_data_versions(app=None) -> DataVersionStore:
+    """Initialize global data versions (Redis; disabled only if redis-py is missing)"""
+    global data_versions
+    install_session_hooks()
+    redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    client = None
+    if REDIS_AVAILABLE:
+        # Connects on first command; failed reads back off (see current)
+        client = redis.Redis.from_url(
+            redis_url, decode_responses=True, socket_connect_timeout=0.5, socket_timeout=0.5
+        )
+    data_versions = DataVersionStore(client)
+    return data_versions
+
+
+def get_data_versions() -> DataVersionStore:
+    """Get global data versions instance"""
+    if data_versions is None:
+        with _data_versions_lock:
+            if data_versions is None:
+                init_data_versions()
+    return data_versions
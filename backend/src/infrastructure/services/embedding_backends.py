@@ -0,0 +1,225 @@
+"""
+Embedding backends: what turns texts into vectors for an embedding version.
+
+    openai   the OpenAI embeddings API (needs OPENAI_API_KEY)
+    local    a sentence-transformer exported to ONNX, run on the CPU with
+             ONNX Runtime: no API key, no per-token cost, works offline
+
+A local model is a directory named after the model under
+LOCAL_EMBEDDING_MODELS_DIR, holding model.onnx and tokenizer.json (both
+in the model's Hugging Face repository, e.g. onnx/model.onnx of
+sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2).
+
+Local inference is batched: texts are sorted by length, so a batch pads
+little, and the batches run on a thread pool of LOCAL_EMBEDDING_THREADS
+(ONNX Runtime releases the GIL while it runs). Each run uses one thread,
+so a session starts no threads of its own and can be created before a
+fork: with gunicorn's preload_app (backend/gunicorn.conf.py) the model is
+loaded once in the master and its weights are shared copy-on-write by
+every worker. The thread pool is created per process, on first use.
+"""
+import os
+import threading
+import importlib.util
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from ...config import Config
+
+# openai is imported on first client use; it dominates worker boot time
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+LOCAL_AVAILABLE = (
+    importlib.util.find_spec("onnxruntime") is not None
+    and importlib.util.find_spec("tokenizers") is not None
+)
+
+# Tokenizers' own thread pool does not survive a fork; batches are
+# parallelised by the backend's pool instead
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+# Sentence-transformer MiniLM models are trained on at most 128 tokens
+LOCAL_MAX_TOKENS = 128
+
+
+class EmbeddingBackend(ABC):
+    """Embeds texts with one model"""
+
+    @property
+    @abstractmethod
+    def available(self) -> bool:
+        """Whether the backend can embed (its dependencies and credentials or files are there)"""
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """One vector per text, in order; raises on failure"""
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    """Embeddings API of OpenAI, one request per call"""
+
+    def __init__(self, model: str, api_key: str = None):
+        self.model = model
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self._client = None
+
+    @property
+    def client(self):
+        """Lazy initialization of OpenAI client"""
+        if self._client is None and OPENAI_AVAILABLE and self.api_key:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key)
+        return self._client
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        response = self.client.embeddings.create(model=self.model, input=texts)
+        return [item.embedding for item in response.data]
+
+
+class LocalEmbeddingBackend(EmbeddingBackend):
+    """
+    A sentence-transformer in ONNX format on the CPU: mean pooling over the
+    tokens, normalised to unit length. Shared by every thread of a process
+    (see get_local_backend()).
+    """
+
+    def __init__(
+        self, model_dir: str, dimension: int, batch_size: int = None, threads: int = None,
+        max_tokens: int = LOCAL_MAX_TOKENS
+    ):
+        self.model_dir = model_dir
+        self.dimension = dimension
+        self.batch_size = batch_size or Config.LOCAL_EMBEDDING_BATCH_SIZE
+        self.threads = threads or Config.LOCAL_EMBEDDING_THREADS or os.cpu_count() or 1
+        self.max_tokens = max_tokens
+        self._session = None
+        self._tokenizer = None
+        self._input_names = ()
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_pid = None
+
+    @property
+    def available(self) -> bool:
+        return LOCAL_AVAILABLE and all(
+            os.path.isfile(os.path.join(self.model_dir, name)) for name in ("model.onnx", "tokenizer.json")
+        )
+
+    @property
+    def loaded(self) -> bool:
+        return self._session is not None
+
+    def load(self) -> None:
+        """Load the tokenizer and model; idempotent"""
+        if self._session is not None:
+            return
+        with self._lock:
+            if self._session is not None:
+                return
+            import onnxruntime
+            from tokenizers import Tokenizer
+
+            tokenizer = Tokenizer.from_file(os.path.join(self.model_dir, "tokenizer.json"))
+            tokenizer.enable_truncation(max_length=self.max_tokens)
+            pad_token = next((t for t in ("<pad>", "[PAD]") if tokenizer.token_to_id(t) is not None), None)
+            if pad_token is None:
+                tokenizer.enable_padding()
+            else:
+                tokenizer.enable_padding(pad_id=tokenizer.token_to_id(pad_token), pad_token=pad_token)
+
+            options = onnxruntime.SessionOptions()
+            # One thread per run: batches are parallelised by the pool, and a
+            # session without threads of its own is safe to fork
+            options.intra_op_num_threads = 1
+            options.inter_op_num_threads = 1
+            options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            session = onnxruntime.InferenceSession(
+                os.path.join(self.model_dir, "model.onnx"), options, providers=["CPUExecutionProvider"]
+            )
+            width = session.get_outputs()[0].shape[-1]
+            if isinstance(width, int) and width != self.dimension:
+                raise ValueError(f"{self.model_dir} embeds into {width} dimensions, not {self.dimension}")
+            self._input_names = {i.name for i in session.get_inputs()}
+            self._tokenizer = tokenizer
+            self._session = session
+
+    def _executor(self) -> ThreadPoolExecutor:
+        # A pool inherited through a fork has no threads; each process makes its own
+        pid = os.getpid()
+        if self._pool is None or self._pool_pid != pid:
+            with self._lock:
+                if self._pool is None or self._pool_pid != pid:
+                    self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="embed")
+                    self._pool_pid = pid
+        return self._pool
+
+    def _run(self, texts: List[str]):
+        import numpy as np
+
+        encodings = self._tokenizer.encode_batch(texts)
+        ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        output = self._session.run(None, feeds)[0]
+        if output.ndim == 3:
+            # Token embeddings: average over the real (unpadded) tokens
+            weights = mask[:, :, None].astype(np.float32)
+            output = (output * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+        norms = np.linalg.norm(output, axis=1, keepdims=True)
+        return output / np.maximum(norms, 1e-12)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        self.load()
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batches = [order[i:i + self.batch_size] for i in range(0, len(order), self.batch_size)]
+        if len(batches) == 1:
+            results = [self._run([texts[i] for i in batches[0]])]
+        else:
+            results = self._executor().map(self._run, ([texts[i] for i in batch] for batch in batches))
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        for batch, result in zip(batches, results):
+            for i, vector in zip(batch, result.tolist()):
+                vectors[i] = vector
+        return vectors
+
+
+# One instance per local model and process, so its weights are loaded once
+_local_backends: Dict[str, LocalEmbeddingBackend] = {}
+_local_backends_lock = threading.Lock()
+
+
+def get_local_backend(model: str, dimension: int) -> LocalEmbeddingBackend:
+    """The shared backend of a local model (not loaded until it first embeds)"""
+    backend = _local_backends.get(model)
+    if backend is None:
+        with _local_backends_lock:
+            backend = _local_backends.get(model)
+            if backend is None:
+                backend = LocalEmbeddingBackend(os.path.join(Config.LOCAL_EMBEDDING_MODELS_DIR, model), dimension)
+                _local_backends[model] = backend
+    return backend
+
+
+def preload_local_backends(models) -> List[str]:
+    """
+    Load the local models among `models` (EmbeddingModel entries) whose files
+    are installed; call before forking workers. Returns the models loaded.
+    """
+    loaded = []
+    for model in models:
+        if model.provider != "local":
+            continue
+        backend = get_local_backend(model.model, model.dimension)
+        if backend.available:
+            backend.load()
+            loaded.append(model.model)
+    return loaded
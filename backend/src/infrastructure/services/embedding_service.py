@@ -1,83 +1,91 @@
 import os
-from typing import List, Optional
+from typing import Dict, List, NamedTuple
 
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from .embedding_backends import EmbeddingBackend, OpenAIEmbeddingBackend, get_local_backend
+
+
+class EmbeddingModel(NamedTuple):
+    version: str        # stored with every vector; vectors of different versions never mix
+    model: str          # the provider's model name (local: the model's directory)
+    dimension: int
+    provider: str = "openai"    # "openai" or "local" (see embedding_backends.py)
+
+
+# Embedding versions that can be rolled out (see services/embedding_version_service.py).
+# Bump the version suffix, not the model, when the text fed to a model changes.
+EMBEDDING_MODELS: Dict[str, EmbeddingModel] = {m.version: m for m in (
+    EmbeddingModel("text-embedding-3-small@1", "text-embedding-3-small", 1536),
+    EmbeddingModel("text-embedding-3-large@1", "text-embedding-3-large", 3072),
+    EmbeddingModel("text-embedding-ada-002@1", "text-embedding-ada-002", 1536),
+    # Multilingual (Vietnamese included), runs on the CPU of the app itself
+    EmbeddingModel("multilingual-minilm-l12@1", "paraphrase-multilingual-MiniLM-L12-v2", 384, provider="local"),
+)}
+DEFAULT_EMBEDDING_VERSION = "text-embedding-3-small@1"
 
 
 class EmbeddingService:
     """
-    Service for creating text embeddings using OpenAI
+    Service for creating text embeddings of one embedding version, with
+    the OpenAI API or a local model depending on the version
     Used for semantic search and recommendations
     """
     
-    def __init__(self, api_key: str = None, model: str = "text-embedding-3-small"):
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        self.model = model
-        self._client = None
-        # Embedding dimensions for different models
-        self.dimensions = {
-            "text-embedding-3-small": 1536,
-            "text-embedding-3-large": 3072,
-            "text-embedding-ada-002": 1536
-        }
-        
-    @property
-    def client(self):
-        """Lazy initialization of OpenAI client"""
-        if self._client is None and OPENAI_AVAILABLE and self.api_key:
-            self._client = OpenAI(api_key=self.api_key)
-        return self._client
+    def __init__(self, api_key: str = None, version: str = DEFAULT_EMBEDDING_VERSION):
+        if version not in EMBEDDING_MODELS:
+            raise ValueError(f"Unknown embedding version: {version}")
+        entry = EMBEDDING_MODELS[version]
+        self.version = version
+        self.model = entry.model
+        self.provider = entry.provider
+        if entry.provider == "local":
+            self.backend: EmbeddingBackend = get_local_backend(entry.model, entry.dimension)
+        else:
+            self.backend = OpenAIEmbeddingBackend(entry.model, api_key or os.getenv("OPENAI_API_KEY"))
 
     def create_embedding(self, text: str) -> List[float]:
         """
         Create embedding vector for text
         Returns a list of floats representing the semantic meaning
         """
-        if not self.client:
-            # Return dummy embedding when OpenAI is not available
+        if not self.backend.available:
+            # Return dummy embedding when the backend is not available
             return self._create_dummy_embedding(text)
         
         try:
             # Clean and truncate text if needed
-            clean_text = self._preprocess_text(text)
-            
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=clean_text
-            )
-            return response.data[0].embedding
+            return self.backend.embed([self._preprocess_text(text)])[0]
         except Exception as e:
             # Fallback to dummy embedding on error
             print(f"Embedding error: {e}")
             return self._create_dummy_embedding(text)
 
-    def create_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+    def create_embeddings_batch(self, texts: List[str], strict: bool = False) -> List[List[float]]:
         """
-        Create embeddings for multiple texts in a single API call
+        Create embeddings for multiple texts in a single API call (one
+        batched run on a local model)
         More efficient for bulk operations
+        strict: raise backend errors instead of falling back to dummy embeddings
+        (for vectors that get stored)
         """
-        if not self.client:
+        if not self.backend.available:
             return [self._create_dummy_embedding(t) for t in texts]
         
         try:
-            clean_texts = [self._preprocess_text(t) for t in texts]
-            
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=clean_texts
-            )
-            return [item.embedding for item in response.data]
+            return self.backend.embed([self._preprocess_text(t) for t in texts])
         except Exception as e:
+            if strict:
+                raise
             print(f"Batch embedding error: {e}")
             return [self._create_dummy_embedding(t) for t in texts]
 
+    @property
+    def model_key(self) -> str:
+        """Identifies what produces the vectors: the model, or the dummy fallback"""
+        return self.model if self.backend.available else "dummy"
+
     def get_embedding_dimension(self) -> int:
         """Get the dimension of embeddings for current model"""
-        return self.dimensions.get(self.model, 1536)
+        return EMBEDDING_MODELS[self.version].dimension
 
     def _preprocess_text(self, text: str, max_tokens: int = 8000) -> str:
         """Preprocess text for embedding"""
@@ -91,7 +99,7 @@ class EmbeddingService:
 
     def _create_dummy_embedding(self, text: str) -> List[float]:
         """
-        Create a dummy embedding when OpenAI is not available
+        Create a dummy embedding when the backend is not available
         Uses simple hash-based approach for testing
         """
         import hashlib
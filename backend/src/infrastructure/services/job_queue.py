@@ -0,0 +1,532 @@
+"""
+Job Queue for S2O Platform
+Infrastructure layer service running slow side effects off the request thread
+No business logic - queueing, retries and workers; handlers live in src/jobs.py
+
+A job is a named handler plus a JSON payload, pushed to a priority lane
+(high, default, low); a worker always takes from the highest non-empty
+lane it serves. A failing job is retried with exponential backoff up to
+its max_attempts, then moved to the dead-letter list. While a job is
+queued, running or waiting for a retry, enqueueing another job with the
+same dedupe key is a no-op. A job enqueued with a delay waits in the
+delayed set first; with a dedupe key this debounces bursts of writes
+into one run.
+
+Backends:
+    RedisJobQueue      shared by web and worker processes (scripts/run_job_worker.py)
+    InMemoryJobQueue   single process; for tests, and when Redis is unreachable
+
+Services don't enqueue directly. They write jobs to the transactional
+outbox (OutboxRepository) in the same transaction as their data, and the
+jobs are pushed here once the commit succeeds, so a rolled-back request
+never runs its side effects. Outbox rows are deleted when their job
+settles; the OutboxRelay re-pushes rows left behind by a crash between
+commit and push. Delivery is at least once: handlers must be idempotent.
+
+Config (env):
+    JOB_QUEUE_BACKEND          redis (default) or memory
+    JOB_INPROCESS_WORKERS      worker threads in the web process
+                               (default 0 with Redis, 1 with the memory backend)
+    JOB_OUTBOX_RELAY_SECONDS   age at which unsettled outbox rows are re-pushed (default 30)
+"""
+import os
+import json
+import time
+import heapq
+import uuid
+import random
+import logging
+import itertools
+import threading
+from collections import deque
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Highest priority first
+LANES = ("high", "default", "low")
+
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 300.0
+# A claimed job not settled within this is handed to another worker
+VISIBILITY_TIMEOUT_SECONDS = 300
+DEDUPE_TTL_SECONDS = 86400
+DEAD_LETTER_LIMIT = 1000
+
+# Results of enqueue()
+QUEUED = "queued"
+DUPLICATE = "duplicate"      # another job holds the dedupe key
+IN_FLIGHT = "in_flight"      # this same job is already queued, running or retrying
+
+OUTBOX_PENDING_KEY = "s2o_outbox_jobs"
+
+
+class JobDefinition:
+    __slots__ = ("name", "fn", "lane", "max_attempts")
+
+    def __init__(self, name: str, fn: Callable[[Dict[str, Any]], Any], lane: str, max_attempts: int):
+        self.name = name
+        self.fn = fn
+        self.lane = lane
+        self.max_attempts = max_attempts
+
+
+# Job name -> definition, filled by the @job decorators in src/jobs.py
+JOB_HANDLERS: Dict[str, JobDefinition] = {}
+
+
+def job(name: str, lane: str = "default", max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+    """Register a function as the handler of job `name` (called with the payload)"""
+    if lane not in LANES:
+        raise ValueError(f"Unknown lane {lane}")
+
+    def decorator(fn):
+        JOB_HANDLERS[name] = JobDefinition(name, fn, lane, max_attempts)
+        return fn
+    return decorator
+
+
+def load_job_handlers() -> Dict[str, JobDefinition]:
+    """Import src/jobs.py, which registers the handlers"""
+    from ... import jobs  # noqa: F401
+    return JOB_HANDLERS
+
+
+def make_job(
+    name: str,
+    payload: Dict[str, Any],
+    lane: Optional[str] = None,
+    dedupe_key: Optional[str] = None,
+    job_id: Optional[str] = None,
+    outbox_id: Optional[str] = None,
+    delay: float = 0.0
+) -> Dict[str, Any]:
+    """Build a job; lane and max_attempts default to the handler's registration"""
+    definition = load_job_handlers().get(name)
+    lane = lane or (definition.lane if definition else "default")
+    if lane not in LANES:
+        raise ValueError(f"Unknown lane {lane}")
+    return {
+        "id": job_id or uuid.uuid4().hex,
+        "name": name,
+        "payload": payload,
+        "lane": lane,
+        "dedupe_key": dedupe_key,
+        "attempts": 0,
+        "max_attempts": definition.max_attempts if definition else DEFAULT_MAX_ATTEMPTS,
+        "outbox_id": outbox_id,
+        "enqueued_at": time.time(),
+        "run_at": time.time() + delay if delay > 0 else None,
+    }
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter: ~2s, 4s, 8s ... capped at 5 minutes"""
+    delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * (2 ** (attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+class InMemoryJobQueue:
+    """
+    Single-process job queue.
+    Used by tests (drain with JobWorker(queue).run_pending()) and as the
+    fallback when Redis is unreachable, with in-process worker threads.
+    """
+
+    def __init__(self):
+        self._lanes = {lane: deque() for lane in LANES}
+        self._delayed: List = []  # heap of (run_at, seq, job)
+        self._dedupe: Dict[str, str] = {}  # dedupe key -> job id
+        self._dead = deque(maxlen=DEAD_LETTER_LIMIT)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def enqueue(self, job: Dict[str, Any]) -> str:
+        with self._cond:
+            key = job.get("dedupe_key")
+            if key:
+                holder = self._dedupe.get(key)
+                if holder is not None:
+                    return IN_FLIGHT if holder == job["id"] else DUPLICATE
+                self._dedupe[key] = job["id"]
+            if job.get("run_at"):
+                heapq.heappush(self._delayed, (job["run_at"], next(self._seq), job))
+            else:
+                self._lanes[job["lane"]].append(job)
+            self._cond.notify()
+        return QUEUED
+
+    def claim(self, lanes: Iterable[str] = LANES, timeout: float = 0.0) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.time()
+                while self._delayed and self._delayed[0][0] <= now:
+                    _, _, job = heapq.heappop(self._delayed)
+                    self._lanes[job["lane"]].appendleft(job)
+                for lane in lanes:
+                    if self._lanes[lane]:
+                        return self._lanes[lane].popleft()
+                wait = deadline - time.monotonic()
+                if wait <= 0:
+                    return None
+                if self._delayed:
+                    wait = min(wait, max(0.001, self._delayed[0][0] - now))
+                self._cond.wait(wait)
+
+    def ack(self, job: Dict[str, Any]) -> None:
+        with self._cond:
+            self._release(job)
+
+    def retry(self, job: Dict[str, Any], delay: float) -> None:
+        with self._cond:
+            heapq.heappush(self._delayed, (time.time() + delay, next(self._seq), job))
+            self._cond.notify()
+
+    def dead(self, job: Dict[str, Any], error: str) -> None:
+        with self._cond:
+            self._release(job)
+            self._dead.append(dict(job, error=error, failed_at=time.time()))
+
+    def _release(self, job: Dict[str, Any]) -> None:
+        key = job.get("dedupe_key")
+        if key and self._dedupe.get(key) == job["id"]:
+            del self._dedupe[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            stats = {f"lane_{lane}": len(q) for lane, q in self._lanes.items()}
+            stats.update(delayed=len(self._delayed), dead=len(self._dead))
+        return stats
+
+
+class RedisJobQueue:
+    """
+    Redis job queue shared by every process.
+
+    Keys (prefix s2o:jobs):
+        lane:<lane>     list of job ids, LPUSH to enqueue, RPOP to claim
+        data            hash job id -> job JSON
+        delayed         zset job id -> run at (retries, delayed jobs)
+        inflight        zset job id -> visibility deadline
+        dedupe:<key>    job id holding the dedupe key
+        dead            list of failed job JSON, newest first, capped
+
+    Claims run as one Lua script: due retries and jobs of crashed workers
+    (visibility deadline passed) go back to the front of their lanes, then
+    the first id of the highest-priority non-empty lane is moved in flight.
+    """
+
+    _ENQUEUE = """
+        if ARGV[3] == '1' then
+            local holder = redis.call('GET', KEYS[3])
+            if holder then
+                if holder == ARGV[1] then return 2 end
+                return 0
+            end
+            redis.call('SET', KEYS[3], ARGV[1], 'EX', ARGV[4])
+        end
+        redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+        if tonumber(ARGV[5]) > 0 then
+            redis.call('ZADD', KEYS[4], ARGV[5], ARGV[1])
+        else
+            redis.call('LPUSH', KEYS[2], ARGV[1])
+        end
+        return 1
+    """
+
+    _CLAIM = """
+        local now = tonumber(ARGV[1])
+        local lane_keys = {}
+        for i = 4, #KEYS do lane_keys[ARGV[i - 1]] = KEYS[i] end
+        for _, zkey in ipairs({KEYS[1], KEYS[2]}) do
+            local due = redis.call('ZRANGEBYSCORE', zkey, '-inf', now, 'LIMIT', 0, 100)
+            for _, id in ipairs(due) do
+                local body = redis.call('HGET', KEYS[3], id)
+                local lane = body and lane_keys[cjson.decode(body)['lane']]
+                if lane then
+                    redis.call('ZREM', zkey, id)
+                    redis.call('RPUSH', lane, id)
+                elseif not body then
+                    redis.call('ZREM', zkey, id)
+                end
+            end
+        end
+        for i = 4, #KEYS do
+            local id = redis.call('RPOP', KEYS[i])
+            while id do
+                local body = redis.call('HGET', KEYS[3], id)
+                if body then
+                    redis.call('ZADD', KEYS[2], now + tonumber(ARGV[2]), id)
+                    return body
+                end
+                id = redis.call('RPOP', KEYS[i])
+            end
+        end
+        return false
+    """
+
+    def __init__(self, client, prefix: str = "s2o:jobs", poll_interval: float = 0.25):
+        self._redis = client
+        self._prefix = prefix
+        self._poll_interval = poll_interval
+        self._enqueue_script = client.register_script(self._ENQUEUE)
+        self._claim_script = client.register_script(self._CLAIM)
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self._prefix, *parts))
+
+    def enqueue(self, job: Dict[str, Any]) -> str:
+        key = job.get("dedupe_key")
+        result = self._enqueue_script(
+            keys=[
+                self._key("data"), self._key("lane", job["lane"]), self._key("dedupe", key or ""), self._key("delayed")
+            ],
+            args=[job["id"], json.dumps(job), "1" if key else "0", DEDUPE_TTL_SECONDS, job.get("run_at") or 0]
+        )
+        return {1: QUEUED, 2: IN_FLIGHT}.get(int(result), DUPLICATE)
+
+    def claim(self, lanes: Iterable[str] = LANES, timeout: float = 0.0) -> Optional[Dict[str, Any]]:
+        lanes = list(lanes)
+        keys = [self._key("delayed"), self._key("inflight"), self._key("data")]
+        keys += [self._key("lane", lane) for lane in lanes]
+        deadline = time.monotonic() + timeout
+        while True:
+            body = self._claim_script(keys=keys, args=[time.time(), VISIBILITY_TIMEOUT_SECONDS, *lanes])
+            if body:
+                return json.loads(body)
+            wait = deadline - time.monotonic()
+            if wait <= 0:
+                return None
+            time.sleep(min(wait, self._poll_interval))
+
+    def ack(self, job: Dict[str, Any]) -> None:
+        pipe = self._redis.pipeline()
+        pipe.zrem(self._key("inflight"), job["id"])
+        pipe.hdel(self._key("data"), job["id"])
+        if job.get("dedupe_key"):
+            pipe.delete(self._key("dedupe", job["dedupe_key"]))
+        pipe.execute()
+
+    def retry(self, job: Dict[str, Any], delay: float) -> None:
+        pipe = self._redis.pipeline()
+        pipe.hset(self._key("data"), job["id"], json.dumps(job))
+        pipe.zadd(self._key("delayed"), {job["id"]: time.time() + delay})
+        pipe.zrem(self._key("inflight"), job["id"])
+        pipe.execute()
+
+    def dead(self, job: Dict[str, Any], error: str) -> None:
+        pipe = self._redis.pipeline()
+        pipe.lpush(self._key("dead"), json.dumps(dict(job, error=error, failed_at=time.time())))
+        pipe.ltrim(self._key("dead"), 0, DEAD_LETTER_LIMIT - 1)
+        pipe.zrem(self._key("inflight"), job["id"])
+        pipe.hdel(self._key("data"), job["id"])
+        if job.get("dedupe_key"):
+            pipe.delete(self._key("dedupe", job["dedupe_key"]))
+        pipe.execute()
+
+    def stats(self) -> Dict[str, int]:
+        pipe = self._redis.pipeline()
+        for lane in LANES:
+            pipe.llen(self._key("lane", lane))
+        pipe.zcard(self._key("delayed"))
+        pipe.zcard(self._key("inflight"))
+        pipe.llen(self._key("dead"))
+        values = pipe.execute()
+        stats = {f"lane_{lane}": n for lane, n in zip(LANES, values)}
+        stats.update(delayed=values[-3], inflight=values[-2], dead=values[-1])
+        return stats
+
+
+class JobWorker:
+    """
+    Claims jobs from the lanes it serves, runs their handlers and settles them:
+    ack on success, retry with backoff on failure, dead letter once attempts run out.
+    """
+
+    def __init__(self, queue, lanes: Iterable[str] = LANES, metrics=None):
+        self.queue = queue
+        self.lanes = tuple(lanes)
+        self.metrics = metrics
+        self.handlers = load_job_handlers()
+
+    def run_once(self, timeout: float = 0.0) -> bool:
+        """Run one job if one is available within timeout; returns whether one ran"""
+        job = self.queue.claim(self.lanes, timeout)
+        if job is None:
+            return False
+        self._execute(job)
+        return True
+
+    def run_pending(self) -> int:
+        """Run every job that is due now (tests); returns how many ran"""
+        ran = 0
+        while self.run_once():
+            ran += 1
+        return ran
+
+    def run_forever(self, stop: threading.Event, poll_timeout: float = 1.0) -> None:
+        while not stop.is_set():
+            try:
+                self.run_once(poll_timeout)
+            except Exception as e:
+                # Queue unreachable: back off instead of spinning
+                logger.error(f"JobWorker: claim failed ({e})")
+                stop.wait(poll_timeout)
+
+    def _execute(self, job: Dict[str, Any]) -> None:
+        definition = self.handlers.get(job["name"])
+        if definition is None:
+            logger.error(f"JobWorker: no handler for job {job['name']}")
+            self.queue.dead(job, "unknown job")
+            self._settle_outbox(job)
+            return
+
+        started = perf_counter()
+        try:
+            definition.fn(job["payload"])
+        except Exception as e:
+            job["attempts"] += 1
+            outcome = "retry"
+            if job["attempts"] >= job.get("max_attempts", definition.max_attempts):
+                outcome = "dead"
+                logger.error(f"JobWorker: {job['name']} {job['id']} failed for good after {job['attempts']} attempts ({e!r})")
+                self.queue.dead(job, repr(e))
+                self._settle_outbox(job)
+            else:
+                delay = retry_delay(job["attempts"])
+                logger.warning(f"JobWorker: {job['name']} {job['id']} failed ({e!r}), retry in {delay:.0f}s")
+                self.queue.retry(job, delay)
+        else:
+            outcome = "ok"
+            self.queue.ack(job)
+            self._settle_outbox(job)
+        if self.metrics is not None:
+            self.metrics.record_job(job["name"], outcome, perf_counter() - started)
+
+    @staticmethod
+    def _settle_outbox(job: Dict[str, Any]) -> None:
+        if job.get("outbox_id"):
+            from ..repositories.outbox_repository import delete_outbox_rows
+            try:
+                delete_outbox_rows([job["outbox_id"]])
+            except Exception as e:
+                # The relay will push it again; handlers are idempotent
+                logger.warning(f"JobWorker: outbox row {job['outbox_id']} not deleted ({e})")
+
+
+class OutboxRelay:
+    """Re-pushes outbox rows whose after-commit push was lost (crash, queue down)"""
+
+    def __init__(self, queue, older_than: float = 30.0, batch: int = 500):
+        self.queue = queue
+        self.older_than = older_than
+        self.batch = batch
+
+    def relay_once(self) -> int:
+        from ..repositories.outbox_repository import relay_outbox_rows
+        return relay_outbox_rows(self.queue, self.older_than, self.batch)
+
+    def run_forever(self, stop: threading.Event) -> None:
+        while not stop.wait(self.older_than):
+            try:
+                pushed = self.relay_once()
+                if pushed:
+                    logger.info(f"OutboxRelay: re-pushed {pushed} jobs")
+            except Exception as e:
+                logger.error(f"OutboxRelay: relay failed ({e})")
+
+
+def _dispatch_outbox(session) -> None:
+    pending = session.info.pop(OUTBOX_PENDING_KEY, None)
+    if not pending:
+        return
+    try:
+        queue = get_job_queue()
+        for job in pending:
+            queue.enqueue(job)
+    except Exception as e:
+        # Rows are committed; the relay pushes them later
+        logger.error(f"JobQueue: after-commit push failed, left to the outbox relay ({e})")
+
+
+def _discard_outbox(session, *args) -> None:
+    session.info.pop(OUTBOX_PENDING_KEY, None)
+
+
+def install_outbox_dispatch() -> None:
+    """Push outbox jobs after every successful commit (idempotent)"""
+    if not event.contains(Session, "after_commit", _dispatch_outbox):
+        event.listen(Session, "after_commit", _dispatch_outbox)
+        event.listen(Session, "after_rollback", _discard_outbox)
+
+
+def start_inprocess_workers(queue, count: int, relay: bool = True) -> threading.Event:
+    """Run `count` worker threads (and the outbox relay) in this process"""
+    from .metrics_service import get_metrics_service
+
+    stop = threading.Event()
+    for i in range(count):
+        worker = JobWorker(queue, metrics=get_metrics_service())
+        threading.Thread(target=worker.run_forever, args=(stop,), name=f"job-worker-{i}", daemon=True).start()
+    if relay:
+        older_than = float(os.getenv('JOB_OUTBOX_RELAY_SECONDS') or 30)
+        threading.Thread(
+            target=OutboxRelay(queue, older_than).run_forever, args=(stop,), name="outbox-relay", daemon=True
+        ).start()
+    return stop
+
+
+# Global instance
+job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def init_job_queue(app=None, workers: Optional[int] = None):
+    """
+    Initialize global job queue (Redis when configured and reachable, otherwise
+    in-memory) and start in-process workers if configured. The memory backend
+    gets one worker by default, as no other process can run its jobs.
+    """
+    global job_queue
+    backend = os.getenv('JOB_QUEUE_BACKEND', 'redis')
+    queue = None
+    if backend == 'redis' and REDIS_AVAILABLE:
+        redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        try:
+            client = redis.Redis.from_url(redis_url, decode_responses=True, socket_connect_timeout=0.5)
+            client.ping()
+            queue = RedisJobQueue(client)
+            logger.info(f"JobQueue: Redis connected at {redis_url}")
+        except Exception as e:
+            logger.warning(f"JobQueue: Redis failed ({e}), using in-memory queue")
+    if queue is None:
+        queue = InMemoryJobQueue()
+
+    if workers is None:
+        default = "1" if isinstance(queue, InMemoryJobQueue) else "0"
+        workers = int(os.getenv('JOB_INPROCESS_WORKERS') or default)
+    if workers:
+        start_inprocess_workers(queue, workers)
+    job_queue = queue
+    return job_queue
+
+
+def get_job_queue():
+    """Get global job queue instance, connecting on first use"""
+    if job_queue is None:
+        with _job_queue_lock:
+            if job_queue is None:
+                init_job_queue()
+    return job_queue
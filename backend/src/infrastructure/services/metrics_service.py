@@ -0,0 +1,207 @@
+"""
+Metrics Service for S2O Platform
+Infrastructure layer service for request/SQL/cache metrics
+No business logic - pure measurement and Prometheus text exposition
+
+Per-request numbers are collected in a context variable, so SQLAlchemy
+and cache hooks can record into the current request without a Flask
+import. Aggregates are per process.
+"""
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Seconds; shared by request and SQL latency histograms
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Statements kept per request for the slow-request breakdown
+MAX_SAMPLED_STATEMENTS = 200
+
+
+class RequestStats:
+    """Numbers collected while one request is handled"""
+
+    __slots__ = ("request_id", "sql_count", "sql_seconds", "statements", "cache_hits", "cache_misses")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.statements: List[Tuple[str, float]] = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("s2o_request_stats", default=None)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsService:
+    """
+    Infrastructure service for performance metrics.
+
+    Usage:
+        from infrastructure.services import get_metrics_service
+        metrics = get_metrics_service()
+        stats = metrics.start_request(request_id)
+        ...
+        metrics.finish_request(stats, "GET", "/api/v1/orders", 200, 0.012, 5321)
+        text = metrics.render()
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (method, endpoint, status) -> latency histogram
+        self._latency: Dict[Tuple[str, str, str], _Histogram] = {}
+        # (method, endpoint) -> counters
+        self._sql_count: Dict[Tuple[str, str], int] = {}
+        self._sql_seconds: Dict[Tuple[str, str], float] = {}
+        self._response_bytes: Dict[Tuple[str, str], int] = {}
+        self._sql_latency = _Histogram()
+        self._cache = {"hit": 0, "miss": 0}
+        # (job name, outcome) -> duration histogram, for jobs run in this process
+        self._jobs: Dict[Tuple[str, str], _Histogram] = {}
+        # Called with (method, endpoint, status, stats) after every request
+        self._observers: List[Callable] = []
+
+    def add_request_observer(self, observer: Callable) -> None:
+        if observer not in self._observers:
+            self._observers.append(observer)
+
+    # Request lifecycle
+    def start_request(self, request_id: str) -> RequestStats:
+        stats = RequestStats(request_id)
+        _current.set(stats)
+        return stats
+
+    @staticmethod
+    def current() -> Optional[RequestStats]:
+        return _current.get()
+
+    def finish_request(
+        self,
+        stats: RequestStats,
+        method: str,
+        endpoint: str,
+        status: int,
+        seconds: float,
+        response_bytes: int
+    ) -> None:
+        _current.set(None)
+        key = (method, endpoint)
+        with self._lock:
+            self._latency.setdefault((method, endpoint, str(status)), _Histogram()).observe(seconds)
+            self._sql_count[key] = self._sql_count.get(key, 0) + stats.sql_count
+            self._sql_seconds[key] = self._sql_seconds.get(key, 0.0) + stats.sql_seconds
+            self._response_bytes[key] = self._response_bytes.get(key, 0) + response_bytes
+        for observer in self._observers:
+            observer(method, endpoint, status, stats)
+
+    # Hooks
+    def record_statement(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self._sql_latency.observe(seconds)
+        stats = _current.get()
+        if stats is not None:
+            stats.sql_count += 1
+            stats.sql_seconds += seconds
+            if len(stats.statements) < MAX_SAMPLED_STATEMENTS:
+                stats.statements.append((statement, seconds))
+
+    def record_cache_lookup(self, hit: bool) -> None:
+        with self._lock:
+            self._cache["hit" if hit else "miss"] += 1
+        stats = _current.get()
+        if stats is not None:
+            if hit:
+                stats.cache_hits += 1
+            else:
+                stats.cache_misses += 1
+
+    def record_job(self, name: str, outcome: str, seconds: float) -> None:
+        with self._lock:
+            self._jobs.setdefault((name, outcome), _Histogram()).observe(seconds)
+
+    # Exposition
+    def render(self) -> str:
+        """Prometheus text format (version 0.0.4)"""
+        lines: List[str] = []
+        with self._lock:
+            lines += [
+                "# HELP s2o_request_duration_seconds Request latency by endpoint",
+                "# TYPE s2o_request_duration_seconds histogram",
+            ]
+            for (method, endpoint, status), hist in sorted(self._latency.items()):
+                labels = f'method="{method}",endpoint="{_escape(endpoint)}",status="{status}"'
+                lines += _histogram_lines("s2o_request_duration_seconds", labels, hist)
+
+            for name, help_text, values in (
+                ("s2o_request_sql_statements_total", "SQL statements executed, by endpoint", self._sql_count),
+                ("s2o_request_sql_seconds_total", "Time spent in SQL, by endpoint", self._sql_seconds),
+                ("s2o_response_bytes_total", "Response body bytes, by endpoint", self._response_bytes),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (method, endpoint), value in sorted(values.items()):
+                    lines.append(f'{name}{{method="{method}",endpoint="{_escape(endpoint)}"}} {value}')
+
+            lines += [
+                "# HELP s2o_sql_statement_duration_seconds SQL statement latency",
+                "# TYPE s2o_sql_statement_duration_seconds histogram",
+            ]
+            lines += _histogram_lines("s2o_sql_statement_duration_seconds", "", self._sql_latency)
+
+            lines += [
+                "# HELP s2o_cache_lookups_total CacheService lookups by result",
+                "# TYPE s2o_cache_lookups_total counter",
+                f's2o_cache_lookups_total{{result="hit"}} {self._cache["hit"]}',
+                f's2o_cache_lookups_total{{result="miss"}} {self._cache["miss"]}',
+            ]
+
+            lines += [
+                "# HELP s2o_job_duration_seconds Background job run time by job and outcome (ok, retry, dead)",
+                "# TYPE s2o_job_duration_seconds histogram",
+            ]
+            for (name, outcome), hist in sorted(self._jobs.items()):
+                lines += _histogram_lines("s2o_job_duration_seconds", f'job="{_escape(name)}",outcome="{outcome}"', hist)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _histogram_lines(name: str, labels: str, hist: _Histogram) -> List[str]:
+    sep = "," if labels else ""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(LATENCY_BUCKETS, hist.buckets):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {hist.count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {hist.sum}")
+    lines.append(f"{name}_count{suffix} {hist.count}")
+    return lines
+
+
+# Global instance
+metrics_service = MetricsService()
+
+
+def get_metrics_service() -> MetricsService:
+    """Get global metrics service instance"""
+    return metrics_service
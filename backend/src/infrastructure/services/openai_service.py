@@ -1,11 +1,9 @@
 import os
+import importlib.util
 from typing import List, Dict, Any, Optional
 
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# openai is imported on first client use; it dominates worker boot time
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
 
 
 class OpenAIService:
@@ -23,18 +21,40 @@ class OpenAIService:
     def client(self):
         """Lazy initialization of OpenAI client"""
         if self._client is None and OPENAI_AVAILABLE and self.api_key:
+            from openai import OpenAI
             self._client = OpenAI(api_key=self.api_key)
         return self._client
 
-    def generate_answer(self, query: str, context_docs: List[Dict[str, Any]]) -> str:
+    def generate_answer(
+        self, query: str, context_docs: List[Dict[str, Any]],
+        history: List[Dict[str, str]] = None, summary: str = None
+    ) -> str:
         """
         Generate an answer using RAG - Retrieval Augmented Generation
-        Uses context documents to inform the response
+        Uses context documents to inform the response; history (earlier
+        turns as {"question", "answer"}) and the summary of turns before
+        those carry a conversation on
         """
         if not self.client:
             # Fallback for when OpenAI is not configured
             return self._generate_fallback_answer(query, context_docs)
-        
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=self.build_answer_messages(query, context_docs, history, summary),
+                max_tokens=500,
+                temperature=0.7
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            return f"I apologize, but I'm having trouble processing your request. Error: {str(e)}"
+
+    def build_answer_messages(
+        self, query: str, context_docs: List[Dict[str, Any]],
+        history: List[Dict[str, str]] = None, summary: str = None
+    ) -> List[Dict[str, str]]:
+        """Chat messages generate_answer() sends"""
         # Build context from retrieved documents
         context_text = self._build_context(context_docs)
         
@@ -51,19 +71,45 @@ User question: {query}
 
 Please provide a helpful answer based on the context above."""
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=500,
-                temperature=0.7
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            return f"I apologize, but I'm having trouble processing your request. Error: {str(e)}"
+        messages = [{"role": "system", "content": system_prompt}]
+        if summary:
+            messages.append({"role": "system", "content": f"Summary of the conversation so far: {summary}"})
+        for turn in history or []:
+            messages.append({"role": "user", "content": turn["question"]})
+            messages.append({"role": "assistant", "content": turn["answer"]})
+        messages.append({"role": "user", "content": user_prompt})
+        return messages
+
+    def summarize_conversation(self, summary: str, turns: List[Dict[str, str]], max_tokens: int = 200) -> str:
+        """
+        Fold conversation turns ({"question", "answer"}) into the running
+        summary of a conversation, in at most about max_tokens
+        """
+        if self.client:
+            transcript = "\n".join(f"Guest: {t['question']}\nAssistant: {t['answer']}" for t in turns)
+            prompt = f"""Summary so far: {summary or "(none)"}
+
+New part of the conversation:
+{transcript}
+
+Update the summary of this conversation between a restaurant guest and its assistant.
+Keep what the guest wants, likes, avoids and has decided, and facts the assistant gave.
+Answer with the summary only, in at most {max_tokens // 2} words."""
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=max_tokens,
+                    temperature=0.2
+                )
+                return response.choices[0].message.content.strip()
+            except Exception:
+                pass
+        # Without the API: the guest's questions, the most recent kept
+        asked = "; ".join(t["question"] for t in turns)
+        text = f"{summary}; {asked}" if summary else f"The guest asked about: {asked}"
+        max_chars = max_tokens * 4
+        return text if len(text) <= max_chars else "..." + text[-max_chars:]
 
     def generate_menu_description(self, dish_name: str, ingredients: List[str] = None) -> str:
         """Generate an appealing menu description for a dish"""
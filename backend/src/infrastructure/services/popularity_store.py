@@ -0,0 +1,223 @@
+"""
+Popularity Store for S2O Platform
+Infrastructure layer service holding time-decayed product rankings per branch
+No business logic - sorted-set storage; windows and events live in the popularity service
+
+Scores decay exponentially with a window's half-life, using forward decay:
+an order at time t adds quantity * 2^((t - epoch) / half_life) instead of
+decaying every stored score as time passes. Ordering by stored score is
+then the same as ordering by decayed score at any moment, so a ranking is
+one sorted-set range read, O(log n + k). Before the exponent can overflow,
+the set is rebased (all scores scaled down, epoch moved to now); a full
+recompute rebases as well.
+"""
+import os
+import logging
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Rebase once scores have grown by 2^REBASE_HALF_LIVES
+REBASE_HALF_LIVES = 64
+# Rankings of branches without orders expire
+RANKING_TTL_SECONDS = 14 * 24 * 60 * 60
+SEEN_ORDER_TTL_SECONDS = 7 * 24 * 60 * 60
+SEEN_ORDER_LIMIT = 100_000
+
+# (product_id, score decayed to now), best first
+Ranking = List[Tuple[str, float]]
+
+
+class _SortedScores:
+    """Scores kept both by product and in rank order, for O(log n) reads"""
+
+    __slots__ = ("epoch", "by_product", "ranked")
+
+    def __init__(self, epoch: float, scores: Mapping[str, float]):
+        self.epoch = epoch
+        self.by_product: Dict[str, float] = dict(scores)
+        self.ranked: List[Tuple[float, str]] = sorted((-s, p) for p, s in scores.items())
+
+    def add(self, product_id: str, amount: float) -> None:
+        old = self.by_product.get(product_id)
+        if old is not None:
+            del self.ranked[bisect_left(self.ranked, (-old, product_id))]
+        new = (old or 0.0) + amount
+        self.by_product[product_id] = new
+        insort(self.ranked, (-new, product_id))
+
+    def rebase(self, epoch: float, factor: float) -> None:
+        self.epoch = epoch
+        self.by_product = {p: s * factor for p, s in self.by_product.items()}
+        self.ranked = [(s * factor, p) for s, p in self.ranked]
+
+
+class InMemoryPopularityStore:
+    """
+    Process-local popularity store.
+    Used when Redis is unreachable and as the stand-in for tests.
+    """
+
+    def __init__(self):
+        self._rankings: Dict[Tuple[str, str], _SortedScores] = {}
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_built(self, branch_id: str, window: str) -> bool:
+        return (branch_id, window) in self._rankings
+
+    def replace(self, branch_id: str, window: str, scores: Mapping[str, float], now: float) -> None:
+        with self._lock:
+            self._rankings[(branch_id, window)] = _SortedScores(now, scores)
+
+    def mark_order(self, order_id: str) -> bool:
+        """True the first time an order is seen, False on re-delivery"""
+        with self._lock:
+            if order_id in self._seen:
+                return False
+            self._seen[order_id] = None
+            if len(self._seen) > SEEN_ORDER_LIMIT:
+                self._seen.popitem(last=False)
+            return True
+
+    def add(
+        self, branch_id: str, window: str, half_life: float, quantities: Mapping[str, float], at: float
+    ) -> bool:
+        """Add an order's quantities at time `at`; False if the ranking isn't built"""
+        with self._lock:
+            ranking = self._rankings.get((branch_id, window))
+            if ranking is None:
+                return False
+            if (at - ranking.epoch) / half_life > REBASE_HALF_LIVES:
+                ranking.rebase(at, 2.0 ** (-(at - ranking.epoch) / half_life))
+            weight = 2.0 ** ((at - ranking.epoch) / half_life)
+            for product_id, quantity in quantities.items():
+                ranking.add(product_id, quantity * weight)
+            return True
+
+    def top(self, branch_id: str, window: str, half_life: float, k: int, now: float) -> Optional[Ranking]:
+        """Top-k products with their scores decayed to `now`; None if the ranking isn't built"""
+        ranking = self._rankings.get((branch_id, window))
+        if ranking is None:
+            return None
+        decay = 2.0 ** (-(now - ranking.epoch) / half_life)
+        return [(p, -s * decay) for s, p in ranking.ranked[:k]]
+
+
+class RedisPopularityStore:
+    """
+    Popularity store in Redis sorted sets, shared by every worker process.
+
+    s2o:pop:<branch>:<window>          zset product -> forward-decayed score
+    s2o:pop:<branch>:<window>:epoch    epoch of the scores; absent until built
+    s2o:pop:seen:<order_id>            set once the order is counted
+    """
+
+    # Add an order's items; rebases first when the weight would grow too large
+    _ADD_SCRIPT = """
+        local epoch = redis.call('GET', KEYS[2])
+        if not epoch then return 0 end
+        epoch = tonumber(epoch)
+        local at = tonumber(ARGV[1])
+        local half_life = tonumber(ARGV[2])
+        if (at - epoch) / half_life > tonumber(ARGV[3]) then
+            local factor = math.pow(2, -(at - epoch) / half_life)
+            redis.call('ZUNIONSTORE', KEYS[1], 1, KEYS[1], 'WEIGHTS', tostring(factor))
+            epoch = at
+            redis.call('SET', KEYS[2], tostring(epoch))
+        end
+        local weight = math.pow(2, (at - epoch) / half_life)
+        for i = 5, #ARGV, 2 do
+            redis.call('ZINCRBY', KEYS[1], tostring(tonumber(ARGV[i + 1]) * weight), ARGV[i])
+        end
+        redis.call('EXPIRE', KEYS[1], ARGV[4])
+        redis.call('EXPIRE', KEYS[2], ARGV[4])
+        return 1
+    """
+
+    def __init__(self, client):
+        self._redis = client
+        self._add = client.register_script(self._ADD_SCRIPT)
+
+    @staticmethod
+    def _key(branch_id: str, window: str) -> str:
+        return f"s2o:pop:{branch_id}:{window}"
+
+    def is_built(self, branch_id: str, window: str) -> bool:
+        return bool(self._redis.exists(self._key(branch_id, window) + ":epoch"))
+
+    def replace(self, branch_id: str, window: str, scores: Mapping[str, float], now: float) -> None:
+        key = self._key(branch_id, window)
+        pipe = self._redis.pipeline()
+        pipe.delete(key)
+        if scores:
+            pipe.zadd(key, dict(scores))
+            pipe.expire(key, RANKING_TTL_SECONDS)
+        pipe.set(key + ":epoch", repr(now), ex=RANKING_TTL_SECONDS)
+        pipe.execute()
+
+    def mark_order(self, order_id: str) -> bool:
+        """True the first time an order is seen, False on re-delivery"""
+        return bool(self._redis.set(f"s2o:pop:seen:{order_id}", 1, nx=True, ex=SEEN_ORDER_TTL_SECONDS))
+
+    def add(
+        self, branch_id: str, window: str, half_life: float, quantities: Mapping[str, float], at: float
+    ) -> bool:
+        """Add an order's quantities at time `at`; False if the ranking isn't built"""
+        key = self._key(branch_id, window)
+        args = [repr(at), half_life, REBASE_HALF_LIVES, RANKING_TTL_SECONDS]
+        for product_id, quantity in quantities.items():
+            args += [product_id, quantity]
+        return bool(self._add(keys=[key, key + ":epoch"], args=args))
+
+    def top(self, branch_id: str, window: str, half_life: float, k: int, now: float) -> Optional[Ranking]:
+        """Top-k products with their scores decayed to `now`; None if the ranking isn't built"""
+        key = self._key(branch_id, window)
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.get(key + ":epoch")
+        pipe.zrevrange(key, 0, k - 1, withscores=True)
+        epoch, ranked = pipe.execute()
+        if epoch is None:
+            return None
+        decay = 2.0 ** (-(now - float(epoch)) / half_life)
+        return [(p, s * decay) for p, s in ranked]
+
+
+# Global instance
+popularity_store = None
+_popularity_store_lock = threading.Lock()
+
+
+def init_popularity_store(app=None):
+    """Initialize global popularity store (Redis when reachable, otherwise in-memory)"""
+    global popularity_store
+    redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    if REDIS_AVAILABLE:
+        try:
+            client = redis.Redis.from_url(redis_url, decode_responses=True, socket_connect_timeout=0.5)
+            client.ping()
+            popularity_store = RedisPopularityStore(client)
+            logger.info(f"PopularityStore: Redis connected at {redis_url}")
+            return popularity_store
+        except Exception as e:
+            logger.warning(f"PopularityStore: Redis failed ({e}), using in-memory store")
+    popularity_store = InMemoryPopularityStore()
+    return popularity_store
+
+
+def get_popularity_store():
+    """Get global popularity store instance, connecting on first use"""
+    if popularity_store is None:
+        with _popularity_store_lock:
+            if popularity_store is None:
+                init_popularity_store()
+    return popularity_store
@@ -3,16 +3,15 @@ QR Code Generation Service for S2O Platform
 Generates QR codes for tables, payments, and menu access
 """
 import io
+import importlib.util
 import base64
 from typing import Optional, Dict, Any
 
-try:
-    import qrcode
-    from qrcode.image.styledpil import StyledPilImage
-    from qrcode.image.styles.moduledrawers import RoundedModuleDrawer
-    QRCODE_AVAILABLE = True
-except ImportError:
-    QRCODE_AVAILABLE = False
+# qrcode (and Pillow behind it) is imported when the first image is rendered
+QRCODE_AVAILABLE = importlib.util.find_spec("qrcode") is not None
+
+# Table QR images never change for a given URL; rendered PNGs are kept this long
+TABLE_QR_CACHE_SECONDS = 7 * 86400
 
 
 class QRCodeService:
@@ -51,6 +50,24 @@ class QRCodeService:
             }
         )
     
+    def get_table_qr_png(self, tenant_id: str, branch_id: str, table_id: str) -> Optional[bytes]:
+        """
+        PNG of a table's QR code from the cache, rendered on a miss.
+        New tables are rendered ahead of time by the qrcode.render_table job.
+        """
+        from .cache_service import get_cache_service
+
+        cache = get_cache_service()
+        key = cache.make_key("qr", "table", self.base_url, tenant_id, branch_id, table_id)
+        png = cache.get(key)
+        if png is None:
+            result = self.generate_table_qr(tenant_id, branch_id, table_id)
+            if not result.get("qr_image_base64"):
+                return None
+            png = base64.b64decode(result["qr_image_base64"])
+            cache.set(key, png, timeout=TABLE_QR_CACHE_SECONDS)
+        return png
+
     def generate_payment_qr(
         self,
         tenant_id: str,
@@ -147,6 +164,8 @@ class QRCodeService:
             return result
         
         try:
+            import qrcode
+
             # Create QR code with styling
             qr = qrcode.QRCode(
                 version=1,
@@ -0,0 +1,113 @@
+"""
+Rate Limiter for S2O Platform
+Infrastructure layer service pacing calls to quota-limited external APIs
+No business logic - limits are passed in by the caller
+
+Each limit is a rate (units per second) with a burst allowance, enforced
+with the generic cell rate algorithm: a key stores only the theoretical
+time its budget is next fully used. reserve() books `cost` units and
+returns how long the caller must wait before spending them; if that wait
+is longer than max_wait nothing is booked, so a background job can put
+itself back on the queue instead of holding a worker.
+"""
+import os
+import time
+import logging
+import threading
+from typing import Dict
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _reserve(tat: float, now: float, cost: float, rate: float, burst: float, max_wait: float):
+    """(wait, new theoretical arrival time or None when not booked)"""
+    new_tat = max(tat, now) + cost / rate
+    wait = max(0.0, new_tat - burst / rate - now)
+    return (wait, None) if wait > max_wait else (wait, new_tat)
+
+
+class InMemoryRateLimiter:
+    """
+    Process-local rate limiter.
+    Used when Redis is unreachable and as the stand-in for tests.
+    """
+
+    def __init__(self):
+        self._tat: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, cost: float, rate: float, burst: float, max_wait: float = float("inf")) -> float:
+        """Book `cost` units; seconds to wait before using them (not booked if over max_wait)"""
+        with self._lock:
+            wait, tat = _reserve(self._tat.get(key, 0.0), time.time(), cost, rate, burst, max_wait)
+            if tat is not None:
+                self._tat[key] = tat
+            return wait
+
+
+class RedisRateLimiter:
+    """
+    Rate limiter shared by every worker process, so a quota holds however
+    many workers spend it.
+
+    s2o:rate:<key>    theoretical arrival time, expiring once the budget is full again
+    """
+
+    # Same arithmetic as _reserve(), on the Redis clock
+    _RESERVE_SCRIPT = """
+        local t = redis.call('TIME')
+        local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+        local cost, rate, burst, max_wait = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+        local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+        local new_tat = math.max(tat, now) + cost / rate
+        local wait = math.max(0, new_tat - burst / rate - now)
+        if wait > max_wait then return tostring(wait) end
+        redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000) + 1000)
+        return tostring(wait)
+    """
+
+    def __init__(self, client):
+        self._redis = client
+        self._reserve = client.register_script(self._RESERVE_SCRIPT)
+
+    def reserve(self, key: str, cost: float, rate: float, burst: float, max_wait: float = float("inf")) -> float:
+        """Book `cost` units; seconds to wait before using them (not booked if over max_wait)"""
+        max_wait = min(max_wait, 1e9)
+        return float(self._reserve(keys=[f"s2o:rate:{key}"], args=[cost, rate, burst, max_wait]))
+
+
+# Global instance
+rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def init_rate_limiter(app=None):
+    """Initialize global rate limiter (Redis when reachable, otherwise in-memory)"""
+    global rate_limiter
+    redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    if REDIS_AVAILABLE:
+        try:
+            client = redis.Redis.from_url(redis_url, decode_responses=True, socket_connect_timeout=0.5)
+            client.ping()
+            rate_limiter = RedisRateLimiter(client)
+            logger.info(f"RateLimiter: Redis connected at {redis_url}")
+            return rate_limiter
+        except Exception as e:
+            logger.warning(f"RateLimiter: Redis failed ({e}), using in-memory limiter")
+    rate_limiter = InMemoryRateLimiter()
+    return rate_limiter
+
+
+def get_rate_limiter():
+    """Get global rate limiter instance, connecting on first use"""
+    if rate_limiter is None:
+        with _rate_limiter_lock:
+            if rate_limiter is None:
+                init_rate_limiter()
+    return rate_limiter
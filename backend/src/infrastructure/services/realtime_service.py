@@ -3,6 +3,7 @@ Realtime Service for S2O Platform
 Infrastructure layer service for real-time communication (WebSocket/SocketIO)
 No business logic - pure event emission abstraction
 """
+import os
 from typing import Dict, Any, List
 import logging
 
@@ -35,6 +36,8 @@ class RealtimeService:
                 app,
                 cors_allowed_origins="*",
                 async_mode='threading',  # simpler than eventlet for students
+                # Shared with job worker processes, so their emits reach clients
+                message_queue=os.getenv('SOCKETIO_MESSAGE_QUEUE') or None,
                 logger=False,
                 engineio_logger=False
             )
@@ -50,6 +53,19 @@ class RealtimeService:
             logger.warning(f"RealtimeService: Initialization failed - {e}")
             self._available = False
     
+    def init_emitter(self, message_queue: str):
+        """Emit-only SocketIO for processes without clients (job workers)"""
+        try:
+            from flask_socketio import SocketIO
+
+            self._socketio = SocketIO(message_queue=message_queue)
+            self._available = True
+            logger.info("RealtimeService: emitting through message queue")
+        except ImportError:
+            logger.warning("RealtimeService: Flask-SocketIO not installed")
+        except Exception as e:
+            logger.warning(f"RealtimeService: Emitter initialization failed - {e}")
+
     def _register_handlers(self):
         """Register basic WebSocket event handlers"""
         from flask_socketio import emit, join_room, leave_room
@@ -126,6 +142,9 @@ class RealtimeEvents:
     ORDER_CREATED = 'order:created'
     ORDER_STATUS_CHANGED = 'order:status_changed'
     
+    # Table board (payload carries only changed tables)
+    TABLE_STATUS_CHANGED = 'table:status_changed'
+    
     # Kitchen workflow
     ITEM_COOKING = 'item:cooking'
     ITEM_READY = 'item:ready'
@@ -133,6 +152,7 @@ class RealtimeEvents:
     
     # Notifications
     NOTIFICATION = 'notification'
+    INVOICE_CREATED = 'invoice:created'
 
 
 # Global instance
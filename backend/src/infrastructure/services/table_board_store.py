@@ -0,0 +1,280 @@
+"""
+Table Board Store for S2O Platform
+Infrastructure layer service holding the live per-branch table board
+No business logic - hot-state storage plus write-behind to Postgres
+
+Each branch board maps table_id -> {id, name, seats, status, updated_at, v}.
+Every change bumps the branch version and stamps the changed entry with it,
+so a screen that last saw version N asks only for entries with v > N.
+"""
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Any, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Boards are rebuilt from Postgres if untouched for a day
+BOARD_TTL_SECONDS = 24 * 60 * 60
+
+# (version, loaded_version, entries) as returned by get()
+BoardSnapshot = Tuple[int, int, Dict[str, Dict[str, Any]]]
+
+
+class InMemoryTableBoard:
+    """
+    Process-local board store.
+    Used when Redis is unreachable and as the stand-in for tests.
+    """
+
+    def __init__(self):
+        self._boards: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._versions: Dict[str, int] = {}
+        self._loaded: Dict[str, int] = {}
+        self._branch_of: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, branch_id: str) -> Optional[BoardSnapshot]:
+        with self._lock:
+            board = self._boards.get(branch_id)
+            if board is None:
+                return None
+            return self._versions[branch_id], self._loaded[branch_id], {k: dict(v) for k, v in board.items()}
+
+    def load(self, branch_id: str, entries: List[Dict[str, Any]]) -> int:
+        with self._lock:
+            version = self._versions.get(branch_id, 0) + 1
+            self._boards[branch_id] = {e["id"]: dict(e, v=version) for e in entries}
+            self._versions[branch_id] = self._loaded[branch_id] = version
+            for entry in entries:
+                self._branch_of[entry["id"]] = branch_id
+            return version
+
+    def update(self, branch_id: str, table_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._boards.get(branch_id, {}).get(table_id)
+            if entry is None:
+                return None
+            version = self._versions[branch_id] + 1
+            self._versions[branch_id] = version
+            entry.update(fields, v=version)
+            return dict(entry)
+
+    def branch_of(self, table_id: str) -> Optional[str]:
+        with self._lock:
+            return self._branch_of.get(table_id)
+
+    def invalidate(self, branch_id: str) -> None:
+        with self._lock:
+            self._boards.pop(branch_id, None)
+            self._loaded.pop(branch_id, None)
+
+
+class RedisTableBoard:
+    """
+    Board store in Redis hashes, shared by every worker process.
+
+    s2o:board:<branch_id>           table_id -> JSON entry, plus __loaded__
+    s2o:board:<branch_id>:version   version counter; no TTL, so versions keep
+                                    growing across rebuilds of an expired or
+                                    invalidated board
+    s2o:board:branch_of             table_id -> branch_id
+    """
+
+    # Boards written before the counter had its own key kept it in the hash
+    _NEXT_VERSION = """
+        if redis.call('EXISTS', KEYS[2]) == 0 then
+            local old = redis.call('HGET', KEYS[1], '__version__')
+            if old then redis.call('SET', KEYS[2], old) end
+        end
+        local v = redis.call('INCR', KEYS[2])
+    """
+
+    # Replace the board with fresh entries, all stamped with a new version, in one atomic step
+    _LOAD_SCRIPT = _NEXT_VERSION + """
+        redis.call('DEL', KEYS[1])
+        redis.call('HSET', KEYS[1], '__loaded__', v)
+        for i = 2, #ARGV - 1, 2 do
+            local e = cjson.decode(ARGV[i + 1])
+            e['v'] = v
+            redis.call('HSET', KEYS[1], ARGV[i], cjson.encode(e))
+        end
+        redis.call('EXPIRE', KEYS[1], ARGV[1])
+        return v
+    """
+
+    # Merge fields into an existing entry; nil when the board or table is not loaded
+    _UPDATE_SCRIPT = """
+        local cur = redis.call('HGET', KEYS[1], ARGV[1])
+        if not cur then return false end
+    """ + _NEXT_VERSION + """
+        local e = cjson.decode(cur)
+        for k, val in pairs(cjson.decode(ARGV[2])) do e[k] = val end
+        e['v'] = v
+        local out = cjson.encode(e)
+        redis.call('HSET', KEYS[1], ARGV[1], out)
+        return out
+    """
+
+    BRANCH_OF_KEY = "s2o:board:branch_of"
+
+    def __init__(self, client):
+        self._redis = client
+        self._load = client.register_script(self._LOAD_SCRIPT)
+        self._update = client.register_script(self._UPDATE_SCRIPT)
+
+    @staticmethod
+    def _key(branch_id: str) -> str:
+        return f"s2o:board:{branch_id}"
+
+    @classmethod
+    def _keys(cls, branch_id: str) -> List[str]:
+        return [cls._key(branch_id), f"{cls._key(branch_id)}:version"]
+
+    def get(self, branch_id: str) -> Optional[BoardSnapshot]:
+        pipe = self._redis.pipeline()
+        pipe.hgetall(self._key(branch_id))
+        pipe.get(f"{self._key(branch_id)}:version")
+        raw, version = pipe.execute()
+        if "__loaded__" not in raw:
+            return None
+        legacy = raw.pop("__version__", None)
+        loaded = int(raw.pop("__loaded__"))
+        version = int(version or legacy or loaded)
+        return version, loaded, {table_id: json.loads(entry) for table_id, entry in raw.items()}
+
+    def load(self, branch_id: str, entries: List[Dict[str, Any]]) -> int:
+        args = [BOARD_TTL_SECONDS]
+        for entry in entries:
+            args += [entry["id"], json.dumps(entry)]
+        version = self._load(keys=self._keys(branch_id), args=args)
+        if entries:
+            self._redis.hset(self.BRANCH_OF_KEY, mapping={e["id"]: branch_id for e in entries})
+        return int(version)
+
+    def update(self, branch_id: str, table_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        out = self._update(keys=self._keys(branch_id), args=[table_id, json.dumps(fields)])
+        return json.loads(out) if out else None
+
+    def branch_of(self, table_id: str) -> Optional[str]:
+        return self._redis.hget(self.BRANCH_OF_KEY, table_id)
+
+    def invalidate(self, branch_id: str) -> None:
+        # Entries and __loaded__ only; the version counter carries on
+        self._redis.delete(self._key(branch_id))
+
+
+class TableStatusWriter:
+    """
+    Write-behind queue for table statuses.
+    Keeps only the latest status per table and persists the batch
+    in the background, so bursts of changes cost one transaction.
+    """
+
+    def __init__(self, persist: Callable[[Dict[str, str]], None], interval: float = 1.0):
+        self._persist = persist
+        self._interval = interval
+        self._pending: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="table-status-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def enqueue(self, table_id: str, status: str) -> None:
+        with self._lock:
+            self._pending[table_id] = status
+        self.start()
+        self._wake.set()
+
+    def flush(self) -> int:
+        """Persist pending statuses now; returns how many tables were written"""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+        try:
+            self._persist(batch)
+        except Exception as e:
+            logger.error(f"TableStatusWriter: persist failed, will retry ({e})")
+            with self._lock:
+                # Statuses enqueued meanwhile are newer and win
+                for table_id, status in batch.items():
+                    self._pending.setdefault(table_id, status)
+            self._wake.set()
+            return 0
+        return len(batch)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            # Let a burst of changes accumulate before writing
+            time.sleep(self._interval)
+            self.flush()
+
+
+def persist_table_statuses(statuses: Dict[str, str]) -> None:
+    """Write a batch of table statuses to Postgres in one transaction"""
+    from ..databases.postgres import SessionLocal
+    from ..repositories.table_repository import TableRepository
+
+    session = SessionLocal()
+    try:
+        TableRepository(session).bulk_set_status(statuses)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+# Global instances
+table_board = None
+table_status_writer = TableStatusWriter(persist_table_statuses)
+_table_board_lock = threading.Lock()
+
+
+def init_table_board(app=None):
+    """Initialize global table board (Redis when reachable, otherwise in-memory)"""
+    global table_board
+    redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    if REDIS_AVAILABLE:
+        try:
+            client = redis.Redis.from_url(redis_url, decode_responses=True, socket_connect_timeout=0.5)
+            client.ping()
+            table_board = RedisTableBoard(client)
+            logger.info(f"TableBoard: Redis connected at {redis_url}")
+            return table_board
+        except Exception as e:
+            logger.warning(f"TableBoard: Redis failed ({e}), using in-memory board")
+    table_board = InMemoryTableBoard()
+    return table_board
+
+
+def get_table_board():
+    """Get global table board instance, connecting on first use"""
+    if table_board is None:
+        with _table_board_lock:
+            if table_board is None:
+                init_table_board()
+    return table_board
+
+
+def get_table_status_writer() -> TableStatusWriter:
+    """Get global table status writer"""
+    return table_status_writer
@@ -0,0 +1,101 @@
+"""
+Typeahead Store for S2O Platform
+Infrastructure layer service holding per-tenant typeahead indexes in process memory
+No business logic - caching and invalidation; the index lives in domain/typeahead.py
+
+Indexes are built on first use and kept for the most recently used
+MAX_TENANTS tenants. A tenant's index is rebuilt once its products or
+categories change: the store compares the tenant's data versions (bumped
+on every menu write, see data_version_store) at most every
+REFRESH_SECONDS. Indexes are also rebuilt hourly, so popularity follows
+recent orders, and every minute while versions are unavailable (Redis
+unreachable). While one thread rebuilds, the others keep serving the
+previous index.
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from ...domain.typeahead import TypeaheadIndex
+from .data_version_store import get_data_versions
+
+MAX_TENANTS = 64
+REFRESH_SECONDS = 2.0
+REBUILD_SECONDS = 3600.0
+UNVERSIONED_REBUILD_SECONDS = 60.0
+VERSIONED_RESOURCES = ("products", "categories")
+
+
+class TypeaheadStore:
+    """Process-local LRU of tenant typeahead indexes"""
+
+    def __init__(self, max_tenants: int = MAX_TENANTS, refresh_seconds: float = REFRESH_SECONDS):
+        self._max_tenants = max_tenants
+        self._refresh_seconds = refresh_seconds
+        # tenant -> (index, version, built_at, checked_at)
+        self._indexes: "OrderedDict[str, Tuple[TypeaheadIndex, Optional[str], float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._building: Dict[str, threading.Lock] = {}
+
+    def get(self, tenant_id: str, build: Callable[[], TypeaheadIndex]) -> TypeaheadIndex:
+        """The tenant's index, built or rebuilt with `build` when missing or stale"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._indexes.get(tenant_id)
+            if cached is not None:
+                self._indexes.move_to_end(tenant_id)
+        if cached is not None and now - cached[3] < self._refresh_seconds:
+            return cached[0]
+
+        version = get_data_versions().current(tenant_id, VERSIONED_RESOURCES)
+        if cached is not None and not self._is_stale(cached, version, now):
+            with self._lock:
+                self._indexes[tenant_id] = (cached[0], version, cached[2], now)
+            return cached[0]
+
+        with self._lock:
+            building = self._building.setdefault(tenant_id, threading.Lock())
+        if not building.acquire(blocking=cached is None):
+            return cached[0]
+        try:
+            # Whoever held the lock may have just built it
+            with self._lock:
+                current = self._indexes.get(tenant_id)
+            if current is not None and current is not cached and not self._is_stale(current, version, time.monotonic()):
+                return current[0]
+            index = build()
+            with self._lock:
+                self._indexes[tenant_id] = (index, version, now, now)
+                self._indexes.move_to_end(tenant_id)
+                while len(self._indexes) > self._max_tenants:
+                    evicted, _ = self._indexes.popitem(last=False)
+                    self._building.pop(evicted, None)
+            return index
+        finally:
+            building.release()
+
+    @staticmethod
+    def _is_stale(cached, version: Optional[str], now: float) -> bool:
+        if version is None or cached[1] is None:
+            return now - cached[2] >= UNVERSIONED_REBUILD_SECONDS
+        return version != cached[1] or now - cached[2] >= REBUILD_SECONDS
+
+    def invalidate(self, tenant_id: str) -> None:
+        with self._lock:
+            self._indexes.pop(tenant_id, None)
+
+
+# Global instance
+typeahead_store = None
+_typeahead_store_lock = threading.Lock()
+
+
+def get_typeahead_store() -> TypeaheadStore:
+    """Get global typeahead store instance"""
+    global typeahead_store
+    if typeahead_store is None:
+        with _typeahead_store_lock:
+            if typeahead_store is None:
+                typeahead_store = TypeaheadStore()
+    return typeahead_store
@@ -0,0 +1,99 @@
+import os
+import re
+import random
+import logging
+import uuid
+from collections import defaultdict
+from time import perf_counter
+
+from flask import Response, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .infrastructure.services.metrics_service import get_metrics_service
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Incoming request IDs end up in logs; accept only short token-like values
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    get_metrics_service().record_statement(statement, perf_counter() - started)
+
+
+def _log_slow_request(stats, method: str, path: str, seconds: float) -> None:
+    """Group the request's statements and log the most expensive ones"""
+    grouped = defaultdict(lambda: [0, 0.0])
+    for statement, duration in stats.statements:
+        entry = grouped[" ".join(statement.split())[:200]]
+        entry[0] += 1
+        entry[1] += duration
+    top = sorted(grouped.items(), key=lambda item: -item[1][1])[:5]
+    breakdown = "".join(f" | {count}x {total * 1000:.1f}ms {sql}" for sql, (count, total) in top)
+    logger.warning(
+        f"Slow request {method} {path}: {seconds * 1000:.0f}ms, "
+        f"{stats.sql_count} queries in {stats.sql_seconds * 1000:.0f}ms, "
+        f"cache {stats.cache_hits} hit/{stats.cache_misses} miss{breakdown}"
+    )
+
+
+def setup_instrumentation(app):
+    """
+    Per-request latency, SQL, cache and response-size metrics.
+
+    Config (env):
+        SLOW_REQUEST_MS              threshold for the slow-request breakdown (default 500)
+        SLOW_REQUEST_SAMPLE_RATE     fraction of slow requests logged (default 0.1)
+        METRICS_TOKEN                if set, /metrics requires "Authorization: Bearer <token>"
+    """
+    metrics = get_metrics_service()
+    slow_seconds = float(os.getenv("SLOW_REQUEST_MS", "500")) / 1000
+    sample_rate = float(os.getenv("SLOW_REQUEST_SAMPLE_RATE", "0.1"))
+    metrics_token = os.getenv("METRICS_TOKEN")
+
+    # Engine class-level listeners cover every engine the app creates
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def start_request_metrics():
+        request_id = request.headers.get(REQUEST_ID_HEADER, "")
+        if not _VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        g.request_id = request_id
+        g.request_stats = metrics.start_request(request_id)
+        g.request_started = perf_counter()
+
+    @app.after_request
+    def finish_request_metrics(response):
+        stats = g.pop("request_stats", None)
+        if stats is None:
+            return response
+        seconds = perf_counter() - g.pop("request_started")
+        # Matched route pattern keeps label cardinality bounded
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        size = response.calculate_content_length() or 0
+
+        response.headers[REQUEST_ID_HEADER] = stats.request_id
+        response.headers["Server-Timing"] = (
+            f"app;dur={seconds * 1000:.1f}, db;dur={stats.sql_seconds * 1000:.1f};desc=\"{stats.sql_count} queries\""
+        )
+        if seconds >= slow_seconds and random.random() < sample_rate:
+            _log_slow_request(stats, request.method, request.path, seconds)
+        metrics.finish_request(stats, request.method, endpoint, response.status_code, seconds, size)
+        return response
+
+    @app.route("/metrics")
+    def prometheus_metrics():
+        if metrics_token and request.headers.get("Authorization") != f"Bearer {metrics_token}":
+            return Response("unauthorized\n", status=401, mimetype="text/plain")
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
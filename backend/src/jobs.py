@@ -0,0 +1,160 @@
+"""
+Background job handlers
+
+Each handler takes the job payload (a JSON-safe dict) and opens what it
+needs itself, e.g. its own database session. Services enqueue these
+through the outbox (IJobOutbox), so they run only after the request that
+asked for them has committed. Delivery is at least once: a handler may
+run again after a crash or a lost acknowledgement, so it must be
+idempotent. An exception makes the job retry with backoff (see
+infrastructure/services/job_queue.py).
+"""
+from .infrastructure.services.job_queue import job
+
+
+@job("chatbot.index_document", lane="low")
+def index_document(payload):
+    """Embed a document and upsert it into the RAG index"""
+    from .infrastructure.databases.postgres import SessionLocal
+    from .infrastructure.repositories.vector_repository import VectorRepository
+    from .infrastructure.services.openai_service import OpenAIService
+    from .infrastructure.services.embedding_service import EmbeddingService
+    from .services.chatbot_service import ChatbotService
+
+    session = SessionLocal()
+    try:
+        chatbot = ChatbotService(VectorRepository(session), OpenAIService(), EmbeddingService())
+        chatbot.index_document(payload["doc_id"], payload["text"], payload.get("metadata"))
+    finally:
+        session.close()
+
+
+@job("qrcode.render_table", lane="low")
+def render_table_qr(payload):
+    """Render a new table's QR code into the cache before the first scan"""
+    from .infrastructure.services.qrcode_service import QRCodeService
+
+    png = QRCodeService().get_table_qr_png(payload["tenant_id"], payload["branch_id"], payload["table_id"])
+    if png is None:
+        raise RuntimeError("QR code rendering failed")
+
+
+@job("notifications.invoice_created", lane="high")
+def notify_invoice_created(payload):
+    """Tell the tenant's staff screens that an invoice is waiting for payment"""
+    from .infrastructure.services.realtime_service import get_realtime_service, RealtimeEvents
+
+    realtime = get_realtime_service()
+    realtime.emit(RealtimeEvents.INVOICE_CREATED, payload, room=realtime.tenant_room(payload["tenant_id"]))
+
+
+@job("menu.embed_products", lane="low")
+def embed_products(payload):
+    """Embed a tenant's new and edited products in every live embedding version (debounced per tenant)"""
+    from .infrastructure.databases.postgres import SessionLocal
+    from .infrastructure.repositories.product_repository import ProductRepository
+    from .infrastructure.repositories.embedding_version_repository import EmbeddingVersionRepository
+    from .infrastructure.services.embedding_service import EmbeddingService
+    from .services.embedding_version_service import EmbeddingVersionService
+    from .services.product_embedding_service import ProductEmbeddingService
+
+    session = SessionLocal()
+    try:
+        for version in EmbeddingVersionService(EmbeddingVersionRepository(session)).live():
+            service = ProductEmbeddingService(ProductRepository(session), EmbeddingService(version=version))
+            service.embed_stale(payload["tenant_id"], commit=session.commit)
+    finally:
+        session.close()
+
+
+@job("embeddings.reembed_products", lane="low")
+def reembed_products(payload):
+    """Backfill one batch of a building embedding version, then queue the next"""
+    from .infrastructure.databases.postgres import SessionLocal
+    from .infrastructure.repositories.product_repository import ProductRepository
+    from .infrastructure.repositories.embedding_version_repository import EmbeddingVersionRepository
+    from .infrastructure.repositories.outbox_repository import OutboxRepository
+    from .infrastructure.services.rate_limiter import get_rate_limiter
+    from .services.embedding_version_service import EmbeddingVersionService
+
+    session = SessionLocal()
+    try:
+        versions = EmbeddingVersionService(
+            EmbeddingVersionRepository(session), ProductRepository(session), OutboxRepository(session)
+        )
+        after_id, delay = versions.reembed_batch(
+            payload["version"], payload.get("after_id"), get_rate_limiter(), commit=session.commit
+        )
+        if after_id is not None:
+            versions.queue_reembed(payload["version"], after_id, delay=delay)
+            session.commit()
+    finally:
+        session.close()
+
+
+@job("orders.completed")
+def order_completed(payload):
+    """Fold a completed order into the tenant's recommendation models"""
+    from .infrastructure.databases.postgres import SessionLocal
+    from .infrastructure.repositories.order_item_repository import OrderItemRepository
+    from .infrastructure.repositories.customer_repository import CustomerRepository
+    from .infrastructure.repositories.product_repository import ProductRepository
+    from .infrastructure.repositories.embedding_version_repository import EmbeddingVersionRepository
+    from .infrastructure.services.cache_service import get_cache_service
+    from .infrastructure.services.cooccurrence_store import get_cooccurrence_store
+    from .infrastructure.services.popularity_store import get_popularity_store
+    from .services.cooccurrence_service import CooccurrenceService
+    from .services.popularity_service import PopularityService
+    from .services.taste_service import TasteService
+    from .services.embedding_version_service import EmbeddingVersionService
+
+    session = SessionLocal()
+    try:
+        order_items = OrderItemRepository(session)
+        CooccurrenceService(order_items, get_cooccurrence_store()).record_order(payload["tenant_id"], payload["order_id"])
+        # Jobs queued before rankings existed carry no branch; the next recompute covers them
+        if "branch_id" in payload:
+            PopularityService(order_items, get_popularity_store()).record_order(
+                payload["order_id"], payload["branch_id"], payload["completed_at"]
+            )
+        if payload.get("customer_id"):
+            version = EmbeddingVersionService(EmbeddingVersionRepository(session)).active()
+            taste = TasteService(
+                CustomerRepository(session), ProductRepository(session), order_items, get_cache_service(), version
+            )
+            taste.record_order(
+                payload["tenant_id"], payload["customer_id"], payload["order_id"], payload["completed_at"],
+                commit=session.commit
+            )
+    finally:
+        session.close()
+
+
+@job("recommendations.build_cooccurrence", lane="low")
+def build_cooccurrence(payload):
+    """Build a tenant's "frequently ordered together" model from all its completed orders"""
+    from .infrastructure.databases.postgres import SessionLocal
+    from .infrastructure.repositories.order_item_repository import OrderItemRepository
+    from .infrastructure.services.cooccurrence_store import get_cooccurrence_store
+    from .services.cooccurrence_service import CooccurrenceService
+
+    session = SessionLocal()
+    try:
+        CooccurrenceService(OrderItemRepository(session), get_cooccurrence_store()).build(payload["tenant_id"])
+    finally:
+        session.close()
+
+
+@job("recommendations.recompute_popularity", lane="low")
+def recompute_popularity(payload):
+    """Rebuild a branch's popularity and trending rankings from its completed orders"""
+    from .infrastructure.databases.postgres import SessionLocal
+    from .infrastructure.repositories.order_item_repository import OrderItemRepository
+    from .infrastructure.services.popularity_store import get_popularity_store
+    from .services.popularity_service import PopularityService
+
+    session = SessionLocal()
+    try:
+        PopularityService(OrderItemRepository(session), get_popularity_store()).recompute(payload["branch_id"])
+    finally:
+        session.close()
@@ -0,0 +1,144 @@
+"""
+Query budgets and N+1 detection.
+
+    @order_bp.route("/<order_id>", methods=["GET"])
+    @auth_required()
+    @query_budget(3)
+    def get_order(order_id): ...
+
+    with query_budget(5, name="kitchen board"):
+        service.get_kitchen_board(...)
+
+Every SQL statement executed inside the block is counted. Statements are
+reduced to a shape (parameters and literals stripped), and a shape that
+repeats more than `max_repeats` times is reported as a likely N+1.
+A violation raises QueryBudgetExceeded when QUERY_BUDGET_MODE=raise,
+logs a warning when it is "warn" (the default), and is ignored when it
+is "off". Violation hooks (see on_violation) are called in every mode
+but "off"; the pytest plugin in testing/ uses one to fail the test.
+"""
+import os
+import re
+import logging
+import functools
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_REPEATS = 5
+
+_violation_hooks: List[Callable[[str], None]] = []
+
+_active: ContextVar[Tuple["query_budget", ...]] = ContextVar("s2o_query_budgets", default=())
+
+_PARAM = re.compile(r"%\(\w+\)s|\?|:\w+|\$\d+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement with parameters, literals and IN-list lengths normalized away"""
+    shape = _PARAM.sub("?", statement)
+    shape = _LITERAL.sub("?", shape)
+    shape = _IN_LIST.sub("(?...)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in 'raise' mode when a block exceeds its query budget or shows N+1"""
+    pass
+
+
+class query_budget:
+    """Context manager / decorator enforcing a SQL statement budget"""
+
+    def __init__(
+        self,
+        max_queries: Optional[int] = None,
+        max_repeats: int = DEFAULT_MAX_REPEATS,
+        name: Optional[str] = None,
+        mode: Optional[str] = None
+    ):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.name = name
+        self.mode = mode
+        self.shapes: Counter = Counter()
+        self.count = 0
+        self._token = None
+
+    def __call__(self, func):
+        name = self.name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # A fresh budget per call keeps concurrent requests apart
+            with query_budget(self.max_queries, self.max_repeats, name, self.mode):
+                return func(*args, **kwargs)
+
+        wrapper.query_budget = self.max_queries
+        return wrapper
+
+    def __enter__(self) -> "query_budget":
+        _install_listener()
+        self.shapes.clear()
+        self.count = 0
+        self._token = _active.set(_active.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _active.reset(self._token)
+        if exc_type is None:
+            problems = self.violations()
+            if problems:
+                self._report(problems)
+        return False
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than max_repeats times"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > self.max_repeats]
+
+    def violations(self) -> List[str]:
+        problems = []
+        if self.max_queries is not None and self.count > self.max_queries:
+            problems.append(f"{self.count} queries, budget {self.max_queries}")
+        for shape, n in self.repeated():
+            problems.append(f"possible N+1: {n}x {shape[:200]}")
+        return problems
+
+    def _report(self, problems: List[str]) -> None:
+        mode = self.mode or os.getenv("QUERY_BUDGET_MODE", "warn")
+        if mode == "off":
+            return
+        message = f"Query budget exceeded in {self.name or 'block'}: " + "; ".join(problems)
+        for hook in _violation_hooks:
+            hook(message)
+        if mode == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+def on_violation(hook: Callable[[str], None]) -> None:
+    """Register a callback receiving every budget violation message"""
+    if hook not in _violation_hooks:
+        _violation_hooks.append(hook)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    for budget in _active.get():
+        budget.record(statement)
+
+
+def _install_listener() -> None:
+    if not event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
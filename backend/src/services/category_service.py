@@ -3,14 +3,17 @@ import uuid
 from datetime import datetime
 
 from ..domain.interfaces.icategory_repository import ICategoryRepository
+from ..domain.interfaces.ijob_outbox import IJobOutbox
 from ..domain.models.category import Category
+from .product_embedding_service import queue_product_embeddings
 
 
 class CategoryService:
     """Service for category-related business logic"""
     
-    def __init__(self, category_repo: ICategoryRepository):
+    def __init__(self, category_repo: ICategoryRepository, outbox: IJobOutbox = None):
         self.category_repo = category_repo
+        self.outbox = outbox
     
     def create_category(self, tenant_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new category"""
@@ -42,6 +45,7 @@ class CategoryService:
         if not category:
             raise ValueError(f"Category {category_id} not found")
         
+        renamed = data.get('name') is not None and data['name'] != category.name
         if 'name' in data and data['name'] is not None:
             category.name = data['name']
         if 'display_order' in data and data['display_order'] is not None:
@@ -50,6 +54,9 @@ class CategoryService:
         category.updated_at = datetime.utcnow()
         
         updated = self.category_repo.save(category)
+        if renamed:
+            # The category name is part of its products' embedding text
+            queue_product_embeddings(self.outbox, category.tenant_id)
         return self._to_dict(updated)
     
     def delete_category(self, category_id: str) -> bool:
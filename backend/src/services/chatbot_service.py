@@ -1,49 +1,192 @@
-from typing import Dict, Any
+import uuid
+import base64
+import hashlib
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import Config
 from ..infrastructure.services.openai_service import OpenAIService
 from ..infrastructure.services.embedding_service import EmbeddingService
 from ..domain.interfaces.ivector_repository import IVectorRepository
+from ..domain.interfaces.ijob_outbox import IJobOutbox
+from .embedding_version_service import estimate_tokens
+
+RETRIEVAL_TOP_K = 5
+# A question this close (cosine) to one already answered in the session
+# reuses that question's context documents instead of searching again
+REUSE_SIMILARITY = 0.85
+# Retrievals a session remembers for reuse, most recent first
+MAX_SESSION_RETRIEVALS = 6
+# Length of the running summary of turns that left the history window
+SUMMARY_MAX_TOKENS = 200
+
+
+def _normalize(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _pack(vector: List[float]) -> str:
+    # float16 is plenty to compare query vectors, at an eighth of their JSON size
+    return base64.b64encode(np.asarray(vector, dtype=np.float16).tobytes()).decode()
+
+
+def _unpack(packed: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(packed), dtype=np.float16).astype(np.float32)
 
 
 class ChatbotService:
-    """Service for AI-powered chatbot using RAG (Retrieval Augmented Generation)"""
+    """
+    Service for AI-powered chatbot using RAG (Retrieval Augmented Generation)
+
+    With a conversation store, questions can belong to a session that
+    remembers the conversation:
+    - recent turns are sent along verbatim, up to CHAT_HISTORY_TOKENS; once
+      they exceed it the oldest are folded into a running summary, down to
+      half the budget so the summary is rewritten every few turns rather
+      than every turn
+    - the context documents of earlier questions are kept with their query
+      vectors; a question close to one of them (or asked again) reuses
+      those documents instead of running another vector search
+    """
 
     def __init__(
         self, 
         vector_repo: IVectorRepository, 
         openai_service: OpenAIService, 
-        embed_service: EmbeddingService
+        embed_service: EmbeddingService,
+        outbox: IJobOutbox = None,
+        store=None
     ):
         self.vector_repo = vector_repo
         self.openai = openai_service
         self.embedding = embed_service
+        self.outbox = outbox
+        self.store = store
 
-    def ask_chatbot(self, query: str, tenant_id: str = None) -> Dict[str, Any]:
+    def ask_chatbot(
+        self, query: str, tenant_id: str = None, session_id: str = None, user_id: str = None
+    ) -> Dict[str, Any]:
         """
         Process a user query using RAG:
         1. Create embedding of the query
         2. Search for relevant context documents
         3. Generate answer using LLM with context
+        Within a session (store given; no or an unknown session_id starts
+        one) the conversation so far is taken into account.
         """
-        # Create embedding for the query
-        query_embedding = self.embedding.create_embedding(query)
-        
-        # Search for relevant context documents
-        context_docs = self.vector_repo.search_vector(query_embedding, top_k=5)
-        
-        # Generate answer using OpenAI with context
-        final_answer = self.openai.generate_answer(query, context_docs)
+        if self.store is None:
+            # Create embedding for the query
+            query_embedding = self.embedding.create_embedding(query)
+            
+            # Search for relevant context documents
+            context_docs = self.vector_repo.search_vector(query_embedding, top_k=RETRIEVAL_TOP_K)
+            
+            # Generate answer using OpenAI with context
+            final_answer = self.openai.generate_answer(query, context_docs)
+
+            return {
+                "query": query,
+                "context": context_docs,
+                "answer": final_answer
+            }
 
+        session = self._load_session(tenant_id, session_id, user_id)
+        context_docs, reused = self._retrieve(session, query)
+        answer = self.openai.generate_answer(query, context_docs, session["turns"], session["summary"])
+        session["turns"].append({
+            "question": query, "answer": answer, "tokens": estimate_tokens(query) + estimate_tokens(answer)
+        })
+        summarized = self._compact(session)
+        self.store.save(f"{tenant_id}:{session['id']}", session, Config.CHAT_SESSION_TTL_SECONDS)
         return {
             "query": query,
             "context": context_docs,
-            "answer": final_answer
+            "answer": answer,
+            "session_id": session["id"],
+            "memory": {
+                "context_reused": reused,
+                "history_turns": len(session["turns"]),
+                "history_tokens": sum(t["tokens"] for t in session["turns"]),
+                "summarized": summarized,
+                "has_summary": bool(session["summary"])
+            }
         }
 
+    def end_session(self, tenant_id: str, session_id: str, user_id: str = None) -> bool:
+        """Forget a conversation; False if there was none (of this user)"""
+        key = f"{tenant_id}:{session_id}"
+        session = self.store.load(key)
+        if session is None or session.get("user_id") != user_id:
+            return False
+        return self.store.delete(key)
+
+    def _load_session(self, tenant_id: str, session_id: Optional[str], user_id: Optional[str]) -> Dict[str, Any]:
+        if session_id:
+            session = self.store.load(f"{tenant_id}:{session_id}")
+            # Sessions are private to the user who started them
+            if session is not None and session.get("user_id") == user_id:
+                return session
+        return {"id": uuid.uuid4().hex, "user_id": user_id, "summary": "", "turns": [], "retrievals": []}
+
+    def _retrieve(self, session: Dict[str, Any], query: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """Context documents for a question, and whether they were reused from the session"""
+        retrievals = session["retrievals"]
+        normalized = _normalize(query)
+        for i, retrieval in enumerate(retrievals):
+            if retrieval["query"] == normalized:
+                retrievals.insert(0, retrievals.pop(i))
+                return retrieval["docs"], True
+
+        query_embedding = self.embedding.create_embedding(query)
+        if retrievals:
+            vector = np.asarray(query_embedding, dtype=np.float32)
+            # Vectors of another model (a version rollover mid-session) never match
+            similarities = [
+                float(v @ vector) if v.shape == vector.shape else -1.0
+                for v in (_unpack(r["vector"]) for r in retrievals)
+            ]
+            best = int(np.argmax(similarities))
+            if similarities[best] >= REUSE_SIMILARITY:
+                retrievals.insert(0, retrievals.pop(best))
+                return retrievals[0]["docs"], True
+
+        docs = self.vector_repo.search_vector(query_embedding, top_k=RETRIEVAL_TOP_K)
+        retrievals.insert(0, {"query": normalized, "vector": _pack(query_embedding), "docs": docs})
+        del retrievals[MAX_SESSION_RETRIEVALS:]
+        return docs, False
+
+    def _compact(self, session: Dict[str, Any]) -> bool:
+        """Keep the verbatim history within its token budget; True if turns were summarized"""
+        turns = session["turns"]
+        budget = Config.CHAT_HISTORY_TOKENS
+        total = sum(t["tokens"] for t in turns)
+        if total <= budget:
+            return False
+        evicted = []
+        # The latest turn always stays verbatim
+        while len(turns) > 1 and total > budget // 2:
+            turn = turns.pop(0)
+            total -= turn["tokens"]
+            evicted.append(turn)
+        if not evicted:
+            return False
+        session["summary"] = self.openai.summarize_conversation(session["summary"], evicted, SUMMARY_MAX_TOKENS)
+        return True
+
     def index_document(self, doc_id: str, text: str, metadata: Dict[str, Any] = None) -> bool:
-        """Index a document for RAG retrieval"""
-        try:
-            embedding = self.embedding.create_embedding(text)
-            self.vector_repo.upsert_vector(doc_id, embedding, metadata or {"text": text})
-            return True
-        except Exception:
-            return False
\ No newline at end of file
+        """Index a document for RAG retrieval (raises on failure, so the job retries)"""
+        embedding = self.embedding.create_embedding(text)
+        self.vector_repo.upsert_vector(doc_id, embedding, metadata or {"text": text})
+        return True
+
+    def queue_index_document(self, doc_id: str, text: str, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Index a document in the background once the caller commits"""
+        # The same text queued twice is embedded once
+        text_hash = hashlib.sha1(text.encode()).hexdigest()
+        job_id = self.outbox.enqueue(
+            "chatbot.index_document",
+            {"doc_id": doc_id, "text": text, "metadata": metadata},
+            dedupe_key=f"index_document:{doc_id}:{text_hash}"
+        )
+        return {"doc_id": doc_id, "job_id": job_id, "status": "queued"}
\ No newline at end of file
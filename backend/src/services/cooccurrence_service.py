@@ -0,0 +1,60 @@
+from typing import Any, Dict
+
+from ..domain.interfaces.iorder_item_repository import IOrderItemRepository
+from ..domain.cooccurrence import pair_counts, top_neighbours, rank_neighbours, order_pairs
+
+
+class CooccurrenceService:
+    """
+    Builds and maintains each tenant's "frequently ordered together" model.
+
+    build() recomputes it from all completed orders with sparse matrix
+    products; record_order() folds in one newly completed order and
+    re-ranks only that order's products. Rebuilding periodically
+    (scripts/build_cooccurrence.py) corrects the neighbour lists of
+    products an incremental update didn't touch.
+    """
+
+    def __init__(self, order_item_repo: IOrderItemRepository, store):
+        self.order_item_repo = order_item_repo
+        self.store = store
+
+    def build(self, tenant_id: str) -> Dict[str, Any]:
+        """Recompute the tenant's model from its completed orders"""
+        order_index: Dict[Any, int] = {}
+        product_index: Dict[Any, int] = {}
+        orders, products = [], []
+        for order_id, product_id in self.order_item_repo.get_completed_order_products(tenant_id):
+            orders.append(order_index.setdefault(order_id, len(order_index)))
+            products.append(product_index.setdefault(product_id, len(product_index)))
+        product_ids = [str(p) for p in product_index]
+
+        counts, order_counts = pair_counts(orders, products, len(product_ids))
+        neighbours = top_neighbours(counts, order_counts, product_ids)
+        rows = {}
+        for i, product_id in enumerate(product_ids):
+            start, end = counts.indptr[i], counts.indptr[i + 1]
+            rows[product_id] = {
+                product_ids[j]: int(c) for j, c in zip(counts.indices[start:end], counts.data[start:end])
+            }
+        self.store.replace(
+            tenant_id, rows, {p: int(n) for p, n in zip(product_ids, order_counts)}, neighbours
+        )
+        return {"orders": len(order_index), "products": len(product_ids), "pairs": int(counts.nnz) // 2}
+
+    def record_order(self, tenant_id: str, order_id: str) -> bool:
+        """
+        Count a completed order; False when skipped (no model yet, which the
+        first build will cover, or the order was counted already)
+        """
+        products = {
+            str(row["product_id"]) for row in self.order_item_repo.get_rows_by_order(order_id)
+            if getattr(row["item_status"], "value", row["item_status"]) != "CANCELLED"
+        }
+        if not products or not self.store.add_order(tenant_id, order_id, order_pairs(products), products):
+            return False
+        rows, order_counts = self.store.get_rows(tenant_id, products)
+        self.store.set_neighbours(
+            tenant_id, {p: rank_neighbours(p, rows[p], order_counts) for p in products}
+        )
+        return True
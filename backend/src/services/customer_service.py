@@ -3,6 +3,7 @@ import uuid
 
 from ..domain.interfaces.icustomer_repository import ICustomerRepository
 from ..domain.models.customer import Customer
+from ..domain.models.loyalty_ledger import LoyaltyLedgerEntry
 
 
 class CustomerService:
@@ -44,26 +45,46 @@ class CustomerService:
         updated = self.customer_repo.update(user_id, customer)
         return self._to_dict(updated)
     
-    def add_loyalty_points(self, user_id: str, points: int) -> Dict[str, Any]:
-        """Add loyalty points to customer"""
+    def add_loyalty_points(self, tenant_id: str, user_id: str, points: int) -> Dict[str, Any]:
+        """Add loyalty points to a tenant's customer"""
         if points <= 0:
             raise ValueError("Points must be positive")
         
-        updated = self.customer_repo.add_loyalty_points(user_id, points)
+        updated = self.customer_repo.add_loyalty_points(tenant_id, user_id, points)
         return self._to_dict(updated)
     
-    def redeem_loyalty_points(self, user_id: str, points: int) -> Dict[str, Any]:
-        """Redeem loyalty points"""
+    def redeem_loyalty_points(self, tenant_id: str, user_id: str, points: int) -> Dict[str, Any]:
+        """Redeem loyalty points of a tenant's customer"""
         if points <= 0:
             raise ValueError("Points must be positive")
         
-        success = self.customer_repo.redeem_loyalty_points(user_id, points)
-        if not success:
+        customer = self.customer_repo.redeem_loyalty_points(tenant_id, user_id, points)
+        if not customer:
             raise ValueError("Insufficient loyalty points")
         
-        customer = self.customer_repo.get_by_user_id(user_id)
         return self._to_dict(customer)
     
+    def accrue_points_for_orders(self, tenant_id: str, order_ids: List[str], points_rate: float = 0.1) -> Dict[str, Any]:
+        """
+        Accrue loyalty points for a batch of a tenant's completed orders
+        Orders that already accrued points (or belong to another tenant)
+        are skipped, so re-running is safe
+        """
+        if points_rate <= 0:
+            raise ValueError("Points rate must be positive")
+        
+        accrued = self.customer_repo.accrue_points_for_orders(tenant_id, order_ids, points_rate)
+        return {
+            "customers_updated": len(accrued),
+            "points_accrued": sum(accrued.values()),
+            "accruals": accrued,
+        }
+    
+    def get_loyalty_history(self, tenant_id: str, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get loyalty ledger entries for a tenant's customer, newest first"""
+        entries = self.customer_repo.get_loyalty_ledger(tenant_id, user_id, limit)
+        return [self._entry_to_dict(e) for e in entries]
+    
     def delete_customer(self, user_id: str) -> bool:
         """Delete customer profile"""
         return self.customer_repo.delete(user_id)
@@ -73,4 +94,14 @@ class CustomerService:
             "user_id": customer.user_id,
             "phone_number": customer.phone_number,
             "loyalty_points": customer.loyalty_points,
+            "membership_tier": customer.membership_tier.value,
+        }
+    
+    def _entry_to_dict(self, entry: LoyaltyLedgerEntry) -> Dict[str, Any]:
+        return {
+            "id": entry.id,
+            "entry_type": entry.entry_type,
+            "points": entry.points,
+            "order_id": entry.order_id,
+            "created_at": entry.created_at.isoformat() if entry.created_at else None,
         }
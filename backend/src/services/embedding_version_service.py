@@ -0,0 +1,202 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import Config
+from ..domain.interfaces.iembedding_version_repository import IEmbeddingVersionRepository
+from ..domain.interfaces.iproduct_repository import IProductRepository
+from ..domain.interfaces.ijob_outbox import IJobOutbox
+from ..infrastructure.services.embedding_service import EmbeddingService, EMBEDDING_MODELS, DEFAULT_EMBEDDING_VERSION
+from .product_embedding_service import ProductEmbeddingService, EMBED_BATCH_SIZE
+
+# Rollout of an embedding version
+BUILDING = "building"   # being backfilled; menu writes keep it current, queries don't use it
+READY = "ready"         # complete; can be cut over to (or back to)
+ACTIVE = "active"       # what queries use; exactly one
+RETIRED = "retired"     # vectors deleted, no longer written
+LIVE_STATUSES = (BUILDING, READY, ACTIVE)
+
+# Every request reads the active version; a cutover shows within this
+VERSIONS_CACHE_KEY = "embedding_versions"
+VERSIONS_CACHE_SECONDS = 10
+# Re-embedding waits in-process for the rate limiter up to this long,
+# beyond that its job is queued again with the wait as delay
+REEMBED_MAX_WAIT_SECONDS = 15.0
+# Rate limiter burst: this many seconds of the budget may be spent at once
+REEMBED_BURST_SECONDS = 10
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (4 characters per token), for rate limiting"""
+    return len(text) // 4 + 1
+
+
+class EmbeddingVersionService:
+    """
+    Rolls product embeddings over from one embedding version to another
+    without downtime.
+
+    start() registers a version as building and queues its backfill, which
+    reembed_batch() runs a batch at a time within the API budget while
+    queries keep using the active version. Menu writes embed into every
+    live version, so nothing goes stale meanwhile. Once a full pass finds
+    nothing left the version is ready, and cutover() makes it the one
+    queries use; the previous version stays ready for a rollback until
+    retire() drops it.
+    """
+
+    def __init__(
+        self,
+        version_repo: IEmbeddingVersionRepository,
+        product_repo: IProductRepository = None,
+        outbox: IJobOutbox = None,
+        cache=None
+    ):
+        self.version_repo = version_repo
+        self.product_repo = product_repo
+        self.outbox = outbox
+        self.cache = cache
+
+    def _statuses(self) -> Dict[str, str]:
+        if self.cache is not None:
+            cached = self.cache.get(VERSIONS_CACHE_KEY)
+            if cached is not None:
+                return cached
+        statuses = {v["version"]: v["status"] for v in self.version_repo.get_versions()}
+        if self.cache is not None:
+            self.cache.set(VERSIONS_CACHE_KEY, statuses, timeout=VERSIONS_CACHE_SECONDS)
+        return statuses
+
+    def _changed(self) -> None:
+        if self.cache is not None:
+            self.cache.delete(VERSIONS_CACHE_KEY)
+
+    def active(self) -> str:
+        """The version queries embed with and search in"""
+        for version, status in self._statuses().items():
+            if status == ACTIVE:
+                return version
+        return DEFAULT_EMBEDDING_VERSION
+
+    def live(self) -> List[str]:
+        """Versions menu writes keep current, the active one first"""
+        statuses = self._statuses()
+        active = self.active()
+        return [active] + [v for v, s in statuses.items() if s in LIVE_STATUSES and v != active]
+
+    def embedding_service(self) -> EmbeddingService:
+        """Embedding service of the active version"""
+        return EmbeddingService(version=self.active())
+
+    def get_versions(self) -> List[Dict[str, Any]]:
+        """Registered versions with their product coverage"""
+        versions = self.version_repo.get_versions()
+        for v in versions:
+            if self.product_repo is not None and v["status"] != RETIRED:
+                v["embedded"], v["products"] = self.product_repo.count_embeddings(v["version"])
+        return versions
+
+    def start(self, version: str) -> Dict[str, Any]:
+        """Register a version (or bring back a retired one) and queue its backfill"""
+        if version not in EMBEDDING_MODELS:
+            raise ValueError(f"Unknown embedding version: {version}")
+        self.version_repo.lock_versions()
+        existing = self.version_repo.get_version(version)
+        if existing is None:
+            model = EMBEDDING_MODELS[version]
+            self.version_repo.add_version(version, model.model, model.dimension, BUILDING)
+        elif existing["status"] == RETIRED:
+            self.version_repo.set_status(version, BUILDING)
+        elif existing["status"] != BUILDING:
+            raise ValueError(f"Embedding version {version} is already {existing['status']}")
+        self.queue_reembed(version, dedupe_key=f"reembed:{version}")
+        self._changed()
+        return {"version": version, "status": BUILDING}
+
+    def queue_reembed(
+        self, version: str, after_id: Optional[str] = None, delay: float = 0.0, dedupe_key: Optional[str] = None
+    ) -> None:
+        """Queue the backfill of a building version, from after product `after_id` on"""
+        self.outbox.enqueue(
+            "embeddings.reembed_products",
+            {"version": version, "after_id": after_id},
+            lane="low",
+            dedupe_key=dedupe_key,
+            delay=delay
+        )
+
+    def reembed_batch(
+        self, version: str, after_id: Optional[str], limiter, commit: Callable[[], None],
+        embedding: EmbeddingService = None, max_wait: float = REEMBED_MAX_WAIT_SECONDS
+    ) -> Tuple[Optional[str], float]:
+        """
+        Embed the next batch of products missing from a building version,
+        after product `after_id` ("" or None: from the first), within the API
+        budget (local models have none). Returns the `after_id` of the next
+        batch and how long to wait before it; None once the version is
+        complete (now ready) or no longer building.
+        A pass that reaches the last product starts over, until a pass finds
+        nothing: products written before the version was live may be missing
+        behind the cursor.
+        """
+        current = self.version_repo.get_version(version)
+        if current is None or current["status"] != BUILDING:
+            return None, 0.0
+        rows = self.product_repo.get_unembedded_sources(version, after_id, EMBED_BATCH_SIZE)
+        if not rows:
+            if after_id:
+                return "", 0.0
+            self.version_repo.set_status(version, READY)
+            commit()
+            self._changed()
+            return None, 0.0
+
+        service = ProductEmbeddingService(self.product_repo, embedding or EmbeddingService(version=version))
+        products = [service.prepare(row) for row in rows]
+        if EMBEDDING_MODELS[version].provider == "local":
+            # No API quota to share; the batch costs this process's CPU only
+            service.embed(products)
+            commit()
+            return str(rows[-1]["id"]), 0.0
+        tokens = sum(estimate_tokens(p["text"]) for p in products)
+        token_rate = Config.REEMBED_TOKENS_PER_MINUTE / 60
+        request_rate = Config.REEMBED_REQUESTS_PER_MINUTE / 60
+        wait = limiter.reserve(
+            "reembed:tokens", tokens, token_rate, max(token_rate * REEMBED_BURST_SECONDS, tokens), max_wait
+        )
+        if wait > max_wait:
+            return after_id or "", wait
+        wait = max(wait, limiter.reserve("reembed:requests", 1, request_rate, request_rate * REEMBED_BURST_SECONDS))
+        time.sleep(wait)
+        service.embed(products)
+        commit()
+        return str(rows[-1]["id"]), 0.0
+
+    def cutover(self, version: str, force: bool = False) -> Dict[str, Any]:
+        """
+        Make a ready version the one queries use; the active one stays ready.
+        force: cut over to a building version (products it lacks drop out of
+        vector results until the backfill reaches them).
+        """
+        self.version_repo.lock_versions()
+        target = self.version_repo.get_version(version)
+        if target is None or target["status"] not in ((READY, BUILDING) if force else (READY,)):
+            status = target["status"] if target else "not registered"
+            raise ValueError(f"Embedding version {version} is {status}, not ready")
+        previous = self.active()
+        if previous != version:
+            self.version_repo.set_status(previous, READY)
+        self.version_repo.set_status(version, ACTIVE)
+        self._changed()
+        return {"version": version, "previous": previous}
+
+    def retire(self, version: str) -> int:
+        """Stop maintaining a version that is not active and delete its vectors; returns vectors deleted"""
+        self.version_repo.lock_versions()
+        current = self.version_repo.get_version(version)
+        if current is None:
+            raise ValueError(f"Embedding version {version} is not registered")
+        if current["status"] == ACTIVE:
+            raise ValueError(f"Embedding version {version} is active; cut over to another first")
+        self.version_repo.set_status(version, RETIRED)
+        self._changed()
+        return self.product_repo.delete_embeddings(version)
@@ -3,14 +3,16 @@ from datetime import datetime
 from typing import List, Optional, Dict, Any
 
 from ..domain.interfaces.iinvoice_repository import IInvoiceRepository
+from ..domain.interfaces.ijob_outbox import IJobOutbox
 from ..domain.models.invoice import Invoice, PaymentStatus, PaymentMethod
 
 
 class InvoiceService:
     """Service layer for Invoice operations"""
     
-    def __init__(self, invoice_repo: IInvoiceRepository):
+    def __init__(self, invoice_repo: IInvoiceRepository, outbox: IJobOutbox = None):
         self.invoice_repo = invoice_repo
+        self.outbox = outbox
 
     def create_invoice(self, tenant_id: str, order_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new invoice"""
@@ -29,7 +31,15 @@ class InvoiceService:
         )
         
         saved_invoice = self.invoice_repo.create(invoice)
-        return self._to_dict(saved_invoice)
+        result = self._to_dict(saved_invoice)
+        if self.outbox:
+            self.outbox.enqueue("notifications.invoice_created", {
+                "tenant_id": result["tenant_id"],
+                "invoice_id": result["id"],
+                "order_id": result["order_id"],
+                "final_amount": result["final_amount"],
+            })
+        return result
 
     def get_invoice(self, invoice_id: str) -> Optional[Dict[str, Any]]:
         """Get an invoice by ID"""
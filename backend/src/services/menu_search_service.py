@@ -0,0 +1,88 @@
+import re
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from ..domain.interfaces.iproduct_repository import IProductRepository
+from ..infrastructure.services.embedding_service import EmbeddingService
+
+# Reciprocal-rank fusion: a result scores sum(1 / (RRF_K + rank)) over the
+# rankings it appears in; 60 is the usual constant, damping the top ranks
+RRF_K = 60
+# Results reachable by paging; each ranking contributes this many candidates
+MAX_RESULTS = 200
+MAX_PAGE_SIZE = 50
+# Query embeddings are reused across searches for the same text
+QUERY_EMBEDDING_CACHE_SECONDS = 24 * 3600
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def prefix_tsquery(text: str) -> Optional[str]:
+    """tsquery text matching every word of `text` as a prefix ("pho b" -> "pho:* & b:*")"""
+    tokens = _TOKEN.findall(text.lower())
+    return " & ".join(f"{t}:*" for t in tokens) if tokens else None
+
+
+class MenuSearchService:
+    """
+    Hybrid product search: full-text and fuzzy name matching, plus semantic
+    similarity when real embeddings are available, fused by rank.
+
+    Full-text catches exact words, trigram matching catches misspellings
+    and partial names, and vectors catch meaning ("noodle soup" -> pho).
+    Text is accent-folded on both sides, so "pho bo" finds "Phở bò".
+    """
+
+    def __init__(self, product_repo: IProductRepository, embedding_service: EmbeddingService = None, cache=None):
+        self.product_repo = product_repo
+        self.embedding_service = embedding_service
+        self.cache = cache
+
+    def search(
+        self,
+        tenant_id: str,
+        query: str,
+        page: int = 1,
+        page_size: int = 20,
+        available_only: bool = True
+    ) -> Dict[str, Any]:
+        page = max(page, 1)
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        offset = (page - 1) * page_size
+        tsquery = prefix_tsquery(query)
+
+        results, total = [], 0
+        if tsquery and offset < MAX_RESULTS:
+            results, total = self.product_repo.search_rows_hybrid(
+                tenant_id, tsquery, query.strip(), self._query_embedding(query),
+                pool=MAX_RESULTS, rrf_k=RRF_K,
+                limit=min(page_size, MAX_RESULTS - offset), offset=offset,
+                available_only=available_only,
+                version=self.embedding_service.version if self.embedding_service else None
+            )
+        return {
+            "query": query,
+            "results": results,
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+        }
+
+    def _query_embedding(self, query: str) -> Optional[List[float]]:
+        """Embedding of the query text; None without a real model or when it fails"""
+        if self.embedding_service is None or self.embedding_service.model_key == "dummy":
+            # Dummy vectors are hashes, not meaning; ranking by them would add noise
+            return None
+        text = " ".join(query.lower().split())
+        key = "search_embedding:" + hashlib.sha256(f"{self.embedding_service.version}:{text}".encode()).hexdigest()
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        try:
+            embedding = self.embedding_service.create_embeddings_batch([text], strict=True)[0]
+        except Exception:
+            return None
+        if self.cache is not None:
+            self.cache.set(key, embedding, timeout=QUERY_EMBEDDING_CACHE_SECONDS)
+        return embedding
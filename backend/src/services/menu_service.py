@@ -1,15 +1,24 @@
 import uuid
 import datetime
-from typing import List, Optional
+import dataclasses
+from typing import List, Optional, Dict, Any
 from ..domain.interfaces.icategory_repository import ICategoryRepository
 from ..domain.interfaces.iproduct_repository import IProductRepository
+from ..domain.interfaces.ijob_outbox import IJobOutbox
 from ..domain.models.category import Category
 from ..domain.models.product import Product
+from .product_embedding_service import queue_product_embeddings
+
+# Product fields its embedding is built from
+EMBEDDED_FIELDS = ("name", "description", "category_id")
 
 class MenuService:
-    def __init__(self, category_repo: ICategoryRepository, product_repo: IProductRepository):
+    def __init__(
+        self, category_repo: ICategoryRepository, product_repo: IProductRepository, outbox: IJobOutbox = None
+    ):
         self.category_repo = category_repo
         self.product_repo = product_repo
+        self.outbox = outbox
 
     def create_category(self, tenant_id: str, name: str, display_order: int) -> Category:
         category = Category(
@@ -39,13 +48,35 @@ class MenuService:
             price=data['price'],
             description=data.get('description'),
             is_available=data.get('is_available', True),
-            embedding_vector=None, # To be handled by AI service later
             created_at=datetime.datetime.utcnow(),
             updated_at=datetime.datetime.utcnow()
         )
-        return self.product_repo.save(product)
+        saved = self.product_repo.save(product)
+        # Embedded by the menu.embed_products job
+        queue_product_embeddings(self.outbox, tenant_id)
+        return saved
+
+    def update_product(self, tenant_id: str, product_id: str, data: dict) -> Optional[Dict[str, Any]]:
+        # None when the product doesn't exist for this tenant
+        product = self.product_repo.get_by_id(product_id)
+        if not product or str(product.tenant_id) != tenant_id:
+            return None
+        if data.get('category_id') is not None:
+            category = self.category_repo.get_by_id(str(data['category_id']))
+            if not category or str(category.tenant_id) != tenant_id:
+                raise ValueError("Invalid category")
+            data = dict(data, category_id=category.id)
+
+        changes = {k: v for k, v in data.items() if v is not None or k == 'description'}
+        updated = dataclasses.replace(product, **changes, updated_at=datetime.datetime.utcnow())
+        self.product_repo.save(updated)
+        # The embedding job skips unchanged text anyway; this only saves the job
+        if any(getattr(updated, f) != getattr(product, f) for f in EMBEDDED_FIELDS):
+            queue_product_embeddings(self.outbox, tenant_id)
+        return self.product_repo.get_rows_by_ids(tenant_id, [product_id])[0]
 
-    def get_products(self, tenant_id: str, category_id: Optional[str] = None) -> List[Product]:
+    def get_products(self, tenant_id: str, category_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        # Raw rows for listing; serialize with api.responses.json_response
         if category_id:
-            return self.product_repo.get_all_by_category(category_id)
-        return self.product_repo.get_all_by_tenant(tenant_id)
+            return self.product_repo.get_rows_by_category(category_id)
+        return self.product_repo.get_rows_by_tenant(tenant_id)
@@ -2,14 +2,16 @@ from typing import List, Optional, Dict, Any
 import uuid
 
 from ..domain.interfaces.iorder_item_repository import IOrderItemRepository
-from ..domain.models.order_item import OrderItem
+from ..domain.interfaces.iorder_repository import IOrderRepository
+from ..domain.models.order_item import OrderItem, OrderItemStatus
 
 
 class OrderItemService:
     """Service for order item business logic"""
     
-    def __init__(self, order_item_repo: IOrderItemRepository):
+    def __init__(self, order_item_repo: IOrderItemRepository, order_repo: IOrderRepository = None):
         self.order_item_repo = order_item_repo
+        self.order_repo = order_repo
     
     def create_order_item(self, tenant_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new order item"""
@@ -24,6 +26,7 @@ class OrderItemService:
         )
         
         created = self.order_item_repo.create(order_item)
+        self._adjust_order_total(order_item.order_id, self._billable_amount(order_item))
         return self._to_dict(created)
     
     def get_order_item(self, order_item_id: str) -> Optional[Dict[str, Any]]:
@@ -32,37 +35,39 @@ class OrderItemService:
         return self._to_dict(order_item) if order_item else None
     
     def get_order_items_by_order(self, order_id: str) -> List[Dict[str, Any]]:
-        """Get all items for an order"""
-        items = self.order_item_repo.get_by_order(order_id)
-        return [self._to_dict(i) for i in items]
+        """Get all items for an order as raw rows (serialize with api.responses.json_response)"""
+        return self.order_item_repo.get_rows_by_order(order_id)
     
     def get_order_items_by_status(self, order_id: str, status: str) -> List[Dict[str, Any]]:
-        """Get items by status for an order"""
-        items = self.order_item_repo.get_by_status(order_id, status)
-        return [self._to_dict(i) for i in items]
+        """Get items by status for an order as raw rows"""
+        return self.order_item_repo.get_rows_by_status(order_id, status)
     
     def update_order_item(self, order_item_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update order item"""
-        order_item = self.order_item_repo.get_by_id(order_item_id)
+        order_item = self._get_for_update(order_item_id)
         if not order_item:
             raise ValueError(f"Order item {order_item_id} not found")
         
+        billed_before = self._billable_amount(order_item)
         if 'quantity' in data and data['quantity'] is not None:
             order_item.quantity = data['quantity']
         if 'item_status' in data and data['item_status'] is not None:
             order_item.item_status = data['item_status']
         
         updated = self.order_item_repo.update(order_item_id, order_item)
+        self._adjust_order_total(updated.order_id, self._billable_amount(updated) - billed_before)
         return self._to_dict(updated)
     
     def update_status(self, order_item_id: str, status: str) -> Dict[str, Any]:
         """Update order item status"""
-        order_item = self.order_item_repo.get_by_id(order_item_id)
+        order_item = self._get_for_update(order_item_id)
         if not order_item:
             raise ValueError(f"Order item {order_item_id} not found")
         
+        billed_before = self._billable_amount(order_item)
         order_item.item_status = status
         updated = self.order_item_repo.update(order_item_id, order_item)
+        self._adjust_order_total(updated.order_id, self._billable_amount(updated) - billed_before)
         return self._to_dict(updated)
     
     def mark_cooking(self, order_item_id: str) -> Dict[str, Any]:
@@ -83,7 +88,34 @@ class OrderItemService:
     
     def delete_order_item(self, order_item_id: str) -> bool:
         """Delete order item"""
-        return self.order_item_repo.delete(order_item_id)
+        order_item = self._get_for_update(order_item_id)
+        if not order_item:
+            return False
+        
+        deleted = self.order_item_repo.delete(order_item_id)
+        if deleted:
+            self._adjust_order_total(order_item.order_id, -self._billable_amount(order_item))
+        return deleted
+    
+    def _get_for_update(self, order_item_id: str) -> Optional[OrderItem]:
+        """Lock the item when its change has to be reflected in the order total"""
+        if self.order_repo:
+            return self.order_item_repo.get_for_update(order_item_id)
+        return self.order_item_repo.get_by_id(order_item_id)
+    
+    @staticmethod
+    def _billable_amount(order_item: OrderItem) -> float:
+        """Amount the item contributes to its order total (cancelled items count as zero)"""
+        if order_item.item_status == OrderItemStatus.CANCELLED:
+            return 0.0
+        return order_item.get_subtotal()
+    
+    def _adjust_order_total(self, order_id: str, delta: float) -> None:
+        """Apply a total change to the parent order with a single atomic UPDATE"""
+        if not self.order_repo or not delta:
+            return
+        if self.order_repo.adjust_total(order_id, delta) is None:
+            raise ValueError(f"Order with id {order_id} not found")
     
     def _to_dict(self, order_item: OrderItem) -> Dict[str, Any]:
         return {
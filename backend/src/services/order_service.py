@@ -1,19 +1,26 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 
 from ..domain.interfaces.iorder_repository import IOrderRepository
 from ..domain.interfaces.iorder_item_repository import IOrderItemRepository
+from ..domain.interfaces.ijob_outbox import IJobOutbox
 from ..domain.models.order import Order, OrderStatus
 from ..domain.models.order_item import OrderItem
 
+# Orders still being worked on; matches the persisted order statuses
+KITCHEN_BOARD_STATUSES = ["PENDING", "CONFIRMED", "PREPARING", "READY", "SERVED"]
+
 
 class OrderService:
     """Service layer for Order operations"""
     
-    def __init__(self, order_repo: IOrderRepository, order_item_repo: IOrderItemRepository = None):
+    def __init__(
+        self, order_repo: IOrderRepository, order_item_repo: IOrderItemRepository = None, outbox: IJobOutbox = None
+    ):
         self.order_repo = order_repo
         self.order_item_repo = order_item_repo
+        self.outbox = outbox
 
     def create_order(self, tenant_id: str, branch_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new order"""
@@ -35,31 +42,32 @@ class OrderService:
         return self._to_dict(saved_order)
 
     def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
-        """Get an order by ID"""
-        order = self.order_repo.get_by_id(order_id)
+        """Get an order by ID with its items"""
+        order = self.order_repo.get_with_items(order_id)
         if order:
-            result = self._to_dict(order)
-            # Get order items if repo available
-            if self.order_item_repo:
-                items = self.order_item_repo.get_by_order(order_id)
-                result['items'] = [self._item_to_dict(i) for i in items]
-            return result
+            return self._to_dict_with_items(order)
         return None
 
+    def get_kitchen_board(
+        self, tenant_id: str, branch_id: str, statuses: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get open orders of a branch together with their items"""
+        orders = self.order_repo.get_by_branch_with_items(
+            tenant_id, branch_id, statuses or KITCHEN_BOARD_STATUSES
+        )
+        return [self._to_dict_with_items(o) for o in orders]
+
     def get_orders_by_tenant(self, tenant_id: str) -> List[Dict[str, Any]]:
-        """Get all orders for a tenant"""
-        orders = self.order_repo.get_by_tenant(tenant_id)
-        return [self._to_dict(o) for o in orders]
+        """Get all orders for a tenant as raw rows (serialize with api.responses.json_response)"""
+        return self.order_repo.get_rows_by_tenant(tenant_id)
 
     def get_orders_by_table(self, table_id: str) -> List[Dict[str, Any]]:
-        """Get orders for a table"""
-        orders = self.order_repo.get_by_table(table_id)
-        return [self._to_dict(o) for o in orders]
+        """Get orders for a table as raw rows"""
+        return self.order_repo.get_rows_by_table(table_id)
 
     def get_orders_by_status(self, tenant_id: str, status: str) -> List[Dict[str, Any]]:
-        """Get orders by status"""
-        orders = self.order_repo.get_by_status(tenant_id, status)
-        return [self._to_dict(o) for o in orders]
+        """Get orders by status as raw rows"""
+        return self.order_repo.get_rows_by_status(tenant_id, status)
 
     def update_order_status(self, order_id: str, status: str) -> Dict[str, Any]:
         """Update order status"""
@@ -67,10 +75,24 @@ class OrderService:
         if not order:
             raise ValueError(f"Order with id {order_id} not found")
         
+        completed = status == OrderStatus.COMPLETED and order.status != OrderStatus.COMPLETED
         order.status = status
         order.updated_at = datetime.utcnow()
         
         updated_order = self.order_repo.update(order_id, order)
+        if completed and self.outbox:
+            # Recommendation models learn from completed orders
+            self.outbox.enqueue(
+                "orders.completed",
+                {
+                    "tenant_id": str(updated_order.tenant_id),
+                    "order_id": str(order_id),
+                    "branch_id": str(updated_order.branch_id),
+                    "customer_id": str(updated_order.customer_id) if updated_order.customer_id else None,
+                    "completed_at": updated_order.updated_at.replace(tzinfo=timezone.utc).timestamp(),
+                },
+                dedupe_key=f"order_completed:{order_id}"
+            )
         return self._to_dict(updated_order)
 
     def add_item_to_order(self, order_id: str, tenant_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -78,10 +100,6 @@ class OrderService:
         if not self.order_item_repo:
             raise ValueError("Order item repository not available")
         
-        order = self.order_repo.get_by_id(order_id)
-        if not order:
-            raise ValueError(f"Order with id {order_id} not found")
-        
         item_id = uuid.uuid4()
         item = OrderItem(
             id=str(item_id),
@@ -92,12 +110,11 @@ class OrderService:
             price_at_order=data['price']
         )
         
-        saved_item = self.order_item_repo.create(item)
+        # Update order total in the database; concurrent adds cannot lose updates
+        if self.order_repo.adjust_total(order_id, item.get_subtotal()) is None:
+            raise ValueError(f"Order with id {order_id} not found")
         
-        # Update order total
-        order.total_amount += item.get_subtotal()
-        order.updated_at = datetime.utcnow()
-        self.order_repo.update(order_id, order)
+        saved_item = self.order_item_repo.create(item)
         
         return self._item_to_dict(saved_item)
 
@@ -120,6 +137,12 @@ class OrderService:
             "updated_at": order.updated_at.isoformat() if order.updated_at else None
         }
 
+    def _to_dict_with_items(self, order: Order) -> Dict[str, Any]:
+        """Convert order entity with loaded items to dictionary"""
+        result = self._to_dict(order)
+        result['items'] = [self._item_to_dict(i) for i in order.items]
+        return result
+
     def _item_to_dict(self, item: OrderItem) -> Dict[str, Any]:
         """Convert order item to dictionary"""
         return {
@@ -0,0 +1,59 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from ..domain.interfaces.iorder_item_repository import IOrderItemRepository
+
+# Ranking windows: name -> half-life of an order's weight, in seconds
+POPULARITY_WINDOWS = {
+    "popular": 7 * 24 * 3600,   # best sellers of the last weeks
+    "trending": 3 * 3600,       # what is being ordered right now
+}
+# Orders older than this many half-lives weigh under 0.1% and are left out of recomputes
+RECOMPUTE_HALF_LIVES = 10
+
+
+def popularity_timestamp(value: datetime) -> float:
+    """Unix time of a naive UTC datetime (how orders store their times)"""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class PopularityService:
+    """
+    Time-decayed product popularity per branch.
+
+    Completed orders are added incrementally to each window's ranking;
+    recompute() rebuilds a branch's rankings from the database, which
+    corrects drift (missed events, cancelled lines) and bounds the stored
+    scores. Rankings are read through RecommendationService.get_popular_products.
+    """
+
+    def __init__(self, order_item_repo: IOrderItemRepository, store):
+        self.order_item_repo = order_item_repo
+        self.store = store
+
+    def recompute(self, branch_id: str, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Rebuild every window's ranking of a branch; returns products ranked per window"""
+        now = now or datetime.utcnow()
+        ranked = {}
+        for window, half_life in POPULARITY_WINDOWS.items():
+            since = now - timedelta(seconds=half_life * RECOMPUTE_HALF_LIVES)
+            rows = self.order_item_repo.get_decayed_product_scores(branch_id, half_life, since, now)
+            scores = {str(r["product_id"]): float(r["score"]) for r in rows}
+            self.store.replace(branch_id, window, scores, popularity_timestamp(now))
+            ranked[window] = len(scores)
+        return ranked
+
+    def record_order(self, order_id: str, branch_id: str, completed_at: float) -> bool:
+        """Add a completed order to the branch's rankings; False if it was counted already"""
+        if not self.store.mark_order(order_id):
+            return False
+        quantities = Counter()
+        for row in self.order_item_repo.get_rows_by_order(order_id):
+            if getattr(row["item_status"], "value", row["item_status"]) != "CANCELLED":
+                quantities[str(row["product_id"])] += row["quantity"]
+        if not quantities:
+            return False
+        for window, half_life in POPULARITY_WINDOWS.items():
+            self.store.add(branch_id, window, half_life, quantities, completed_at)
+        return True
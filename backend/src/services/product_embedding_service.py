@@ -0,0 +1,89 @@
+import hashlib
+from typing import Any, Callable, Dict, List
+
+from ..domain.interfaces.iproduct_repository import IProductRepository
+from ..domain.interfaces.ijob_outbox import IJobOutbox
+from ..infrastructure.services.embedding_service import EmbeddingService
+
+# Texts per embedding API call (OpenAI accepts up to 2048; menu texts are short)
+EMBED_BATCH_SIZE = 256
+# Menu writes within this window share one embedding run
+EMBED_DEBOUNCE_SECONDS = 5.0
+
+
+def queue_product_embeddings(outbox: IJobOutbox, tenant_id: str) -> None:
+    """Schedule (debounced, once per tenant) embedding of the tenant's changed products"""
+    if outbox is None:
+        return
+    outbox.enqueue(
+        "menu.embed_products",
+        {"tenant_id": str(tenant_id)},
+        dedupe_key=f"embed_products:{tenant_id}",
+        delay=EMBED_DEBOUNCE_SECONDS
+    )
+
+
+class ProductEmbeddingService:
+    """
+    Keeps a product's embedding in one embedding version (the version of
+    the embedding service it is given) in step with the menu.
+
+    A product is embedded from its name, category and description. The hash
+    of that text (and the model) is stored next to the vector, so only new
+    or edited products are sent to the embedding API, in batches, and
+    written back with one upsert per batch. Menu writes keep every live
+    version current (see EmbeddingVersionService).
+    """
+
+    def __init__(self, product_repo: IProductRepository, embed_service: EmbeddingService):
+        self.product_repo = product_repo
+        self.embedding = embed_service
+        self.version = embed_service.version
+
+    @staticmethod
+    def embedding_text(name: str, category_name: str = None, description: str = None) -> str:
+        return ". ".join(part.strip() for part in (name, category_name, description) if part and part.strip())
+
+    def content_hash(self, text: str) -> str:
+        return hashlib.sha256(f"{self.embedding.model_key}\n{text}".encode()).hexdigest()
+
+    def prepare(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """A product row from get_embedding_sources as {"id", "text", "hash"}"""
+        text = self.embedding_text(row["name"], row["category_name"], row["description"])
+        return {"id": row["id"], "text": text, "hash": self.content_hash(text)}
+
+    def find_stale(self, tenant_id: str) -> List[Dict[str, Any]]:
+        """Products whose embedding is missing or built from other text: [{"id", "text", "hash"}]"""
+        stale = []
+        for row in self.product_repo.get_embedding_sources(tenant_id, self.version):
+            product = self.prepare(row)
+            if product["hash"] != row["embedding_hash"]:
+                stale.append(product)
+        return stale
+
+    def embed(self, products: List[Dict[str, Any]]) -> int:
+        """Embed products from find_stale() or prepare() in one API call and write them back"""
+        if not products:
+            return 0
+        vectors = self.embedding.create_embeddings_batch([p["text"] for p in products], strict=True)
+        return self.product_repo.update_embeddings(self.version, [
+            {"id": p["id"], "embedding": vector, "embedding_hash": p["hash"]}
+            for p, vector in zip(products, vectors)
+        ])
+
+    def embed_stale(self, tenant_id: str, commit: Callable[[], None], max_rounds: int = 3) -> int:
+        """
+        Embed all stale products of a tenant, committing after each batch so a
+        large import keeps its progress. Scans again at the end: menu writes
+        committed during the run were deduplicated into this job, not queued
+        behind it.
+        """
+        embedded = 0
+        for _ in range(max_rounds):
+            stale = self.find_stale(tenant_id)
+            if not stale:
+                break
+            for start in range(0, len(stale), EMBED_BATCH_SIZE):
+                embedded += self.embed(stale[start:start + EMBED_BATCH_SIZE])
+                commit()
+        return embedded
@@ -1,14 +1,29 @@
+from datetime import datetime
 from typing import List, Dict, Any
 from ..domain.interfaces.ivector_repository import IVectorRepository
-from ..infrastructure.services.embedding_service import EmbeddingService
+from ..domain.interfaces.iproduct_repository import IProductRepository
+from ..infrastructure.services.embedding_service import EmbeddingService, DEFAULT_EMBEDDING_VERSION
+from ..infrastructure.services.job_queue import make_job
+from .popularity_service import POPULARITY_WINDOWS, popularity_timestamp
 
 
 class RecommendationService:
     """Service for AI-powered recommendations using vector similarity search"""
 
-    def __init__(self, vector_repo: IVectorRepository, embedding_service: EmbeddingService = None):
+    def __init__(
+        self, vector_repo: IVectorRepository, embedding_service: EmbeddingService = None,
+        product_repo: IProductRepository = None, cooccurrence_store=None, job_queue=None,
+        popularity_store=None, taste_service=None, embedding_version: str = DEFAULT_EMBEDDING_VERSION
+    ):
         self.vector_repo = vector_repo
         self.embedding_service = embedding_service
+        self.product_repo = product_repo
+        self.cooccurrence = cooccurrence_store
+        self.job_queue = job_queue
+        self.popularity = popularity_store
+        self.taste_service = taste_service
+        # Product vectors are compared within the active embedding version
+        self.embedding_version = embedding_version
 
     def get_recommendations_by_embedding(
         self, 
@@ -40,32 +55,116 @@ class RecommendationService:
 
     def get_similar_products(
         self, 
+        tenant_id: str,
         product_id: str, 
-        product_embedding: List[float],
         top_k: int = 5
     ) -> Dict[str, Any]:
         """
-        Get products similar to a given product
+        Get the tenant's products closest to a product, by their stored embeddings
+        (empty until the product's embedding has been generated)
         """
-        results = self.vector_repo.search_vector(product_embedding, top_k + 1)
-        # Filter out the source product
-        filtered = [r for r in results if r.get('id') != product_id][:top_k]
+        if not self.product_repo:
+            raise ValueError("Product repository not configured")
+
+        product_embedding = self.product_repo.get_embedding(tenant_id, product_id, self.embedding_version)
+        results = []
+        if product_embedding is not None:
+            results = self.product_repo.search_rows_by_embedding(
+                tenant_id, self.embedding_version, product_embedding, top_k, exclude_id=product_id
+            )
+        return {
+            "source_product_id": product_id,
+            "similar_products": results,
+            "count": len(results)
+        }
+
+    def get_frequently_ordered_together(
+        self,
+        tenant_id: str,
+        product_id: str,
+        top_k: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Products most often ordered together with a product, from the tenant's
+        co-occurrence model (served from memory). The first request for a
+        tenant without a model queues its build and returns nothing yet.
+        """
+        neighbours = self.cooccurrence.get_neighbours(tenant_id, product_id)
+        if neighbours is None:
+            self._queue_job("recommendations.build_cooccurrence", {"tenant_id": tenant_id}, f"build_cooccurrence:{tenant_id}")
+            neighbours = []
+
+        scores = dict(neighbours)
+        results = []
+        if scores:
+            rows = self.product_repo.get_rows_by_ids(tenant_id, list(scores))
+            rows = [dict(r, score=scores[str(r["id"])]) for r in rows if r["is_available"]]
+            results = sorted(rows, key=lambda r: r["score"], reverse=True)[:top_k]
         return {
             "source_product_id": product_id,
-            "similar_products": filtered,
-            "count": len(filtered)
+            "products": results,
+            "count": len(results)
         }
 
+    def get_popular_products(
+        self,
+        tenant_id: str,
+        branch_id: str,
+        window: str = "trending",
+        top_k: int = 10
+    ) -> Dict[str, Any]:
+        """
+        A branch's most ordered available products, time-decayed ("popular" over
+        weeks, "trending" over hours). The first request for a branch without
+        rankings queues their computation and returns nothing yet.
+        """
+        if window not in POPULARITY_WINDOWS:
+            raise ValueError(f"Unknown ranking window {window}")
+
+        # Read a margin past top_k: unavailable products are dropped below
+        ranking = self.popularity.top(
+            branch_id, window, POPULARITY_WINDOWS[window], top_k * 2, popularity_timestamp(datetime.utcnow())
+        )
+        if ranking is None:
+            self._queue_job("recommendations.recompute_popularity", {"branch_id": branch_id}, f"recompute_popularity:{branch_id}")
+            ranking = []
+
+        scores = dict(ranking)
+        results = []
+        if scores:
+            rows = self.product_repo.get_rows_by_ids(tenant_id, list(scores))
+            rows = [dict(r, score=round(scores[str(r["id"])], 4)) for r in rows if r["is_available"]]
+            results = sorted(rows, key=lambda r: r["score"], reverse=True)[:top_k]
+        return {
+            "branch_id": branch_id,
+            "window": window,
+            "products": results,
+            "count": len(results)
+        }
+
+    def _queue_job(self, name: str, payload: Dict[str, Any], dedupe_key: str) -> None:
+        if self.job_queue is not None:
+            self.job_queue.enqueue(make_job(name, payload, dedupe_key=dedupe_key))
+
     def get_personalized_recommendations(
         self,
-        user_preferences: List[float],
+        tenant_id: str,
+        customer_id: str,
         top_k: int = 10
     ) -> Dict[str, Any]:
         """
-        Get personalized recommendations based on user preference vector
+        Get the tenant's products closest to a customer's taste vector
+        (empty until the customer has completed an order)
         """
-        results = self.vector_repo.search_vector(user_preferences, top_k)
+        if not self.product_repo or not self.taste_service:
+            raise ValueError("Product repository and taste service not configured")
+
+        taste = self.taste_service.get_taste_vector(tenant_id, customer_id)
+        results = []
+        if taste is not None:
+            results = self.product_repo.search_rows_by_embedding(tenant_id, self.embedding_version, taste, top_k)
         return {
+            "customer_id": customer_id,
             "personalized_recommendations": results,
             "count": len(results)
-        }
\ No newline at end of file
+        }
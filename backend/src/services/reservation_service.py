@@ -1,36 +1,131 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, date, time, timedelta, timezone
 from typing import List, Optional, Dict, Any
 
+from ..domain.availability import AvailabilityIndex
+from ..domain.constants import (
+    DEFAULT_RESERVATION_MINUTES, RESERVATION_SLOT_MINUTES,
+    DEFAULT_OPENING_TIME, DEFAULT_CLOSING_TIME, MAX_AVAILABILITY_DAYS
+)
+from ..domain.exceptions import ReservationConflictException, ResourceNotFoundException
+from ..domain.interfaces.ibranch_repository import IBranchRepository
 from ..domain.interfaces.ireservation_repository import IReservationRepository
+from ..domain.interfaces.itable_repository import ITableRepository
 from ..domain.models.reservation import Reservation, ReservationStatus
 
 
 class ReservationService:
     """Service layer for Reservation operations"""
     
-    def __init__(self, reservation_repo: IReservationRepository):
+    def __init__(
+        self,
+        reservation_repo: IReservationRepository,
+        table_repo: ITableRepository = None,
+        branch_repo: IBranchRepository = None
+    ):
         self.reservation_repo = reservation_repo
+        # Optional: without it reservations are stored without a table or capacity check
+        self.table_repo = table_repo
+        # Optional: without it the branch is not checked against the tenant
+        self.branch_repo = branch_repo
+
+    @staticmethod
+    def _parse_booking_time(booking_time) -> datetime:
+        """Parse ISO input into naive UTC, matching the booking_time column"""
+        if isinstance(booking_time, str):
+            booking_time = datetime.fromisoformat(booking_time.replace('Z', '+00:00'))
+        if booking_time.tzinfo is not None:
+            booking_time = booking_time.astimezone(timezone.utc).replace(tzinfo=None)
+        return booking_time
+
+    def _check_branch(self, tenant_id: str, branch_id: str) -> None:
+        """Another tenant's branch is reported as not found"""
+        if self.branch_repo is None:
+            return
+        branch = self.branch_repo.get_by_id(branch_id)
+        if not branch or str(branch.tenant_id) != str(tenant_id):
+            raise ResourceNotFoundException(f"Branch with id {branch_id} not found")
+
+    def _build_index(self, branch_id: str, start: datetime, end: datetime, exclude_id: Optional[str] = None) -> AvailabilityIndex:
+        """Two queries: the branch's tables and its live reservations in the window"""
+        tables = self.table_repo.get_by_branch(branch_id)
+        reservations = self.reservation_repo.get_active_in_window(branch_id, start, end)
+        if exclude_id:
+            reservations = [r for r in reservations if r.id != exclude_id]
+        return AvailabilityIndex.build(tables, reservations)
+
+    def _assign_table(self, reservation: Reservation) -> None:
+        """Check capacity and put the reservation on a free table (best fit if none requested)"""
+        if self.table_repo is None:
+            return
+        start, end = reservation.booking_time, reservation.end_time
+        index = self._build_index(reservation.branch_id, start, end, exclude_id=reservation.id)
+        if reservation.table_id:
+            if not index.is_table_free(reservation.table_id, start, end, reservation.party_size):
+                raise ReservationConflictException("Requested table is not available for this party at that time")
+            return
+        table_id = index.find_table(start, end, reservation.party_size)
+        if table_id is None:
+            raise ReservationConflictException("No table available for this party size at the requested time")
+        reservation.table_id = table_id
+
+    def get_availability(
+        self,
+        tenant_id: str,
+        branch_id: str,
+        start_date: date,
+        party_size: int,
+        days: int = 1,
+        duration_minutes: int = DEFAULT_RESERVATION_MINUTES,
+        opening: Optional[time] = None,
+        closing: Optional[time] = None
+    ) -> List[Dict[str, Any]]:
+        """Bookable slots per day for a party at a branch"""
+        if self.table_repo is None:
+            raise ValueError("Availability requires a table repository")
+        if not 1 <= days <= MAX_AVAILABILITY_DAYS:
+            raise ValueError(f"days must be between 1 and {MAX_AVAILABILITY_DAYS}")
+        self._check_branch(tenant_id, branch_id)
+        opening = opening or time.fromisoformat(DEFAULT_OPENING_TIME)
+        closing = closing or time.fromisoformat(DEFAULT_CLOSING_TIME)
+
+        last_date = start_date + timedelta(days=days - 1)
+        index = self._build_index(
+            branch_id,
+            datetime.combine(start_date, opening),
+            datetime.combine(last_date, closing)
+        )
+
+        duration = timedelta(minutes=duration_minutes)
+        step = timedelta(minutes=RESERVATION_SLOT_MINUTES)
+        result = []
+        for offset in range(days):
+            day = start_date + timedelta(days=offset)
+            slots = index.available_slots(day, party_size, duration, opening, closing, step)
+            result.append({
+                "date": day.isoformat(),
+                "slots": [{"time": start.isoformat(), "table_id": table_id} for start, table_id in slots]
+            })
+        return result
 
     def create_reservation(self, tenant_id: str, branch_id: str, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new reservation"""
+        self._check_branch(tenant_id, branch_id)
         reservation_id = uuid.uuid4()
         
-        # Parse booking time
-        booking_time = data.get('booking_time')
-        if isinstance(booking_time, str):
-            booking_time = datetime.fromisoformat(booking_time.replace('Z', '+00:00'))
-        
         reservation = Reservation(
             id=str(reservation_id),
             tenant_id=tenant_id,
             branch_id=branch_id,
             user_id=user_id,
-            booking_time=booking_time,
+            booking_time=self._parse_booking_time(data.get('booking_time')),
             party_size=data.get('party_size', 1),
             status=ReservationStatus.PENDING,
-            created_at=datetime.utcnow()
+            created_at=datetime.utcnow(),
+            table_id=data.get('table_id'),
+            duration_minutes=data.get('duration_minutes') or DEFAULT_RESERVATION_MINUTES
         )
+        self._assign_table(reservation)
         
         saved_reservation = self.reservation_repo.create(reservation)
         return self._to_dict(saved_reservation)
@@ -64,14 +159,23 @@ class ReservationService:
             raise ValueError(f"Reservation with id {reservation_id} not found")
         
         if 'booking_time' in data:
-            booking_time = data['booking_time']
-            if isinstance(booking_time, str):
-                booking_time = datetime.fromisoformat(booking_time.replace('Z', '+00:00'))
-            existing.booking_time = booking_time
+            existing.booking_time = self._parse_booking_time(data['booking_time'])
         
         if 'party_size' in data:
             existing.party_size = data['party_size']
         
+        if 'duration_minutes' in data:
+            existing.duration_minutes = data['duration_minutes']
+        
+        if 'table_id' in data:
+            existing.table_id = data['table_id']
+        elif data.keys() & {'booking_time', 'party_size', 'duration_minutes'} and self.table_repo:
+            # Re-pick the best-fitting table for the new time/size
+            existing.table_id = None
+        
+        if data.keys() & {'booking_time', 'party_size', 'duration_minutes', 'table_id'}:
+            self._assign_table(existing)
+        
         updated_reservation = self.reservation_repo.update(reservation_id, existing)
         return self._to_dict(updated_reservation)
 
@@ -99,6 +203,8 @@ class ReservationService:
             "user_id": str(reservation.user_id),
             "booking_time": reservation.booking_time.isoformat() if reservation.booking_time else None,
             "party_size": reservation.party_size,
+            "table_id": reservation.table_id,
+            "duration_minutes": reservation.duration_minutes,
             "status": reservation.status if isinstance(reservation.status, str) else reservation.status.value,
             "created_at": reservation.created_at.isoformat() if reservation.created_at else None
         }
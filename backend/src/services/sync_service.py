@@ -0,0 +1,120 @@
+from typing import Callable, Dict, List, Optional, Any
+
+from ..domain.interfaces.isync_repository import ISyncRepository
+from ..domain.interfaces.iproduct_repository import IProductRepository
+from ..domain.interfaces.icategory_repository import ICategoryRepository
+from ..domain.interfaces.itable_repository import ITableRepository
+from ..domain.interfaces.iorder_repository import IOrderRepository
+from .order_service import KITCHEN_BOARD_STATUSES
+
+# Change rows per delta response; a client with more to fetch gets has_more
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+# Loads rows of one resource: all of them (ids=None) or only the given IDs
+Loader = Callable[[Optional[List[str]]], List[Dict[str, Any]]]
+
+
+class SyncService:
+    """
+    Delta sync of menu, tables and open orders for the mobile and guest apps.
+
+    A client starts with a full sync and keeps the returned version; later
+    calls pass it as `since` and get only the rows changed after it plus the
+    IDs to remove (deleted, or no longer matching the requested set). Versions
+    are per tenant and recorded by the change log on every commit.
+    """
+
+    def __init__(
+        self, sync_repo: ISyncRepository, product_repo: IProductRepository = None,
+        category_repo: ICategoryRepository = None, table_repo: ITableRepository = None,
+        order_repo: IOrderRepository = None
+    ):
+        self.sync_repo = sync_repo
+        self.product_repo = product_repo
+        self.category_repo = category_repo
+        self.table_repo = table_repo
+        self.order_repo = order_repo
+
+    def get_menu(self, tenant_id: str, since: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """Products and categories changed after `since` (all of them without it)"""
+        return self._sync(tenant_id, since, limit, {
+            "categories": lambda ids: (
+                self.category_repo.get_rows_by_tenant(tenant_id) if ids is None
+                else self.category_repo.get_rows_by_ids(tenant_id, ids)
+            ),
+            "products": lambda ids: (
+                self.product_repo.get_rows_by_tenant(tenant_id) if ids is None
+                else self.product_repo.get_rows_by_ids(tenant_id, ids)
+            ),
+        })
+
+    def get_tables(
+        self, tenant_id: str, since: Optional[int] = None, branch_id: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Dict[str, Any]:
+        """Tables (of a branch, if given) changed after `since`"""
+        def load(ids):
+            if ids is None:
+                if branch_id:
+                    return self.table_repo.get_rows_by_branch(tenant_id, branch_id)
+                return self.table_repo.get_rows_by_tenant(tenant_id)
+            rows = self.table_repo.get_rows_by_ids(tenant_id, ids)
+            return [r for r in rows if not branch_id or str(r["branch_id"]) == branch_id]
+        return self._sync(tenant_id, since, limit, {"tables": load})
+
+    def get_open_orders(
+        self, tenant_id: str, since: Optional[int] = None, branch_id: Optional[str] = None,
+        table_id: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> Dict[str, Any]:
+        """Open orders with their items (of a branch or table, if given) changed after `since`"""
+        return self._sync(tenant_id, since, limit, {
+            "orders": lambda ids: self.order_repo.get_rows_with_items(
+                tenant_id, KITCHEN_BOARD_STATUSES, order_ids=ids, branch_id=branch_id, table_id=table_id
+            ),
+        })
+
+    def _sync(self, tenant_id: str, since: Optional[int], limit: int, loaders: Dict[str, Loader]) -> Dict[str, Any]:
+        # Read the version first: every change up to it is committed, and rows
+        # loaded afterwards can only be newer, which the next delta repeats
+        version, purged_version = self.sync_repo.get_versions(tenant_id)
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        if since is None or since < purged_version or since > version:
+            # No cursor, or tombstones it needs are gone: client replaces its copy
+            return {
+                "version": version, "full": True, "has_more": False,
+                "changes": {resource: load(None) for resource, load in loaders.items()},
+                "removed": {resource: [] for resource in loaders},
+            }
+
+        resources = list(loaders)
+        changes = []
+        has_more = False
+        if since < version:
+            changes = self.sync_repo.get_changes(tenant_id, resources, since, version, limit + 1)
+            if len(changes) > limit:
+                # Page on a version boundary, so no change of a commit is split off
+                has_more = True
+                cut = changes[limit]["version"]
+                changes = [c for c in changes if c["version"] < cut]
+                if not changes:
+                    # A single commit larger than a page is sent whole
+                    changes = self.sync_repo.get_changes_at(tenant_id, resources, cut)
+                version = changes[-1]["version"]
+
+        changed = {resource: [] for resource in resources}
+        removed = {resource: [] for resource in resources}
+        for change in changes:
+            target = removed if change["deleted"] else changed
+            target[change["resource"]].append(str(change["entity_id"]))
+
+        result = {"version": version, "full": False, "has_more": has_more, "changes": {}, "removed": removed}
+        for resource, load in loaders.items():
+            ids = changed[resource]
+            rows = load(ids) if ids else []
+            # Changed but not returned: deleted since, or no longer in the requested set
+            returned = {str(r["id"]) for r in rows}
+            removed[resource].extend(i for i in ids if i not in returned)
+            result["changes"][resource] = rows
+        return result
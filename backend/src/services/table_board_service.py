@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from ..domain.interfaces.itable_repository import ITableRepository
+from ..domain.models.table import Table, TableStatus
+
+# Statuses the tables.status column can persist
+BOARD_STATUSES = (TableStatus.AVAILABLE.value, TableStatus.OCCUPIED.value)
+
+
+class TableBoardService:
+    """
+    Live table board for host stands.
+
+    Reads and status changes are served from the shared board store;
+    Postgres is only read to build a branch board the first time and is
+    written in the background through the status writer.
+    """
+
+    def __init__(self, table_repo: ITableRepository, board, writer=None, realtime=None):
+        self.table_repo = table_repo
+        self.board = board
+        self.writer = writer
+        self.realtime = realtime
+
+    def get_board(self, branch_id: str, since: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Full board, or only tables changed after version `since`.
+        A client whose version predates the last rebuild gets the full board back.
+        """
+        snapshot = self.board.get(branch_id)
+        if snapshot is None:
+            snapshot = self._load(branch_id)
+        version, loaded, entries = snapshot
+
+        if since is None or since < loaded or since > version:
+            return {"branch_id": branch_id, "version": version, "full": True, "tables": entries}
+        changed = {table_id: e for table_id, e in entries.items() if e["v"] > since}
+        return {"branch_id": branch_id, "version": version, "full": False, "tables": changed}
+
+    def update_status(self, table_id: str, status: str) -> Dict[str, Any]:
+        """Set a table's status on the board, queue the database write and broadcast the diff"""
+        if status not in BOARD_STATUSES:
+            raise ValueError(f"Invalid table status {status}")
+
+        branch_id = self.board.branch_of(table_id)
+        if branch_id is None:
+            table = self.table_repo.get_by_id(table_id)
+            if not table:
+                raise ValueError(f"Table with id {table_id} not found")
+            branch_id = table.branch_id
+
+        fields = {"status": status, "updated_at": datetime.utcnow().isoformat()}
+        entry = self.board.update(branch_id, table_id, fields)
+        if entry is None:
+            # Board not built yet (or expired): build it, then apply the change
+            self._load(branch_id)
+            entry = self.board.update(branch_id, table_id, fields)
+            if entry is None:
+                raise ValueError(f"Table with id {table_id} not found")
+
+        if self.writer:
+            self.writer.enqueue(table_id, status)
+        if self.realtime:
+            self.realtime.emit(
+                'table:status_changed',
+                {"branch_id": branch_id, "version": entry["v"], "tables": {table_id: entry}},
+                room=self.realtime.branch_room(branch_id)
+            )
+        return entry
+
+    def invalidate(self, branch_id: str) -> None:
+        """Drop a branch board after table create/rename/delete so it is rebuilt"""
+        self.board.invalidate(branch_id)
+
+    def invalidate_table(self, table_id: str) -> None:
+        """Drop the board holding a table, if one is loaded"""
+        branch_id = self.board.branch_of(table_id)
+        if branch_id:
+            self.board.invalidate(branch_id)
+
+    def _load(self, branch_id: str):
+        entries = [self._to_entry(t) for t in self.table_repo.get_by_branch(branch_id)]
+        version = self.board.load(branch_id, entries)
+        # The snapshot just written, not a re-read: the board may be
+        # invalidated (a table CRUD) or expire before a get()
+        return version, version, {e["id"]: dict(e, v=version) for e in entries}
+
+    def _to_entry(self, table: Table) -> Dict[str, Any]:
+        """Board entry for a table (the store stamps the version)"""
+        return {
+            "id": str(table.id),
+            "name": table.name,
+            "seats": table.seats,
+            "status": table.status if isinstance(table.status, str) else table.status.value,
+            "updated_at": table.updated_at.isoformat() if table.updated_at else None
+        }
@@ -3,14 +3,16 @@ from datetime import datetime
 from typing import List, Optional, Dict, Any
 
 from ..domain.interfaces.itable_repository import ITableRepository
+from ..domain.interfaces.ijob_outbox import IJobOutbox
 from ..domain.models.table import Table, TableStatus
 
 
 class TableService:
     """Service layer for Table operations"""
     
-    def __init__(self, table_repo: ITableRepository):
+    def __init__(self, table_repo: ITableRepository, outbox: IJobOutbox = None):
         self.table_repo = table_repo
+        self.outbox = outbox
 
     def create_table(self, tenant_id: str, branch_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new table"""
@@ -20,12 +22,18 @@ class TableService:
             tenant_id=tenant_id,
             branch_id=branch_id,
             name=data['name'],
+            seats=data.get('seats', 4),
             status=TableStatus.AVAILABLE,
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow()
         )
         
         saved_table = self.table_repo.create(table)
+        if self.outbox:
+            # Render the QR image ahead of the first scan
+            self.outbox.enqueue("qrcode.render_table", {
+                "tenant_id": str(tenant_id), "branch_id": str(branch_id), "table_id": str(table_id)
+            })
         return self._to_dict(saved_table)
 
     def get_table(self, table_id: str) -> Optional[Dict[str, Any]]:
@@ -36,19 +44,16 @@ class TableService:
         return None
 
     def get_tables_by_tenant(self, tenant_id: str) -> List[Dict[str, Any]]:
-        """Get all tables for a tenant"""
-        tables = self.table_repo.get_by_tenant(tenant_id)
-        return [self._to_dict(t) for t in tables]
+        """Get all tables for a tenant as raw rows (serialize with api.responses.json_response)"""
+        return self.table_repo.get_rows_by_tenant(tenant_id)
 
-    def get_tables_by_branch(self, branch_id: str) -> List[Dict[str, Any]]:
-        """Get all tables for a branch"""
-        tables = self.table_repo.get_by_branch(branch_id)
-        return [self._to_dict(t) for t in tables]
+    def get_tables_by_branch(self, tenant_id: str, branch_id: str) -> List[Dict[str, Any]]:
+        """Get all tables of a tenant's branch as raw rows"""
+        return self.table_repo.get_rows_by_branch(tenant_id, branch_id)
 
     def get_available_tables(self, tenant_id: str) -> List[Dict[str, Any]]:
-        """Get all available tables for a tenant"""
-        tables = self.table_repo.get_by_status(tenant_id, TableStatus.AVAILABLE.value)
-        return [self._to_dict(t) for t in tables]
+        """Get all available tables for a tenant as raw rows"""
+        return self.table_repo.get_rows_by_status(tenant_id, TableStatus.AVAILABLE.value)
 
     def update_table(self, table_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a table"""
@@ -57,6 +62,7 @@ class TableService:
             raise ValueError(f"Table with id {table_id} not found")
         
         existing.name = data.get('name', existing.name)
+        existing.seats = data.get('seats', existing.seats)
         existing.updated_at = datetime.utcnow()
         
         updated_table = self.table_repo.update(table_id, existing)
@@ -95,6 +101,7 @@ class TableService:
             "tenant_id": str(table.tenant_id),
             "branch_id": str(table.branch_id),
             "name": table.name,
+            "seats": table.seats,
             "status": table.status if isinstance(table.status, str) else table.status.value,
             "qr_code_link": table.qr_code_link,
             "created_at": table.created_at.isoformat() if table.created_at else None,
@@ -0,0 +1,139 @@
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import groupby
+from typing import Callable, List, Optional
+
+from ..domain.interfaces.icustomer_repository import ICustomerRepository
+from ..domain.interfaces.iorder_item_repository import IOrderItemRepository
+from ..domain.interfaces.iproduct_repository import IProductRepository
+from ..domain.taste import fold_order, to_bytes, from_bytes
+from ..infrastructure.services.embedding_service import DEFAULT_EMBEDDING_VERSION
+
+# Updates write through to the cache; standalone job workers have no cache
+# backend, so entries also expire soon enough for their updates to show
+TASTE_CACHE_SECONDS = 10 * 60
+
+
+def _timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class TasteService:
+    """
+    Maintains customers' taste vectors (see domain/taste.py).
+
+    record_order() folds one completed order into its customer's taste,
+    under a row lock; rebuild() replays a customer's whole history, for
+    backfills. Each order is flagged when folded (orders.taste_folded_at),
+    so re-delivered jobs are no-ops and an order whose job runs after a
+    later order's is still folded in. Reads go through the cache, which
+    updates overwrite.
+
+    Tastes are built from product embeddings of one embedding version and
+    are only read in that version. After a cutover the next completed order
+    rebuilds a customer's taste in the new version; until then (or a run of
+    scripts/build_taste_vectors.py) they have none.
+    """
+
+    def __init__(
+        self,
+        customer_repo: ICustomerRepository,
+        product_repo: IProductRepository = None,
+        order_item_repo: IOrderItemRepository = None,
+        cache=None,
+        embedding_version: str = DEFAULT_EMBEDDING_VERSION
+    ):
+        self.customer_repo = customer_repo
+        self.product_repo = product_repo
+        self.order_item_repo = order_item_repo
+        self.cache = cache
+        self.version = embedding_version
+
+    def _cache_key(self, tenant_id: str, customer_id: str) -> str:
+        return f"taste:{self.version}:{tenant_id}:{customer_id}"
+
+    def record_order(
+        self, tenant_id: str, customer_id: str, order_id: str, completed_at: float, commit: Callable[[], None]
+    ) -> bool:
+        """
+        Fold a completed order into the customer's taste; False when skipped
+        (already folded, or nothing in it has an embedding yet)
+        """
+        taste = self.customer_repo.get_taste(tenant_id, customer_id, for_update=True)
+        if taste is None:
+            return False
+        if taste["vector"] is not None and taste["version"] != self.version:
+            # Built in another embedding version: replay the history in this one
+            return self.rebuild(tenant_id, customer_id, commit) > 0
+        # Taken under the customer's row lock; rolled back with it when nothing is folded
+        if not self.customer_repo.mark_taste_orders([order_id]):
+            return False
+        updated_at = None if taste["updated_at"] is None else _timestamp(taste["updated_at"])
+
+        quantities = Counter()
+        for row in self.order_item_repo.get_rows_by_order(order_id):
+            if getattr(row["item_status"], "value", row["item_status"]) != "CANCELLED":
+                quantities[str(row["product_id"])] += row["quantity"]
+        embeddings = self.product_repo.get_embeddings(tenant_id, list(quantities), self.version)
+        if not embeddings:
+            return False
+
+        vector, weight = fold_order(
+            taste["vector"], taste["weight"], updated_at,
+            ((embeddings[p], q) for p, q in quantities.items() if p in embeddings), completed_at
+        )
+        self.customer_repo.save_taste(
+            customer_id, vector, self.version, weight,
+            datetime.utcfromtimestamp(completed_at if updated_at is None else max(completed_at, updated_at))
+        )
+        commit()
+        self._cache_set(tenant_id, customer_id, vector)
+        return True
+
+    def rebuild(self, tenant_id: str, customer_id: str, commit: Callable[[], None]) -> int:
+        """Recompute a customer's taste from all their completed orders; returns orders folded"""
+        # Serializes with record_order(), which would otherwise fold an order
+        # completing meanwhile into a taste this then overwrites
+        if self.customer_repo.get_taste(tenant_id, customer_id, for_update=True) is None:
+            return 0
+        lines = self.order_item_repo.get_customer_order_lines(tenant_id, customer_id)
+        embeddings = self.product_repo.get_embeddings(
+            tenant_id, list({str(r["product_id"]) for r in lines}), self.version
+        )
+        vector, weight, updated_at, folded = None, 0.0, None, []
+        for order_id, order_lines in groupby(lines, key=lambda r: r["order_id"]):
+            order_lines = list(order_lines)
+            completed_at = _timestamp(order_lines[0]["completed_at"])
+            pairs = [
+                (embeddings[str(r["product_id"])], r["quantity"])
+                for r in order_lines if str(r["product_id"]) in embeddings
+            ]
+            if pairs:
+                vector, weight = fold_order(vector, weight, updated_at, pairs, completed_at)
+                updated_at = completed_at if updated_at is None else max(completed_at, updated_at)
+                folded.append(str(order_id))
+        if vector is None:
+            return 0
+        self.customer_repo.save_taste(
+            customer_id, vector, self.version, weight, datetime.utcfromtimestamp(updated_at)
+        )
+        self.customer_repo.mark_taste_orders(folded)
+        commit()
+        self._cache_set(tenant_id, customer_id, vector)
+        return len(folded)
+
+    def get_taste_vector(self, tenant_id: str, customer_id: str) -> Optional[List[float]]:
+        """A customer's taste vector; None if they have none yet (in this version)"""
+        if self.cache is not None:
+            cached = self.cache.get(self._cache_key(tenant_id, customer_id))
+            if cached is not None:
+                return from_bytes(cached).tolist()
+        taste = self.customer_repo.get_taste(tenant_id, customer_id)
+        if taste is None or taste["vector"] is None or taste["version"] != self.version:
+            return None
+        self._cache_set(tenant_id, customer_id, taste["vector"])
+        return taste["vector"]
+
+    def _cache_set(self, tenant_id: str, customer_id: str, vector) -> None:
+        if self.cache is not None:
+            self.cache.set(self._cache_key(tenant_id, customer_id), to_bytes(vector), timeout=TASTE_CACHE_SECONDS)
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from ..domain.interfaces.icategory_repository import ICategoryRepository
+from ..domain.interfaces.iorder_item_repository import IOrderItemRepository
+from ..domain.interfaces.iproduct_repository import IProductRepository
+from ..domain.typeahead import TypeaheadEntry, TypeaheadIndex, MAX_SUGGESTIONS
+
+# Orders counted for popularity tie-breaks
+POPULARITY_DAYS = 30
+
+
+class TypeaheadService:
+    """
+    Autocomplete over a tenant's available products and its categories.
+
+    Lookups are served from an in-memory index (see domain/typeahead.py);
+    the repositories are only read when the index has to be (re)built.
+    """
+
+    def __init__(
+        self,
+        store,
+        product_repo: IProductRepository,
+        category_repo: ICategoryRepository,
+        order_item_repo: IOrderItemRepository = None
+    ):
+        self.store = store
+        self.product_repo = product_repo
+        self.category_repo = category_repo
+        self.order_item_repo = order_item_repo
+
+    def suggest(self, tenant_id: str, prefix: str, limit: int = MAX_SUGGESTIONS) -> Dict[str, Any]:
+        index = self.store.get(tenant_id, lambda: self.build_index(tenant_id))
+        return {
+            "query": prefix,
+            "suggestions": [
+                {"type": e.kind, "id": e.id, "name": e.name, "category_id": e.category_id}
+                for e in index.lookup(prefix, limit)
+            ],
+        }
+
+    def build_index(self, tenant_id: str) -> TypeaheadIndex:
+        """Index of the tenant's current menu, ranked by recent order quantity"""
+        popularity = {}
+        if self.order_item_repo is not None:
+            since = datetime.utcnow() - timedelta(days=POPULARITY_DAYS)
+            popularity = self.order_item_repo.get_product_order_counts(tenant_id, since)
+
+        entries, category_popularity = [], {}
+        for row in self.product_repo.get_rows_by_tenant(tenant_id):
+            if not row["is_available"]:
+                continue
+            product_id, category_id = str(row["id"]), str(row["category_id"])
+            score = popularity.get(product_id, 0)
+            category_popularity[category_id] = category_popularity.get(category_id, 0) + score
+            entries.append(TypeaheadEntry("product", product_id, row["name"], category_id, score))
+        for row in self.category_repo.get_rows_by_tenant(tenant_id):
+            category_id = str(row["id"])
+            entries.append(TypeaheadEntry(
+                "category", category_id, row["name"], None, category_popularity.get(category_id, 0)
+            ))
+        return TypeaheadIndex(entries)
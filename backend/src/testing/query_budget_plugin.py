@@ -0,0 +1,137 @@
+"""
+pytest plugin: per-route SQL query baseline and query-budget enforcement
+
+The root conftest.py loads it, so the backend tests always run with it:
+
+    TEST_DATABASE_URI=... python -m pytest backend/tests
+    TEST_DATABASE_URI=... python -m pytest backend/tests --update-query-baseline
+
+Every request the app handles during the run records its SQL statement
+count under its route rule (through MetricsService); 5xx responses are
+not recorded. At the end of the
+session the per-route maxima are compared with the baseline file: a route
+issuing more queries than recorded fails the session. The baseline lists
+every /api route of the app, with null for routes no test exercised;
+backend/tests/test_routes_smoke.py requests each of them once. The
+baseline (backend/tests/query_baseline.json) is committed: it is written
+when missing or with --update-query-baseline, and only from a run that
+handled requests, so a run whose database tests were skipped leaves it
+alone.
+
+Any query_budget violation raised while a test runs fails that test.
+"""
+import json
+import os
+from typing import Dict, List, Optional, Set
+
+import pytest
+
+from .. import query_budget
+from ..infrastructure.services.metrics_service import get_metrics_service
+
+IGNORED_METHODS = {"HEAD", "OPTIONS"}
+DEFAULT_BASELINE = os.path.normpath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "tests", "query_baseline.json")
+)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("query-budget")
+    group.addoption(
+        "--query-baseline", default=None,
+        help="Per-route query count baseline (JSON), relative to rootdir "
+             "(default: backend/tests/query_baseline.json)"
+    )
+    group.addoption(
+        "--update-query-baseline", action="store_true",
+        help="Rewrite the baseline with this run's counts instead of comparing"
+    )
+    group.addoption(
+        "--query-baseline-slack", type=int, default=0,
+        help="Extra queries a route may issue over its baseline"
+    )
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(QueryBaselineRecorder(config), "query-baseline-recorder")
+
+
+class QueryBaselineRecorder:
+    def __init__(self, config):
+        path = config.getoption("--query-baseline")
+        self.path = os.path.join(str(config.rootpath), path) if path else DEFAULT_BASELINE
+        self.update = config.getoption("--update-query-baseline")
+        self.slack = config.getoption("--query-baseline-slack")
+        self.counts: Dict[str, int] = {}
+        self.routes: Set[str] = set()
+        self.violations: List[str] = []
+        self.regressions: List[str] = []
+        self.written = False
+
+        get_metrics_service().add_request_observer(self.observe)
+        query_budget.on_violation(self.violations.append)
+
+    def observe(self, method: str, endpoint: str, status: int, stats) -> None:
+        # A request that failed says nothing about what the route costs
+        if endpoint == "unmatched" or status >= 500:
+            return
+        key = f"{method} {endpoint}"
+        self.counts[key] = max(self.counts.get(key, 0), stats.sql_count)
+        if not self.routes:
+            from flask import current_app
+            self.routes = {
+                f"{m} {rule.rule}"
+                for rule in current_app.url_map.iter_rules()
+                if rule.rule.startswith("/api/")
+                for m in rule.methods - IGNORED_METHODS
+            }
+
+    @pytest.fixture(autouse=True)
+    def _query_budget_guard(self):
+        self.violations.clear()
+        yield
+        if self.violations:
+            pytest.fail("\n".join(self.violations), pytrace=False)
+
+    def _load(self) -> Optional[Dict[str, Optional[int]]]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            return json.load(f)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        # No request was handled (e.g. the database tests were skipped):
+        # nothing to compare, and nothing to write
+        if not self.counts:
+            return
+        baseline = self._load()
+        if baseline is None or self.update:
+            merged = dict(baseline or {})
+            merged.update({route: merged.get(route) for route in self.routes})
+            merged.update(self.counts)
+            with open(self.path, "w") as f:
+                json.dump(dict(sorted(merged.items())), f, indent=2)
+                f.write("\n")
+            self.written = True
+            return
+
+        for route, count in sorted(self.counts.items()):
+            allowed = baseline.get(route)
+            if allowed is not None and count > allowed + self.slack:
+                self.regressions.append(f"{route}: {count} queries (baseline {allowed})")
+        if self.regressions:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.regressions:
+            terminalreporter.section("query baseline regressions")
+            for line in self.regressions:
+                terminalreporter.line(line)
+        elif self.written:
+            terminalreporter.write_line(f"query baseline: {len(self.counts)} routes written to {self.path}")
+        elif self.counts:
+            terminalreporter.write_line(
+                f"query baseline: {len(self.counts)} routes within budget ({self.path})"
+            )
+        else:
+            terminalreporter.write_line(f"query baseline: no requests handled, {self.path} not checked")
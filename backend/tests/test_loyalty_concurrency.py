@@ -0,0 +1,162 @@
+"""
+Loyalty points under concurrent requests: accruals of the same orders must
+count once, redemptions must never overdraw, and the balance must always
+equal the sum of the ledger.
+"""
+import uuid
+import threading
+
+import pytest
+from sqlalchemy import func
+
+from backend.src.infrastructure.repositories.customer_repository import CustomerRepository
+from backend.src.infrastructure.models.tenant_model import Tenant
+from backend.src.infrastructure.models.order_model import Order, OrderStatus
+from backend.src.infrastructure.models.customer_model import Customer
+from backend.src.infrastructure.models.loyalty_ledger_model import LoyaltyLedgerEntry
+
+POINTS_RATE = 0.1
+
+
+def make_orders(session_factory, tenant, customer_id, totals):
+    with session_factory() as db:
+        orders = [
+            Order(
+                tenant_id=uuid.UUID(tenant["tenant_id"]), branch_id=uuid.UUID(tenant["branch_id"]),
+                table_id=uuid.UUID(tenant["table_id"]), customer_id=uuid.UUID(customer_id),
+                status=OrderStatus.COMPLETED, total_amount=total
+            )
+            for total in totals
+        ]
+        db.add_all(orders)
+        db.commit()
+        return [str(o.id) for o in orders]
+
+
+def run_parallel(session_factory, calls):
+    """Runs each call(repo) on its own thread and session, all released at once"""
+    barrier = threading.Barrier(len(calls))
+    results = [None] * len(calls)
+    errors = []
+
+    def worker(n, call):
+        db = session_factory()
+        try:
+            barrier.wait()
+            results[n] = call(CustomerRepository(db))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            errors.append(e)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=worker, args=(n, call)) for n, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+    return results
+
+
+def balance_and_ledger(session_factory, customer_id):
+    with session_factory() as db:
+        balance = db.query(Customer.loyalty_points).filter(Customer.id == uuid.UUID(customer_id)).scalar()
+        ledger = db.query(LoyaltyLedgerEntry.entry_type, func.count(), func.sum(LoyaltyLedgerEntry.points)).filter(
+            LoyaltyLedgerEntry.customer_id == uuid.UUID(customer_id)
+        ).group_by(LoyaltyLedgerEntry.entry_type).all()
+        return balance, {str(getattr(t, "value", t)): (count, total) for t, count, total in ledger}
+
+
+def test_parallel_accruals_of_the_same_orders_count_once(session_factory, tenant, make_customer):
+    first, second = make_customer(), make_customer()
+    orders = (
+        make_orders(session_factory, tenant, first["customer_id"], [900, 450, 1230])
+        + make_orders(session_factory, tenant, second["customer_id"], [700, 2000])
+    )
+
+    results = run_parallel(session_factory, [
+        lambda repo: repo.accrue_points_for_orders(tenant["tenant_id"], orders, POINTS_RATE)
+        for _ in range(8)
+    ])
+
+    # Every order accrued exactly once, by whichever call got there first
+    accrued = {}
+    for result in results:
+        for user_id, points in result.items():
+            accrued[user_id] = accrued.get(user_id, 0) + points
+    assert accrued == {first["user_id"]: 90 + 45 + 123, second["user_id"]: 70 + 200}
+
+    for customer, orders_count, points in ((first, 3, 258), (second, 2, 270)):
+        balance, ledger = balance_and_ledger(session_factory, customer["customer_id"])
+        assert balance == points
+        assert ledger == {"ACCRUAL": (orders_count, points)}
+
+
+def test_parallel_accruals_and_redemptions_keep_balance_equal_to_ledger(session_factory, tenant, make_customer):
+    customer = make_customer()
+    with session_factory() as db:
+        CustomerRepository(db).add_loyalty_points(tenant["tenant_id"], customer["user_id"], 100)
+        db.commit()
+    batches = [make_orders(session_factory, tenant, customer["customer_id"], [300, 500]) for _ in range(3)]
+
+    calls = [lambda repo: repo.redeem_loyalty_points(tenant["tenant_id"], customer["user_id"], 40) for _ in range(10)]
+    # Each batch is accrued by two calls at once
+    calls += [
+        lambda repo, batch=batch: repo.accrue_points_for_orders(tenant["tenant_id"], batch, POINTS_RATE)
+        for batch in batches for _ in range(2)
+    ]
+    results = run_parallel(session_factory, calls)
+
+    redeemed = sum(40 for ok in results[:10] if ok)
+    balance, ledger = balance_and_ledger(session_factory, customer["customer_id"])
+    assert balance >= 0
+    assert balance == 100 + 3 * 80 - redeemed
+    assert ledger["ACCRUAL"] == (6, 240)
+    assert sum(total for _, total in ledger.values()) == balance
+
+
+def test_accrual_ignores_another_tenants_orders(session_factory, tenant, make_customer):
+    customer = make_customer()
+    orders = make_orders(session_factory, tenant, customer["customer_id"], [900])
+
+    with session_factory() as db:
+        assert CustomerRepository(db).accrue_points_for_orders(str(uuid.uuid4()), orders, POINTS_RATE) == {}
+        db.commit()
+    balance, ledger = balance_and_ledger(session_factory, customer["customer_id"])
+    assert balance == 0 and ledger == {}
+
+
+def test_ledger_is_scoped_to_the_tenant(session_factory, tenant, make_customer):
+    customer = make_customer()
+    make_orders(session_factory, tenant, customer["customer_id"], [900])
+    with session_factory() as db:
+        repo = CustomerRepository(db)
+        repo.add_loyalty_points(tenant["tenant_id"], customer["user_id"], 10)
+        db.commit()
+        assert len(repo.get_loyalty_ledger(tenant["tenant_id"], customer["user_id"])) == 1
+        assert repo.get_loyalty_ledger(str(uuid.uuid4()), customer["user_id"]) == []
+
+
+def test_adjustments_and_redemptions_touch_only_the_tenants_customer(session_factory, tenant, make_customer):
+    slug = f"test-{uuid.uuid4().hex[:12]}"
+    with session_factory() as db:
+        other = Tenant(name=slug, slug=slug)
+        db.add(other)
+        db.commit()
+        other_id = str(other.id)
+    here = make_customer(loyalty_points=50)
+    there = make_customer(loyalty_points=50, tenant_id=other_id, user_id=here["user_id"])
+
+    with session_factory() as db:
+        repo = CustomerRepository(db)
+        assert repo.add_loyalty_points(tenant["tenant_id"], here["user_id"], 10).loyalty_points == 60
+        assert repo.redeem_loyalty_points(tenant["tenant_id"], here["user_id"], 30).loyalty_points == 30
+        assert repo.redeem_loyalty_points(tenant["tenant_id"], here["user_id"], 40) is None
+        with pytest.raises(ValueError):
+            repo.redeem_loyalty_points(str(uuid.uuid4()), here["user_id"], 1)
+        db.commit()
+
+    assert balance_and_ledger(session_factory, here["customer_id"]) == (30, {"ADJUSTMENT": (1, 10), "REDEMPTION": (1, -30)})
+    assert balance_and_ledger(session_factory, there["customer_id"]) == (50, {})
@@ -0,0 +1,352 @@
+"""
+Requests every /api route once, so each has a query count in the baseline
+(see backend/src/testing/query_budget_plugin.py).
+
+The calls run in order as one scenario against the seeded tenant: rows
+are created with real request bodies, read, updated, moved through their
+statuses and deleted last. Every call must answer the status listed for
+it, so a route that errors is caught here rather than recorded in the
+baseline. Routes that need an extension the test database lacks, and
+routes marked broken (with the reason), are not requested and stay
+without a baseline entry.
+"""
+import re
+import uuid
+import warnings
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pytest
+from sqlalchemy import text
+
+from backend.src.infrastructure.models.user_model import User, UserRole
+from backend.src.infrastructure.models.order_model import Order, OrderStatus
+from backend.src.infrastructure.services.popularity_store import get_popularity_store
+from backend.src.infrastructure.services.cooccurrence_store import get_cooccurrence_store
+from backend.src.services.popularity_service import POPULARITY_WINDOWS, popularity_timestamp
+
+PARAM = re.compile(r"<(?:\w+:)?(\w+)>")
+API = "/api/v1"
+LATER = "2099-06-01T19:00:00"
+
+
+@dataclass
+class Call:
+    """One request of the scenario and the status it must answer"""
+    method: str
+    rule: str
+    status: int = 200
+    role: Optional[str] = "OWNER"
+    json: Any = None
+    query: Dict[str, Any] = field(default_factory=dict)
+    # Path parameter -> state key, where they are not named alike
+    params: Dict[str, str] = field(default_factory=dict)
+    # State key <- response field, for the rows later calls name
+    save: Dict[str, str] = field(default_factory=dict)
+    # Acting user (state key); the owner unless the role is CUSTOMER
+    user: Optional[str] = None
+    # Extensions the route needs
+    requires: Tuple[str, ...] = ()
+    # Why the route cannot answer yet; it is not requested
+    broken: Optional[str] = None
+    # Run with the state before the request
+    prepare: Optional[Callable[[Dict[str, str]], None]] = None
+
+
+def rank_products(state):
+    """Rankings and co-occurrences of the menu's products, as the jobs would build them"""
+    now = popularity_timestamp(datetime.utcnow())
+    scores = {state["product_id"]: 3.0, state["side_product_id"]: 1.0}
+    for window in POPULARITY_WINDOWS:
+        get_popularity_store().replace(state["branch_id"], window, scores, now)
+    get_cooccurrence_store().set_neighbours(state["tenant_id"], {state["product_id"]: [(state["side_product_id"], 0.5)]})
+
+
+NO_TENANT_READS = "TenantRepository has no get_by_id, get_all or update"
+PAYMENTS_OFF_MODEL = "the payments service expects invoice_id and enum columns the Payment model lacks"
+
+
+CALLS = [
+    Call("GET", "/"),
+    Call("GET", "/health"),
+    Call("POST", "/auth/register", 201, role=None, json={
+        "tenant_name": "Smoke {uid}", "full_name": "Smoke Owner",
+        "email": "owner-{uid}@example.com", "password": "secret-password",
+    }),
+    Call("POST", "/auth/login", role=None, json={"email": "owner-{uid}@example.com", "password": "secret-password"}),
+
+    # Tenants
+    Call("GET", "/tenants", role="SYS_ADMIN", broken=NO_TENANT_READS),
+    Call("POST", "/tenants", 201, role="SYS_ADMIN", json={"name": "Smoke tenant {uid}"}, save={"other_tenant_id": "id"}),
+    Call("GET", "/tenants/<tenant_id>", broken=NO_TENANT_READS),
+    Call("PUT", "/tenants/<tenant_id>", role="SYS_ADMIN", json={"subscription_plan": "PRO"},
+         params={"tenant_id": "other_tenant_id"}, broken=NO_TENANT_READS),
+
+    # Users
+    Call("GET", "/users"),
+    Call("GET", "/users/all", role="SYS_ADMIN"),
+    Call("POST", "/users", 201, json={
+        "email": "staff-{uid}@example.com", "password": "secret-password", "full_name": "Smoke Staff", "role": "STAFF",
+    }, save={"staff_user_id": "id"}),
+    Call("POST", "/users", 201, json={
+        "email": "member-{uid}@example.com", "password": "secret-password", "full_name": "Smoke Member",
+    }, save={"member_user_id": "id"}),
+    Call("GET", "/users/<user_id>", params={"user_id": "staff_user_id"}),
+    Call("PUT", "/users/<user_id>", json={"full_name": "Smoke Staffer"}, params={"user_id": "staff_user_id"}),
+    Call("PUT", "/users/<user_id>/role", role="SYS_ADMIN", json={"role": "STAFF"}, params={"user_id": "staff_user_id"}),
+    Call("GET", "/users/me"),
+    Call("PUT", "/users/me", json={"full_name": "Smoke Owner"}),
+
+    # Branches
+    Call("GET", "/branches"),
+    Call("POST", "/branches", 201, json={"name": "Riverside", "address": "1 River Road"}, save={"new_branch_id": "id"}),
+    Call("GET", "/branches/<branch_id>"),
+    Call("PUT", "/branches/<branch_id>", json={"name": "Riverside 2"}, params={"branch_id": "new_branch_id"}),
+
+    # Staff
+    Call("POST", "/staff", 201, json={"branch_id": "{branch_id}", "position": "Waiter"},
+         query={"user_id": "{staff_user_id}"}),
+    Call("GET", "/staff"),
+    Call("GET", "/staff/me", role="STAFF", user="staff_user_id"),
+    Call("GET", "/staff/branch/<branch_id>"),
+    Call("GET", "/staff/<user_id>", params={"user_id": "staff_user_id"}),
+    Call("PUT", "/staff/<user_id>", json={"position": "Head waiter"}, params={"user_id": "staff_user_id"}),
+
+    # Menu
+    Call("POST", "/categories", 201, json={"name": "Drinks", "display_order": 1}, save={"category_id": "id"}),
+    Call("GET", "/categories"),
+    Call("GET", "/categories/<category_id>"),
+    Call("PUT", "/categories/<category_id>", json={"name": "Cold drinks"}),
+    Call("POST", "/categories/reorder", json={"order": ["{category_id}"]}),
+    Call("POST", "/menu/categories", 201, json={"name": "Noodles"}, save={"menu_category_id": "id"}),
+    Call("GET", "/menu/categories"),
+    Call("POST", "/menu/products", 201, json={
+        "category_id": "{menu_category_id}", "name": "Pho bo", "price": 65000, "description": "Beef noodle soup",
+    }, save={"product_id": "id"}),
+    Call("POST", "/menu/products", 201, json={
+        "category_id": "{menu_category_id}", "name": "Bun cha", "price": 55000,
+    }, save={"side_product_id": "id"}),
+    Call("GET", "/menu/products"),
+    Call("PUT", "/menu/products/<product_id>", json={"price": 70000}),
+    Call("GET", "/menu/search", query={"q": "pho"}, requires=("pg_trgm", "unaccent")),
+    Call("GET", "/menu/autocomplete", query={"q": "ph"}),
+
+    # Tables
+    Call("GET", "/tables"),
+    Call("POST", "/tables", 201, json={"branch_id": "{branch_id}", "name": "T2", "seats": 6}, save={"new_table_id": "id"}),
+    # Creating a table dropped the branch's board: this reads it from the database
+    Call("GET", "/tables/board/<branch_id>"),
+    Call("GET", "/tables/<table_id>"),
+    Call("PUT", "/tables/<table_id>", json={"seats": 8}, params={"table_id": "new_table_id"}),
+    Call("PUT", "/tables/<table_id>/status", json={"status": "OCCUPIED"}, params={"table_id": "new_table_id"}),
+    Call("GET", "/tables/<table_id>/qr"),
+
+    # Orders
+    Call("POST", "/orders", 201, role="CUSTOMER", json={
+        "branch_id": "{branch_id}", "table_id": "{table_id}", "customer_id": "{customer_id}", "note": "No onions",
+    }, save={"open_order_id": "id"}),
+    Call("POST", "/orders", 201, role="CUSTOMER", json={"branch_id": "{branch_id}", "table_id": "{table_id}"},
+         save={"empty_order_id": "id"}),
+    Call("GET", "/orders"),
+    Call("GET", "/orders/<order_id>", params={"order_id": "open_order_id"}),
+    Call("POST", "/orders/<order_id>/items", 201, role="CUSTOMER", json={
+        "product_id": "{product_id}", "quantity": 2, "price": 70000,
+    }, params={"order_id": "open_order_id"}),
+    Call("PUT", "/orders/<order_id>/status", json={"status": "CONFIRMED"}, params={"order_id": "open_order_id"}),
+    Call("GET", "/orders/kitchen-board/<branch_id>"),
+    Call("POST", "/order-items", 201, role="CUSTOMER", json={
+        "order_id": "{open_order_id}", "product_id": "{product_id}", "quantity": 1, "price_at_order": 70000,
+    }, save={"order_item_id": "id"}),
+    Call("POST", "/order-items", 201, role="CUSTOMER", json={
+        "order_id": "{open_order_id}", "product_id": "{product_id}", "quantity": 1, "price_at_order": 70000,
+    }, save={"cancelled_item_id": "id"}),
+    Call("GET", "/order-items/<order_item_id>"),
+    Call("PUT", "/order-items/<order_item_id>", role="CUSTOMER", json={"quantity": 3}),
+    Call("GET", "/order-items/by-order/<order_id>", params={"order_id": "open_order_id"}),
+    Call("PATCH", "/order-items/<order_item_id>/status", json={"item_status": "PENDING"}),
+    Call("POST", "/order-items/<order_item_id>/cooking"),
+    Call("POST", "/order-items/<order_item_id>/ready"),
+    Call("POST", "/order-items/<order_item_id>/served"),
+    Call("POST", "/order-items/<order_item_id>/cancel", params={"order_item_id": "cancelled_item_id"}),
+
+    # Customers and loyalty
+    Call("POST", "/customers", 201, role="CUSTOMER", user="member_user_id", json={"phone_number": "0901234567"}),
+    Call("GET", "/customers"),
+    Call("GET", "/customers/<user_id>"),
+    Call("GET", "/customers/me", role="CUSTOMER"),
+    Call("PUT", "/customers/me", role="CUSTOMER", json={"phone_number": "0907654321"}),
+    Call("POST", "/customers/loyalty/accrue", json={"order_ids": ["{order_id}"]}),
+    Call("POST", "/customers/<user_id>/loyalty/add", json={"points": 100}),
+    Call("POST", "/customers/<user_id>/loyalty/redeem", role="CUSTOMER", json={"points": 30}),
+    Call("GET", "/customers/<user_id>/loyalty/ledger", role="CUSTOMER"),
+
+    # Billing
+    Call("POST", "/invoices", 201, json={"order_id": "{order_id}", "final_amount": 120000}, save={"invoice_id": "id"}),
+    Call("GET", "/invoices"),
+    Call("GET", "/invoices/<invoice_id>"),
+    Call("GET", "/invoices/order/<order_id>"),
+    Call("POST", "/payments", 201, role="CUSTOMER", json={
+        "invoice_id": "{invoice_id}", "payment_method": "QR_CODE", "amount": 120000,
+    }, broken=PAYMENTS_OFF_MODEL),
+    Call("GET", "/payments", broken=PAYMENTS_OFF_MODEL),
+    Call("GET", "/payments/<payment_id>", broken=PAYMENTS_OFF_MODEL),
+    Call("GET", "/payments/<payment_id>/qr", role="CUSTOMER", broken=PAYMENTS_OFF_MODEL),
+    Call("GET", "/payments/order/<order_id>", broken=PAYMENTS_OFF_MODEL),
+    Call("POST", "/payments/<payment_id>/process", broken=PAYMENTS_OFF_MODEL),
+    Call("POST", "/payments/<payment_id>/refund", broken=PAYMENTS_OFF_MODEL),
+    Call("POST", "/invoices/<invoice_id>/pay"),
+    Call("POST", "/invoices/<invoice_id>/refund"),
+    Call("POST", "/promotions", 201, json={
+        "code": "SMOKE{uid}", "type": "PERCENTAGE", "value": 10,
+        "start_date": "2020-01-01T00:00:00", "end_date": LATER,
+    }, save={"promotion_id": "id"}),
+    Call("GET", "/promotions"),
+    Call("GET", "/promotions/<promotion_id>"),
+    Call("GET", "/promotions/code/<code>", params={"code": "promotion_code"}),
+    Call("PUT", "/promotions/<promotion_id>", json={"value": 15}),
+    Call("POST", "/promotions/apply", role="CUSTOMER", json={"code": "SMOKE{uid}", "amount": 100000}),
+
+    # QR codes
+    Call("GET", "/qrcode/image/<qr_type>/<entity_id>", role="CUSTOMER", query={"tenant_id": "{tenant_id}"}),
+    Call("GET", "/qrcode/loyalty/<customer_id>", role="CUSTOMER"),
+    Call("GET", "/qrcode/restaurant", query={"branch_id": "{branch_id}"}),
+    Call("POST", "/qrcode/table", json={"branch_id": "{branch_id}", "table_id": "{table_id}", "table_number": "T1"}),
+    Call("POST", "/qrcode/payment", role="CUSTOMER", json={"order_id": "{order_id}", "amount": 120000}),
+
+    # Recommendations and chatbot
+    Call("GET", "/recommendations/popular", role="CUSTOMER", query={"branch_id": "{branch_id}"}, prepare=rank_products),
+    Call("GET", "/recommendations/personalized", role="CUSTOMER"),
+    Call("GET", "/recommendations/similar-products/<product_id>", role="CUSTOMER"),
+    Call("GET", "/recommendations/frequently-ordered-together/<product_id>", role="CUSTOMER"),
+    Call("POST", "/recommendations/by-embedding", role="CUSTOMER", json={"embedding": [0.1, 0.2, 0.3]}),
+    Call("POST", "/recommendations/by-text", role="CUSTOMER", json={"text": "spicy noodle soup"}),
+    Call("POST", "/chatbot/index", 202, json={"doc_id": "hours-{uid}", "text": "We open every day from 9am to 10pm."}),
+    Call("POST", "/chatbot/chat", role="CUSTOMER", json={"question": "When do you open?"},
+         save={"chat_session_id": "session_id"}),
+
+    # Reservations
+    Call("GET", "/reservations/availability", role="CUSTOMER",
+         query={"branch_id": "{branch_id}", "date": "2099-06-01", "party_size": 2}, requires=("btree_gist",)),
+    Call("POST", "/reservations", 201, role="CUSTOMER", json={
+        "branch_id": "{branch_id}", "booking_time": LATER, "party_size": 2,
+    }, save={"reservation_id": "id"}, requires=("btree_gist",)),
+    Call("GET", "/reservations", requires=("btree_gist",)),
+    Call("GET", "/reservations/my", role="CUSTOMER", requires=("btree_gist",)),
+    Call("GET", "/reservations/<reservation_id>", role="CUSTOMER", requires=("btree_gist",)),
+    Call("PUT", "/reservations/<reservation_id>", role="CUSTOMER", json={"party_size": 3}, requires=("btree_gist",)),
+    Call("PUT", "/reservations/<reservation_id>/status", json={"status": "CONFIRMED"}, requires=("btree_gist",)),
+    Call("POST", "/reservations/<reservation_id>/cancel", role="CUSTOMER", requires=("btree_gist",)),
+
+    # Reviews
+    Call("POST", "/reviews", 201, role="CUSTOMER", json={"order_id": "{order_id}", "rating": 5, "comment": "Great pho"},
+         save={"review_id": "id"}),
+    Call("GET", "/reviews"),
+    Call("GET", "/reviews/my", role="CUSTOMER"),
+    Call("GET", "/reviews/<review_id>"),
+    Call("PUT", "/reviews/<review_id>", role="CUSTOMER", json={"rating": 4}),
+
+    # Sync
+    Call("GET", "/sync/menu"),
+    Call("GET", "/sync/tables", query={"branch_id": "{branch_id}"}),
+    Call("GET", "/sync/orders", query={"branch_id": "{branch_id}"}),
+
+    # Deletes, after every read of the rows
+    Call("DELETE", "/chatbot/sessions/<session_id>", role="CUSTOMER", params={"session_id": "chat_session_id"}),
+    Call("DELETE", "/reviews/<review_id>", role="CUSTOMER"),
+    Call("DELETE", "/promotions/<promotion_id>"),
+    Call("DELETE", "/order-items/<order_item_id>", params={"order_item_id": "cancelled_item_id"}),
+    Call("DELETE", "/orders/<order_id>", params={"order_id": "empty_order_id"}),
+    Call("DELETE", "/tables/<table_id>", params={"table_id": "new_table_id"}),
+    Call("DELETE", "/categories/<category_id>"),
+    Call("DELETE", "/staff/<user_id>", params={"user_id": "staff_user_id"}),
+    Call("DELETE", "/users/<user_id>", params={"user_id": "staff_user_id"}),
+    Call("DELETE", "/branches/<branch_id>", params={"branch_id": "new_branch_id"}),
+    Call("DELETE", "/tenants/<tenant_id>", role="SYS_ADMIN", params={"tenant_id": "other_tenant_id"},
+         broken=NO_TENANT_READS),
+]
+
+
+@pytest.fixture
+def seeded(session_factory, tenant, make_customer):
+    customer = make_customer()
+    uid = uuid.uuid4().hex[:10]
+    with session_factory() as db:
+        owner = User(email=f"{uuid.uuid4().hex}@example.com", password_hash="x", role=UserRole.OWNER)
+        order = Order(
+            tenant_id=uuid.UUID(tenant["tenant_id"]), branch_id=uuid.UUID(tenant["branch_id"]),
+            table_id=uuid.UUID(tenant["table_id"]), customer_id=uuid.UUID(customer["customer_id"]),
+            status=OrderStatus.COMPLETED, total_amount=120000
+        )
+        db.add_all([owner, order])
+        db.commit()
+        return {
+            **tenant, **customer, "uid": uid,
+            "owner_id": str(owner.id), "order_id": str(order.id),
+            "qr_type": "table", "entity_id": tenant["table_id"],
+            "promotion_code": f"SMOKE{uid}",
+        }
+
+
+@pytest.fixture
+def extensions(engine):
+    with engine.connect() as conn:
+        return set(conn.execute(text("SELECT extname FROM pg_extension")).scalars())
+
+
+def api_routes(app):
+    return {
+        (method, rule.rule)
+        for rule in app.url_map.iter_rules()
+        if rule.rule.startswith(API)
+        for method in rule.methods - {"HEAD", "OPTIONS"}
+    }
+
+
+def fill(value, state):
+    """`value` with "{key}" placeholders replaced by state values"""
+    if isinstance(value, str):
+        return value.format(**state)
+    if isinstance(value, list):
+        return [fill(v, state) for v in value]
+    if isinstance(value, dict):
+        return {k: fill(v, state) for k, v in value.items()}
+    return value
+
+
+def test_every_route_answers(app, client, seeded, extensions, auth_headers):
+    assert {(call.method, API + call.rule) for call in CALLS} == api_routes(app)
+
+    state = dict(seeded)
+    failures, skipped = [], []
+    for call in CALLS:
+        name = f"{call.method} {call.rule}"
+        missing = [e for e in call.requires if e not in extensions]
+        if call.broken or missing:
+            skipped.append(f"{name} ({call.broken or 'needs ' + ', '.join(missing)})")
+            continue
+        try:
+            path = API + PARAM.sub(lambda m: state[call.params.get(m.group(1), m.group(1))], call.rule)
+            body = fill(call.json, state)
+            query = fill(call.query, state)
+            headers = {}
+            if call.role:
+                user = call.user or ("user_id" if call.role == "CUSTOMER" else "owner_id")
+                headers = auth_headers(state[user], state["tenant_id"], call.role)
+        except KeyError as e:
+            failures.append(f"{name}: no {e.args[0]}, the call creating it failed")
+            continue
+        if call.prepare:
+            call.prepare(state)
+        response = client.open(path, method=call.method, headers=headers, json=body, query_string=query)
+        body = response.get_json(silent=True)
+        # Some routes report an error in a 200 body
+        if response.status_code != call.status or (isinstance(body, dict) and "error" in body):
+            failures.append(f"{name}: {response.status_code} {body}")
+            continue
+        for key, source in call.save.items():
+            state[key] = str(body[source])
+
+    if skipped:
+        warnings.warn(f"not requested: {'; '.join(skipped)}")
+    assert not failures, "\n".join(failures)
@@ -0,0 +1,40 @@
+"""
+TableBoardService: a board dropped right after it was built (a table was
+created or deleted meanwhile) is still served from what was loaded.
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+from backend.src.services.table_board_service import TableBoardService
+from backend.src.infrastructure.services.table_board_store import InMemoryTableBoard
+
+
+class Tables:
+    def get_by_branch(self, branch_id):
+        return [
+            SimpleNamespace(id=f"t{n}", name=f"T{n}", seats=4, status="AVAILABLE", updated_at=datetime(2026, 1, 1))
+            for n in (1, 2)
+        ]
+
+
+class InvalidatedBoard(InMemoryTableBoard):
+    """Loses every board as soon as it is loaded"""
+
+    def load(self, branch_id, entries):
+        version = super().load(branch_id, entries)
+        self.invalidate(branch_id)
+        return version
+
+
+def test_board_invalidated_after_load_is_served_from_the_load():
+    board = TableBoardService(Tables(), InvalidatedBoard()).get_board("b1")
+    assert board["full"] and board["version"] == 1
+    assert sorted(board["tables"]) == ["t1", "t2"]
+    assert board["tables"]["t1"]["v"] == 1
+
+
+def test_loaded_board_matches_the_store():
+    store = InMemoryTableBoard()
+    board = TableBoardService(Tables(), store).get_board("b1")
+    version, loaded, entries = store.get("b1")
+    assert (board["version"], board["tables"]) == (version, entries)
@@ -0,0 +1,93 @@
+"""
+Taste folding: the taste of a customer must not depend on the order in
+which their orders' jobs run, and a re-delivered job must change nothing.
+"""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from backend.src.domain.taste import fold_order, TASTE_HALF_LIFE_SECONDS
+from backend.src.services.taste_service import TasteService
+
+DAY = 24 * 3600
+VERSION = "test@1"
+EMBEDDINGS = {"pho": [1.0, 0.0, 0.0], "bun": [0.0, 1.0, 0.0], "tra": [0.0, 0.0, 1.0]}
+# order_id -> (completed_at, [(product_id, quantity)])
+ORDERS = {
+    "o1": (1000 * DAY, [("pho", 2)]),
+    "o2": (1030 * DAY, [("bun", 1), ("tra", 3)]),
+    "o3": (1200 * DAY, [("pho", 1), ("bun", 1)]),
+}
+
+
+class Customers:
+    """The taste columns of one customer and the orders' taste flags"""
+
+    def __init__(self):
+        self.taste = {"vector": None, "version": None, "weight": 0.0, "updated_at": None}
+        self.flagged = set()
+
+    def get_taste(self, tenant_id, customer_id, for_update=False):
+        return dict(self.taste)
+
+    def save_taste(self, customer_id, vector, version, weight, updated_at):
+        self.taste = {"vector": list(vector), "version": version, "weight": weight, "updated_at": updated_at}
+
+    def mark_taste_orders(self, order_ids):
+        new = [o for o in order_ids if o not in self.flagged]
+        self.flagged.update(new)
+        return new
+
+
+class OrderItems:
+    def get_rows_by_order(self, order_id):
+        return [{"product_id": p, "quantity": q, "item_status": "SERVED"} for p, q in ORDERS[order_id][1]]
+
+    def get_customer_order_lines(self, tenant_id, customer_id):
+        return [
+            {"order_id": o, "completed_at": datetime.utcfromtimestamp(at), "product_id": p, "quantity": q}
+            for o, (at, lines) in sorted(ORDERS.items(), key=lambda item: item[1][0])
+            for p, q in lines
+        ]
+
+
+class Products:
+    def get_embeddings(self, tenant_id, product_ids, version):
+        return {p: EMBEDDINGS[p] for p in product_ids if p in EMBEDDINGS}
+
+
+def service():
+    return TasteService(Customers(), Products(), OrderItems(), embedding_version=VERSION)
+
+
+def test_late_order_is_decayed_from_its_own_completion():
+    vector, weight = fold_order(None, 0.0, None, [(EMBEDDINGS["pho"], 1)], 100 * DAY)
+    vector, weight = fold_order(vector, weight, 100 * DAY, [(EMBEDDINGS["bun"], 1)], 100 * DAY - TASTE_HALF_LIFE_SECONDS)
+    assert weight == pytest.approx(1.5)
+    assert vector.tolist() == pytest.approx([2 / 3, 1 / 3, 0.0])
+
+
+@pytest.mark.parametrize("sequence", [["o1", "o2", "o3"], ["o3", "o1", "o2"], ["o2", "o3", "o1"]])
+def test_taste_does_not_depend_on_job_order(sequence):
+    expected = service()
+    expected.rebuild("t", "c", commit=lambda: None)
+
+    taste = service()
+    for order_id in sequence:
+        assert taste.record_order("t", "c", order_id, ORDERS[order_id][0], commit=lambda: None)
+
+    got, want = taste.customer_repo.taste, expected.customer_repo.taste
+    assert got["updated_at"] == want["updated_at"] == datetime.utcfromtimestamp(1200 * DAY)
+    assert got["weight"] == pytest.approx(want["weight"], rel=1e-6)
+    assert np.allclose(got["vector"], want["vector"], atol=1e-6)
+
+
+def test_redelivered_order_is_skipped():
+    taste = service()
+    assert taste.record_order("t", "c", "o3", ORDERS["o3"][0], commit=lambda: None)
+    assert taste.record_order("t", "c", "o1", ORDERS["o1"][0], commit=lambda: None)
+    before = taste.customer_repo.taste
+    assert not taste.record_order("t", "c", "o1", ORDERS["o1"][0], commit=lambda: None)
+    assert not taste.record_order("t", "c", "o3", ORDERS["o3"][0], commit=lambda: None)
+    assert taste.customer_repo.taste == before
@@ -0,0 +1,39 @@
+"""
+Requests naming another tenant's records must not return them.
+"""
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def outsider(tenant, auth_headers):
+    """Headers of an owner of a second tenant"""
+    return auth_headers(str(uuid.uuid4()), str(uuid.uuid4()), "OWNER")
+
+
+@pytest.mark.parametrize("path", ["/api/v1/sync/tables", "/api/v1/tables"])
+def test_tables_of_another_tenants_branch_are_not_listed(client, tenant, outsider, path):
+    response = client.get(path, query_string={"branch_id": tenant["branch_id"]}, headers=outsider)
+    assert response.status_code == 200
+    body = response.get_json()
+    tables = body["changes"]["tables"] if "changes" in body else body["tables"]
+    assert tables == []
+
+
+def test_availability_at_another_tenants_branch_is_not_found(client, tenant, outsider):
+    response = client.get(
+        "/api/v1/reservations/availability",
+        query_string={"branch_id": tenant["branch_id"], "date": "2030-01-07"},
+        headers=outsider
+    )
+    assert response.status_code == 404
+
+
+def test_reservation_at_another_tenants_branch_is_not_found(client, tenant, outsider):
+    response = client.post(
+        "/api/v1/reservations",
+        json={"branch_id": tenant["branch_id"], "booking_time": "2030-01-07T19:00:00", "party_size": 2},
+        headers=outsider
+    )
+    assert response.status_code == 404
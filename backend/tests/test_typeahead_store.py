@@ -0,0 +1,35 @@
+"""
+TypeaheadStore under concurrent first requests: one build per tenant, and
+every caller gets the index that build produced.
+"""
+import time
+import threading
+
+from backend.src.infrastructure.services.typeahead_store import TypeaheadStore
+
+
+def test_concurrent_cold_requests_build_once():
+    store = TypeaheadStore()
+    builds = []
+
+    def build():
+        time.sleep(0.05)
+        index = object()
+        builds.append(index)
+        return index
+
+    barrier = threading.Barrier(8)
+    results = []
+
+    def request():
+        barrier.wait()
+        results.append(store.get("tenant", build))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert results == builds * 8
@@ -0,0 +1,5 @@
+"""
+Repository-wide pytest setup. Plugins can only be registered from the
+root conftest, whichever directory or test file pytest is pointed at.
+"""
+pytest_plugins = ["backend.src.testing.query_budget_plugin"]